@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Labeeb request path.
+
+Run with ``python -m benchmarks.run``. Every scenario talks to a local fake
+Ollama server, so results do not depend on a model being installed.
+"""
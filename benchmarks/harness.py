@@ -0,0 +1,294 @@
+"""
+Benchmark harness for measuring request-path latency.
+
+---
+description: Runs a workload, records latencies, and compares against baselines
+endpoints: [run_async_benchmark, run_sync_benchmark, compare_to_baseline]
+inputs: [workload, iterations, concurrency]
+outputs: [BenchmarkResult]
+dependencies: [asyncio, psutil, json]
+auth: none
+alwaysApply: false
+---
+
+- Time each call of a workload, sequentially or with bounded concurrency
+- Report p50/p95/p99 latency, throughput, errors and peak RSS
+- Store results as baselines and flag regressions beyond a tolerance
+"""
+
+import asyncio
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import psutil
+
+DEFAULT_BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Get a percentile by linear interpolation between closest ranks.
+
+    Args:
+        values: The samples, in any order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements from one benchmark run."""
+
+    name: str
+    iterations: int
+    concurrency: int
+    wall_time: float
+    peak_rss: int
+    latencies: List[float] = field(default_factory=list, repr=False)
+    errors: int = 0
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.latencies, 95)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.latencies, 99)
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second."""
+        return self.iterations / self.wall_time if self.wall_time else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the summary to a JSON-serializable dictionary, times in milliseconds."""
+        return {
+            "iterations": self.iterations,
+            "concurrency": self.concurrency,
+            "errors": self.errors,
+            "p50_ms": round(self.p50 * 1000, 3),
+            "p95_ms": round(self.p95 * 1000, 3),
+            "p99_ms": round(self.p99 * 1000, 3),
+            "throughput_per_s": round(self.throughput, 2),
+            "peak_rss_mb": round(self.peak_rss / 1024**2, 1),
+        }
+
+    def format(self) -> str:
+        """Format the summary as one line of text."""
+        data = self.to_dict()
+        return (
+            f"{self.name:<45} p50 {data['p50_ms']:>9.2f} ms  p95 {data['p95_ms']:>9.2f} ms  "
+            f"p99 {data['p99_ms']:>9.2f} ms  {data['throughput_per_s']:>9.1f}/s  "
+            f"rss {data['peak_rss_mb']:>7.1f} MB  errors {self.errors}"
+        )
+
+
+class PeakRSSSampler:
+    """Samples this process's resident set size on a background thread."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+async def run_async_benchmark(
+    name: str,
+    workload: Callable[[int], Awaitable[Any]],
+    iterations: int = 100,
+    concurrency: int = 1,
+    warmup: int = 5,
+) -> BenchmarkResult:
+    """
+    Benchmark a coroutine function.
+
+    Args:
+        name: Name of the benchmark
+        workload: Coroutine function called with the iteration number
+        iterations: Number of measured calls
+        concurrency: Maximum number of calls in flight
+        warmup: Number of unmeasured calls made first
+
+    Returns:
+        BenchmarkResult: The measurements
+    """
+    for i in range(warmup):
+        await workload(-1 - i)
+
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def timed(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await workload(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    with PeakRSSSampler() as rss:
+        start = time.perf_counter()
+        await asyncio.gather(*(timed(i) for i in range(iterations)))
+        wall_time = time.perf_counter() - start
+
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        concurrency=concurrency,
+        wall_time=wall_time,
+        peak_rss=rss.peak,
+        latencies=latencies,
+        errors=errors,
+    )
+
+
+def run_sync_benchmark(
+    name: str,
+    workload: Callable[[int], Any],
+    iterations: int = 100,
+    warmup: int = 5,
+) -> BenchmarkResult:
+    """
+    Benchmark a blocking function, one call at a time.
+
+    Args:
+        name: Name of the benchmark
+        workload: Function called with the iteration number
+        iterations: Number of measured calls
+        warmup: Number of unmeasured calls made first
+
+    Returns:
+        BenchmarkResult: The measurements
+    """
+    for i in range(warmup):
+        workload(-1 - i)
+
+    latencies: List[float] = []
+    errors = 0
+    with PeakRSSSampler() as rss:
+        start = time.perf_counter()
+        for i in range(iterations):
+            call_start = time.perf_counter()
+            try:
+                workload(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - call_start)
+        wall_time = time.perf_counter() - start
+
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        concurrency=1,
+        wall_time=wall_time,
+        peak_rss=rss.peak,
+        latencies=latencies,
+        errors=errors,
+    )
+
+
+def load_baselines(path: Union[str, Path] = DEFAULT_BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Load stored baselines.
+
+    Args:
+        path: Path of the baseline file
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Benchmark names mapped to their stored summaries
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(
+    results: List[BenchmarkResult], path: Union[str, Path] = DEFAULT_BASELINE_PATH
+) -> None:
+    """
+    Store results as baselines, keeping baselines of benchmarks that were not run.
+
+    Args:
+        results: The results to store
+        path: Path of the baseline file
+    """
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result.name] = result.to_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(
+    result: BenchmarkResult, baseline: Dict[str, Any], tolerance: float = 0.25
+) -> List[str]:
+    """
+    List the ways a result is worse than its baseline.
+
+    Args:
+        result: The new result
+        baseline: The stored summary
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        List[str]: One message per regressed metric, empty if none regressed
+    """
+    current = result.to_dict()
+    regressions = []
+    for metric in ("p50_ms", "p95_ms", "p99_ms"):
+        if metric in baseline and current[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f"{metric} {current[metric]} > baseline {baseline[metric]}")
+    if "throughput_per_s" in baseline and current["throughput_per_s"] < baseline[
+        "throughput_per_s"
+    ] * (1 - tolerance):
+        regressions.append(
+            f"throughput_per_s {current['throughput_per_s']} < "
+            f"baseline {baseline['throughput_per_s']}"
+        )
+    if current["errors"] > baseline.get("errors", 0):
+        regressions.append(f"errors {current['errors']} > baseline {baseline.get('errors', 0)}")
+    return regressions
@@ -0,0 +1,133 @@
+"""
+Run the Labeeb benchmark suite against a fake Ollama server.
+
+---
+description: Command-line entry point for the benchmark suite
+endpoints: [main]
+inputs: [scenario, iterations, concurrency, token_latency]
+outputs: [report, baselines]
+dependencies: [argparse, fake_ollama, harness, scenarios]
+auth: none
+alwaysApply: false
+---
+
+Usage::
+
+    python -m benchmarks.run                       # run every scenario
+    python -m benchmarks.run -s ollama_client.generate -n 500 -c 8
+    python -m benchmarks.run --compare             # fail on regressions
+    python -m benchmarks.run --save-baseline       # record new baselines
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.harness import (
+    DEFAULT_BASELINE_PATH,
+    BenchmarkResult,
+    compare_to_baseline,
+    load_baselines,
+    save_baselines,
+)
+from benchmarks.scenarios import SCENARIOS
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+# Importing the fake does not import any Labeeb service, so scenarios still
+# import those only after the environment points them at the fake server
+from labeeb.testing.fake_ollama import FakeOllamaConfig, FakeOllamaServer  # noqa: E402
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Labeeb request-path benchmarks")
+    parser.add_argument(
+        "-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+        help="Scenario to run, may be repeated (default: all)",
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="Measured calls per scenario")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Calls in flight for async scenarios")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Fake server seconds between chunks")
+    parser.add_argument("--first-token-latency", type=float, default=0.0, help="Fake server seconds before the first chunk")
+    parser.add_argument("--chunk-size", type=int, default=4, help="Fake server characters per chunk")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fake server fraction of failed requests")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baselines")
+    parser.add_argument("--compare", action="store_true", help="Exit non-zero if a result regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    config = FakeOllamaConfig(
+        chunk_size=args.chunk_size,
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        failure_rate=args.failure_rate,
+    )
+    results: List[BenchmarkResult] = []
+    failed: List[str] = []
+    skipped: List[str] = []
+
+    with tempfile.TemporaryDirectory() as base_dir, FakeOllamaServer(config).run_in_thread() as url:
+        # Keep Labeeb's files and model traffic away from the real installation
+        os.environ["LABEEB_BASE_DIR"] = base_dir
+        os.environ["OLLAMA_HOST"] = url
+
+        for name in args.scenario or list(SCENARIOS):
+            try:
+                result = SCENARIOS[name](url, args.iterations, args.concurrency)
+            except ImportError as e:
+                # Optional dependencies or parts of Labeeb missing from this installation
+                print(f"{name:<45} skipped: {e}")
+                skipped.append(name)
+                continue
+            except Exception as e:
+                print(f"{name:<45} failed to run: {e}")
+                failed.append(name)
+                continue
+            results.append(result)
+            print(result.format())
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({r.name: r.to_dict() for r in results}, f, indent=2)
+
+    if args.save_baseline:
+        save_baselines(results, args.baseline)
+        print(f"Saved {len(results)} baselines to {args.baseline}")
+
+    regressed = False
+    missing = False
+    if args.compare:
+        baselines = load_baselines(args.baseline)
+        for name in skipped:
+            # A tracked hot path that did not run cannot be allowed to pass
+            if name in baselines:
+                print(f"MISSING {name}: has a baseline but produced no result")
+                missing = True
+        for result in results:
+            baseline = baselines.get(result.name)
+            if baseline is None:
+                print(f"MISSING {result.name}: no baseline, record one with --save-baseline")
+                missing = True
+                continue
+            for message in compare_to_baseline(result, baseline, args.tolerance):
+                print(f"REGRESSION {result.name}: {message}")
+                regressed = True
+
+    if skipped:
+        print(f"Skipped {len(skipped)} scenario(s) that cannot be imported here")
+    return 1 if regressed or missing or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
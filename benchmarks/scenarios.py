@@ -0,0 +1,205 @@
+"""
+Benchmark scenarios for the Labeeb request path.
+
+---
+description: Workloads that drive the request path against a fake Ollama server
+endpoints: [SCENARIOS]
+inputs: [base_url, iterations, concurrency]
+outputs: [BenchmarkResult]
+dependencies: [asyncio, fake_ollama, harness]
+auth: none
+alwaysApply: false
+---
+
+- Ollama client generate and token streaming
+- CommandProcessor.process_command_async with streamed responses
+- AICommandInterpreter.process_plan_async on a fan-out/fan-in plan of model calls
+- Labeeb.process_single_command on a fully initialized instance
+
+Labeeb modules are imported inside each scenario so that the runner can
+point them at the fake server through the environment first.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict
+
+from benchmarks.harness import BenchmarkResult, run_async_benchmark, run_sync_benchmark
+
+MODEL = "gemma3:4b"
+
+
+class BenchmarkConfig(dict):
+    """Minimal stand-in for ConfigManager."""
+
+    def set(self, key: str, value: Any) -> None:
+        self[key] = value
+
+
+def bench_ollama_generate(base_url: str, iterations: int, concurrency: int) -> BenchmarkResult:
+    """Complete generations through the pooled Ollama client."""
+    from labeeb.services.ollama_client import OllamaClient
+
+    async def run() -> BenchmarkResult:
+        client = OllamaClient(base_url)
+        try:
+            return await run_async_benchmark(
+                "ollama_client.generate",
+                lambda i: client.generate(MODEL, f"list the files in folder {i}"),
+                iterations,
+                concurrency,
+            )
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+def bench_ollama_stream(base_url: str, iterations: int, concurrency: int) -> BenchmarkResult:
+    """Streamed generations through the pooled Ollama client."""
+    from labeeb.services.ollama_client import OllamaClient
+
+    async def run() -> BenchmarkResult:
+        client = OllamaClient(base_url)
+
+        async def consume(i: int) -> None:
+            async for _ in client.stream_tokens(MODEL, f"list the files in folder {i}"):
+                pass
+
+        try:
+            return await run_async_benchmark(
+                "ollama_client.stream_tokens", consume, iterations, concurrency
+            )
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+class BenchmarkModelManager:
+    """Minimal stand-in for ModelManager: the pooled client is all the request path uses."""
+
+    def __init__(self, base_url: str):
+        from labeeb.services.ollama_client import OllamaClient
+
+        self.config = BenchmarkConfig(ollama_base_url=base_url, model=MODEL)
+        self.client = OllamaClient(base_url)
+
+
+def bench_command_processor(base_url: str, iterations: int, concurrency: int) -> BenchmarkResult:
+    """Uncached commands through CommandProcessor, streaming from the model."""
+    from labeeb.services.ai_handler import AIHandler
+    from labeeb.services.command_processor import CommandProcessor
+
+    ai_handler = AIHandler(model_manager=BenchmarkModelManager(base_url))
+    ai_handler.ollama_model_name = MODEL
+    processor = CommandProcessor(ai_handler, persistent_cache=False)
+
+    async def run() -> BenchmarkResult:
+        try:
+            # A distinct command per call so every request reaches the model
+            return await run_async_benchmark(
+                "command_processor.process_command_async",
+                lambda i: processor.process_command_async(
+                    f"list the files in folder {i}", on_token=lambda token: None
+                ),
+                iterations,
+                concurrency,
+            )
+        finally:
+            await ai_handler.model_manager.client.close()
+
+    return asyncio.run(run())
+
+
+def bench_plan_execution(base_url: str, iterations: int, concurrency: int) -> BenchmarkResult:
+    """A fan-out/fan-in plan whose branches query the model through the DAG scheduler."""
+    from labeeb.services.ai_command_interpreter import AICommandInterpreter, PlanStep
+    from labeeb.services.ollama_client import OllamaClient
+    from labeeb.tools.tool_lifecycle_manager import POLICY_SHARED
+
+    class ModelTool:
+        """Plan-step tool that sends its prompt to the fake server."""
+
+        concurrency_policy = POLICY_SHARED
+
+        def __init__(self, config: Dict[str, Any]):
+            self.client = OllamaClient(config["base_url"])
+
+        async def generate(self, prompt: str) -> Dict[str, Any]:
+            return await self.client.generate(MODEL, prompt)
+
+        async def cleanup(self) -> None:
+            await self.client.close()
+
+    interpreter = AICommandInterpreter(max_concurrency=concurrency)
+    interpreter.tool_lifecycle.register_tool(ModelTool, {"base_url": base_url}, name="model")
+    width = 8
+    plan = [
+        PlanStep(
+            step=i,
+            description=f"Branch {i}",
+            operation="model.generate",
+            parameters={"prompt": f"list the files in folder {i}"},
+            confidence=1.0,
+        )
+        for i in range(1, width + 1)
+    ]
+    plan.append(
+        PlanStep(
+            step=width + 1,
+            description="Join",
+            operation="echo",
+            parameters={
+                "text": " ".join(f"{{{{step_{i}.response}}}}" for i in range(1, width + 1))
+            },
+            confidence=1.0,
+            depends_on=list(range(1, width + 1)),
+        )
+    )
+
+    async def run_plan(i: int) -> None:
+        results = await interpreter.process_plan_async(plan)
+        failed = [r for r in results if r.status != "success"]
+        if failed:
+            raise RuntimeError(f"Step {failed[0].step} {failed[0].status}: {failed[0].error}")
+
+    async def run() -> BenchmarkResult:
+        try:
+            # Warm-up calls raise, so a plan that never reaches the server fails loudly
+            return await run_async_benchmark(
+                "ai_command_interpreter.process_plan_async", run_plan, iterations, concurrency
+            )
+        finally:
+            await interpreter.cleanup_async()
+
+    return asyncio.run(run())
+
+
+def bench_single_command(base_url: str, iterations: int, concurrency: int) -> BenchmarkResult:
+    """Commands through a fully initialized Labeeb instance."""
+    from labeeb.main import Labeeb
+
+    labeeb = Labeeb(
+        config={
+            "ollama_base_url": base_url,
+            "default_ollama_model": MODEL,
+            "persistent_response_cache": False,
+            "output_verbosity": "quiet",
+        },
+        mode="command",
+        fast_mode=True,
+    )
+    return run_sync_benchmark(
+        "labeeb.process_single_command",
+        lambda i: labeeb.process_single_command(f"list the files in folder {i}"),
+        iterations,
+    )
+
+
+SCENARIOS: Dict[str, Callable[[str, int, int], BenchmarkResult]] = {
+    "ollama_client.generate": bench_ollama_generate,
+    "ollama_client.stream_tokens": bench_ollama_stream,
+    "command_processor.process_command_async": bench_command_processor,
+    "ai_command_interpreter.process_plan_async": bench_plan_execution,
+    "labeeb.process_single_command": bench_single_command,
+}
@@ -16,10 +16,10 @@ import os
 import json
 import logging
 from typing import Dict, Any, Optional
-from datetime import datetime
 from dotenv import load_dotenv
 
 from labeeb.agents.base_agent import BaseAgent
+from labeeb.services.cache_service import get_cache_service
 from labeeb.tools.weather_tool import WeatherTool
 from labeeb.utils.platform_utils import ensure_labeeb_directories
 
@@ -36,8 +36,8 @@ class WeatherAgent(BaseAgent):
         self.description = "Handles weather queries and forecasts"
         self.version = "1.0.0"
         self.weather_tool = WeatherTool()
-        self.cache = {}
         self.cache_duration = 1800  # 30 minutes
+        self.cache = get_cache_service().namespace("weather_agent", ttl=self.cache_duration)
         
         # Load environment variables
         load_dotenv()
@@ -128,18 +128,11 @@ class WeatherAgent(BaseAgent):
     
     def _get_cached_weather(self, city: str) -> Optional[Dict[str, Any]]:
         """Get cached weather data for a city."""
-        if city in self.cache:
-            cache_entry = self.cache[city]
-            if (datetime.now() - cache_entry["timestamp"]).total_seconds() < self.cache_duration:
-                return cache_entry["data"]
-        return None
+        return self.cache.get(city)
     
     def _cache_weather(self, city: str, weather_data: Dict[str, Any]) -> None:
         """Cache weather data for a city."""
-        self.cache[city] = {
-            "data": weather_data,
-            "timestamp": datetime.now()
-        }
+        self.cache.set(city, weather_data)
     
     def clear_cache(self) -> None:
         """Clear the weather cache."""
@@ -16,7 +16,7 @@ import urllib3
 import argparse
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Callable
 from datetime import datetime
 import asyncio
 import nest_asyncio
@@ -38,7 +38,10 @@ from labeeb.core.shell_handler import ShellHandler
 from labeeb.core.ai_handler import AIHandler
 from labeeb.utils.output_facade import output
 from labeeb.core.file_operations import process_file_flag_request
-from labeeb.services.health_check.ollama_health_check import check_ollama_server, check_model_available
+from labeeb.services.health_check.ollama_health_check import OLLAMA_URL, check_ollama_server, check_model_available
+from labeeb.services.daemon import LabeebDaemon, run_client_command
+from labeeb.services.ollama_client import close_ollama_clients
+from labeeb.services.batch_executor import BatchExecutor, BatchItem, BatchResult, read_batch_file, read_checkpoint
 from labeeb.core.model_manager import ModelManager
 from labeeb.core.config_manager import ConfigManager
 from labeeb.core.ai.agent import LabeebAgent
@@ -62,6 +65,32 @@ try:
 except ImportError:
     DisplayConnectionError = None
 
+DISPLAY_UNAVAILABLE_MESSAGE = (
+    "[Labeeb] GUI/display features are not available in this environment. "
+    "Please run in a graphical session for screenshot, mouse, or clipboard commands."
+)
+
+
+def _is_display_error(error: Exception) -> bool:
+    """Check whether an error comes from a missing display connection."""
+    if DisplayConnectionError and isinstance(error, DisplayConnectionError):
+        return True
+    return 'DISPLAY' in str(error) or 'Xlib.error.DisplayConnectionError' in str(error)
+
+def _close_ollama_clients() -> None:
+    """Close the pooled Ollama sessions; a later request opens a new one."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            raise RuntimeError("Event loop is closed")
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(close_ollama_clients())
+    except Exception as e:
+        logger.error(f"Error closing Ollama clients: {str(e)}")
+
 # Apply nest_asyncio to allow nested event loops
 nest_asyncio.apply()
 
@@ -134,12 +163,15 @@ class Labeeb:
             output.set_verbosity(output_verbosity)
             output.set_rtl_support(self.rtl_support)
 
+            # Stream model tokens to the terminal as they are generated
+            self.stream_output = self.config.get("stream_output", True) and not fast_mode
+
             # Initialize shell handler and command processor
             self.shell_handler = ShellHandler(fast_mode=fast_mode)
 
             # Initialize AI handler with caching and Arabic support
             model_type = self.config.get("default_ai_provider", "ollama")
-            ollama_base_url = self.config.get("ollama_base_url", "http://localhost:11434")
+            ollama_base_url = self.config.get("ollama_base_url", OLLAMA_URL)
 
             # --- Automated Ollama model selection ---
             default_model = self.config.get("default_ollama_model", "gemma3:4b")
@@ -171,7 +203,10 @@ class Labeeb:
             if model_type == "ollama":
                 setattr(self.ai_handler, "ollama_model_name", selected_model)
 
-            self.command_processor = CommandProcessor(self.ai_handler)
+            self.command_processor = CommandProcessor(
+                self.ai_handler,
+                persistent_cache=self.config.get("persistent_response_cache", True),
+            )
 
             # Set up language-specific welcome messages
             self.welcome_messages = {
@@ -221,44 +256,104 @@ Type 'help' for available commands or ask me anything!
         else:
             return "generic"
 
-    def _handle_task(self, task: str) -> str:
+    async def _handle_task_async(self, task: str) -> str:
         """Handle a single task with human-like variations in Arabic and English."""
-        try:
-            # Process task in both languages
-            arabic_task = f"المهمة: {task}"
-            english_task = f"Task: {task}"
+        # Process task in both languages
+        arabic_task = f"المهمة: {task}"
+        english_task = f"Task: {task}"
 
-            # Get platform-specific path
-            platform_path = self._get_platform_specific_path()
+        # Process task with platform awareness
+        response = await self._run_batch_command(task)
 
-            # Process task with platform awareness
-            response = self.command_processor.process_command(task)
+        # Format response based on language
+        if self.rtl_support:
+            return f"{arabic_task}\n{response}"
+        else:
+            return f"{english_task}\n{response}"
 
-            # Format response based on language
-            if self.rtl_support:
-                return f"{arabic_task}\n{response}"
-            else:
-                return f"{english_task}\n{response}"
+    def run_batch(
+        self,
+        items: List[BatchItem],
+        process: Callable[[str], Awaitable[str]],
+        concurrency: int = 1,
+        output_path: Optional[str] = None,
+        resume: bool = False,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ) -> List[BatchResult]:
+        """
+        Process batch items concurrently, emitting results in input order.
 
-        except Exception as e:
-            logger.error(f"Error processing task: {str(e)}")
-            return f"Error processing task: {str(e)}"
+        Args:
+            items: The batch items
+            process: Coroutine function processing one command
+            concurrency: Maximum number of commands processed at once
+            output_path: Optional JSONL file receiving one result per line
+            resume: Continue from the checkpoint left next to output_path
+            on_result: Optional callback invoked with each result in input order
 
-    def _process_tasks_sequentially(self, tasks: List[str]) -> None:
-        """Process a list of tasks one by one."""
-        for task in tasks:
+        Returns:
+            The results in input order
+        """
+        if resume and not output_path:
+            raise ValueError("Resuming a batch requires an output file")
+        checkpoint_path = f"{output_path}.checkpoint" if output_path else None
+        start_line, failed = read_checkpoint(checkpoint_path) if resume else (0, set())
+        if start_line or failed:
+            logger.info(f"Resuming batch from line {start_line}, retrying {len(failed)} failed")
+
+        out = open(output_path, "a" if resume else "w", encoding="utf-8") if output_path else None
+        try:
+            executor = BatchExecutor(process, concurrency, out, checkpoint_path)
             try:
-                response = self._handle_task(task)
-                if not self.fast_mode:
-                    output.info(response)
-                else:
-                    print(response)
-            except Exception as e:
-                logger.error(f"Error in task processing: {str(e)}")
+                loop = asyncio.get_event_loop()
+            except RuntimeError:
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+            return loop.run_until_complete(executor.run(items, start_line, on_result, failed))
+        finally:
+            if out is not None:
+                out.close()
+            self.cleanup()
+
+    async def _run_batch_command(self, command: str) -> str:
+        """Process one batch command, raising on failure so the batch records an error."""
+        try:
+            return await self.command_processor.process_command_async(command)
+        except Exception as e:
+            if _is_display_error(e):
+                raise RuntimeError(DISPLAY_UNAVAILABLE_MESSAGE) from e
+            raise
+
+    def _process_tasks(
+        self,
+        tasks: List[str],
+        concurrency: int = 1,
+        output_path: Optional[str] = None,
+        resume: bool = False,
+    ) -> None:
+        """Process a list of tasks, up to ``concurrency`` at a time."""
+        items = [BatchItem(line=i, command=task) for i, task in enumerate(tasks, 1)]
+
+        def show(result: BatchResult) -> None:
+            if result.error is not None:
+                message = f"Task failed: {result.error}"
                 if not self.fast_mode:
-                    output.error(f"Task failed: {str(e)}")
+                    output.error(message)
                 else:
-                    print(f"Error: {str(e)}")
+                    print(f"Error: {message}")
+            elif not self.fast_mode:
+                output.info(result.result)
+            else:
+                print(result.result)
+
+        self.run_batch(
+            items,
+            self._handle_task_async,
+            concurrency,
+            output_path,
+            resume,
+            on_result=None if output_path else show,
+        )
 
     def start(self) -> None:
         """Start the Labeeb interactive session."""
@@ -344,6 +439,14 @@ Type 'help' for available commands or ask me anything!
                     self.switch_model()
                     continue
 
+                if self.stream_output:
+                    # The output facade reshapes RTL text a line at a time as it streams
+                    self.command_processor.process_command(
+                        user_input, on_token=output.stream_token
+                    )
+                    output.end_stream()
+                    continue
+
                 response = self.command_processor.process_command(user_input)
 
                 # Handle RTL output
@@ -434,12 +537,8 @@ Type 'help' for available commands or ask me anything!
             return result
         except Exception as e:
             # Handle display connection errors gracefully
-            if DisplayConnectionError and isinstance(e, DisplayConnectionError):
-                return ("[Labeeb] GUI/display features are not available in this environment. "
-                        "Please run in a graphical session for screenshot, mouse, or clipboard commands.")
-            if 'DISPLAY' in str(e) or 'Xlib.error.DisplayConnectionError' in str(e):
-                return ("[Labeeb] GUI/display features are not available in this environment. "
-                        "Please run in a graphical session for screenshot, mouse, or clipboard commands.")
+            if _is_display_error(e):
+                return DISPLAY_UNAVAILABLE_MESSAGE
             raise
         finally:
             self.cleanup()
@@ -447,40 +546,47 @@ Type 'help' for available commands or ask me anything!
     def cleanup(self) -> None:
         """Clean up resources."""
         try:
+            self.command_processor.response_cache.flush()
             self.platform_manager.cleanup()
+            _close_ollama_clients()
             logger.info("Resources cleaned up successfully")
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
 
-    def process_test_requests(self, file_path: str) -> None:
+    def process_test_requests(
+        self,
+        file_path: str,
+        concurrency: int = 1,
+        output_path: Optional[str] = None,
+        resume: bool = False,
+    ) -> None:
         """
         Process test requests from a file.
 
         Args:
-            file_path: Path to the file containing test requests
+            file_path: Path to a text or JSONL file containing test requests
+            concurrency: Maximum number of requests processed at once
+            output_path: Optional JSONL file receiving results instead of the terminal
+            resume: Continue from the checkpoint left next to output_path
         """
         try:
-            with open(file_path, "r") as f:
-                lines = f.readlines()
-            requests = [
-                line.strip() for line in lines if line.strip() and not line.strip().startswith("#")
-            ]
-            for request in requests:
-                output.box(f"🤖 Processing your request: '{request}'", "Request")
-                try:
-                    response = self.command_processor.process_command(request)
-                    output.info(response)
-                except Exception as e:
-                    # Handle display connection errors gracefully
-                    if DisplayConnectionError and isinstance(e, DisplayConnectionError):
-                        output.error("[Labeeb] GUI/display features are not available in this environment. "
-                                     "Please run in a graphical session for screenshot, mouse, or clipboard commands.")
-                        continue
-                    if 'DISPLAY' in str(e) or 'Xlib.error.DisplayConnectionError' in str(e):
-                        output.error("[Labeeb] GUI/display features are not available in this environment. "
-                                     "Please run in a graphical session for screenshot, mouse, or clipboard commands.")
-                        continue
-                    output.error(f"Error processing request: {str(e)}")
+            items = read_batch_file(file_path)
+
+            def show(result: BatchResult) -> None:
+                output.box(f"🤖 Processing your request: '{result.command}'", "Request")
+                if result.error is not None:
+                    output.error(f"Error processing request: {result.error}")
+                else:
+                    output.info(result.result)
+
+            self.run_batch(
+                items,
+                self._run_batch_command,
+                concurrency,
+                output_path,
+                resume,
+                on_result=None if output_path else show,
+            )
         except Exception as e:
             logger.error(f"Error processing test requests: {str(e)}")
             raise
@@ -600,32 +706,72 @@ def main():
     parser.add_argument("--file", help="File containing commands to execute")
     parser.add_argument("--tasks", nargs="+", help="List of tasks to execute")
     parser.add_argument("--test-dir", help="Directory for test-related operations")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a resident daemon serving commands over a Unix socket",
+    )
+    parser.add_argument(
+        "--connect",
+        action="store_true",
+        help="Send --command/--file/--tasks to a running daemon instead of starting Labeeb",
+    )
+    parser.add_argument("--socket", help="Unix socket path for --serve and --connect")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of --file/--tasks commands processed at once",
+    )
+    parser.add_argument("--output", help="Write --file/--tasks results to this JSONL file")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume --file/--tasks from the checkpoint next to --output",
+    )
 
     args = parser.parse_args()
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
 
     try:
         # Set up logging
         setup_logging("main")
 
+        if args.connect:
+            _run_client(args)
+            return
+
         # Initialize Labeeb
         labeeb = Labeeb(debug=args.debug, mode=args.mode, fast_mode=args.fast)
 
-        if args.command:
+        if args.serve:
+            daemon = LabeebDaemon(labeeb, args.socket)
+            print(f"[Labeeb] Serving on {daemon.socket_path}")
+            asyncio.run(daemon.serve_forever())
+        elif args.command:
             # Process single command
             response = labeeb.process_single_command(args.command)
             print(response)
         elif args.file:
             # Process commands from file
-            with open(args.file, "r", encoding="utf-8") as f:
-                commands = f.readlines()
-            for cmd in commands:
-                cmd = cmd.strip()
-                if cmd and not cmd.startswith("#"):
-                    response = labeeb.process_single_command(cmd)
-                    print(response)
+            def show(result: BatchResult) -> None:
+                if result.error is not None:
+                    print(f"Error processing command: {result.error}")
+                else:
+                    print(result.result)
+
+            labeeb.run_batch(
+                read_batch_file(args.file),
+                labeeb._run_batch_command,
+                args.concurrency,
+                args.output,
+                args.resume,
+                on_result=None if args.output else show,
+            )
         elif args.tasks:
             # Process list of tasks
-            labeeb._process_tasks_sequentially(args.tasks)
+            labeeb._process_tasks(args.tasks, args.concurrency, args.output, args.resume)
         else:
             # Start interactive session
             labeeb.start()
@@ -638,6 +784,25 @@ def main():
         sys.exit(1)
 
 
+def _run_client(args: argparse.Namespace) -> None:
+    """Run --command/--file/--tasks against a running daemon."""
+    if args.command:
+        commands = [args.command]
+    elif args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            commands = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+    elif args.tasks:
+        commands = args.tasks
+    else:
+        raise ValueError("--connect requires --command, --file or --tasks")
+
+    for cmd in commands:
+        try:
+            print(run_client_command(cmd, args.socket))
+        except RuntimeError as e:
+            print(f"Error: {str(e)}")
+
+
 async def process_command_and_log(command: str):
     """Process a command and log its execution."""
     try:
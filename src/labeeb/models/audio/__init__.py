@@ -5,5 +5,18 @@ This module provides audio processing capabilities using Whisper Tiny.
 """
 
 from .processor import AudioProcessor, AudioResult
+from .transcriber import (
+    TranscriptionEngine,
+    TranscriptSegment,
+    VoiceActivitySegmenter,
+    get_transcription_engine,
+)
 
-__all__ = ["AudioProcessor", "AudioResult"]
+__all__ = [
+    "AudioProcessor",
+    "AudioResult",
+    "TranscriptionEngine",
+    "TranscriptSegment",
+    "VoiceActivitySegmenter",
+    "get_transcription_engine",
+]
@@ -2,14 +2,21 @@
 Audio processor module for Labeeb.
 
 This module provides audio processing capabilities using Whisper Tiny.
+Whisper is imported and its model loaded on the first transcription, once per
+process, through the shared transcription engine.
 """
 
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
-from pathlib import Path
-import whisper
-import ffmpeg
+from typing import Optional, Dict, Any, Iterable, Iterator, List
+import numpy as np
 from labeeb.core.logging_config import get_logger
+from .transcriber import (
+    SAMPLE_RATE,
+    TranscriptSegment,
+    get_transcription_engine,
+    iter_wav_chunks,
+    to_mono,
+)
 
 logger = get_logger(__name__)
 
@@ -28,9 +35,14 @@ class AudioProcessor:
 
     def __init__(self):
         """Initialize the audio processor."""
+        self.model_name = "tiny"
+        self.engine = get_transcription_engine()
+
+    @property
+    def model(self) -> Any:
+        """The Whisper model, loaded on first access."""
         try:
-            self.model = whisper.load_model("tiny")
-            logger.info("Audio processor initialized successfully")
+            return self.engine.load_model(self.model_name)
         except Exception as e:
             logger.error(f"Failed to initialize audio processor: {str(e)}")
             raise
@@ -46,7 +58,7 @@ class AudioProcessor:
             AudioResult containing the transcription and segments
         """
         try:
-            result = self.model.transcribe(audio_path)
+            result = self.engine.transcribe(audio_path, self.model_name)
             return AudioResult(
                 text=result["text"], segments=result["segments"], metadata={"model": "Whisper-Tiny"}
             )
@@ -54,32 +66,48 @@ class AudioProcessor:
             logger.error(f"Error transcribing audio: {str(e)}")
             raise
 
+    def stream_transcription(
+        self, chunks: Iterable[np.ndarray], sample_rate: int = SAMPLE_RATE
+    ) -> Iterator[TranscriptSegment]:
+        """
+        Transcribe live audio, yielding each speech segment as it finishes.
+
+        Args:
+            chunks: Float samples, shape (frames,) or (frames, channels)
+            sample_rate: Sample rate of the chunks
+
+        Yields:
+            TranscriptSegment: Transcript of each speech segment, in order
+        """
+        mono = (to_mono(chunk, sample_rate) for chunk in chunks)
+        return self.engine.stream(mono, self.model_name)
+
     def process_audio_stream(self, stream_data: bytes) -> AudioResult:
         """
         Process audio stream data.
 
+        The WAV data is decoded in memory and split on pauses in speech, so
+        each segment is transcribed while the rest is still being decoded.
+
         Args:
             stream_data: Raw audio data bytes
 
         Returns:
             AudioResult containing the transcription
         """
-        temp_path = Path("temp_audio.wav")
         try:
-            # Save stream to temporary file
-            with open(temp_path, "wb") as f:
-                f.write(stream_data)
-
-            # Process the audio
-            result = self.transcribe_audio(str(temp_path))
-            return result
+            segments = [
+                segment.to_dict()
+                for segment in self.engine.stream(iter_wav_chunks(stream_data), self.model_name)
+            ]
+            return AudioResult(
+                text=" ".join(segment["text"] for segment in segments),
+                segments=segments,
+                metadata={"model": "Whisper-Tiny"},
+            )
         except Exception as e:
             logger.error(f"Error processing audio stream: {str(e)}")
             raise
-        finally:
-            # Clean up temporary file
-            if temp_path.exists():
-                temp_path.unlink()
 
     def process_voice_command(self, audio_path: str) -> AudioResult:
         """
@@ -0,0 +1,379 @@
+"""
+Streaming transcription module for Labeeb.
+
+This module splits audio into speech segments as it arrives and transcribes
+each segment in memory as soon as it ends. Whisper models are loaded once per
+process and shared through one worker queue, so voice commands, meetings and
+the STT tool do not each load their own copy.
+"""
+
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from labeeb.services import audio_stream
+
+logger = logging.getLogger(__name__)
+
+# Whisper works on 16 kHz mono float32 audio
+SAMPLE_RATE = 16000
+
+AudioInput = Union[str, np.ndarray]
+
+
+@dataclass
+class SpeechSegment:
+    """A stretch of audio that contains speech."""
+
+    start: float
+    end: float
+    samples: np.ndarray
+
+
+@dataclass
+class TranscriptSegment:
+    """The transcript of one speech segment."""
+
+    start: float
+    end: float
+    text: str
+    language: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the segment to a JSON-serializable dictionary."""
+        return {"start": self.start, "end": self.end, "text": self.text, "language": self.language}
+
+
+def to_mono(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    Convert audio samples to 16 kHz mono float32.
+
+    Args:
+        samples: Float samples, shape (frames,) or (frames, channels)
+        sample_rate: Sample rate of the samples
+
+    Returns:
+        np.ndarray: Mono samples at SAMPLE_RATE
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    if sample_rate != SAMPLE_RATE and len(samples):
+        length = int(round(len(samples) * SAMPLE_RATE / sample_rate))
+        positions = np.arange(length) * (sample_rate / SAMPLE_RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+
+def iter_wav_chunks(source: audio_stream.AudioSource) -> Iterator[np.ndarray]:
+    """
+    Decode WAV audio block by block to 16 kHz mono float32.
+
+    Args:
+        source: WAV file path, data, or stream
+
+    Yields:
+        np.ndarray: Mono samples at SAMPLE_RATE
+    """
+    params = audio_stream.read_params(source)
+    for block in audio_stream.iter_blocks(source):
+        samples = audio_stream.to_float(block, params.sampwidth, params.nchannels)
+        yield to_mono(samples, params.framerate)
+
+
+class VoiceActivitySegmenter:
+    """Splits a stream of samples into speech segments by frame energy."""
+
+    def __init__(
+        self,
+        threshold_db: float = -45.0,
+        margin_db: float = 10.0,
+        frame_ms: int = 30,
+        min_speech: float = 0.25,
+        min_silence: float = 0.5,
+        max_segment: float = 15.0,
+        padding: float = 0.2,
+    ):
+        """
+        Initialize the segmenter.
+
+        A frame is speech when its energy is above both ``threshold_db`` and
+        the running noise floor plus ``margin_db``.
+
+        Args:
+            threshold_db: Lowest speech energy, in dB relative to full scale
+            margin_db: How far speech must rise above the noise floor
+            frame_ms: Analysis frame length in milliseconds
+            min_speech: Shortest speech, in seconds, worth transcribing
+            min_silence: Silence, in seconds, that ends a segment
+            max_segment: Longest segment in seconds; longer speech is cut
+            padding: Audio kept before and after speech, in seconds
+        """
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.frame_length = SAMPLE_RATE * frame_ms // 1000
+        self.min_speech_frames = max(1, int(min_speech * 1000 / frame_ms))
+        self.min_silence_frames = max(1, int(min_silence * 1000 / frame_ms))
+        self.max_segment_frames = max(1, int(max_segment * 1000 / frame_ms))
+        self.padding_frames = int(padding * 1000 / frame_ms)
+        self._noise_db: Optional[float] = None
+        self._leftover = np.zeros(0, dtype=np.float32)
+        self._before: Deque[np.ndarray] = deque(maxlen=self.padding_frames or None)
+        self._segment: Optional[List[np.ndarray]] = None
+        self._segment_start = 0
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._position = 0
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        energy_db = 10 * np.log10(float(np.mean(frame * frame)) + 1e-12)
+        threshold = self.threshold_db
+        if self._noise_db is not None:
+            threshold = max(threshold, self._noise_db + self.margin_db)
+        speech = energy_db > threshold
+        if not speech:
+            # Track the noise floor on non-speech frames only
+            if self._noise_db is None:
+                self._noise_db = energy_db
+            else:
+                self._noise_db = 0.95 * self._noise_db + 0.05 * energy_db
+        return speech
+
+    def _finish(self) -> Optional[SpeechSegment]:
+        frames, self._segment = self._segment, None
+        if frames is None or self._speech_frames < self.min_speech_frames:
+            return None
+        # Keep only `padding` of the trailing silence
+        trim = max(self._silent_frames - self.padding_frames, 0)
+        if trim:
+            frames = frames[:-trim]
+        samples = np.concatenate(frames)
+        start = self._segment_start / SAMPLE_RATE
+        return SpeechSegment(start, start + len(samples) / SAMPLE_RATE, samples)
+
+    def feed(self, samples: np.ndarray) -> List[SpeechSegment]:
+        """
+        Add samples and return the segments that ended within them.
+
+        Args:
+            samples: Mono samples at SAMPLE_RATE
+
+        Returns:
+            List[SpeechSegment]: Finished segments, in order
+        """
+        samples = np.concatenate([self._leftover, np.asarray(samples, dtype=np.float32)])
+        finished = []
+        offset = 0
+        while offset + self.frame_length <= len(samples):
+            frame = samples[offset : offset + self.frame_length]
+            offset += self.frame_length
+            speech = self._is_speech(frame)
+            if self._segment is None:
+                if speech:
+                    self._segment = list(self._before) + [frame]
+                    self._segment_start = self._position - len(self._before) * self.frame_length
+                    self._before.clear()
+                    self._speech_frames, self._silent_frames = 1, 0
+                elif self.padding_frames:
+                    self._before.append(frame)
+            else:
+                self._segment.append(frame)
+                if speech:
+                    self._speech_frames += 1
+                    self._silent_frames = 0
+                else:
+                    self._silent_frames += 1
+                if (
+                    self._silent_frames >= self.min_silence_frames
+                    or len(self._segment) >= self.max_segment_frames
+                ):
+                    segment = self._finish()
+                    if segment is not None:
+                        finished.append(segment)
+            self._position += self.frame_length
+        self._leftover = samples[offset:].copy()
+        return finished
+
+    def flush(self) -> List[SpeechSegment]:
+        """
+        End the stream and return the segment still open, if any.
+
+        Returns:
+            List[SpeechSegment]: The last segment, or nothing
+        """
+        if self._segment is not None and len(self._leftover):
+            self._segment.append(self._leftover)
+        self._leftover = np.zeros(0, dtype=np.float32)
+        segment = self._finish()
+        return [segment] if segment is not None else []
+
+
+@dataclass
+class _Request:
+    """A queued transcription request."""
+
+    audio: AudioInput
+    model: str
+    options: Dict[str, Any]
+    future: Future
+
+
+class TranscriptionEngine:
+    """Runs Whisper transcriptions from a queue, sharing loaded models."""
+
+    def __init__(self):
+        """Initialize the engine. Models are loaded on first use."""
+        self._models: Dict[str, Any] = {}
+        self._models_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def load_model(self, name: str) -> Any:
+        """
+        Get a Whisper model, loading it on first use.
+
+        Args:
+            name: Whisper model name, e.g. ``tiny`` or ``base``
+
+        Returns:
+            Any: The loaded model
+        """
+        model = self._models.get(name)
+        if model is None:
+            with self._models_lock:
+                model = self._models.get(name)
+                if model is None:
+                    import whisper
+
+                    model = whisper.load_model(name)
+                    self._models[name] = model
+                    logger.info(f"Whisper {name} model loaded")
+        return model
+
+    def _transcribe(self, request: _Request) -> Dict[str, Any]:
+        model = self.load_model(request.model)
+        options = dict(request.options)
+        options.setdefault("fp16", getattr(model.device, "type", "cpu") == "cuda")
+        return model.transcribe(request.audio, **options)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._serve, name="transcription-engine", daemon=True
+                    )
+                    self._worker.start()
+
+    def _serve(self) -> None:
+        """Transcribe queued requests one at a time until shut down."""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                request.future.set_result(self._transcribe(request))
+            except Exception as e:
+                logger.error(f"Transcription failed: {e}")
+                request.future.set_exception(e)
+
+    def submit(self, audio: AudioInput, model: str = "tiny", **options: Any) -> Future:
+        """
+        Queue a transcription.
+
+        Args:
+            audio: Audio file path, or mono float32 samples at SAMPLE_RATE
+            model: Whisper model name
+            **options: Options for ``whisper.transcribe``, e.g. ``language``
+
+        Returns:
+            Future: Resolves to Whisper's result dictionary
+        """
+        if isinstance(audio, np.ndarray):
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put(_Request(audio, model, options, future))
+        return future
+
+    def transcribe(self, audio: AudioInput, model: str = "tiny", **options: Any) -> Dict[str, Any]:
+        """Transcribe audio, waiting for requests queued before it."""
+        return self.submit(audio, model, **options).result()
+
+    def stream(
+        self,
+        chunks: Iterable[np.ndarray],
+        model: str = "tiny",
+        segmenter: Optional[VoiceActivitySegmenter] = None,
+        **options: Any,
+    ) -> Iterator[TranscriptSegment]:
+        """
+        Transcribe a stream of audio segment by segment.
+
+        Each speech segment is queued as soon as it ends, while the next one
+        is still being read, and transcripts are yielded in order as they
+        finish.
+
+        Args:
+            chunks: Mono float32 samples at SAMPLE_RATE, e.g. from ``iter_wav_chunks``
+            model: Whisper model name
+            segmenter: Voice activity segmenter, defaults to a new one
+            **options: Options for ``whisper.transcribe``, e.g. ``language``
+
+        Yields:
+            TranscriptSegment: Transcripts of segments with speech
+        """
+        segmenter = segmenter or VoiceActivitySegmenter()
+        pending: Deque[Tuple[SpeechSegment, Future]] = deque()
+
+        def ready(wait: bool) -> Iterator[TranscriptSegment]:
+            while pending and (wait or pending[0][1].done()):
+                segment, future = pending.popleft()
+                result = future.result()
+                text = result.get("text", "").strip()
+                if text:
+                    yield TranscriptSegment(
+                        segment.start, segment.end, text, result.get("language")
+                    )
+
+        try:
+            for chunk in chunks:
+                for segment in segmenter.feed(chunk):
+                    pending.append((segment, self.submit(segment.samples, model, **options)))
+                yield from ready(wait=False)
+            for segment in segmenter.flush():
+                pending.append((segment, self.submit(segment.samples, model, **options)))
+            yield from ready(wait=True)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker after the queued requests are served."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+
+_engine: Optional[TranscriptionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_transcription_engine() -> TranscriptionEngine:
+    """Get the process-wide transcription engine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TranscriptionEngine()
+    return _engine
@@ -20,7 +20,7 @@ Example:
 
 import logging
 logger = logging.getLogger(__name__)
-from typing import Optional, Dict, Any, Union, List, TypeVar, Generic, Protocol
+from typing import Optional, Dict, Any, Union, List, TypeVar, Generic, Protocol, AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from .config_manager import ConfigManager
@@ -30,8 +30,9 @@ import os
 import json
 import requests
 import asyncio
-import aiohttp
 from labeeb.core.exceptions import AIError
+from labeeb.services.intent_matcher import get_intent_matcher
+from labeeb.services.ollama_client import get_ollama_client
 
 try:
     import ollama
@@ -107,6 +108,7 @@ class ModelManager:
         self.current_model = None
         self.available_models = []
         self.terminal = TerminalTool()
+        self.client = get_ollama_client(config.get("ollama_base_url", "http://localhost:11434"))
         self._initialize_model()
         self.quiet_mode = False
 
@@ -122,7 +124,7 @@ class ModelManager:
         """Initialize Ollama model with better error handling."""
         try:
             # Get available models
-            response = requests.get("http://localhost:11434/api/tags")
+            response = requests.get(f"{self.client.base_url}/api/tags")
             if response.status_code == 200:
                 self.available_models = [model["name"] for model in response.json()["models"]]
             else:
@@ -151,7 +153,7 @@ class ModelManager:
     def list_available_models(self) -> List[str]:
         """List all available models."""
         try:
-            response = requests.get("http://localhost:11434/api/tags")
+            response = requests.get(f"{self.client.base_url}/api/tags")
             if response.status_code == 200:
                 return [model["name"] for model in response.json()["models"]]
             return []
@@ -176,33 +178,37 @@ class ModelManager:
             self.logger.error(f"Error switching model: {str(e)}")
             return False
 
+    def _generation_options(self) -> Dict[str, Any]:
+        """Get the generation options sent with every request."""
+        return {
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_tokens": 1024,
+        }
+
     async def generate_response(self, prompt: str) -> str:
         """Generate a response using the current model."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "http://localhost:11434/api/generate",
-                    json={
-                        "model": self.current_model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.95,
-                            "top_k": 40,
-                            "max_tokens": 1024,
-                        },
-                    },
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get("response", "")
-                    else:
-                        raise ConnectionError(f"Failed to generate response: {response.status}")
+            result = await self.client.generate(
+                self.current_model, prompt, options=self._generation_options()
+            )
+            return result.get("response", "")
         except Exception as e:
             self.logger.error(f"Error generating response: {str(e)}")
             raise
 
+    async def stream_response(self, prompt: str) -> AsyncIterator[str]:
+        """Stream response tokens from the current model as they are generated."""
+        try:
+            async for token in self.client.stream_tokens(
+                self.current_model, prompt, options=self._generation_options()
+            ):
+                yield token
+        except Exception as e:
+            self.logger.error(f"Error streaming response: {str(e)}")
+            raise
+
     def is_available(self) -> bool:
         """Check if the model manager is available."""
         return self.current_model is not None
@@ -261,8 +267,13 @@ class ModelManager:
                 "status": "system_awareness",
             }
 
+            match = get_intent_matcher().match(
+                command, allowed={"greeting", "identity", "weather", *known_commands}
+            )
+            intent = match.intent if match else None
+
             # Handle natural language queries
-            if command.lower().startswith(("hi", "hello", "hey")):
+            if intent == "greeting":
                 return MultiStepPlan(
                     steps=[
                         PlanStep(
@@ -274,7 +285,7 @@ class ModelManager:
                     ]
                 )
 
-            if "who are you" in command.lower() or "what is your name" in command.lower():
+            if intent == "identity":
                 return MultiStepPlan(
                     steps=[
                         PlanStep(
@@ -286,7 +297,7 @@ class ModelManager:
                     ]
                 )
 
-            if "temperature" in command.lower() or "weather" in command.lower():
+            if intent == "weather":
                 return MultiStepPlan(
                     steps=[
                         PlanStep(
@@ -299,9 +310,8 @@ class ModelManager:
                 )
 
             # Check for known commands
-            for cmd, tool in known_commands.items():
-                if cmd in command.lower():
-                    return MultiStepPlan(steps=[PlanStep(action=tool, parameters=kwargs)])
+            if intent in known_commands:
+                return MultiStepPlan(steps=[PlanStep(action=known_commands[intent], parameters=kwargs)])
 
             # For unknown commands, try to get a plan from the model
             prompt = f"""Create a plan to execute the following command: {command}
@@ -4,6 +4,7 @@ Vision module for Labeeb.
 This module provides vision processing capabilities using SmolVLM-256M.
 """
 
+from .model_host import VisionModelHost, get_vision_model_host
 from .processor import VisionProcessor, VisionResult
 
-__all__ = ["VisionProcessor", "VisionResult"]
+__all__ = ["VisionModelHost", "VisionProcessor", "VisionResult", "get_vision_model_host"]
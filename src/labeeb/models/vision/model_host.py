@@ -0,0 +1,335 @@
+"""
+Vision model host module for Labeeb.
+
+This module keeps one SmolVLM-256M instance per process and shares it between
+VisionTool and VisionProcessor. torch, transformers and the weights are loaded
+on the first request. Requests that arrive within a few milliseconds of each
+other are run as one padded batch, and answers are cached by image content.
+"""
+
+import asyncio
+import io
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from PIL import Image
+
+from labeeb.services.cache_service import CacheNamespace, get_cache_service, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+MODEL_ID = "HuggingFaceTB/SmolVLM-256M-Instruct"
+
+# How long the first request of a batch waits for others to join, in seconds
+BATCH_WINDOW = 0.005
+MAX_BATCH_SIZE = 8
+
+# Default prompt and generation cap per task
+TASK_PROMPTS = {
+    "describe": "Can you describe this image?",
+    "screenshot": "What is on the screen?",
+    "document": "Analyze this document.",
+    "question": "Can you describe this image?",
+}
+TASK_MAX_NEW_TOKENS = {
+    "describe": 128,
+    "screenshot": 192,
+    "document": 384,
+    "question": 64,
+}
+
+ImageInput = Union[str, Path, bytes, Image.Image]
+
+
+@dataclass
+class _Request:
+    """A queued generation request."""
+
+    key: str
+    image: Image.Image
+    prompt: str
+    max_new_tokens: int
+    future: Future
+
+
+def _image_bytes(image: ImageInput) -> Union[bytes, Image.Image]:
+    if isinstance(image, (str, Path)):
+        return Path(image).read_bytes()
+    return image
+
+
+def _content_key(image: Union[bytes, Image.Image], prompt: str, max_new_tokens: int) -> str:
+    """Cache key for an image's content, the prompt and the generation cap."""
+    if isinstance(image, Image.Image):
+        return make_cache_key(
+            image.tobytes(), image.mode, image.size, prompt, max_new_tokens=max_new_tokens
+        )
+    return make_cache_key(image, prompt, max_new_tokens=max_new_tokens)
+
+
+class VisionModelHost:
+    """Serves SmolVLM generation requests from one shared, lazily loaded model."""
+
+    def __init__(
+        self,
+        model_id: str = MODEL_ID,
+        batch_window: float = BATCH_WINDOW,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        device: Optional[str] = None,
+        cache: Optional[CacheNamespace] = None,
+    ):
+        """
+        Initialize the model host. Nothing is loaded until the first request.
+
+        Args:
+            model_id: HuggingFace model to load
+            batch_window: Seconds the first request of a batch waits for others
+            max_batch_size: Most requests run in one batch
+            device: torch device, defaults to CUDA when available, else the CPU
+            cache: Answer cache, defaults to the ``vision`` namespace of the shared cache
+        """
+        self.model_id = model_id
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.device = device
+        self.cache = cache if cache is not None else get_cache_service().namespace("vision")
+        self.processor = None
+        self.model = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def load(self) -> None:
+        """Load the processor and model if they are not loaded yet."""
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is not None:
+                return
+            import torch
+            from transformers import AutoModelForVision2Seq, AutoProcessor
+
+            processor = AutoProcessor.from_pretrained(self.model_id)
+            # Decoder-only batches must be padded on the left to generate
+            processor.tokenizer.padding_side = "left"
+            model = AutoModelForVision2Seq.from_pretrained(
+                self.model_id, torch_dtype=torch.bfloat16
+            )
+            self.device = self.device or ("cuda" if torch.cuda.is_available() else "cpu")
+            model = model.to(self.device).eval()
+            self.processor = processor
+            self.model = model
+            logger.info(f"{self.model_id} loaded locally on {self.device}")
+
+    def _format_prompt(self, prompt: str) -> str:
+        if "<image>" in prompt:
+            return prompt
+        messages = [
+            {"role": "user", "content": [{"type": "image"}, {"type": "text", "text": prompt}]}
+        ]
+        return self.processor.apply_chat_template(messages, add_generation_prompt=True)
+
+    def _generate_batch(
+        self, images: List[Image.Image], prompts: List[str], max_new_tokens: List[int]
+    ) -> List[str]:
+        """
+        Run one padded batch through the model.
+
+        The batch generates up to the largest cap; each answer is cut to its own.
+
+        Args:
+            images: One image per request
+            prompts: One prompt per request
+            max_new_tokens: Generation cap per request
+
+        Returns:
+            List[str]: Generated text per request, without the prompt
+        """
+        import torch
+
+        self.load()
+        inputs = self.processor(
+            text=[self._format_prompt(prompt) for prompt in prompts],
+            images=[[image] for image in images],
+            padding=True,
+            return_tensors="pt",
+        ).to(self.device)
+        with torch.inference_mode():
+            generated = self.model.generate(
+                **inputs, max_new_tokens=max(max_new_tokens), do_sample=False
+            )
+        new_tokens = generated[:, inputs["input_ids"].shape[1] :]
+        return [
+            text.strip()
+            for text in self.processor.batch_decode(
+                [row[:cap] for row, cap in zip(new_tokens, max_new_tokens)],
+                skip_special_tokens=True,
+            )
+        ]
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._inflight_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._serve, name="vision-model-host", daemon=True
+                    )
+                    self._worker.start()
+
+    def _serve(self) -> None:
+        """Collect requests into batches and run them until shut down."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window
+            stop = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, requests: List[_Request]) -> None:
+        # Requests cancelled while queued are dropped from the batch
+        batch = [request for request in requests if request.future.set_running_or_notify_cancel()]
+        try:
+            if batch:
+                outputs = self._generate_batch(
+                    [request.image for request in batch],
+                    [request.prompt for request in batch],
+                    [request.max_new_tokens for request in batch],
+                )
+                for request, output in zip(batch, outputs):
+                    self.cache.set(request.key, output)
+                    request.future.set_result(output)
+        except Exception as e:
+            logger.error(f"Vision batch of {len(batch)} failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                for request in requests:
+                    self._inflight.pop(request.key, None)
+
+    def submit(
+        self,
+        image: ImageInput,
+        prompt: Optional[str] = None,
+        task: str = "describe",
+        max_new_tokens: Optional[int] = None,
+    ) -> Future:
+        """
+        Queue a generation request.
+
+        Cached answers and identical requests already queued are shared
+        instead of generating again.
+
+        Args:
+            image: Image path, encoded image data, or PIL image
+            prompt: Prompt, defaults to the task's prompt
+            task: ``describe``, ``screenshot``, ``document`` or ``question``
+            max_new_tokens: Generation cap, defaults to the task's cap
+
+        Returns:
+            Future: Resolves to the generated text
+        """
+        if task not in TASK_MAX_NEW_TOKENS:
+            raise ValueError(f"Unknown vision task: {task}")
+        prompt = prompt or TASK_PROMPTS[task]
+        max_new_tokens = max_new_tokens or TASK_MAX_NEW_TOKENS[task]
+        content = _image_bytes(image)
+        key = _content_key(content, prompt, max_new_tokens)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._inflight_lock:
+            if key in self._inflight:
+                return self._inflight[key]
+            if isinstance(content, Image.Image):
+                decoded = content.convert("RGB")
+            else:
+                with Image.open(io.BytesIO(content)) as opened:
+                    decoded = opened.convert("RGB")
+            future = Future()
+            self._inflight[key] = future
+        self._ensure_worker()
+        self._queue.put(_Request(key, decoded, prompt, max_new_tokens, future))
+        return future
+
+    def generate(
+        self,
+        image: ImageInput,
+        prompt: Optional[str] = None,
+        task: str = "describe",
+        max_new_tokens: Optional[int] = None,
+    ) -> str:
+        """Generate text for an image, waiting for the batch it joins."""
+        return self.submit(image, prompt, task, max_new_tokens).result()
+
+    async def agenerate(
+        self,
+        image: ImageInput,
+        prompt: Optional[str] = None,
+        task: str = "describe",
+        max_new_tokens: Optional[int] = None,
+    ) -> str:
+        """Generate text for an image without blocking the event loop."""
+        future = await asyncio.to_thread(self.submit, image, prompt, task, max_new_tokens)
+        return await asyncio.wrap_future(future)
+
+    def generate_many(
+        self,
+        images: Sequence[ImageInput],
+        prompt: Optional[str] = None,
+        task: str = "describe",
+        max_new_tokens: Optional[int] = None,
+    ) -> List[str]:
+        """Generate text for many images, submitted together so they share batches."""
+        futures = [self.submit(image, prompt, task, max_new_tokens) for image in images]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        """Stop the batching thread after the queued requests are served."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+
+_host: Optional[VisionModelHost] = None
+_host_lock = threading.Lock()
+
+
+def get_vision_model_host() -> VisionModelHost:
+    """Get the process-wide vision model host."""
+    global _host
+    if _host is None:
+        with _host_lock:
+            if _host is None:
+                _host = VisionModelHost()
+    return _host
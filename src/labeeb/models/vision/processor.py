@@ -1,8 +1,7 @@
-import torch
-from PIL import Image
 from dataclasses import dataclass
-from transformers import AutoProcessor, AutoModelForVision2Seq
-from typing import Optional
+from typing import List, Optional, Sequence
+
+from .model_host import get_vision_model_host
 
 
 @dataclass
@@ -14,24 +13,26 @@ class VisionResult:
 
 class VisionProcessor:
     def __init__(self):
-        self.processor = AutoProcessor.from_pretrained("HuggingFaceTB/SmolVLM-256M-Instruct")
-        self.model = AutoModelForVision2Seq.from_pretrained(
-            "HuggingFaceTB/SmolVLM-256M-Instruct", torch_dtype=torch.bfloat16
-        )
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = self.model.to(self.device)
+        # The model is shared with VisionTool and loaded on the first call
+        self.host = get_vision_model_host()
 
     def process_image(
-        self, image_path: str, prompt: str = "Can you describe this image?"
+        self, image_path: str, prompt: str = "Can you describe this image?", task: str = "describe"
     ) -> VisionResult:
-        image = Image.open(image_path)
-        inputs = self.processor(text=prompt, images=[image], return_tensors="pt").to(self.device)
-        generated_ids = self.model.generate(**inputs, max_new_tokens=500)
-        description = self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+        description = self.host.generate(image_path, prompt, task=task)
         return VisionResult(description=description, confidence=1.0, raw=description)
 
+    def process_images(
+        self, image_paths: Sequence[str], prompt: str = "Can you describe this image?"
+    ) -> List[VisionResult]:
+        descriptions = self.host.generate_many(image_paths, prompt)
+        return [
+            VisionResult(description=description, confidence=1.0, raw=description)
+            for description in descriptions
+        ]
+
     def process_screenshot(self, image_path: str) -> VisionResult:
-        return self.process_image(image_path, prompt="What is on the screen?")
+        return self.process_image(image_path, prompt="What is on the screen?", task="screenshot")
 
     def analyze_document(self, image_path: str) -> VisionResult:
-        return self.process_image(image_path, prompt="Analyze this document.")
+        return self.process_image(image_path, prompt="Analyze this document.", task="document")
@@ -3,8 +3,12 @@
 AI-driven command interpreter for Labeeb.
 This module replaces regex-based pattern matching with AI-driven command interpretation.
 """
+import asyncio
+import atexit
+import functools
 import logging
-from typing import Dict, Any, Optional, List, Union
+import weakref
+from typing import Dict, Any, Optional, List, Set, Union
 from pathlib import Path
 import json
 from dataclasses import dataclass, field
@@ -16,11 +20,81 @@ from labeeb.core.file_operations import handle_file_operation
 from labeeb.core.ai.tools.json_tool import JSONTool
 from labeeb.core.ai.tools.tool_registry import ToolRegistry
 import re
+from labeeb.services.intent_matcher import get_intent_matcher
 from labeeb.tools.sound_tool import SoundTool
+from labeeb.tools.tool_lifecycle_manager import ToolLifecycleManager
 from labeeb.tools.weather.weather import WeatherPlugin
 
 logger = get_logger(__name__)
 
+# Intents that interpret_command turns into tool plans
+INTERPRETER_INTENTS = frozenset(
+    {"weather", "screenshot", "calculate", "clipboard_copy", "play_sound", "web_search"}
+)
+
+# Interpreters whose warm tool instances are cleaned up at exit
+_live_interpreters: "weakref.WeakSet[AICommandInterpreter]" = weakref.WeakSet()
+
+# Matches "{{step_2}}" or "{{step_2.field}}" inside plan step parameters
+STEP_REFERENCE_PATTERN = re.compile(r"\{\{\s*step_(\d+)(?:\.(\w+))?\s*\}\}")
+
+
+def _find_step_references(value: Any) -> Set[int]:
+    """Find the step numbers referenced anywhere in a parameter value."""
+    if isinstance(value, str):
+        return {int(m.group(1)) for m in STEP_REFERENCE_PATTERN.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_find_step_references(v) for v in value.values()))
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_find_step_references(v) for v in value))
+    return set()
+
+
+def _lookup_step_output(outputs: Dict[int, Any], step: int, key: Optional[str]) -> Any:
+    """Get a referenced step output, or one field of it."""
+    output = outputs.get(step)
+    if key is None:
+        return output
+    if isinstance(output, dict):
+        return output.get(key)
+    return getattr(output, key, None)
+
+
+def _resolve_step_references(value: Any, outputs: Dict[int, Any]) -> Any:
+    """
+    Substitute earlier step outputs into a parameter value.
+
+    A string that is exactly one reference is replaced by the referenced
+    value itself; references embedded in longer strings are formatted in.
+    """
+    if isinstance(value, str):
+        match = STEP_REFERENCE_PATTERN.fullmatch(value.strip())
+        if match:
+            return _lookup_step_output(outputs, int(match.group(1)), match.group(2))
+        return STEP_REFERENCE_PATTERN.sub(
+            lambda m: str(_lookup_step_output(outputs, int(m.group(1)), m.group(2))), value
+        )
+    if isinstance(value, dict):
+        return {k: _resolve_step_references(v, outputs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve_step_references(v, outputs) for v in value]
+    return value
+
+
+def _dependency_skip_status(dep_status: str, condition: str) -> Optional[str]:
+    """
+    Decide whether a step must not run given one dependency's outcome.
+
+    Returns:
+        None if the step may run, "cancelled" if a required dependency did not
+        succeed, or "skipped" if the step is an unused success/failure handler
+    """
+    if condition == "failure":
+        return None if dep_status in ("error", "unknown_operation") else "skipped"
+    if dep_status == "success":
+        return None
+    return "skipped" if dep_status == "skipped" else "cancelled"
+
 
 @dataclass
 class CommandHistoryEntry:
@@ -44,6 +118,7 @@ class PlanStep:
     on_success: List[int] = field(default_factory=list)
     on_failure: List[int] = field(default_factory=list)
     explanation: Optional[str] = None
+    depends_on: List[int] = field(default_factory=list)
 
 
 @dataclass
@@ -70,8 +145,14 @@ class StepResult:
 class AICommandInterpreter:
     """AI-driven command interpreter for natural language processing."""
 
-    def __init__(self) -> None:
-        """Initialize the AI command interpreter."""
+    def __init__(self, max_concurrency: int = 4) -> None:
+        """Initialize the AI command interpreter.
+
+        Args:
+            max_concurrency: Maximum number of plan steps executed at once
+        """
+        self.max_concurrency = max_concurrency
+        self.tool_lifecycle = ToolLifecycleManager(resolver=ToolRegistry.get_tool)
         self.command_history: List[CommandHistoryEntry] = []
         self.context: Dict[str, Any] = {}
         self.json_tool = JSONTool()
@@ -84,6 +165,7 @@ class AICommandInterpreter:
         except Exception:
             pass
         self.sound_tool = SoundTool()
+        _live_interpreters.add(self)
 
     def interpret_command(self, command: str, language: str = "en") -> InterpretedCommand:
         """
@@ -102,25 +184,15 @@ class AICommandInterpreter:
 
         # --- Intent mapping ---
         plan = []
-        cmd = command.strip().lower()
         step = 1
+        match = get_intent_matcher().match(command, allowed=INTERPRETER_INTENTS)
+        intent = match.intent if match else None
+        slots = match.slots if match else {}
         # Weather (English/Arabic)
-        weather_patterns = [
-            r"weather in ([\w\s]+)",
-            r"ما هو الطقس في ([^؟]+)",
-            r"ما هو الطقس ب([\w\s]+)",
-            r"ما هو الطقس الآن",
-        ]
-        match = None
-        for pat in weather_patterns:
-            m = re.search(pat, cmd)
-            if m:
-                match = m
-                break
-        if match:
-            city = match.group(1).strip() if match.lastindex else ""
+        if intent == "weather":
+            city = slots.get("city")
             if not city:
-                city = "الكويت" if "الكويت" in cmd else "your city"
+                city = "الكويت" if "الكويت" in match.text else "your city"
             plan.append(PlanStep(
                 step=step,
                 description=f"Get current weather for {city}",
@@ -130,7 +202,7 @@ class AICommandInterpreter:
                 explanation="Fetches current weather using the weather tool."
             ))
         # Screenshot (English/Arabic)
-        elif any(x in cmd for x in ["screenshot", "لقطة شاشة", "خذ لقطة"]):
+        elif intent == "screenshot":
             plan.append(PlanStep(
                 step=step,
                 description="Take a screenshot of the desktop",
@@ -140,9 +212,8 @@ class AICommandInterpreter:
                 explanation="Takes a screenshot using the screen control tool."
             ))
         # Calculator (English/Arabic)
-        elif any(x in cmd for x in ["calculate", "احسب", "حاسبة", "اجمع", "اضرب", "اطرح", "اقسم"]):
-            expr = re.findall(r"\d+[\s\+\-\*/xX×÷]+\d+", cmd)
-            expression = expr[0] if expr else cmd
+        elif intent == "calculate":
+            expression = slots.get("expression", match.text)
             plan.append(PlanStep(
                 step=step,
                 description=f"Calculate expression: {expression}",
@@ -152,10 +223,8 @@ class AICommandInterpreter:
                 explanation="Performs calculation using the calculator tool."
             ))
         # Clipboard (copy text)
-        elif any(x in cmd for x in ["copy the text", "انسخ النص"]):
-            text = re.findall(r"copy the text (.+)", cmd)
-            text = text[0] if text else re.findall(r"انسخ النص (.+)", cmd)
-            text = text[0] if text else ""
+        elif intent == "clipboard_copy":
+            text = slots.get("text", "")
             plan.append(PlanStep(
                 step=step,
                 description=f"Copy text to clipboard: {text}",
@@ -165,10 +234,8 @@ class AICommandInterpreter:
                 explanation="Copies text to clipboard using the clipboard tool."
             ))
         # Play sound/audio
-        elif any(x in cmd for x in ["play the file", "شغل الملف"]):
-            fname = re.findall(r"play the file ([\w\.]+)", cmd)
-            fname = fname[0] if fname else re.findall(r"شغل الملف ([\w\.]+)", cmd)
-            fname = fname[0] if fname else "music.wav"
+        elif intent == "play_sound":
+            fname = slots.get("filename", "music.wav")
             plan.append(PlanStep(
                 step=step,
                 description=f"Play sound file: {fname}",
@@ -178,10 +245,8 @@ class AICommandInterpreter:
                 explanation="Plays a sound file using the sound tool."
             ))
         # Web search/news
-        elif any(x in cmd for x in ["search the web", "ابحث في الإنترنت"]):
-            query = re.findall(r"search the web for (.+)", cmd)
-            query = query[0] if query else re.findall(r"ابحث في الإنترنت عن (.+)", cmd)
-            query = query[0] if query else "AI news"
+        elif intent == "web_search":
+            query = slots.get("query", "AI news")
             plan.append(PlanStep(
                 step=step,
                 description=f"Search the web for: {query}",
@@ -204,85 +269,213 @@ class AICommandInterpreter:
         self.command_history.append(CommandHistoryEntry(command=command, language=language))
         return InterpretedCommand(plan=plan, overall_confidence=0.96, language=language)
 
-    async def process_plan_async(self, plan: List[PlanStep]) -> List[StepResult]:
+    def _build_dependencies(self, plan: List[PlanStep]) -> Dict[int, Dict[int, str]]:
         """
-        Async version: Process and execute each step in the plan.
+        Work out which earlier steps each step waits for.
+
+        A step depends on the steps listed in its ``depends_on`` field and on
+        any step whose output its parameters reference. It also depends on
+        every step that lists it in ``on_success`` or ``on_failure``; such a
+        step only runs if that step succeeded or failed respectively.
+
+        Args:
+            plan: The plan steps
+
+        Returns:
+            Dict mapping each step number to ``{dependency: "success" | "failure"}``
         """
-        results: List[StepResult] = []
-        step_results: Dict[int, StepResult] = {}
+        known = {step.step for step in plan}
+        requires: Dict[int, Dict[int, str]] = {step.step: {} for step in plan}
 
         for step in plan:
-            result = StepResult(step=step.step, description=step.description, status="skipped")
-            try:
-                # Parse operation as tool_name.method
-                if "." in step.operation:
-                    tool_name, method = step.operation.split(".", 1)
-                    # Special bridging for weather and sound tools
-                    if tool_name == "weather_tool":
-                        if self.weather_plugin and hasattr(self.weather_plugin, "get_current_weather"):
-                            output = self.weather_plugin.get_current_weather(**step.parameters)
-                            result.status = "success"
-                            result.output = output
-                        else:
-                            result.status = "error"
-                            result.error = "Weather plugin not available."
-                    elif tool_name == "sound_tool":
-                        if hasattr(self.sound_tool, method):
-                            func = getattr(self.sound_tool, method)
-                            output = func(**step.parameters)
-                            result.status = "success"
-                            result.output = output
-                        else:
-                            result.status = "error"
-                            result.error = f"Method '{method}' not found in SoundTool."
+            for dep in list(step.depends_on) + sorted(_find_step_references(step.parameters)):
+                requires[step.step][dep] = "success"
+            for target in step.on_success:
+                if target in requires:
+                    requires[target][step.step] = "success"
+            for target in step.on_failure:
+                if target in requires:
+                    requires[target][step.step] = "failure"
+
+        for step_no, deps in requires.items():
+            for dep in [d for d in deps if d not in known or d == step_no]:
+                logger.warning(f"Step {step_no} depends on unknown step {dep}, ignoring")
+                del deps[dep]
+        return requires
+
+    @staticmethod
+    def _find_cycle(requires: Dict[int, Dict[int, str]]) -> List[int]:
+        """Return the steps that can never run because of a dependency cycle."""
+        remaining = {step: set(deps) for step, deps in requires.items()}
+        ready = [step for step, deps in remaining.items() if not deps]
+        while ready:
+            done = ready.pop()
+            del remaining[done]
+            for step, deps in remaining.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(step)
+        return sorted(remaining)
+
+    async def process_plan_async(
+        self, plan: List[PlanStep], max_concurrency: Optional[int] = None
+    ) -> List[StepResult]:
+        """
+        Async version: Process and execute the plan as a dependency graph.
+
+        Independent steps run concurrently, up to ``max_concurrency`` at a time.
+        A step whose dependency failed is cancelled, along with everything
+        downstream of it, unless it is that dependency's ``on_failure`` handler.
+
+        Args:
+            plan: The plan steps
+            max_concurrency: Maximum steps running at once, defaults to the
+                interpreter's ``max_concurrency``
+
+        Returns:
+            Step results in plan order
+        """
+        requires = self._build_dependencies(plan)
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        tasks: Dict[int, "asyncio.Task[StepResult]"] = {}
+
+        cyclic = set(self._find_cycle(requires))
+
+        async def run(step: PlanStep) -> StepResult:
+            outputs: Dict[int, Any] = {}
+            for dep, condition in requires[step.step].items():
+                dep_result = await tasks[dep]
+                outputs[dep] = dep_result.output
+                skip = _dependency_skip_status(dep_result.status, condition)
+                if skip:
+                    return StepResult(
+                        step=step.step,
+                        description=step.description,
+                        status=skip,
+                        error=f"Dependency step {dep} {dep_result.status}"
+                        if skip == "cancelled"
+                        else None,
+                    )
+
+            async with semaphore:
+                parameters = _resolve_step_references(step.parameters, outputs)
+                return await self._execute_step(step, parameters)
+
+        for step in plan:
+            if step.step in cyclic:
+                continue
+            tasks[step.step] = asyncio.ensure_future(run(step))
+
+        results: List[StepResult] = []
+        for step in plan:
+            if step.step in cyclic:
+                results.append(StepResult(
+                    step=step.step,
+                    description=step.description,
+                    status="error",
+                    error="Dependency cycle detected.",
+                ))
+            else:
+                results.append(await tasks[step.step])
+        return results
+
+    async def _call(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Await a coroutine function, or run a blocking one in the default executor."""
+        if inspect.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _call_tool_method(
+        self, tool: Any, tool_name: str, method: str, parameters: Dict[str, Any], result: StepResult
+    ) -> None:
+        """Call a tool method, falling back to its execute entry points, and record the outcome."""
+        if hasattr(tool, method):
+            output = await self._call(getattr(tool, method), **parameters)
+        # Try .execute or ._execute_command fallback
+        elif hasattr(tool, "execute"):
+            output = await self._call(tool.execute, method, parameters)
+        elif hasattr(tool, "_execute_command"):
+            output = await self._call(tool._execute_command, method, parameters)
+        else:
+            result.status = "error"
+            result.error = f"Method '{method}' not found in tool '{tool_name}'."
+            return
+        result.status = "success"
+        result.output = output
+
+    async def cleanup_async(self) -> None:
+        """Clean up the warm tool instances."""
+        await self.tool_lifecycle.cleanup_async()
+
+    def cleanup(self) -> None:
+        """Sync wrapper for cleanup_async, run at exit for every live interpreter."""
+        if not any(stats["instances"] for stats in self.tool_lifecycle.get_pool_stats().values()):
+            return
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_closed():
+                raise RuntimeError("Event loop is closed")
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.cleanup_async())
+        except Exception as e:
+            logger.error(f"Error cleaning up tools: {str(e)}")
+
+    async def _execute_step(self, step: PlanStep, parameters: Dict[str, Any]) -> StepResult:
+        """
+        Execute a single plan step.
+
+        Args:
+            step: The plan step
+            parameters: The step parameters with step references resolved
+
+        Returns:
+            The step result
+        """
+        result = StepResult(step=step.step, description=step.description, status="skipped")
+        try:
+            # Parse operation as tool_name.method
+            if "." in step.operation:
+                tool_name, method = step.operation.split(".", 1)
+                # Special bridging for weather and sound tools
+                if tool_name == "weather_tool":
+                    if self.weather_plugin and hasattr(self.weather_plugin, "get_current_weather"):
+                        output = await self._call(self.weather_plugin.get_current_weather, **parameters)
+                        result.status = "success"
+                        result.output = output
                     else:
-                        ToolClass = ToolRegistry.get_tool(tool_name)
-                        if ToolClass is None:
-                            result.status = "error"
-                            result.error = f"Tool '{tool_name}' not found."
-                        else:
-                            tool = ToolClass()
-                            if hasattr(tool, method):
-                                func = getattr(tool, method)
-                                if inspect.iscoroutinefunction(func):
-                                    output = await func(**step.parameters)
-                                else:
-                                    output = func(**step.parameters)
-                                result.status = "success"
-                                result.output = output
-                            else:
-                                # Try .execute or ._execute_command fallback
-                                if hasattr(tool, "execute"):
-                                    exec_func = getattr(tool, "execute")
-                                    if inspect.iscoroutinefunction(exec_func):
-                                        output = await exec_func(method, step.parameters)
-                                    else:
-                                        output = exec_func(method, step.parameters)
-                                    result.status = "success"
-                                    result.output = output
-                                elif hasattr(tool, "_execute_command"):
-                                    exec_func = getattr(tool, "_execute_command")
-                                    if inspect.iscoroutinefunction(exec_func):
-                                        output = await exec_func(method, step.parameters)
-                                    else:
-                                        output = exec_func(method, step.parameters)
-                                    result.status = "success"
-                                    result.output = output
-                                else:
-                                    result.status = "error"
-                                    result.error = f"Method '{method}' not found in tool '{tool_name}'."
-                elif step.operation == "echo":
-                    result.status = "success"
-                    result.output = step.parameters.get("text")
+                        result.status = "error"
+                        result.error = "Weather plugin not available."
+                elif tool_name == "sound_tool":
+                    if hasattr(self.sound_tool, method):
+                        func = getattr(self.sound_tool, method)
+                        output = await self._call(func, **parameters)
+                        result.status = "success"
+                        result.output = output
+                    else:
+                        result.status = "error"
+                        result.error = f"Method '{method}' not found in SoundTool."
                 else:
-                    result.status = "unknown_operation"
-                    result.output = f"Unknown operation: {step.operation}"
-            except Exception as e:
-                result.status = "error"
-                result.error = str(e)
-            results.append(result)
-            step_results[step.step] = result
-        return results
+                    if self.tool_lifecycle.get_policy(tool_name) is None:
+                        result.status = "error"
+                        result.error = f"Tool '{tool_name}' not found."
+                    else:
+                        async with self.tool_lifecycle.acquire(tool_name) as tool:
+                            await self._call_tool_method(tool, tool_name, method, parameters, result)
+            elif step.operation == "echo":
+                result.status = "success"
+                result.output = parameters.get("text")
+            else:
+                result.status = "unknown_operation"
+                result.output = f"Unknown operation: {step.operation}"
+        except Exception as e:
+            result.status = "error"
+            result.error = str(e)
+        return result
 
     def process_plan(self, plan: List[PlanStep]) -> List[StepResult]:
         """
@@ -358,3 +551,10 @@ class AICommandInterpreter:
         if filepath.exists():
             with open(filepath, "r") as f:
                 self.context = self.json_tool.load(f.read())
+
+
+@atexit.register
+def _cleanup_live_interpreters() -> None:
+    """Run the tool cleanup hooks of interpreters still alive at exit."""
+    for interpreter in list(_live_interpreters):
+        interpreter.cleanup()
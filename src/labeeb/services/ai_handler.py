@@ -3,7 +3,7 @@ AI Handler for Labeeb.
 Manages AI model interactions and caching.
 """
 
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, AsyncIterator, Tuple
 import json
 import time
 import asyncio
@@ -30,9 +30,59 @@ from labeeb.core.key_manager import KeyManager
 from labeeb.models.system_types import SystemInfo
 from labeeb.core.command_processor.ai_command_extractor import AICommandExtractor
 from labeeb.core.platform_core.platform_manager import get_platform_system_info_gatherer
+from labeeb.services.system_context import SystemContext
 
 logger = logging.getLogger(__name__)
 
+# How long Ollama keeps the model, and the evaluated prompt prefix, in memory
+DEFAULT_KEEP_ALIVE = "30m"
+
+# Fixed instructions sent as the system prompt. They never change between
+# requests, so a model kept alive by Ollama reuses their evaluated prefix
+# instead of processing them again.
+PROMPT_PREFIX = """You are Labeeb, an AI assistant that helps users with tasks. Follow these guidelines:
+
+1. Command Processing:
+   - Focus on executing commands, not providing feedback
+   - Break down complex commands into clear, sequential steps
+   - Each step should have a clear description and operation
+   - For system commands, provide the exact command to execute
+
+2. Response Format:
+   Always respond in this JSON format:
+   {
+     "plan": [
+       {
+         "step": "step_name",
+         "description": "Clear description of what this step does",
+         "operation": "system_command",
+         "parameters": {
+           "command": "exact system command to execute"
+         },
+         "confidence": 0.0-1.0,
+         "conditions": null
+       }
+     ]
+   }
+
+"""
+
+
+def _format_prompt_suffix(prompt: str, system_info: str) -> str:
+    """Format the per-request part of the prompt."""
+    return f"""3. System Information:
+   Current system: {system_info}
+
+User Command: {prompt}
+
+Remember:
+- Focus on executing commands, not providing feedback
+- Use standardized response format
+- Include confidence scores
+- Break down complex commands into multiple steps
+- Only include system commands that can be executed"""
+
+
 @dataclass
 class PromptConfig:
     max_tokens: int = 1024
@@ -59,16 +109,57 @@ class AIHandler:
         self.prompt_config = PromptConfig()
         self.command_extractor = AICommandExtractor()
         self.system_info_gatherer = get_platform_system_info_gatherer()
+        self.system_context = SystemContext()
+        config = getattr(model_manager, "config", None)
+        self.keep_alive = (
+            config.get("ollama_keep_alive", DEFAULT_KEEP_ALIVE) if config else DEFAULT_KEEP_ALIVE
+        )
         logger.info("AI handler initialized")
 
     def process_prompt(self, prompt: str, extra_context: str = None) -> ResponseInfo:
+        """Process a prompt from synchronous code.
+
+        Runs process_prompt_async on a new event loop. Code already running
+        on an event loop must await process_prompt_async instead, so the
+        request never blocks that loop.
+
+        Args:
+            prompt: The user prompt
+            extra_context: Optional visual context to prepend
+
+        Returns:
+            ResponseInfo: The extracted plan and the raw model response
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._process_prompt_once(prompt, extra_context))
+        raise RuntimeError(
+            "process_prompt() cannot run inside an event loop; await process_prompt_async()"
+        )
+
+    async def _process_prompt_once(self, prompt: str, extra_context: str = None) -> ResponseInfo:
+        """Process a prompt on a short-lived loop, closing the pooled session with it."""
         try:
-            system_info = self.system_info_gatherer.get_system_info()["platform"]
-            if extra_context:
-                prompt = f"[Visual Context]: {extra_context}\n{prompt}"
-            formatted_prompt = self.format_ai_prompt(prompt, system_info)
+            return await self.process_prompt_async(prompt, extra_context)
+        finally:
+            # The session is bound to this loop and cannot be reused once it closes
+            await self.model_manager.client.close()
+
+    async def process_prompt_async(self, prompt: str, extra_context: str = None) -> ResponseInfo:
+        """Process a prompt through the shared pooled Ollama client.
+
+        Args:
+            prompt: The user prompt
+            extra_context: Optional visual context to prepend
+
+        Returns:
+            ResponseInfo: The extracted plan and the raw model response
+        """
+        try:
+            system_prompt, formatted_prompt = self.build_prompt(prompt, extra_context)
             logger.debug(f"Formatted AI prompt: {formatted_prompt}")
-            response = self._get_model_response(formatted_prompt)
+            response = await self._get_model_response(formatted_prompt, system=system_prompt)
             logger.debug(f"Raw model response: {response}")
             success, plan, extraction_metadata = self.command_extractor.extract_command(
                 response.get("response", "")
@@ -89,61 +180,75 @@ class AIHandler:
 
     def format_ai_prompt(self, prompt: str, system_info: str) -> str:
         """Format the prompt for the AI model with standardized instructions."""
-        return f"""You are Labeeb, an AI assistant that helps users with tasks. Follow these guidelines:
+        return PROMPT_PREFIX + _format_prompt_suffix(prompt, system_info)
 
-1. Command Processing:
-   - Focus on executing commands, not providing feedback
-   - Break down complex commands into clear, sequential steps
-   - Each step should have a clear description and operation
-   - For system commands, provide the exact command to execute
+    def build_prompt(self, prompt: str, extra_context: str = None) -> Tuple[str, str]:
+        """Build the request for a prompt from the cached prefix and system fragment.
 
-2. Response Format:
-   Always respond in this JSON format:
-   {{
-     "plan": [
-       {{
-         "step": "step_name",
-         "description": "Clear description of what this step does",
-         "operation": "system_command",
-         "parameters": {{
-           "command": "exact system command to execute"
-         }},
-         "confidence": 0.0-1.0,
-         "conditions": null
-       }}
-     ]
-   }}
+        Args:
+            prompt: The user prompt
+            extra_context: Optional visual context to prepend
 
-3. System Information:
-   Current system: {system_info}
+        Returns:
+            Tuple[str, str]: The static system prefix and the per-request prompt
+        """
+        if extra_context:
+            prompt = f"[Visual Context]: {extra_context}\n{prompt}"
+        return PROMPT_PREFIX, _format_prompt_suffix(prompt, self.system_context.fragment())
 
-User Command: {prompt}
+    async def stream_prompt(self, prompt: str, extra_context: str = None) -> AsyncIterator[str]:
+        """Stream the model's response to a prompt token by token.
 
-Remember:
-- Focus on executing commands, not providing feedback
-- Use standardized response format
-- Include confidence scores
-- Break down complex commands into multiple steps
-- Only include system commands that can be executed"""
+        Args:
+            prompt: The user prompt
+            extra_context: Optional visual context to prepend
+
+        Yields:
+            Each response token as soon as the model produces it
+        """
+        system_prompt, formatted_prompt = self.build_prompt(prompt, extra_context)
+        logger.debug(f"Formatted AI prompt: {formatted_prompt}")
+        try:
+            async for token in self.model_manager.client.stream_tokens(
+                self._get_model_name(),
+                formatted_prompt,
+                options=self._get_model_options(),
+                system=system_prompt,
+                keep_alive=self.keep_alive,
+            ):
+                yield token
+        except Exception as e:
+            logger.error(f"Error streaming model response: {str(e)}")
+            raise
+
+    def _get_model_name(self) -> str:
+        """Get the name of the Ollama model to use."""
+        return getattr(self, "ollama_model_name", None) or self.model_manager.model_info.name
+
+    def _get_model_options(self) -> Dict[str, Any]:
+        """Get the generation options from the prompt config."""
+        return {
+            "temperature": self.prompt_config.temperature,
+            "top_p": self.prompt_config.top_p,
+            "top_k": self.prompt_config.top_k,
+            "num_predict": self.prompt_config.max_tokens,
+        }
 
     def _format_prompt(self, prompt: str) -> str:
         return f"User: {prompt}\nAssistant:"
 
-    def _get_model_response(self, prompt: str) -> Dict[str, Any]:
+    async def _get_model_response(
+        self, prompt: str, system: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get a complete response through the shared pooled Ollama client."""
         try:
-            import ollama
-
-            response = ollama.generate(
-                model=self.model_manager.model_info.name,
-                prompt=prompt,
-                options={
-                    "temperature": self.prompt_config.temperature,
-                    "top_p": self.prompt_config.top_p,
-                    "top_k": self.prompt_config.top_k,
-                    "num_predict": self.prompt_config.max_tokens,
-                },
+            return await self.model_manager.client.generate(
+                self._get_model_name(),
+                prompt,
+                options=self._get_model_options(),
+                system=system,
+                keep_alive=self.keep_alive,
             )
-            return response
         except Exception as e:
             logger.error(f"Error getting model response: {str(e)}")
             raise
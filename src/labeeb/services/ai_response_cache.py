@@ -12,32 +12,70 @@ alwaysApply: false
 ---
 
 - Cache AI model responses
+- Normalize keys so equivalent commands share an entry
 - Manage cache size and TTL
 - Provide cache retrieval
 - Support cache statistics
-- Handle cache eviction
+- Handle LRU cache eviction in constant time
+- Read through to an optional persistent tier on a miss, off the event loop when async
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from labeeb.services.ai_response_store import PersistentResponseStore
+from labeeb.utils.text_normalizer import normalize_command
 
 logger = logging.getLogger(__name__)
 
-class AIResponseCache:
-    """Caches AI model responses for improved performance."""
+# Marks a miss in the in-memory tier, where None is a valid cached value
+_MISSING = object()
 
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
+class AIResponseCache:
+    """Caches AI model responses for improved performance.
+
+    Entries are kept in least-recently-used order, so both lookups and
+    evictions are O(1). Expiry is measured on the monotonic clock. When a
+    persistent store is attached, misses read through to it and every set is
+    written behind to it, so a fresh process starts with a warm cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: int = 3600,
+        key_normalizer: Optional[Callable[[str], str]] = normalize_command,
+        persistent_store: Optional[PersistentResponseStore] = None,
+    ):
         """
         Initialize the AI response cache.
 
         Args:
             max_size: Maximum number of responses to cache
             ttl: Time to live for cached responses in seconds
+            key_normalizer: Function mapping a raw key to its cache key, or None to use keys as-is
+            persistent_store: Optional on-disk second tier
         """
         self.max_size = max_size
         self.ttl = ttl
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.key_normalizer = key_normalizer
+        self.persistent_store = persistent_store
+        # key -> (response, expires_at), least recently used first
+        self.cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.persistent_hits = 0
+
+    def _normalize_key(self, key: str) -> str:
+        """Map a raw key to its cache key."""
+        if self.key_normalizer is None:
+            return key
+        return self.key_normalizer(key)
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -49,16 +87,71 @@ class AIResponseCache:
         Returns:
             Optional[Dict[str, Any]]: The cached response, or None if not found or expired
         """
-        if key not in self.cache:
-            return None
+        cache_key = self._normalize_key(key)
+        response = self._get_memory(cache_key)
+        if response is not _MISSING:
+            return response
+
+        stored = None
+        if self.persistent_store is not None:
+            stored = self.persistent_store.get(cache_key)
+        return self._read_through(cache_key, stored)
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a response from the cache without blocking the event loop.
+
+        The in-memory tier is checked inline; a miss reads the persistent
+        store on a worker thread.
+
+        Args:
+            key: The cache key
 
-        cached = self.cache[key]
-        if self._is_expired(cached):
-            del self.cache[key]
+        Returns:
+            Optional[Dict[str, Any]]: The cached response, or None if not found or expired
+        """
+        cache_key = self._normalize_key(key)
+        response = self._get_memory(cache_key)
+        if response is not _MISSING:
+            return response
+
+        stored = None
+        if self.persistent_store is not None:
+            stored = await asyncio.to_thread(self.persistent_store.get, cache_key)
+        return self._read_through(cache_key, stored)
+
+    def _get_memory(self, cache_key: str) -> Any:
+        """Look a key up in the in-memory tier, returning _MISSING on a miss."""
+        cached = self.cache.get(cache_key)
+        if cached is not None and time.monotonic() >= cached[1]:
+            del self.cache[cache_key]
+            self.expirations += 1
+            cached = None
+
+        if cached is None:
+            return _MISSING
+
+        response, _ = cached
+
+        self.cache.move_to_end(cache_key)
+        self.hits += 1
+        logger.debug(f"Cache hit for key: {cache_key}")
+        return response
+
+    def _read_through(
+        self, cache_key: str, stored: Optional[Tuple[Any, float]]
+    ) -> Optional[Dict[str, Any]]:
+        """Record the result of a persistent store lookup for a missed key."""
+        if stored is None:
+            self.misses += 1
             return None
 
-        logger.debug(f"Cache hit for key: {key}")
-        return cached["response"]
+        response, remaining_ttl = stored
+        self._insert(cache_key, response, remaining_ttl)
+        self.hits += 1
+        self.persistent_hits += 1
+        logger.debug(f"Persistent cache hit for key: {cache_key}")
+        return response
 
     def set(self, key: str, response: Dict[str, Any]) -> None:
         """
@@ -68,44 +161,45 @@ class AIResponseCache:
             key: The cache key
             response: The response to cache
         """
-        if len(self.cache) >= self.max_size:
+        cache_key = self._normalize_key(key)
+        self._insert(cache_key, response, self.ttl)
+        if self.persistent_store is not None:
+            self.persistent_store.put(cache_key, response, self.ttl)
+
+        logger.debug(f"Cached response for key: {cache_key}")
+
+    def _insert(self, cache_key: str, response: Any, ttl: float) -> None:
+        """Insert an entry into the in-memory tier."""
+        if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
+        elif len(self.cache) >= self.max_size:
             self._evict_oldest()
 
-        self.cache[key] = {
-            "response": response,
-            "timestamp": datetime.now()
-        }
-
-        logger.debug(f"Cached response for key: {key}")
+        self.cache[cache_key] = (response, time.monotonic() + ttl)
 
     def clear(self) -> None:
         """Clear the cache."""
-        self.cache = {}
+        self.cache.clear()
+        if self.persistent_store is not None:
+            self.persistent_store.clear()
         logger.info("Cleared response cache")
 
-    def _is_expired(self, cached: Dict[str, Any]) -> bool:
-        """
-        Check if a cached response is expired.
-
-        Args:
-            cached: The cached response
+    def flush(self) -> None:
+        """Wait for pending writes to the persistent store to complete."""
+        if self.persistent_store is not None:
+            self.persistent_store.flush()
 
-        Returns:
-            bool: True if the response is expired, False otherwise
-        """
-        timestamp = cached["timestamp"]
-        return datetime.now() - timestamp > timedelta(seconds=self.ttl)
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        return len(self.cache)
 
     def _evict_oldest(self) -> None:
-        """Evict the oldest entry from the cache."""
+        """Evict the least recently used entry from the cache."""
         if not self.cache:
             return
 
-        oldest_key = min(
-            self.cache.keys(),
-            key=lambda k: self.cache[k]["timestamp"]
-        )
-        del self.cache[oldest_key]
+        oldest_key, _ = self.cache.popitem(last=False)
+        self.evictions += 1
         logger.debug(f"Evicted oldest cache entry: {oldest_key}")
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -115,16 +209,16 @@ class AIResponseCache:
         Returns:
             Dict[str, Any]: Cache statistics
         """
+        lookups = self.hits + self.misses
         return {
             "size": len(self.cache),
             "max_size": self.max_size,
             "ttl": self.ttl,
-            "oldest_entry": min(
-                (entry["timestamp"] for entry in self.cache.values()),
-                default=None
-            ),
-            "newest_entry": max(
-                (entry["timestamp"] for entry in self.cache.values()),
-                default=None
-            )
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "persistent": self.persistent_store is not None,
+            "persistent_hits": self.persistent_hits,
         }
@@ -0,0 +1,240 @@
+"""
+AI Response Store Service for persisting AI model responses across restarts.
+
+---
+description: SQLite-backed second tier for the AI response cache
+endpoints: [response_store]
+inputs: [key, response, ttl]
+outputs: [cached_response]
+dependencies: [sqlite3, logging]
+auth: none
+alwaysApply: false
+---
+
+- Persist cached responses in a WAL-mode SQLite database
+- Enforce TTLs in SQL so expired rows are never returned
+- Write entries on a background thread
+- Purge expired rows and cap the table size on open, periodically and as writes pile up
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from labeeb.utils.platform_utils import get_labeeb_cache_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires_at);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+_FLUSH = object()
+_CLEAR = object()
+_STOP = object()
+
+
+class PersistentResponseStore:
+    """Persistent on-disk tier for cached AI responses.
+
+    Reads happen on the calling thread, each thread with its own connection;
+    async callers run them on a worker thread. Writes are queued and applied
+    by a single writer thread, which also runs the vacuum task: once when the
+    store opens, then every ``vacuum_interval`` seconds or after
+    ``max_entries`` writes, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        max_entries: int = 10000,
+        vacuum_interval: float = 300.0,
+    ):
+        """
+        Initialize the persistent response store.
+
+        Args:
+            db_path: Path of the SQLite database, defaults to the Labeeb cache directory
+            max_entries: Maximum number of rows kept after each vacuum
+            vacuum_interval: Maximum seconds between vacuum runs
+        """
+        if db_path is None:
+            db_path = get_labeeb_cache_dir() / "ai_responses.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.vacuum_interval = vacuum_interval
+
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(
+            target=self._run_writer, name="ai-response-store", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection in WAL mode."""
+        # Each connection is used by one thread, but close() may run on another
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Read a response from the store.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            Optional[Tuple[Any, float]]: The response and its remaining TTL in seconds,
+                or None if missing or expired
+        """
+        now = time.time()
+        try:
+            row = self._reader().execute(
+                "SELECT response, expires_at FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading persistent cache: {str(e)}")
+            return None
+        if row is None:
+            return None
+        self._queue.put(("touch", key, now))
+        return json.loads(row[0]), row[1] - now
+
+    def put(self, key: str, response: Any, ttl: float) -> None:
+        """
+        Queue a response to be written to the store.
+
+        Args:
+            key: The cache key
+            response: The JSON-serializable response
+            ttl: Time to live in seconds
+        """
+        now = time.time()
+        self._queue.put(("put", key, json.dumps(response, ensure_ascii=False), now + ttl, now))
+
+    def clear(self) -> None:
+        """Queue removal of all stored responses."""
+        self._queue.put(_CLEAR)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until all queued writes have been applied.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+        """
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Apply pending writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self._local = threading.local()
+
+    def vacuum(self, conn: sqlite3.Connection) -> None:
+        """
+        Purge expired rows and trim the table to the size cap.
+
+        Args:
+            conn: The writer connection
+        """
+        with conn:
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        logger.debug("Vacuumed persistent response cache")
+
+    def _run_writer(self) -> None:
+        """Apply queued writes and run the periodic vacuum."""
+        conn = self._connect()
+        try:
+            # Rows left by earlier runs are trimmed before any queued item is applied
+            self.vacuum(conn)
+        except sqlite3.Error as e:
+            logger.error(f"Error vacuuming persistent cache: {str(e)}")
+        next_vacuum = time.monotonic() + self.vacuum_interval
+        writes = 0
+        try:
+            while True:
+                timeout = max(0.0, next_vacuum - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                try:
+                    if item is _STOP:
+                        return
+                    if item is _CLEAR:
+                        with conn:
+                            conn.execute("DELETE FROM responses")
+                    elif isinstance(item, tuple) and item[0] is _FLUSH:
+                        item[1].set()
+                    elif isinstance(item, tuple) and item[0] == "put":
+                        writes += 1
+                        with conn:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO responses "
+                                "(key, response, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                                item[1:],
+                            )
+                    elif isinstance(item, tuple) and item[0] == "touch":
+                        with conn:
+                            conn.execute(
+                                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                                (item[2], item[1]),
+                            )
+
+                    if time.monotonic() >= next_vacuum or writes >= self.max_entries:
+                        self.vacuum(conn)
+                        next_vacuum = time.monotonic() + self.vacuum_interval
+                        writes = 0
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing persistent cache: {str(e)}")
+        finally:
+            conn.close()
@@ -0,0 +1,277 @@
+"""
+Batch Executor Service for running many commands concurrently.
+
+---
+description: Runs command files through a bounded asyncio worker pool
+endpoints: [batch_executor]
+inputs: [commands, concurrency]
+outputs: [jsonl_results]
+dependencies: [asyncio, json, logging]
+auth: none
+alwaysApply: false
+---
+
+- Read plain-text or JSONL command files
+- Process commands with a bounded number of concurrent workers
+- Emit results in input order as soon as each one is ready
+- Write results as streaming JSONL
+- Record a checkpoint so an interrupted batch can resume and failed lines are retried
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, IO, Iterable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Keys checked, in order, for the command text of a JSONL input line
+COMMAND_KEYS = ("command", "request", "text", "body")
+
+
+@dataclass
+class BatchItem:
+    """A single command read from a batch input."""
+
+    line: int
+    command: str
+    id: Optional[Any] = None
+
+
+@dataclass
+class BatchResult:
+    """The outcome of one batch item."""
+
+    line: int
+    command: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    id: Optional[Any] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary."""
+        data = {
+            "line": self.line,
+            "command": self.command,
+            "status": self.status,
+            "duration": round(self.duration, 4),
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.error is not None:
+            data["error"] = self.error
+        else:
+            data["result"] = self.result
+        return data
+
+
+def parse_batch_line(line: str, line_no: int) -> Optional[BatchItem]:
+    """
+    Parse one input line into a batch item.
+
+    Blank lines and ``#`` comments are skipped. A JSON object line takes its
+    command from the first of ``command``, ``request``, ``text`` or ``body``.
+
+    Args:
+        line: The raw input line
+        line_no: The 1-based line number
+
+    Returns:
+        Optional[BatchItem]: The parsed item, or None if the line has no command
+    """
+    text = line.strip()
+    if not text or text.startswith("#"):
+        return None
+
+    if text.startswith("{"):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            for key in COMMAND_KEYS:
+                if data.get(key):
+                    return BatchItem(
+                        line=line_no,
+                        command=str(data[key]),
+                        id=data.get("id", data.get("request_id")),
+                    )
+            return None
+
+    return BatchItem(line=line_no, command=text)
+
+
+def read_batch_file(path: Union[str, Path]) -> List[BatchItem]:
+    """
+    Read batch items from a plain-text or JSONL file.
+
+    Args:
+        path: Path of the input file
+
+    Returns:
+        List[BatchItem]: The items in file order
+    """
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            item = parse_batch_line(line, line_no)
+            if item is not None:
+                items.append(item)
+    return items
+
+
+def read_checkpoint(path: Union[str, Path]) -> Tuple[int, Set[int]]:
+    """
+    Read where a previous run stopped and which of its lines failed.
+
+    Args:
+        path: Path of the checkpoint file
+
+    Returns:
+        Tuple[int, Set[int]]: The first line number still to be processed, or 0 if
+        there is no checkpoint, and the line numbers that failed before it
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return int(data.get("next_line", 0)), {int(line) for line in data.get("failed", ())}
+    except (FileNotFoundError, ValueError, TypeError, AttributeError, json.JSONDecodeError):
+        return 0, set()
+
+
+class BatchExecutor:
+    """Runs batch items through a bounded pool of asyncio workers.
+
+    Items are processed concurrently but results are written strictly in
+    input order: a finished item waits in a reorder buffer until every item
+    before it has been written. The checkpoint records the next line to
+    process and every line that failed, so a resumed run retries failures.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[str], Awaitable[Any]],
+        concurrency: int = 4,
+        output: Optional[IO[str]] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize the batch executor.
+
+        Args:
+            process: Coroutine function that processes one command
+            concurrency: Maximum number of commands processed at once
+            output: Optional text stream receiving one JSON result per line
+            checkpoint_path: Optional file recording the next line to process
+        """
+        self.process = process
+        self.concurrency = max(1, concurrency)
+        self.output = output
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+
+    async def _run_item(self, item: BatchItem) -> BatchResult:
+        """Process one item, capturing any error."""
+        start = time.perf_counter()
+        try:
+            result = await self.process(item.command)
+            status, error = "ok", None
+        except Exception as e:
+            logger.error(f"Error processing batch line {item.line}: {str(e)}")
+            result, status, error = None, "error", str(e)
+        return BatchResult(
+            line=item.line,
+            command=item.command,
+            status=status,
+            result=result,
+            error=error,
+            duration=time.perf_counter() - start,
+            id=item.id,
+        )
+
+    def _emit(self, result: BatchResult, next_line: int, failed: Set[int]) -> None:
+        """Write a result and advance the checkpoint."""
+        if self.output is not None:
+            self.output.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
+            self.output.flush()
+        if self.checkpoint_path is not None:
+            with open(self.checkpoint_path, "w", encoding="utf-8") as f:
+                json.dump({"next_line": next_line, "failed": sorted(failed)}, f)
+
+    async def run(
+        self,
+        items: List[BatchItem],
+        start_line: int = 0,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+        retry_lines: Iterable[int] = (),
+    ) -> List[BatchResult]:
+        """
+        Process items and emit their results in input order.
+
+        Args:
+            items: The batch items
+            start_line: Skip items before this line number, e.g. from a checkpoint
+            on_result: Optional callback invoked with each result in input order
+            retry_lines: Lines before ``start_line`` to process again, e.g. earlier failures
+
+        Returns:
+            List[BatchResult]: The results in input order
+        """
+        # Failed lines stay in the checkpoint until a run processes them successfully
+        failed = set(retry_lines)
+        items = [item for item in items if item.line >= start_line or item.line in failed]
+        queue: "asyncio.Queue[int]" = asyncio.Queue()
+        for index in range(len(items)):
+            queue.put_nowait(index)
+
+        finished: Dict[int, BatchResult] = {}
+        results: List[BatchResult] = []
+        ready = asyncio.Condition()
+        # Bounds how far workers run ahead of the emitter while the head item is
+        # slow, so finished results waiting for their turn stay limited. Items
+        # are taken in order, so the head is always within the window.
+        window = asyncio.Semaphore(2 * self.concurrency)
+
+        async def worker() -> None:
+            while True:
+                await window.acquire()
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    window.release()
+                    return
+                result = await self._run_item(items[index])
+                async with ready:
+                    finished[index] = result
+                    ready.notify_all()
+
+        async def emitter() -> None:
+            for index in range(len(items)):
+                async with ready:
+                    await ready.wait_for(lambda: index in finished)
+                    result = finished.pop(index)
+                next_line = items[index + 1].line if index + 1 < len(items) else result.line + 1
+                if result.error is None:
+                    failed.discard(result.line)
+                else:
+                    failed.add(result.line)
+                self._emit(result, max(next_line, start_line), failed)
+                window.release()
+                if on_result is not None:
+                    on_result(result)
+                results.append(result)
+
+        workers = [
+            asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, len(items)))
+        ]
+        try:
+            await emitter()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return results
@@ -0,0 +1,611 @@
+"""
+Cache Service for sharing one memory budget between tool caches.
+
+---
+description: Process-wide tiered cache with namespaces and byte accounting
+endpoints: [cache_service, make_cache_key]
+inputs: [namespace, key, value, ttl]
+outputs: [cached_value, stats]
+dependencies: [threading, pickle, logging]
+auth: none
+alwaysApply: false
+---
+
+- Give each tool its own namespace with its own TTL
+- Account for every entry's size against one global byte budget
+- Evict least recently used entries, with TinyLFU admission to keep hot keys
+- Spill large values such as images and video to a disk tier
+- Report hits, misses, evictions and bytes per namespace and overall
+- Derive cache keys by hashing inputs in place, without copying large payloads
+"""
+
+import hashlib
+import itertools
+import logging
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+from labeeb.utils.platform_utils import get_labeeb_cache_dir
+
+logger = logging.getLogger(__name__)
+
+POLICY_LRU = "lru"
+POLICY_TINYLFU = "tinylfu"
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024**2
+DEFAULT_DISK_BUDGET = 1024**3
+DEFAULT_SPILL_THRESHOLD = 1024**2
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+# Bytes hashed per update call when deriving keys from large payloads
+KEY_HASH_CHUNK_SIZE = 1024**2
+
+
+def _hash_bytes(hasher: Any, tag: bytes, data: Any) -> None:
+    """Feed a length-prefixed bytes-like value to a hasher in chunks, without copying it."""
+    view = memoryview(data).cast("B")
+    hasher.update(tag + struct.pack(">Q", view.nbytes))
+    for start in range(0, view.nbytes, KEY_HASH_CHUNK_SIZE):
+        hasher.update(view[start : start + KEY_HASH_CHUNK_SIZE])
+
+
+def _hash_value(hasher: Any, value: Any) -> None:
+    """Feed a canonical, type-tagged encoding of a value to a hasher."""
+    if isinstance(value, _BYTES_TYPES):
+        _hash_bytes(hasher, b"b", value)
+    elif isinstance(value, str):
+        _hash_bytes(hasher, b"s", value.encode("utf-8", "surrogatepass"))
+    elif value is None or isinstance(value, (bool, int, float, complex)):
+        hasher.update(b"n" + repr(value).encode("ascii") + b";")
+    elif isinstance(value, dict):
+        hasher.update(b"d" + struct.pack(">Q", len(value)))
+        for key, item in sorted(value.items(), key=lambda kv: repr(kv[0])):
+            _hash_value(hasher, key)
+            _hash_value(hasher, item)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"l" + struct.pack(">Q", len(value)))
+        for item in value:
+            _hash_value(hasher, item)
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(b"e" + struct.pack(">Q", len(value)))
+        for item in sorted(value, key=repr):
+            _hash_value(hasher, item)
+    elif hasattr(value, "__array_interface__"):
+        # numpy arrays and matrices: hash the buffer, not str(array)
+        interface = value.__array_interface__
+        hasher.update(f"a{interface['typestr']}{interface['shape']};".encode("ascii"))
+        if interface["typestr"].endswith("O"):
+            # Object arrays hold pointers, so hash their elements instead
+            _hash_value(hasher, value.tolist())
+            return
+        try:
+            _hash_bytes(hasher, b"b", value)
+        except (TypeError, ValueError):
+            # Non-contiguous views have no flat buffer
+            _hash_bytes(hasher, b"b", value.tobytes())
+    else:
+        hasher.update(b"r")
+        _hash_bytes(hasher, b"s", repr(value).encode("utf-8", "surrogatepass"))
+
+
+def make_cache_key(*parts: Any, **params: Any) -> str:
+    """
+    Derive a cache key from operation inputs.
+
+    Bytes-like values, including numpy arrays, are hashed in place through
+    ``memoryview`` in chunks, so large images and videos are never copied or
+    converted to strings. Other values are hashed through a compact
+    type-tagged encoding, so equal inputs always give equal keys and inputs
+    of different types never collide.
+
+    Args:
+        *parts: Positional inputs, e.g. the payload and the operation name
+        **params: Keyword parameters, order-independent
+
+    Returns:
+        str: A 32-character hex key
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _hash_value(hasher, parts)
+    _hash_value(hasher, params)
+    return hasher.hexdigest()
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estimate the memory held by a value.
+
+    Bytes-like values and strings are measured exactly. Containers are
+    walked a few levels deep; anything deeper counts its shallow size.
+
+    Args:
+        value: The value to measure
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, _BYTES_TYPES):
+        return value.nbytes if isinstance(value, memoryview) else len(value)
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+class _FrequencySketch:
+    """Count-min sketch of recent key frequencies, aged by periodic halving."""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+        self.additions = 0
+        self.sample_size = width * 10
+
+    def _indexes(self, key: Hashable):
+        h = hash(key)
+        for row in range(self.depth):
+            yield row, hash((h, row)) % self.width
+
+    def increment(self, key: Hashable) -> None:
+        for row, index in self._indexes(key):
+            if self.rows[row][index] < 15:
+                self.rows[row][index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            for row in self.rows:
+                for index in range(self.width):
+                    row[index] >>= 1
+            self.additions //= 2
+
+    def estimate(self, key: Hashable) -> int:
+        return min(self.rows[row][index] for row, index in self._indexes(key))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: Optional[float]
+    spill_path: Optional[Path] = None
+
+
+@dataclass
+class _NamespaceStats:
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheNamespace:
+    """A view of the cache service scoped to one namespace.
+
+    It supports ``get``/``set``/``delete``/``clear``, ``in`` and ``len``,
+    so it can stand in for a tool's private cache dictionary.
+    """
+
+    def __init__(self, service: "CacheService", name: str, ttl: Optional[float] = None):
+        self.service = service
+        self.name = name
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or ``default`` if it is missing or expired."""
+        return self.service.get(self.name, key, default)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a value, using the namespace TTL unless one is given."""
+        return self.service.set(self.name, key, value, self.ttl if ttl is None else ttl)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a value."""
+        return self.service.delete(self.name, key)
+
+    def clear(self) -> None:
+        """Remove every value in the namespace."""
+        self.service.clear(self.name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the namespace statistics."""
+        return self.service.get_stats()["namespaces"].get(self.name, _NamespaceStats().to_dict())
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.service.contains(self.name, key)
+
+    def __len__(self) -> int:
+        return self.service.namespace_size(self.name)
+
+
+class CacheService:
+    """Process-wide cache shared by all tools.
+
+    Entries from every namespace share one byte budget and one recency
+    order. When the budget is exceeded the least recently used entries are
+    evicted. Under the TinyLFU policy a new entry is only admitted if it has
+    been requested more often recently than the entry it would evict, so a
+    burst of one-off values cannot flush frequently used ones.
+
+    Values at least ``spill_threshold`` bytes in size are written to disk
+    and only their file path is kept in memory.
+    """
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        policy: str = POLICY_TINYLFU,
+        spill_dir: Optional[Union[str, Path]] = None,
+        spill_threshold: Optional[int] = DEFAULT_SPILL_THRESHOLD,
+        disk_budget: int = DEFAULT_DISK_BUDGET,
+    ):
+        """
+        Initialize the cache service.
+
+        Args:
+            memory_budget: Maximum bytes held in memory across all namespaces
+            policy: ``"lru"`` or ``"tinylfu"``
+            spill_dir: Directory of the disk tier, defaults to the Labeeb cache directory
+            spill_threshold: Minimum value size written to disk, or None to disable spilling
+            disk_budget: Maximum bytes held in the disk tier
+        """
+        if policy not in (POLICY_LRU, POLICY_TINYLFU):
+            raise ValueError(f"Unknown cache policy: {policy}")
+        self.memory_budget = memory_budget
+        self.policy = policy
+        self.spill_threshold = spill_threshold
+        self.disk_budget = disk_budget
+        self._spill_dir = Path(spill_dir) if spill_dir else None
+        self._spill_ready = False
+        self._spill_counter = itertools.count()
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._namespaces: Dict[str, _NamespaceStats] = {}
+        self._sketch = _FrequencySketch()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.rejections = 0
+
+    @property
+    def spill_dir(self) -> Path:
+        """The disk tier directory, created and cleaned of stale files on first use."""
+        if self._spill_dir is None:
+            self._spill_dir = get_labeeb_cache_dir() / "spill"
+        if not self._spill_ready:
+            with self._lock:
+                if not self._spill_ready:
+                    self._spill_dir.mkdir(parents=True, exist_ok=True)
+                    self._remove_stale_spills()
+                    self._spill_ready = True
+        return self._spill_dir
+
+    def _remove_stale_spills(self) -> None:
+        """Delete spill files left behind by processes that are no longer running."""
+        import psutil
+
+        for path in self._spill_dir.iterdir():
+            owner = path.name.split("-", 1)[0]
+            if owner.isdigit() and int(owner) != os.getpid() and psutil.pid_exists(int(owner)):
+                continue
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.debug(f"Failed to remove stale spill file {path}: {e}")
+
+    def namespace(
+        self, name: str, ttl: Optional[float] = None, scope: Optional[Dict[str, Any]] = None
+    ) -> CacheNamespace:
+        """
+        Get a namespace view.
+
+        Args:
+            name: Namespace name in snake_case, usually the owning module, e.g. ``text_tool``
+            ttl: Default time to live in seconds for values set through the view
+            scope: Settings that change the cached values, e.g. a tool's units; views
+                with different settings get separate namespaces
+
+        Returns:
+            CacheNamespace: The namespace view
+        """
+        if scope:
+            name = f"{name}:{make_cache_key(scope)[:12]}"
+        with self._lock:
+            self._namespaces.setdefault(name, _NamespaceStats())
+        return CacheNamespace(self, name, ttl)
+
+    def _stats(self, namespace: str) -> _NamespaceStats:
+        return self._namespaces.setdefault(namespace, _NamespaceStats())
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value.
+
+        Args:
+            namespace: The namespace
+            key: The key within the namespace
+            default: Returned if the value is missing or expired
+
+        Returns:
+            Any: The cached value or ``default``
+        """
+        full_key = (namespace, key)
+        with self._lock:
+            self._sketch.increment(full_key)
+            stats = self._stats(namespace)
+            entry = self._entries.get(full_key)
+            if (
+                entry is not None
+                and entry.expires_at is not None
+                and time.monotonic() >= entry.expires_at
+            ):
+                self._remove(full_key)
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                stats.misses += 1
+                return default
+            self._entries.move_to_end(full_key)
+            stats.hits += 1
+            spill_path = entry.spill_path
+            value = entry.value
+
+        if spill_path is None:
+            return value
+        return self._read_spilled(full_key, spill_path, default)
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store a value.
+
+        Args:
+            namespace: The namespace
+            key: The key within the namespace
+            value: The value
+            ttl: Time to live in seconds, or None to keep until evicted
+
+        Returns:
+            bool: True if the value was stored, False if it was not admitted
+        """
+        full_key = (namespace, key)
+        size = estimate_size(value)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        spill_path = None
+        if self.spill_threshold is not None and size >= self.spill_threshold:
+            spill_path = self._write_spilled(value)
+
+        with self._lock:
+            if full_key in self._entries:
+                self._remove(full_key)
+            elif not self._admit(full_key, size if spill_path is None else 0):
+                self.rejections += 1
+                if spill_path is not None:
+                    spill_path.unlink(missing_ok=True)
+                return False
+
+            if spill_path is not None:
+                entry = _Entry(None, size, expires_at, spill_path)
+                self.disk_bytes += size
+            else:
+                entry = _Entry(value, size, expires_at)
+                self.memory_bytes += size
+            self._entries[full_key] = entry
+            stats = self._stats(namespace)
+            stats.entries += 1
+            stats.bytes += size
+            self._enforce_budgets()
+        return True
+
+    def _admit(self, full_key: Tuple[str, Hashable], memory_size: int) -> bool:
+        """Decide whether a new entry may displace existing ones."""
+        if memory_size > self.memory_budget:
+            return False
+        if self.policy != POLICY_TINYLFU or self.memory_bytes + memory_size <= self.memory_budget:
+            return True
+        victim = self._first_in_memory()
+        if victim is None:
+            return True
+        return self._sketch.estimate(full_key) >= self._sketch.estimate(victim)
+
+    def _first_in_memory(self) -> Optional[Tuple[str, Hashable]]:
+        for full_key, entry in self._entries.items():
+            if entry.spill_path is None:
+                return full_key
+        return None
+
+    def _enforce_budgets(self) -> None:
+        """Evict least recently used entries until both tiers fit their budgets."""
+        if self.memory_bytes <= self.memory_budget and self.disk_bytes <= self.disk_budget:
+            return
+        for full_key in list(self._entries):
+            if self.memory_bytes <= self.memory_budget and self.disk_bytes <= self.disk_budget:
+                break
+            entry = self._entries[full_key]
+            over_memory = entry.spill_path is None and self.memory_bytes > self.memory_budget
+            over_disk = entry.spill_path is not None and self.disk_bytes > self.disk_budget
+            if over_memory or over_disk:
+                self._remove(full_key)
+                self._stats(full_key[0]).evictions += 1
+
+    def _remove(self, full_key: Tuple[str, Hashable]) -> Optional[_Entry]:
+        entry = self._entries.pop(full_key, None)
+        if entry is None:
+            return None
+        stats = self._stats(full_key[0])
+        stats.entries -= 1
+        stats.bytes -= entry.size
+        if entry.spill_path is not None:
+            self.disk_bytes -= entry.size
+            try:
+                entry.spill_path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"Failed to remove spilled cache file: {e}")
+        else:
+            self.memory_bytes -= entry.size
+        return entry
+
+    def _spill_path(self) -> Path:
+        """A new spill file path, unique to this write and prefixed with the process ID."""
+        return self.spill_dir / f"{os.getpid()}-{next(self._spill_counter)}.bin"
+
+    def _write_spilled(self, value: Any) -> Optional[Path]:
+        """Write a large value to the disk tier."""
+        path = self._spill_path()
+        try:
+            with open(path, "wb") as f:
+                if isinstance(value, _BYTES_TYPES):
+                    f.write(b"B")
+                    f.write(value)
+                else:
+                    f.write(b"P")
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return path
+        except Exception as e:
+            logger.warning(f"Failed to spill cache value to disk, keeping it in memory: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _read_spilled(self, full_key: Tuple[str, Hashable], path: Path, default: Any) -> Any:
+        """Read a value back from the disk tier."""
+        try:
+            with open(path, "rb") as f:
+                kind = f.read(1)
+                if kind == b"B":
+                    return f.read()
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read spilled cache value: {e}")
+            with self._lock:
+                # The key may have been set again since the read started; only drop
+                # the entry if it still points at the file that failed
+                entry = self._entries.get(full_key)
+                if entry is not None and entry.spill_path == path:
+                    self._remove(full_key)
+            return default
+
+    def contains(self, namespace: str, key: Hashable) -> bool:
+        """Check whether an unexpired value is cached, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            return entry is not None and (
+                entry.expires_at is None or time.monotonic() < entry.expires_at
+            )
+
+    def delete(self, namespace: str, key: Hashable) -> bool:
+        """
+        Remove a value.
+
+        Args:
+            namespace: The namespace
+            key: The key within the namespace
+
+        Returns:
+            bool: True if a value was removed
+        """
+        with self._lock:
+            return self._remove((namespace, key)) is not None
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """
+        Remove every value in a namespace, or in all namespaces.
+
+        Args:
+            namespace: The namespace to clear, or None for everything
+        """
+        with self._lock:
+            for full_key in [k for k in self._entries if namespace is None or k[0] == namespace]:
+                self._remove(full_key)
+
+    def namespace_size(self, namespace: str) -> int:
+        """Get the number of entries in a namespace."""
+        with self._lock:
+            stats = self._namespaces.get(namespace)
+            return stats.entries if stats else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Overall totals and per-namespace statistics
+        """
+        with self._lock:
+            namespaces = {name: stats.to_dict() for name, stats in self._namespaces.items()}
+            hits = sum(s["hits"] for s in namespaces.values())
+            misses = sum(s["misses"] for s in namespaces.values())
+            return {
+                "policy": self.policy,
+                "entries": len(self._entries),
+                "memory_bytes": self.memory_bytes,
+                "memory_budget": self.memory_budget,
+                "disk_bytes": self.disk_bytes,
+                "disk_budget": self.disk_budget,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "evictions": sum(s["evictions"] for s in namespaces.values()),
+                "expirations": sum(s["expirations"] for s in namespaces.values()),
+                "rejections": self.rejections,
+                "namespaces": namespaces,
+            }
+
+
+_service: Optional[CacheService] = None
+_service_lock = threading.Lock()
+
+
+def get_cache_service() -> CacheService:
+    """Get the process-wide cache service."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = CacheService()
+    return _service
+
+
+def configure_cache_service(**kwargs: Any) -> CacheService:
+    """
+    Replace the process-wide cache service with a newly configured one.
+
+    Args:
+        **kwargs: Arguments for :class:`CacheService`
+
+    Returns:
+        CacheService: The new service
+    """
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.clear()
+        _service = CacheService(**kwargs)
+    return _service
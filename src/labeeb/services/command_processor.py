@@ -14,6 +14,7 @@ alwaysApply: false
 - Receive command from user
 - Check response cache for existing result
 - Process command using AI handler
+- Stream response tokens as they are generated
 - Extract and validate command
 - Store result in cache
 - Update interaction history
@@ -21,7 +22,7 @@ alwaysApply: false
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, Callable
 import asyncio
 
 from labeeb.services.ai_handler import AIHandler
@@ -30,30 +31,37 @@ from labeeb.services.ai_command_extractor import AICommandExtractor
 from labeeb.services.error_handler import ErrorHandler
 from labeeb.services.user_interaction_history import UserInteractionHistory
 from labeeb.services.ai_response_cache import AIResponseCache
+from labeeb.services.ai_response_store import PersistentResponseStore
 
 logger = logging.getLogger(__name__)
 
 class CommandProcessor:
     """Processes and executes user commands."""
     
-    def __init__(self, ai_handler: AIHandler):
+    def __init__(self, ai_handler: AIHandler, persistent_cache: bool = False):
         """Initialize the command processor.
         
         Args:
             ai_handler: The AI handler to use for processing commands
+            persistent_cache: Whether to back the response cache with an on-disk tier
         """
         self.ai_handler = ai_handler
         self.command_extractor = AICommandExtractor()
         self.error_handler = ErrorHandler()
         self.interaction_history = UserInteractionHistory()
-        self.response_cache = AIResponseCache()
+        self.response_cache = AIResponseCache(
+            persistent_store=PersistentResponseStore() if persistent_cache else None
+        )
         logger.info("Command processor initialized")
     
-    def process_command(self, command: str) -> str:
+    def process_command(
+        self, command: str, on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
         """Process a command synchronously.
         
         Args:
             command: The command to process
+            on_token: Optional callback invoked with each streamed response token
             
         Returns:
             The command result
@@ -70,16 +78,19 @@ class CommandProcessor:
                 asyncio.set_event_loop(loop)
             
             # Run the async command
-            return loop.run_until_complete(self.process_command_async(command))
+            return loop.run_until_complete(self.process_command_async(command, on_token))
         except Exception as e:
             logger.error(f"Error processing command: {str(e)}")
             raise CommandError(f"Failed to process command: {str(e)}")
     
-    async def process_command_async(self, command: str) -> str:
+    async def process_command_async(
+        self, command: str, on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
         """Process a command asynchronously.
         
         Args:
             command: The command to process
+            on_token: Optional callback invoked with each streamed response token
             
         Returns:
             The command result
@@ -87,9 +98,16 @@ class CommandProcessor:
         Raises:
             CommandError: If there's an error processing the command
         """
+        if on_token is not None:
+            parts = []
+            async for token in self.stream_command(command):
+                on_token(token)
+                parts.append(token)
+            return "".join(parts)
+
         try:
             # Check cache first
-            cached_result = self.response_cache.get(command)
+            cached_result = await self.response_cache.get_async(command)
             if cached_result:
                 return cached_result
 
@@ -114,3 +132,44 @@ class CommandProcessor:
             logger.error(f"Error processing command: {str(e)}")
             self.error_handler.handle_error(e)
             raise CommandError(f"Failed to process command: {str(e)}")
+
+    async def stream_command(self, command: str) -> AsyncIterator[str]:
+        """Process a command, yielding response tokens as they are generated.
+
+        A cached result is yielded whole. Otherwise tokens are yielded as soon
+        as the model produces them, and the complete response is validated,
+        cached and recorded once the stream ends.
+        
+        Args:
+            command: The command to process
+            
+        Yields:
+            Response tokens
+            
+        Raises:
+            CommandError: If there's an error processing the command
+        """
+        try:
+            cached_result = await self.response_cache.get_async(command)
+            if cached_result:
+                yield cached_result
+                return
+
+            parts = []
+            async for token in self.ai_handler.stream_prompt(command):
+                parts.append(token)
+                yield token
+            result = "".join(parts)
+
+            success, plan, metadata = self.command_extractor.extract_command(result)
+            if not success:
+                error_msg = metadata.get("error_message", "Unknown error")
+                logger.error(f"Command extraction failed: {error_msg}")
+                raise CommandError(f"Failed to extract command: {error_msg}")
+
+            self.response_cache.set(command, result)
+            self.interaction_history.add(command, result)
+        except Exception as e:
+            logger.error(f"Error streaming command: {str(e)}")
+            self.error_handler.handle_error(e)
+            raise CommandError(f"Failed to process command: {str(e)}")
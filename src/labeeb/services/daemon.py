@@ -0,0 +1,278 @@
+"""
+Daemon Service for serving Labeeb commands over a Unix domain socket.
+
+---
+description: Keeps Labeeb warm and serves newline-delimited JSON requests
+endpoints: [daemon]
+inputs: [command]
+outputs: [result, tokens]
+dependencies: [asyncio, json, logging]
+auth: local socket permissions
+alwaysApply: false
+---
+
+- Listen on a Unix domain socket readable only by the current user
+- Accept one JSON request per line and answer with one JSON object per line
+- Handle concurrent requests on a single event loop
+- Optionally stream response tokens before the final result
+- Provide a thin client that talks to a running daemon
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from labeeb.utils.platform_utils import get_labeeb_temp_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_NAME = "labeeb.sock"
+
+
+def get_default_socket_path() -> Path:
+    """Get the default daemon socket path."""
+    return get_labeeb_temp_dir() / DEFAULT_SOCKET_NAME
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Encode a message as one NDJSON line."""
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class LabeebDaemon:
+    """Serves commands from a warm Labeeb instance.
+
+    Requests are JSON objects, one per line::
+
+        {"id": 1, "command": "what is the weather in Kuwait", "stream": true}
+        {"id": 2, "op": "ping"}
+        {"id": 3, "op": "shutdown"}
+
+    Each request is answered with ``{"id", "status", "result"}`` or
+    ``{"id", "status": "error", "error"}``. Streaming requests first receive
+    ``{"id", "token"}`` lines. Requests on the same connection are processed
+    concurrently, so responses may arrive out of order and are matched by id.
+    """
+
+    def __init__(self, labeeb: Any, socket_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            labeeb: The initialized Labeeb instance whose command processor serves requests
+            socket_path: Path of the Unix socket, defaults to the Labeeb temp directory
+        """
+        self.labeeb = labeeb
+        self.socket_path = Path(socket_path or get_default_socket_path())
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._connections: set = set()
+        self.requests_served = 0
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a daemon that is no longer running."""
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            self.socket_path.unlink()
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A Labeeb daemon is already listening on {self.socket_path}")
+
+    async def start(self) -> None:
+        """Start listening on the socket."""
+        if not hasattr(asyncio, "start_unix_server"):
+            raise RuntimeError("Daemon mode requires Unix domain socket support")
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        self._stopped = asyncio.Event()
+
+        # Bind under a restrictive umask so other users can never connect, not
+        # even in the moment between bind and chmod
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            sock.bind(str(self.socket_path))
+        except BaseException:
+            sock.close()
+            raise
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+        self._server = await asyncio.start_unix_server(self._handle_connection, sock=sock)
+        logger.info(f"Labeeb daemon listening on {self.socket_path}")
+
+    async def serve_forever(self) -> None:
+        """Start the daemon and serve until a shutdown request arrives."""
+        await self.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop listening and release resources."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self.labeeb.cleanup()
+        logger.info("Labeeb daemon stopped")
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read requests from one client and dispatch each one concurrently."""
+        write_lock = asyncio.Lock()
+        pending = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+
+        async def send(message: Dict[str, Any]) -> None:
+            async with write_lock:
+                writer.write(_encode(message))
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._handle_request(line, send))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            logger.debug("Daemon client disconnected")
+        except asyncio.CancelledError:
+            logger.debug("Daemon connection closed on shutdown")
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _handle_request(
+        self, line: bytes, send: Callable[[Dict[str, Any]], Any]
+    ) -> None:
+        """Process one request line and send its response."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            op = request.get("op", "command")
+
+            if op == "ping":
+                await send({"id": request_id, "status": "ok", "result": "pong"})
+            elif op == "shutdown":
+                await send({"id": request_id, "status": "ok", "result": "shutting down"})
+                self._stopped.set()
+            elif op == "command":
+                command = request.get("command")
+                if not command:
+                    raise ValueError("Request has no command")
+                on_token = None
+                token_sends = []
+                if request.get("stream"):
+                    on_token = lambda token: token_sends.append(
+                        asyncio.ensure_future(send({"id": request_id, "token": token}))
+                    )
+                result = await self.labeeb.command_processor.process_command_async(
+                    command, on_token
+                )
+                # Tokens must reach the client before the final result
+                await asyncio.gather(*token_sends)
+                self.requests_served += 1
+                await send({"id": request_id, "status": "ok", "result": result})
+            else:
+                raise ValueError(f"Unknown op: {op}")
+        except Exception as e:
+            logger.error(f"Error handling daemon request: {str(e)}")
+            await send({"id": request_id, "status": "error", "error": str(e)})
+
+
+async def send_request(
+    request: Dict[str, Any],
+    socket_path: Optional[Union[str, Path]] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Send one request to a running daemon and wait for its result.
+
+    Args:
+        request: The request object
+        socket_path: Path of the daemon socket
+        on_token: Optional callback for streamed tokens
+
+    Returns:
+        Dict[str, Any]: The final response object
+
+    Raises:
+        ConnectionError: If no daemon is listening on the socket
+    """
+    path = str(socket_path or get_default_socket_path())
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ConnectionError(f"No Labeeb daemon is listening on {path}") from e
+
+    try:
+        request = dict(request)
+        request.setdefault("id", 1)
+        if on_token is not None:
+            request["stream"] = True
+        writer.write(_encode(request))
+        await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Daemon closed the connection")
+            message = json.loads(line)
+            if "token" in message:
+                if on_token is not None:
+                    on_token(message["token"])
+                continue
+            return message
+    finally:
+        writer.close()
+
+
+def run_client_command(
+    command: str,
+    socket_path: Optional[Union[str, Path]] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Run a command on a running daemon.
+
+    Args:
+        command: The command to run
+        socket_path: Path of the daemon socket
+        on_token: Optional callback for streamed tokens
+
+    Returns:
+        str: The command result
+
+    Raises:
+        RuntimeError: If the daemon reports an error
+    """
+    response = asyncio.run(send_request({"command": command}, socket_path, on_token))
+    if response.get("status") != "ok":
+        raise RuntimeError(response.get("error", "Unknown daemon error"))
+    return response["result"]
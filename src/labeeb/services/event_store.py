@@ -0,0 +1,470 @@
+"""
+Event Store Service for indexed calendar range queries.
+
+---
+description: Calendar events with parsed times, an interval tree and lazily expanded recurrences
+endpoints: [event_store]
+inputs: [event, start_time, end_time, recurrence, db_path]
+outputs: [events, occurrences]
+dependencies: [sqlite3, json, bisect]
+auth: none
+alwaysApply: false
+---
+
+- Parse each event's start and end once, when it is added
+- Keep recurring events as rules (daily, weekly, monthly, yearly) instead of stored instances
+- Answer range queries from a centered interval tree over events and recurring series
+- Expand a series only within the queried window, jumping straight to its first occurrence there
+- Optionally persist events to SQLite
+"""
+
+import bisect
+import calendar
+import json
+import logging
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Suffix joining a series ID and an occurrence number, e.g. event_1_recur_3
+OCCURRENCE_SEPARATOR = "_recur_"
+# Occurrences of an endless series listed by a search without an end time
+OPEN_ENDED_OCCURRENCES = 52
+
+# Step of each frequency: a fixed timedelta, or a number of calendar months
+_FIXED_STEPS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+_MONTH_STEPS = {"monthly": 1, "yearly": 12}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+Event = Dict[str, Any]
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    """Add calendar months, clamping the day to the length of the target month."""
+    month_index = moment.year * 12 + moment.month - 1 + months
+    year, month = divmod(month_index, 12)
+    day = min(moment.day, calendar.monthrange(year, month + 1)[1])
+    return moment.replace(year=year, month=month + 1, day=day)
+
+
+@dataclass
+class RecurrenceRule:
+    """A repeating schedule: every ``interval`` steps of ``frequency``.
+
+    The series ends after ``count`` occurrences, at ``until``, or never.
+    Occurrence numbers in ``exclude`` are skipped.
+    """
+
+    frequency: str = "weekly"
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    exclude: Set[int] = field(default_factory=set)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RecurrenceRule":
+        """
+        Build a rule from an event's ``recurrence`` field.
+
+        Args:
+            data: ``frequency``, ``interval``, ``count``, ``until`` (ISO) and ``exclude``
+
+        Returns:
+            RecurrenceRule: The parsed rule
+
+        Raises:
+            ValueError: If the frequency, interval or count is invalid
+        """
+        frequency = data.get("frequency", "weekly")
+        if frequency not in _FIXED_STEPS and frequency not in _MONTH_STEPS:
+            raise ValueError(f"Unsupported recurrence frequency: {frequency}")
+        interval = int(data.get("interval", 1))
+        count = data.get("count")
+        if interval < 1 or (count is not None and int(count) < 1):
+            raise ValueError("Recurrence interval and count must be positive")
+        until = data.get("until")
+        return cls(
+            frequency=frequency,
+            interval=interval,
+            count=None if count is None else int(count),
+            until=datetime.fromisoformat(until) if until else None,
+            exclude=set(data.get("exclude", ())),
+        )
+
+    def occurrence(self, start: datetime, number: int) -> datetime:
+        """Start of occurrence ``number``, counting the first as 0."""
+        if self.frequency in _FIXED_STEPS:
+            return start + _FIXED_STEPS[self.frequency] * (self.interval * number)
+        return _add_months(start, _MONTH_STEPS[self.frequency] * self.interval * number)
+
+    def first_number_after(self, start: datetime, moment: datetime) -> int:
+        """A lower bound on the first occurrence number that starts at or after ``moment``."""
+        if moment <= start:
+            return 0
+        if self.frequency in _FIXED_STEPS:
+            step = _FIXED_STEPS[self.frequency] * self.interval
+            return max(0, math.floor((moment - start) / step))
+        months = (moment.year - start.year) * 12 + moment.month - start.month
+        # Clamped days can put an occurrence a month early, so step back one
+        return max(0, months // (_MONTH_STEPS[self.frequency] * self.interval) - 1)
+
+    def last_number(self, start: datetime) -> Optional[int]:
+        """The last occurrence number, or None if the series never ends."""
+        last = None if self.count is None else self.count - 1
+        if self.until is not None:
+            number = self.first_number_after(start, self.until)
+            while self.occurrence(start, number + 1) <= self.until:
+                number += 1
+            while number > 0 and self.occurrence(start, number) > self.until:
+                number -= 1
+            last = number if last is None else min(last, number)
+        return last
+
+
+@dataclass
+class _Entry:
+    """A stored event with its parsed times."""
+
+    event: Event
+    start: datetime
+    end: datetime
+    rule: Optional[RecurrenceRule] = None
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+    @property
+    def span(self) -> Tuple[float, float]:
+        """Time covered by the event or, for a series, from its first to its last occurrence."""
+        if self.rule is None:
+            return self.start.timestamp(), self.end.timestamp()
+        last = self.rule.last_number(self.start)
+        if last is None:
+            return self.start.timestamp(), math.inf
+        return (
+            self.start.timestamp(),
+            (self.rule.occurrence(self.start, last) + self.duration).timestamp(),
+        )
+
+
+class _Node:
+    """A node of a centered interval tree."""
+
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[float, float, str]]):
+        points = sorted(point for low, high, _ in intervals for point in (low, high))
+        self.center = points[len(points) // 2]
+        left = [item for item in intervals if item[1] < self.center]
+        right = [item for item in intervals if item[0] > self.center]
+        here = [item for item in intervals if item[0] <= self.center <= item[1]]
+        self.by_start = sorted(here)
+        self.starts = [item[0] for item in self.by_start]
+        self.by_end = sorted(here, key=lambda item: -item[1])
+        self.ends = [-item[1] for item in self.by_end]
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+def _overlapping(node: Optional[_Node], low: float, high: float, found: List[str]) -> None:
+    """Collect the keys of intervals that overlap [low, high]."""
+    while node is not None:
+        if high < node.center:
+            # Everything here ends after the window; keep what starts in time
+            found.extend(
+                item[2] for item in node.by_start[: bisect.bisect_right(node.starts, high)]
+            )
+            node = node.left
+        elif low > node.center:
+            # Everything here starts before the window; keep what ends in time
+            found.extend(item[2] for item in node.by_end[: bisect.bisect_right(node.ends, -low)])
+            node = node.right
+        else:
+            found.extend(item[2] for item in node.by_start)
+            _overlapping(node.left, low, high, found)
+            node = node.right
+
+
+class EventStore:
+    """Calendar events indexed for range queries, optionally persisted to SQLite.
+
+    Recurring events are stored once, as rules. Occurrence ``n`` of series
+    ``id`` is reported with the ID ``{id}_recur_{n}``; occurrence 0 is the
+    series event itself.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the event store.
+
+        Args:
+            db_path: SQLite database to persist events in, None to keep them in memory only
+        """
+        self._entries: Dict[str, _Entry] = {}
+        self._tree: Optional[_Node] = None
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            if str(db_path) != ":memory:":
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            for event_id, data in self._conn.execute("SELECT id, data FROM events"):
+                try:
+                    self._entries[event_id] = self._parse(json.loads(data))
+                except ValueError as e:
+                    logger.error(f"Skipping stored event {event_id}: {e}")
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, event_id: str) -> bool:
+        return self.get(event_id) is not None
+
+    @staticmethod
+    def _parse(event: Event) -> _Entry:
+        start = datetime.fromisoformat(event["start_time"])
+        end = datetime.fromisoformat(event["end_time"])
+        recurrence = event.get("recurrence")
+        rule = RecurrenceRule.from_dict(recurrence) if recurrence else None
+        return _Entry(event, start, end, rule)
+
+    def _save(self, event_id: str) -> None:
+        if self._conn is None:
+            return
+        entry = self._entries.get(event_id)
+        with self._conn:
+            if entry is None:
+                self._conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO events (id, data) VALUES (?, ?)",
+                    (event_id, json.dumps(entry.event)),
+                )
+
+    def _index(self) -> Optional[_Node]:
+        """The interval tree, rebuilt on the first query after a change."""
+        if self._dirty:
+            spans = [(*entry.span, event_id) for event_id, entry in self._entries.items()]
+            self._tree = _Node(spans) if spans else None
+            self._dirty = False
+        return self._tree
+
+    def add(self, event: Event) -> None:
+        """
+        Add an event, or replace the event with the same ID.
+
+        Args:
+            event: Event with ``id``, ISO ``start_time`` and ``end_time``, and an
+                optional ``recurrence`` rule
+
+        Raises:
+            ValueError: If a time or the recurrence rule is invalid
+        """
+        entry = self._parse(event)
+        with self._lock:
+            self._entries[event["id"]] = entry
+            self._dirty = True
+            self._save(event["id"])
+
+    def remove(self, event_id: str) -> Optional[Event]:
+        """
+        Remove an event, a whole series, or one occurrence of a series.
+
+        Args:
+            event_id: Event, series or occurrence ID
+
+        Returns:
+            Optional[Event]: The removed event or occurrence, None if not found
+        """
+        with self._lock:
+            entry = self._entries.pop(event_id, None)
+            if entry is not None:
+                self._dirty = True
+                self._save(event_id)
+                return entry.event
+            occurrence = self.get(event_id)
+            if occurrence is None:
+                return None
+            series_id, number = self._split_id(event_id)
+            series = self._entries[series_id]
+            exclude = sorted(series.rule.exclude | {number})
+            series.event["recurrence"] = {**series.event["recurrence"], "exclude": exclude}
+            series.rule.exclude.add(number)
+            self._save(series_id)
+            return occurrence
+
+    def detach(self, occurrence_id: str) -> Optional[Event]:
+        """
+        Turn one occurrence of a series into a standalone event with the same ID.
+
+        Args:
+            occurrence_id: Occurrence ID
+
+        Returns:
+            Optional[Event]: The standalone event, None if there is no such occurrence
+        """
+        with self._lock:
+            if occurrence_id in self._entries:
+                return self._entries[occurrence_id].event
+            occurrence = self.remove(occurrence_id)
+            if occurrence is not None:
+                self.add(occurrence)
+            return occurrence
+
+    def clear(self) -> None:
+        """Remove every event."""
+        with self._lock:
+            self._entries.clear()
+            self._tree = None
+            self._dirty = False
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM events")
+
+    @staticmethod
+    def _split_id(event_id: str) -> Tuple[str, int]:
+        series_id, _, number = event_id.rpartition(OCCURRENCE_SEPARATOR)
+        return series_id, int(number) if number.isdigit() else -1
+
+    def _occurrence(self, series_id: str, entry: _Entry, number: int) -> Event:
+        if number == 0:
+            return entry.event
+        start = entry.rule.occurrence(entry.start, number)
+        event = dict(entry.event)
+        event.update(
+            {
+                "id": f"{series_id}{OCCURRENCE_SEPARATOR}{number}",
+                "start_time": start.isoformat(),
+                "end_time": (start + entry.duration).isoformat(),
+                "recurrence": None,
+            }
+        )
+        return event
+
+    def get(self, event_id: str) -> Optional[Event]:
+        """
+        Get an event, series or occurrence by ID.
+
+        Args:
+            event_id: Event, series or occurrence ID
+
+        Returns:
+            Optional[Event]: The event, None if not found
+        """
+        with self._lock:
+            entry = self._entries.get(event_id)
+            if entry is not None:
+                return entry.event
+            if OCCURRENCE_SEPARATOR not in event_id:
+                return None
+            series_id, number = self._split_id(event_id)
+            entry = self._entries.get(series_id)
+            if entry is None or entry.rule is None or number < 1 or number in entry.rule.exclude:
+                return None
+            last = entry.rule.last_number(entry.start)
+            if last is not None and number > last:
+                return None
+            return self._occurrence(series_id, entry, number)
+
+    def events(self, predicate: Optional[Callable[[Event], bool]] = None) -> List[Event]:
+        """
+        List stored events and series, without expanding recurrences.
+
+        Args:
+            predicate: Keep only events it accepts
+
+        Returns:
+            List[Event]: Events ordered by start time
+        """
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry.start.timestamp())
+            return [e.event for e in entries if predicate is None or predicate(e.event)]
+
+    def _expand(
+        self, series_id: str, entry: _Entry, start: datetime, end: Optional[datetime]
+    ) -> Iterator[Tuple[datetime, Event]]:
+        """Yield the occurrences of a series that overlap [start, end]."""
+        rule = entry.rule
+        last = rule.last_number(entry.start)
+        number = rule.first_number_after(entry.start, start - entry.duration)
+        while last is None or number <= last:
+            occurrence_start = rule.occurrence(entry.start, number)
+            if end is not None and occurrence_start > end:
+                return
+            if occurrence_start + entry.duration >= start and number not in rule.exclude:
+                yield occurrence_start, self._occurrence(series_id, entry, number)
+            number += 1
+
+    def between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        predicate: Optional[Callable[[Event], bool]] = None,
+    ) -> List[Event]:
+        """
+        Find events and occurrences that overlap a time range.
+
+        Series are expanded only within the range, so the cost depends on the
+        number of events found, not on how many occurrences a series has.
+
+        Args:
+            start: Range start, None for unbounded
+            end: Range end, None for unbounded; a series that never ends then
+                contributes its next OPEN_ENDED_OCCURRENCES occurrences
+            predicate: Keep only events (or series) it accepts
+
+        Returns:
+            List[Event]: Matching events and occurrences ordered by start time
+        """
+        if start is None and end is None:
+            return self.events(predicate)
+        low = -math.inf if start is None else start.timestamp()
+        high = math.inf if end is None else end.timestamp()
+        with self._lock:
+            found: List[str] = []
+            _overlapping(self._index(), low, high, found)
+            matches: List[Tuple[float, Event]] = []
+            for event_id in found:
+                entry = self._entries[event_id]
+                if predicate is not None and not predicate(entry.event):
+                    continue
+                if entry.rule is None:
+                    matches.append((entry.start.timestamp(), entry.event))
+                    continue
+                window_start = entry.start if start is None else start
+                window_end = end
+                if window_end is None and entry.rule.last_number(entry.start) is None:
+                    first = entry.rule.first_number_after(entry.start, window_start)
+                    while entry.rule.occurrence(entry.start, first) < window_start:
+                        first += 1
+                    window_end = entry.rule.occurrence(
+                        entry.start, first + OPEN_ENDED_OCCURRENCES - 1
+                    )
+                for occurrence_start, event in self._expand(
+                    event_id, entry, window_start, window_end
+                ):
+                    matches.append((occurrence_start.timestamp(), event))
+        matches.sort(key=lambda match: match[0])
+        return [event for _, event in matches]
+
+    def close(self) -> None:
+        """Close the SQLite connection, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,301 @@
+"""
+File Hash Service for hashing files off the event loop.
+
+---
+description: Concurrent file hashing with mmap reads and a digest cache
+endpoints: [file_hash_service]
+inputs: [path, algorithm]
+outputs: [digest, duplicate_groups]
+dependencies: [hashlib, mmap, concurrent.futures, cache_service]
+auth: none
+alwaysApply: false
+---
+
+- Hash large files through mmap and small ones with large buffered reads
+- Run hashing on a thread pool; hashlib releases the GIL, so files hash in parallel
+- Cache digests by (device, inode, size, mtime_ns) so unchanged files are never re-read
+- Find duplicate files by size, then a partial hash, then a full hash
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from labeeb.services.cache_service import CacheNamespace, get_cache_service
+
+logger = logging.getLogger(__name__)
+
+# Bytes fed to the hash per update; large enough for hashlib to release the GIL
+READ_SIZE = 1024**2
+# Files at least this large are mapped instead of read
+MMAP_THRESHOLD = 4 * READ_SIZE
+# Bytes hashed from the start of each candidate when pruning duplicates
+PARTIAL_SIZE = 64 * 1024
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _file_key(st: os.stat_result, algorithm: str, partial: bool = False) -> Tuple:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm, partial)
+
+
+def _digest_file(path: PathLike, algorithm: str, size: int, limit: Optional[int] = None) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        path: File to hash
+        algorithm: hashlib algorithm name
+        size: File size from a recent stat
+        limit: Only hash this many leading bytes
+
+    Returns:
+        str: Hex digest
+    """
+    hasher = hashlib.new(algorithm)
+    length = size if limit is None else min(size, limit)
+    with open(path, "rb", buffering=0) as f:
+        if length >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, length, READ_SIZE):
+                        hasher.update(view[start : min(start + READ_SIZE, length)])
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(min(READ_SIZE, max(length, 1)))
+            view = memoryview(buffer)
+            remaining = length
+            while remaining > 0:
+                read = f.readinto(view[: min(len(buffer), remaining)])
+                if not read:
+                    break
+                hasher.update(view[:read])
+                remaining -= read
+    if algorithm.startswith("shake_"):
+        return hasher.hexdigest(32)
+    return hasher.hexdigest()
+
+
+class FileHasher:
+    """Hashes files on a thread pool, reusing digests of unchanged files."""
+
+    def __init__(self, workers: Optional[int] = None, cache: Optional[CacheNamespace] = None):
+        """
+        Initialize the file hasher.
+
+        Args:
+            workers: Number of hashing threads, defaults to the CPU count
+            cache: Digest cache, defaults to the ``file_hash`` namespace of the shared cache
+        """
+        self.workers = workers or min(32, os.cpu_count() or 4)
+        self.cache = cache if cache is not None else get_cache_service().namespace("file_hash")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The hashing thread pool, created on first use."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="file-hash"
+                    )
+        return self._executor
+
+    def hash_file(self, path: PathLike, algorithm: str = "sha256", partial: bool = False) -> str:
+        """
+        Hash a file, or return the cached digest if it has not changed.
+
+        Args:
+            path: File to hash
+            algorithm: hashlib algorithm name
+            partial: Only hash the first PARTIAL_SIZE bytes
+
+        Returns:
+            str: Hex digest
+
+        Raises:
+            ValueError: If the algorithm is not available
+            OSError: If the file cannot be read
+        """
+        if algorithm not in hashlib.algorithms_available:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        st = os.stat(path)
+        key = _file_key(st, algorithm, partial)
+        digest = self.cache.get(key)
+        if digest is not None:
+            return digest
+
+        digest = _digest_file(path, algorithm, st.st_size, PARTIAL_SIZE if partial else None)
+
+        # Only remember the digest if the file did not change while it was read
+        after = os.stat(path)
+        if _file_key(after, algorithm, partial) == key:
+            self.cache.set(key, digest)
+        return digest
+
+    async def hash_file_async(
+        self, path: PathLike, algorithm: str = "sha256", partial: bool = False
+    ) -> str:
+        """
+        Hash a file on the thread pool.
+
+        Args:
+            path: File to hash
+            algorithm: hashlib algorithm name
+            partial: Only hash the first PARTIAL_SIZE bytes
+
+        Returns:
+            str: Hex digest
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.hash_file, path, algorithm, partial)
+
+    def hash_files(
+        self, paths: Iterable[PathLike], algorithm: str = "sha256", partial: bool = False
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Hash several files concurrently.
+
+        Args:
+            paths: Files to hash
+            algorithm: hashlib algorithm name
+            partial: Only hash the first PARTIAL_SIZE bytes of each file
+
+        Returns:
+            Dict[str, Union[str, Exception]]: Each path mapped to its digest, or the error hashing it
+        """
+        paths = [os.fspath(p) for p in paths]
+        futures = [self.executor.submit(self.hash_file, p, algorithm, partial) for p in paths]
+        results: Dict[str, Union[str, Exception]] = {}
+        for path, future in zip(paths, futures):
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                results[path] = e
+        return results
+
+    async def hash_files_async(
+        self, paths: Iterable[PathLike], algorithm: str = "sha256"
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Hash several files concurrently without blocking the event loop.
+
+        Args:
+            paths: Files to hash
+            algorithm: hashlib algorithm name
+
+        Returns:
+            Dict[str, Union[str, Exception]]: Each path mapped to its digest, or the error hashing it
+        """
+        paths = [os.fspath(p) for p in paths]
+        results = await asyncio.gather(
+            *(self.hash_file_async(p, algorithm) for p in paths), return_exceptions=True
+        )
+        return dict(zip(paths, results))
+
+    def find_duplicates(
+        self,
+        root: PathLike,
+        algorithm: str = "sha256",
+        min_size: int = 1,
+        include_hidden: bool = False,
+    ) -> List[List[str]]:
+        """
+        Find files with identical contents below a directory.
+
+        Files are grouped by size first, so most files are never read.
+        Same-size files are then compared by a hash of their first bytes,
+        and only the remaining candidates are hashed in full.
+
+        Args:
+            root: Directory to search
+            algorithm: hashlib algorithm name
+            min_size: Ignore files smaller than this many bytes
+            include_hidden: Whether to include hidden files and directories
+
+        Returns:
+            List[List[str]]: Groups of paths with identical contents, largest files first
+        """
+        by_size: Dict[int, List[str]] = defaultdict(list)
+        seen_inodes = set()
+        for entry in _walk_files(os.fspath(root), include_hidden):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            # Hard links share contents but are not copies
+            if st.st_size < min_size or (st.st_dev, st.st_ino) in seen_inodes:
+                continue
+            seen_inodes.add((st.st_dev, st.st_ino))
+            by_size[st.st_size].append(entry.path)
+
+        candidates = [paths for paths in by_size.values() if len(paths) > 1]
+        for partial in (True, False):
+            to_hash = [p for paths in candidates for p in paths]
+            digests = self.hash_files(to_hash, algorithm, partial=partial)
+            grouped = []
+            for paths in candidates:
+                by_digest: Dict[str, List[str]] = defaultdict(list)
+                for path in paths:
+                    digest = digests.get(path)
+                    if isinstance(digest, str):
+                        by_digest[digest].append(path)
+                grouped += [group for group in by_digest.values() if len(group) > 1]
+            candidates = grouped
+
+        return sorted(
+            (sorted(group) for group in candidates),
+            key=lambda group: (-os.path.getsize(group[0]), group[0]),
+        )
+
+    def shutdown(self) -> None:
+        """Stop the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _walk_files(root: str, include_hidden: bool) -> Iterator[os.DirEntry]:
+    """Yield regular files below a directory, without following symlinks."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if not include_hidden and entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Cannot scan directory: {e}")
+
+
+_hasher: Optional[FileHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_file_hasher() -> FileHasher:
+    """Get the process-wide file hasher."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = FileHasher()
+    return _hasher
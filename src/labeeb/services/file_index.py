@@ -0,0 +1,624 @@
+"""
+File Index Service for fast repeated file searches.
+
+---
+description: Persistent SQLite index of file names, kept current from filesystem events
+endpoints: [file_index]
+inputs: [root, term, glob, ext, size, mtime]
+outputs: [FileRecord]
+dependencies: [sqlite3, concurrent.futures, watchdog (optional)]
+auth: none
+alwaysApply: false
+---
+
+- Crawl directory trees with os.scandir on a thread pool
+- Store paths in SQLite with an FTS5 trigram index on names for substring search
+- Keep the index current from watchdog (inotify) events, or by polling directory mtimes
+- Query by substring, glob, extension, size and modification time
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from labeeb.utils.platform_utils import get_labeeb_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Directory names that are never indexed
+DEFAULT_EXCLUDES = frozenset({"__pycache__", "node_modules", ".Trash", ".git"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    hidden INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_parent ON files(parent);
+CREATE INDEX IF NOT EXISTS files_ext ON files(ext);
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    name, content='files', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO files (path, parent, name, ext, is_dir, size, mtime, hidden)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    is_dir = excluded.is_dir, size = excluded.size, mtime = excluded.mtime
+"""
+
+# Matches shorter than this cannot use the trigram index
+_TRIGRAM = 3
+
+Row = Tuple[str, str, str, str, int, int, float, int]
+
+
+@dataclass
+class FileRecord:
+    """An indexed file or directory."""
+
+    path: str
+    name: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a dictionary."""
+        return asdict(self)
+
+
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """Get the half-open string range holding every path below a directory."""
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FileIndex:
+    """Persistent index of file names under one or more root directories.
+
+    Roots are crawled the first time they are searched and then kept
+    current, so repeated searches are answered from SQLite without touching
+    the filesystem. Hidden directories are recorded but not descended into
+    unless ``index_hidden`` is set.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        index_hidden: bool = False,
+        excludes: Iterable[str] = DEFAULT_EXCLUDES,
+        workers: int = 8,
+        poll_interval: float = 30.0,
+        watch: bool = True,
+    ):
+        """
+        Initialize the file index.
+
+        Args:
+            db_path: SQLite database path, defaults to the Labeeb cache directory
+            index_hidden: Whether to descend into hidden directories
+            excludes: Directory names that are skipped entirely
+            workers: Number of threads used to crawl
+            poll_interval: Seconds between polls when filesystem events are unavailable
+            watch: Whether to keep indexed roots current in the background
+        """
+        if db_path is None:
+            db_path = get_labeeb_cache_dir() / "file_index.db"
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self.index_hidden = index_hidden
+        self.excludes = frozenset(excludes)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.watch = watch
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite older than 3.34 has no trigram tokenizer; fall back to LIKE scans
+            logger.info(f"FTS5 trigram index unavailable, using plain scans: {e}")
+            self.has_fts = False
+        self._conn.commit()
+
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._dirty_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._observer: Any = None
+        self._watched: Set[str] = set()
+
+    # ------------------------------------------------------------------
+    # Crawling
+
+    def _is_hidden_name(self, name: str) -> bool:
+        return name.startswith(".")
+
+    def _row(self, path: str, parent: str, name: str, is_dir: bool, st: os.stat_result, hidden: bool) -> Row:
+        ext = "" if is_dir else os.path.splitext(name)[1][1:].lower()
+        return (path, parent, name, ext, int(is_dir), 0 if is_dir else st.st_size, st.st_mtime, int(hidden))
+
+    def _scan_dir(self, directory: str, hidden: bool) -> Tuple[List[Row], List[Tuple[str, bool]]]:
+        """List one directory, using the stat data cached on each DirEntry.
+
+        Returns:
+            Tuple[List[Row], List[Tuple[str, bool]]]: The entries and the subdirectories to descend into
+        """
+        rows: List[Row] = []
+        subdirs: List[Tuple[str, bool]] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and name in self.excludes:
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entry_hidden = hidden or self._is_hidden_name(name)
+                    rows.append(self._row(entry.path, directory, name, is_dir, st, entry_hidden))
+                    if is_dir and (self.index_hidden or not entry_hidden):
+                        subdirs.append((entry.path, entry_hidden))
+        except OSError as e:
+            logger.debug(f"Cannot scan {directory}: {e}")
+        return rows, subdirs
+
+    def _write_rows(self, rows: List[Row]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.commit()
+
+    def _crawl(self, directory: str, hidden: bool = False) -> int:
+        """Index a directory tree, scanning directories in parallel.
+
+        Returns:
+            int: Number of entries written
+        """
+        written = 0
+        batch: List[Row] = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="file-index") as pool:
+            pending = {pool.submit(self._scan_dir, directory, hidden)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rows, subdirs = future.result()
+                    batch.extend(rows)
+                    for subdir, subdir_hidden in subdirs:
+                        pending.add(pool.submit(self._scan_dir, subdir, subdir_hidden))
+                if len(batch) >= 5000:
+                    self._write_rows(batch)
+                    written += len(batch)
+                    batch = []
+        self._write_rows(batch)
+        return written + len(batch)
+
+    def _covering_root(self, path: str) -> Optional[str]:
+        with self._lock:
+            for (root,) in self._conn.execute("SELECT path FROM roots"):
+                if path == root or path.startswith(_subtree_bounds(root)[0]):
+                    return root
+        return None
+
+    def index_root(self, root: Union[str, Path], force: bool = False) -> str:
+        """
+        Make sure a directory tree is indexed.
+
+        Args:
+            root: Directory to index
+            force: Crawl again even if the tree is already indexed
+
+        Returns:
+            str: The normalized root path
+        """
+        root = os.path.abspath(os.path.expanduser(str(root)))
+        if not force and self._covering_root(root):
+            self._ensure_watching()
+            return root
+
+        start = time.perf_counter()
+        st = os.stat(root)
+        count = self._crawl(root)
+        low, high = _subtree_bounds(root)
+        with self._lock:
+            # A new root replaces any roots nested inside it
+            self._conn.execute("DELETE FROM roots WHERE path >= ? AND path < ?", (low, high))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO roots (path, mtime, indexed_at) VALUES (?, ?, ?)",
+                (root, st.st_mtime, time.time()),
+            )
+            self._conn.commit()
+        logger.info(f"Indexed {count} entries under {root} in {time.perf_counter() - start:.2f}s")
+        self._ensure_watching()
+        return root
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+
+    def _delete_subtree(self, path: str) -> None:
+        low, high = _subtree_bounds(path)
+        self._conn.execute("DELETE FROM files WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+
+    def rescan_directory(self, directory: str) -> None:
+        """
+        Bring one directory's direct children up to date.
+
+        Removed entries are dropped with their subtrees and new
+        subdirectories are crawled.
+
+        Args:
+            directory: The directory to rescan
+        """
+        directory = os.path.abspath(directory)
+        with self._lock:
+            parent_row = self._conn.execute(
+                "SELECT hidden FROM files WHERE path = ?", (directory,)
+            ).fetchone()
+        hidden = bool(parent_row[0]) if parent_row else False
+
+        if not os.path.isdir(directory):
+            with self._lock:
+                self._delete_subtree(directory)
+                self._conn.commit()
+            return
+
+        rows, subdirs = self._scan_dir(directory, hidden)
+        with self._lock:
+            known = {
+                path: is_dir
+                for path, is_dir in self._conn.execute(
+                    "SELECT path, is_dir FROM files WHERE parent = ?", (directory,)
+                )
+            }
+            current = {row[0] for row in rows}
+            for path in known.keys() - current:
+                self._delete_subtree(path)
+            self._conn.executemany(_UPSERT, rows)
+            table = "files" if parent_row else "roots"
+            self._conn.execute(
+                f"UPDATE {table} SET mtime = ? WHERE path = ?", (os.stat(directory).st_mtime, directory)
+            )
+            self._conn.commit()
+
+        for subdir, subdir_hidden in subdirs:
+            if subdir not in known:
+                self._crawl(subdir, subdir_hidden)
+
+    def refresh(self) -> int:
+        """
+        Rescan every indexed directory whose modification time changed.
+
+        This costs one stat call per directory and catches changes made
+        while the index was not watching.
+
+        Returns:
+            int: Number of directories rescanned
+        """
+        with self._lock:
+            directories = list(self._conn.execute("SELECT path, mtime FROM roots"))
+            directories += list(
+                self._conn.execute(
+                    "SELECT path, mtime FROM files WHERE is_dir = 1 AND (hidden = 0 OR ?)",
+                    (int(self.index_hidden),),
+                )
+            )
+        changed = []
+        for path, mtime in directories:
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    changed.append(path)
+            except OSError:
+                changed.append(path)
+        for path in changed:
+            self.rescan_directory(path)
+        return len(changed)
+
+    def _mark_dirty(self, path: str) -> None:
+        """Queue the directory holding a changed path for a rescan."""
+        parts = Path(path).parts
+        if not self.index_hidden and any(self._is_hidden_name(p) for p in parts[:-1]):
+            return
+        if any(p in self.excludes for p in parts):
+            return
+        with self._dirty_lock:
+            self._dirty.add(os.path.dirname(path))
+        self._dirty_event.set()
+
+    def dispatch(self, event: Any) -> None:
+        """Handle a watchdog filesystem event."""
+        if event.event_type in ("opened", "closed", "closed_no_write"):
+            return
+        self._mark_dirty(event.src_path)
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path:
+            self._mark_dirty(dest_path)
+
+    def _run_updates(self) -> None:
+        """Apply queued rescans, or poll when there are no filesystem events."""
+        # Catch up on changes made while nothing was watching
+        self._safe_refresh()
+        while not self._stop_event.is_set():
+            if self._observer is None:
+                if self._stop_event.wait(self.poll_interval):
+                    break
+                self._safe_refresh()
+                continue
+            if not self._dirty_event.wait(1.0):
+                continue
+            # Let bursts of events settle into one rescan per directory
+            time.sleep(0.2)
+            self._dirty_event.clear()
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            for directory in dirty:
+                try:
+                    self.rescan_directory(directory)
+                except Exception as e:
+                    logger.warning(f"Failed to update file index for {directory}: {e}")
+
+    def _safe_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Failed to refresh file index: {e}")
+
+    def _ensure_watching(self) -> None:
+        """Start watching every indexed root in the background."""
+        if not self.watch:
+            return
+        with self._lock:
+            roots = [root for (root,) in self._conn.execute("SELECT path FROM roots")]
+            new_roots = [root for root in roots if root not in self._watched]
+            if not new_roots and self._worker is not None:
+                return
+            self._watched.update(new_roots)
+            if self._observer is None and self._worker is None:
+                self._observer = self._start_observer()
+            if self._observer is not None:
+                for root in new_roots:
+                    try:
+                        self._observer.schedule(self, root, recursive=True)
+                    except OSError as e:
+                        # Usually the inotify watch limit; polling still covers the root
+                        logger.warning(f"Cannot watch {root}, falling back to polling: {e}")
+                        self._observer.stop()
+                        self._observer = None
+                        break
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_updates, name="file-index", daemon=True)
+                self._worker.start()
+
+    def _start_observer(self) -> Any:
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog is not installed, polling for file index updates")
+            return None
+        observer = Observer()
+        observer.daemon = True
+        try:
+            observer.start()
+        except OSError as e:
+            logger.warning(f"Cannot start filesystem observer, polling instead: {e}")
+            return None
+        return observer
+
+    def close(self) -> None:
+        """Stop background updates and close the database."""
+        self._stop_event.set()
+        self._dirty_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    def search(
+        self,
+        term: Optional[str] = None,
+        root: Optional[Union[str, Path]] = None,
+        glob: Optional[Union[str, Sequence[str]]] = None,
+        ext: Optional[Union[str, Sequence[str]]] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_after: Optional[float] = None,
+        modified_before: Optional[float] = None,
+        include_dirs: bool = True,
+        include_files: bool = True,
+        include_hidden: bool = False,
+        case_sensitive: bool = False,
+        in_path: bool = False,
+        limit: Optional[int] = 100,
+    ) -> List[FileRecord]:
+        """
+        Search the index.
+
+        Args:
+            term: Substring of the name, or of the full path if ``in_path`` is set
+            root: Only return entries below this directory, indexing it first if needed
+            glob: Shell pattern(s) the name must match, case-insensitively
+            ext: File extension(s), with or without the leading dot
+            min_size: Minimum size in bytes
+            max_size: Maximum size in bytes
+            modified_after: Earliest modification timestamp
+            modified_before: Latest modification timestamp
+            include_dirs: Whether to return directories
+            include_files: Whether to return files
+            include_hidden: Whether to return hidden entries
+            case_sensitive: Whether ``term`` must match case exactly
+            in_path: Match ``term`` against the full path instead of the name
+            limit: Maximum number of results, None for no limit
+
+        Returns:
+            List[FileRecord]: Matching entries, ordered by path
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        source = "files f"
+
+        if root is not None:
+            root = self.index_root(root)
+            low, high = _subtree_bounds(root)
+            clauses.append("f.path >= ? AND f.path < ?")
+            params += [low, high]
+
+        if term:
+            column = "path" if in_path else "name"
+            # Only names are in the trigram index; indexing full paths triples crawl time
+            if self.has_fts and not in_path and len(term) >= _TRIGRAM:
+                source = "files_fts JOIN files f ON f.id = files_fts.rowid"
+                clauses.append("files_fts MATCH ?")
+                params.append(f'"{term.replace(chr(34), chr(34) * 2)}"')
+            else:
+                clauses.append(f"f.{column} LIKE ? ESCAPE '\\'")
+                params.append(f"%{_escape_like(term)}%")
+            if case_sensitive:
+                clauses.append(f"instr(f.{column}, ?) > 0")
+                params.append(term)
+
+        for pattern in [glob] if isinstance(glob, str) else glob or []:
+            clauses.append("lower(f.name) GLOB ?")
+            params.append(pattern.lower())
+
+        if ext:
+            extensions = [ext] if isinstance(ext, str) else list(ext)
+            extensions = [e.lower().lstrip(".") for e in extensions]
+            clauses.append(f"f.ext IN ({','.join('?' * len(extensions))})")
+            params += extensions
+
+        for clause, value in (
+            ("f.size >= ?", min_size),
+            ("f.size <= ?", max_size),
+            ("f.mtime >= ?", modified_after),
+            ("f.mtime <= ?", modified_before),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        if not include_dirs:
+            clauses.append("f.is_dir = 0")
+        if not include_files:
+            clauses.append("f.is_dir = 1")
+        if not include_hidden:
+            clauses.append("f.hidden = 0")
+
+        sql = f"SELECT f.path, f.name, f.is_dir, f.size, f.mtime FROM {source}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY f.path"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [FileRecord(path, name, bool(is_dir), size, mtime) for path, name, is_dir, size, mtime in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dict[str, Any]: Entry counts, roots and the update mode
+        """
+        with self._lock:
+            files, dirs = self._conn.execute(
+                "SELECT COALESCE(SUM(is_dir = 0), 0), COALESCE(SUM(is_dir = 1), 0) FROM files"
+            ).fetchone()
+            roots = [root for (root,) in self._conn.execute("SELECT path FROM roots")]
+        if self._observer is not None:
+            mode = "events"
+        elif self._worker is not None:
+            mode = "polling"
+        else:
+            mode = "static"
+        return {
+            "files": files,
+            "directories": dirs,
+            "roots": roots,
+            "fts": self.has_fts,
+            "update_mode": mode,
+        }
+
+
+_indexes: Dict[frozenset, FileIndex] = {}
+_index_lock = threading.Lock()
+
+
+def get_file_index(excludes: Iterable[str] = DEFAULT_EXCLUDES) -> FileIndex:
+    """
+    Get the process-wide file index for a set of excluded directory names.
+
+    An index only holds what it crawled, so each set of exclusions gets its
+    own index and database.
+
+    Args:
+        excludes: Directory names that are skipped entirely, empty to index everything
+
+    Returns:
+        FileIndex: The shared index for these exclusions
+    """
+    key = frozenset(excludes)
+    index = _indexes.get(key)
+    if index is None:
+        with _index_lock:
+            index = _indexes.get(key)
+            if index is None:
+                db_name = "file_index.db"
+                if key != DEFAULT_EXCLUDES:
+                    digest = hashlib.sha1("\0".join(sorted(key)).encode()).hexdigest()[:12]
+                    db_name = f"file_index-{digest}.db"
+                index = FileIndex(get_labeeb_cache_dir() / db_name, excludes=key)
+                _indexes[key] = index
+    return index
@@ -9,7 +9,10 @@ import os
 import json
 from typing import Tuple, Optional, List, Dict, Any
 
-OLLAMA_URL = "http://localhost:11434"
+# OLLAMA_HOST follows the Ollama CLI convention and may omit the scheme
+OLLAMA_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+if "://" not in OLLAMA_URL:
+    OLLAMA_URL = f"http://{OLLAMA_URL}"
 DEFAULT_MODEL = "gemma3:4b"
 
 
@@ -0,0 +1,385 @@
+"""
+Image Pipeline Service for chained image operations with reduced decoding.
+
+---
+description: Chained image operations in one decode/encode cycle, with draft decoding and batching
+endpoints: [image_pipeline]
+inputs: [image, operations, format, quality]
+outputs: [image_data, format, dimensions]
+dependencies: [Pillow, concurrent.futures, multiprocessing.shared_memory]
+auth: none
+alwaysApply: false
+---
+
+- Apply a list of operations (resize, thumbnail, crop, rotate, flip, filter, convert) in one pass
+- Ask the JPEG decoder for a reduced-size image (``draft``) when the chain downsizes a lot
+- Downscale in integer steps before resampling (``reducing_gap``) for other formats
+- Process many images on a process pool; in-memory inputs are handed over in shared memory
+"""
+
+import io
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from PIL import Image, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+# Resample in integer-reduced steps when shrinking by more than this factor
+REDUCING_GAP = 3.0
+# Formats that cannot store an alpha channel or palette
+_RGB_ONLY_FORMATS = {"JPEG"}
+_FILTERS = {"blur": ImageFilter.BLUR, "sharpen": ImageFilter.SHARPEN}
+# Operations that change pixels in a way that does not commute with downscaling
+_SCALE_SENSITIVE = {"filter"}
+
+Operation = Dict[str, Any]
+ImageSource = Union[str, bytes, bytearray, memoryview]
+
+
+def _rotated_size(width: float, height: float, angle: float) -> Tuple[float, float]:
+    radians = math.radians(angle)
+    cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+    return width * cos + height * sin, width * sin + height * cos
+
+
+def _target_size(op: Operation, width: float, height: float) -> Tuple[float, float]:
+    """Size a resize or thumbnail operation produces from an image of the given size."""
+    if op["op"] == "thumbnail":
+        scale = min(op["width"] / width, op["height"] / height, 1.0)
+        return width * scale, height * scale
+    return op["width"], op["height"]
+
+
+def draft_scale(operations: Sequence[Operation], size: Tuple[int, int]) -> float:
+    """
+    Work out how much of the source resolution a chain of operations needs.
+
+    Crops, rotations, flips and grayscale conversion commute with scaling, so
+    the first resize or thumbnail in the chain bounds the detail needed.
+    Filters before that point need full resolution.
+
+    Args:
+        operations: Operations to apply, in order
+        size: Source (width, height)
+
+    Returns:
+        float: Fraction of the source resolution that is enough, at most 1.0
+    """
+    width, height = size
+    for op in operations:
+        name = op["op"]
+        if name in ("resize", "thumbnail"):
+            target_width, target_height = _target_size(op, width, height)
+            return min(max(target_width / width, target_height / height), 1.0)
+        if name == "crop":
+            left, top = op.get("left") or 0, op.get("top") or 0
+            right = width if op.get("right") is None else op["right"]
+            bottom = height if op.get("bottom") is None else op["bottom"]
+            width, height = max(right - left, 1), max(bottom - top, 1)
+        elif name == "rotate":
+            width, height = _rotated_size(width, height, op.get("angle", 0))
+        elif name in _SCALE_SENSITIVE and op.get("filter_type") != "grayscale":
+            return 1.0
+    return 1.0
+
+
+def _apply(image: Image.Image, op: Operation, scale: float) -> Image.Image:
+    """Apply one operation; ``scale`` maps source pixel coordinates to the decoded image."""
+    name = op["op"]
+    if name == "resize":
+        return image.resize(
+            (int(op["width"]), int(op["height"])),
+            Image.Resampling.LANCZOS,
+            reducing_gap=REDUCING_GAP,
+        )
+    if name == "thumbnail":
+        image.thumbnail(
+            (int(op["width"]), int(op["height"])),
+            Image.Resampling.LANCZOS,
+            reducing_gap=REDUCING_GAP,
+        )
+        return image
+    if name == "crop":
+        # Before any resize, coordinates refer to the source image, not the draft
+        box = (
+            op.get("left") or 0,
+            op.get("top") or 0,
+            image.width / scale if op.get("right") is None else op["right"],
+            image.height / scale if op.get("bottom") is None else op["bottom"],
+        )
+        return image.crop(tuple(round(value * scale) for value in box))
+    if name == "rotate":
+        return image.rotate(op.get("angle", 0), expand=True)
+    if name == "flip":
+        if op.get("direction", "horizontal") == "horizontal":
+            return image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        return image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    if name == "filter":
+        filter_type = op.get("filter_type")
+        if filter_type == "grayscale":
+            return image.convert("L")
+        if filter_type not in _FILTERS:
+            raise ValueError(f"Unsupported filter type: {filter_type}")
+        return image.filter(_FILTERS[filter_type])
+    if name == "convert":
+        return image
+    raise ValueError(f"Unsupported operation: {name}")
+
+
+def process_image(
+    source: ImageSource,
+    operations: Sequence[Operation],
+    output_format: Optional[str] = None,
+    quality: int = 85,
+    draft: bool = True,
+) -> Dict[str, Any]:
+    """
+    Decode an image once, apply a chain of operations and encode it once.
+
+    Args:
+        source: Image file path or encoded image data
+        operations: Operations to apply in order, e.g.
+            ``{"op": "resize", "width": 640, "height": 480}``
+        output_format: Format to encode, defaults to the format of a ``convert``
+            operation, then the source format
+        quality: Encoder quality for lossy formats
+        draft: Allow reduced-size decoding when the chain downsizes
+
+    Returns:
+        Dict[str, Any]: ``image_data``, ``format``, ``dimensions`` and ``source_dimensions``
+    """
+    for op in operations:
+        if op["op"] == "convert" and op.get("format"):
+            output_format = op["format"]
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        source_format = image.format
+        source_size = image.size
+        output_format = (output_format or source_format or "PNG").upper()
+
+        scale = 1.0
+        if draft and source_format == "JPEG":
+            # The decoder can scale by 1/2, 1/4 or 1/8 and skip color conversion
+            wanted = draft_scale(operations, source_size)
+            grayscale = any(op.get("filter_type") == "grayscale" for op in operations)
+            if wanted < 0.5 or (grayscale and image.mode != "L"):
+                requested = (
+                    math.ceil(source_size[0] * wanted),
+                    math.ceil(source_size[1] * wanted),
+                )
+                image.draft("L" if grayscale else image.mode, requested)
+                scale = image.size[0] / source_size[0]
+
+        result = image
+        for op in operations:
+            result = _apply(result, op, scale)
+            if op["op"] in ("resize", "thumbnail"):
+                # Later coordinates refer to the resized image, not the source
+                scale = 1.0
+
+        if output_format in _RGB_ONLY_FORMATS and result.mode not in ("RGB", "L", "CMYK"):
+            result = result.convert("RGB")
+        output = io.BytesIO()
+        save_args = {"quality": quality} if output_format in ("JPEG", "WEBP") else {}
+        result.save(output, format=output_format, **save_args)
+
+    return {
+        "image_data": output.getvalue(),
+        "format": output_format,
+        "dimensions": result.size,
+        "source_dimensions": source_size,
+    }
+
+
+def _process_shared(
+    location: Tuple[str, int, int],
+    operations: Sequence[Operation],
+    output_format: Optional[str],
+    quality: int,
+) -> Dict[str, Any]:
+    """Worker entry point for an image held in a shared memory block."""
+    name, offset, length = location
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        data = bytes(block.buf[offset : offset + length])
+    finally:
+        block.close()
+    return process_image(data, operations, output_format, quality)
+
+
+def _process_file(
+    path: str,
+    output_path: Optional[str],
+    operations: Sequence[Operation],
+    output_format: Optional[str],
+    quality: int,
+) -> Dict[str, Any]:
+    """Worker entry point for an image file; the output is written by the worker."""
+    result = process_image(path, operations, output_format, quality)
+    if output_path:
+        with open(output_path, "wb") as f:
+            f.write(result.pop("image_data"))
+        result["output_path"] = output_path
+    return result
+
+
+def output_paths(
+    sources: Sequence[ImageSource], output_dir: str, output_format: Optional[str] = None
+) -> Dict[int, str]:
+    """
+    Choose an output file for each file source.
+
+    Outputs are named after their source. A numeric suffix keeps names unique
+    within the batch and keeps any output from replacing one of the sources.
+
+    Args:
+        sources: Image file paths or encoded image data
+        output_dir: Directory for the outputs
+        output_format: Format to encode, defaults to each source's format
+
+    Returns:
+        Dict[int, str]: Output path per index of a file source
+    """
+    taken = {os.path.realpath(source) for source in sources if isinstance(source, str)}
+    paths = {}
+    for i, source in enumerate(sources):
+        if not isinstance(source, str):
+            continue
+        stem, extension = os.path.splitext(os.path.basename(source))
+        extension = (output_format or extension.lstrip(".") or "png").lower()
+        name, suffix = f"{stem}.{extension}", 1
+        while os.path.realpath(os.path.join(output_dir, name)) in taken:
+            name, suffix = f"{stem}-{suffix}.{extension}", suffix + 1
+        paths[i] = os.path.join(output_dir, name)
+        taken.add(os.path.realpath(paths[i]))
+    return paths
+
+
+class ImageBatchProcessor:
+    """Runs image pipelines for many images on a process pool."""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize the batch processor.
+
+        Args:
+            workers: Number of worker processes, defaults to the CPU count
+        """
+        self.workers = workers or os.cpu_count() or 4
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The worker pool, created on first use."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # The parent runs background threads by now, and a forked child
+                    # can inherit their locks held; forkserver children start clean
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context(
+                        "forkserver" if "forkserver" in methods else "spawn"
+                    )
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=context
+                    )
+        return self._executor
+
+    def process(
+        self,
+        sources: Sequence[ImageSource],
+        operations: Sequence[Operation],
+        output_format: Optional[str] = None,
+        quality: int = 85,
+        output_dir: Optional[str] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Apply the same chain of operations to many images in parallel.
+
+        Files are opened by the workers themselves, and with ``output_dir`` set
+        their results are written there by the workers too, under names chosen
+        by :func:`output_paths`. Image data is
+        copied once into a shared memory block that the workers read from,
+        instead of being pickled to each of them.
+
+        Args:
+            sources: Image file paths or encoded image data
+            operations: Operations to apply in order
+            output_format: Format to encode, defaults to each source's format
+            quality: Encoder quality for lossy formats
+            output_dir: Directory for the results of file sources
+
+        Returns:
+            List[Union[Dict[str, Any], Exception]]: A result per source, in order, or the error
+        """
+        operations = list(operations)
+        in_memory = [i for i, s in enumerate(sources) if not isinstance(s, str)]
+        block = None
+        futures = {}
+        try:
+            if in_memory:
+                total = sum(len(sources[i]) for i in in_memory)
+                block = shared_memory.SharedMemory(create=True, size=max(total, 1))
+                offset = 0
+                for i in in_memory:
+                    length = len(sources[i])
+                    block.buf[offset : offset + length] = sources[i]
+                    futures[i] = self.executor.submit(
+                        _process_shared,
+                        (block.name, offset, length),
+                        operations,
+                        output_format,
+                        quality,
+                    )
+                    offset += length
+            targets = output_paths(sources, output_dir, output_format) if output_dir else {}
+            for i, source in enumerate(sources):
+                if i in futures:
+                    continue
+                futures[i] = self.executor.submit(
+                    _process_file, source, targets.get(i), operations, output_format, quality
+                )
+
+            results: List[Union[Dict[str, Any], Exception]] = []
+            for i in range(len(sources)):
+                try:
+                    results.append(futures[i].result())
+                except Exception as e:
+                    results.append(e)
+            return results
+        finally:
+            for future in futures.values():
+                future.cancel()
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_processor: Optional[ImageBatchProcessor] = None
+_processor_lock = threading.Lock()
+
+
+def get_image_batch_processor() -> ImageBatchProcessor:
+    """Get the process-wide image batch processor."""
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = ImageBatchProcessor()
+    return _processor
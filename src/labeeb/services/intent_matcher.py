@@ -0,0 +1,232 @@
+"""
+Intent Matcher Service for mapping commands to known intents.
+
+---
+description: Matches English and Arabic commands against a declarative intent table
+endpoints: [intent_matcher]
+inputs: [command]
+outputs: [intent, slots]
+dependencies: [re, text_normalizer]
+auth: none
+alwaysApply: false
+---
+
+- Declare intents as trigger phrases plus slot patterns
+- Compile every trigger into one alternation regex
+- Normalize the command once, then find the intent and its slots in one pass
+- Take slot values from the original command, not its normalized form
+- Share one matcher between every code path that recognizes intents
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Collection, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from labeeb.utils.text_normalizer import normalize_arabic, normalize_command
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A recognizable intent.
+
+    Triggers are literal phrases; any one of them selects the intent. Slot
+    patterns are regexes with named groups, tried in order on the normalized
+    command once the intent is selected; each value is then cut from the
+    original command. Earlier intents in a table win over later ones.
+    """
+
+    name: str
+    triggers: Tuple[str, ...]
+    slot_patterns: Tuple[str, ...] = ()
+    # Only trigger at the start of the command, on a word boundary
+    prefix: bool = False
+
+
+@dataclass
+class IntentMatch:
+    """The result of matching a command."""
+
+    intent: str
+    slots: Dict[str, str] = field(default_factory=dict)
+    text: str = ""
+
+
+DEFAULT_INTENTS: Tuple[Intent, ...] = (
+    Intent("greeting", ("hi", "hello", "hey", "مرحبا", "السلام عليكم"), prefix=True),
+    Intent("identity", ("who are you", "what is your name", "من انت", "ما اسمك")),
+    # Explicit actions come before weather, so "a screenshot of the weather app" is a screenshot
+    Intent("screenshot", ("screenshot", "لقطة شاشة", "خذ لقطة")),
+    Intent(
+        "calculate",
+        ("calculate", "احسب", "حاسبة", "اجمع", "اضرب", "اطرح", "اقسم"),
+        (r"(?P<expression>\d+[\s\+\-\*/x×÷]+\d+)",),
+    ),
+    Intent(
+        "weather",
+        (
+            "weather in",
+            "weather for",
+            "weather like",
+            "weather today",
+            "weather now",
+            "weather forecast",
+            "what's the weather",
+            "what is the weather",
+            "how is the weather",
+            "how's the weather",
+            "temperature in",
+            "temperature outside",
+            "temperature today",
+            "الطقس",
+            "درجة الحرارة",
+        ),
+        (
+            r"(?:weather|temperature) (?:in|for) (?P<city>[\w\s]+)",
+            r"الطقس في (?P<city>[^؟?]+)",
+            r"الطقس ب(?P<city>[\w\s]+)",
+        ),
+    ),
+    Intent(
+        "clipboard_copy",
+        ("copy the text", "انسخ النص"),
+        (r"copy the text (?P<text>.+)", r"انسخ النص (?P<text>.+)"),
+    ),
+    Intent(
+        "play_sound",
+        ("play the file", "شغل الملف"),
+        (r"play the file (?P<filename>[\w\.]+)", r"شغل الملف (?P<filename>[\w\.]+)"),
+    ),
+    Intent(
+        "web_search",
+        ("search the web", "ابحث في الإنترنت"),
+        (r"search the web for (?P<query>.+)", r"ابحث في الإنترنت عن (?P<query>.+)"),
+    ),
+    Intent("get_activity", ("get_activity",)),
+    Intent("tts", ("tts",)),
+    Intent("show_emoji", ("show_emoji",)),
+    Intent("get_all_devices", ("get_all_devices",)),
+    Intent("status", ("status",)),
+)
+
+
+class IntentMatcher:
+    """Matches commands against an intent table with one compiled regex.
+
+    Each intent becomes a named group of the combined pattern, so a single
+    scan of the command finds every triggered intent no matter how many
+    intents the table holds.
+    """
+
+    def __init__(
+        self,
+        intents: Sequence[Intent] = DEFAULT_INTENTS,
+        normalizer: Callable[[str], str] = normalize_command,
+    ):
+        """
+        Initialize the intent matcher.
+
+        Args:
+            intents: The intent table, in order of precedence
+            normalizer: Function applied to commands and triggers before matching
+        """
+        self.intents: List[Intent] = list(intents)
+        self.normalizer = normalizer
+        self._groups: Dict[str, int] = {}
+        alternatives = []
+        for index, intent in enumerate(self.intents):
+            triggers = sorted({normalizer(t) for t in intent.triggers}, key=len, reverse=True)
+            body = "|".join(re.escape(t) for t in triggers)
+            if intent.prefix:
+                body = rf"^(?:{body})\b"
+            group = f"i{index}"
+            self._groups[group] = index
+            alternatives.append(f"(?P<{group}>{body})")
+        self._pattern: Pattern[str] = re.compile("|".join(alternatives))
+        # Slot patterns are written in lowercase; only their Arabic needs normalizing
+        self._slot_patterns: List[List[Pattern[str]]] = [
+            [re.compile(normalize_arabic(p)) for p in intent.slot_patterns]
+            for intent in self.intents
+        ]
+
+    def match(
+        self, command: str, allowed: Optional[Collection[str]] = None
+    ) -> Optional[IntentMatch]:
+        """
+        Find the highest-precedence intent in a command.
+
+        Args:
+            command: The raw command
+            allowed: Optional intent names to consider, e.g. those a caller can handle
+
+        Returns:
+            Optional[IntentMatch]: The intent and its slots, or None if nothing matched
+        """
+        text, offsets = self._normalize_with_offsets(command)
+        best = None
+        for m in self._pattern.finditer(text):
+            index = self._groups[m.lastgroup]
+            if allowed is not None and self.intents[index].name not in allowed:
+                continue
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        if best is None:
+            return None
+
+        slots: Dict[str, str] = {}
+        for pattern in self._slot_patterns[best]:
+            slot_match = pattern.search(text)
+            if slot_match:
+                for name, value in slot_match.groupdict().items():
+                    if not value:
+                        continue
+                    start, end = slot_match.span(name)
+                    # Trailing diacritics belong to the last letter, so cut up to the next one
+                    value = command[offsets[start] : offsets[end]].strip()
+                    if value:
+                        slots[name] = value
+                break
+        return IntentMatch(intent=self.intents[best].name, slots=slots, text=text)
+
+    def _normalize_with_offsets(self, command: str) -> Tuple[str, List[int]]:
+        """
+        Normalize a command one character at a time, remembering where each came from.
+
+        Whitespace runs collapse to one space and leading or trailing whitespace
+        is dropped, as in :func:`normalize_command`; every other character goes
+        through the normalizer on its own.
+
+        Args:
+            command: The raw command
+
+        Returns:
+            Tuple[str, List[int]]: The normalized text, and for each of its
+            characters plus its end the matching index into ``command``
+        """
+        pieces: List[str] = []
+        offsets: List[int] = []
+        pending_space = None
+        for index, char in enumerate(command):
+            if char.isspace():
+                if offsets and pending_space is None:
+                    pending_space = index
+                continue
+            normalized = self.normalizer(char)
+            if not normalized:
+                continue
+            if pending_space is not None:
+                pieces.append(" ")
+                offsets.append(pending_space)
+                pending_space = None
+            pieces.append(normalized)
+            offsets.extend([index] * len(normalized))
+        offsets.append(len(command))
+        return "".join(pieces), offsets
+
+
+@lru_cache(maxsize=1)
+def get_intent_matcher() -> IntentMatcher:
+    """Get the shared matcher for the default intent table."""
+    return IntentMatcher()
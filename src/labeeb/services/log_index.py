@@ -0,0 +1,497 @@
+"""
+Log Index Service for reading large log files without loading them.
+
+---
+description: Tail reads and time/level queries over log files through a sidecar offset index
+endpoints: [log_index]
+inputs: [log_path, count, start, end, min_level]
+outputs: [lines, records]
+dependencies: [logging.handlers, struct]
+auth: none
+alwaysApply: false
+---
+
+- Read the last lines of a file by seeking backwards in blocks from its end
+- Write logs through a RotatingFileHandler that records byte offsets as it writes
+- Keep a sidecar index (``<log>.idx``) of block offsets, time bounds and the levels present
+- Answer time-range and level queries by seeking only to the blocks that can match
+"""
+
+import io
+import logging
+import os
+import re
+import struct
+import threading
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per step when seeking backwards from the end of a file
+TAIL_BLOCK_SIZE = 64 * 1024
+# Bytes of log covered by one index entry
+INDEX_INTERVAL = 64 * 1024
+
+# start offset, end offset, first record time, last record time, level bucket mask
+_ENTRY = struct.Struct("<QQddH")
+_ALL_LEVELS = 0xFFFF
+_DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+
+# Regex fragments for strftime directives, used to recognise where a record starts
+_DATE_DIRECTIVES = {
+    "Y": r"\d{4}",
+    "y": r"\d{2}",
+    "m": r"\d{1,2}",
+    "d": r"\d{1,2}",
+    "H": r"\d{1,2}",
+    "I": r"\d{1,2}",
+    "M": r"\d{1,2}",
+    "S": r"\d{1,2}",
+    "f": r"\d{1,6}",
+    "j": r"\d{1,3}",
+    "z": r"[+-]\d{4}",
+    "%": "%",
+}
+_FORMAT_FIELD = re.compile(r"%\((\w+)\)[-#0 +]*\d*(?:\.\d+)?[diouxXeEfFgGcrsa]")
+
+Record = Tuple[int, int, str, Optional[float], Optional[int]]
+
+
+def tail_lines(path: str, count: int, block_size: int = TAIL_BLOCK_SIZE) -> List[str]:
+    """
+    Read the last lines of a file.
+
+    Blocks are read backwards from the end until enough line breaks have
+    been seen, so the cost depends on the lines returned, not the file size.
+
+    Args:
+        path: File to read
+        count: Number of lines to return
+        block_size: Bytes to read per step
+
+    Returns:
+        List[str]: The last ``count`` lines, with line endings, oldest first
+    """
+    if count <= 0:
+        return []
+    chunks = []
+    newlines = 0
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        # One extra line break marks the start of the oldest wanted line
+        while position > 0 and newlines <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    data = b"".join(reversed(chunks))
+    if position > 0:
+        data = data[data.index(b"\n") + 1 :]
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="replace").readlines()
+    return lines[-count:]
+
+
+def _level_bucket(levelno: int) -> int:
+    return min(max(levelno, 0) // 10, 15)
+
+
+def _level_mask(levelno: Optional[int]) -> int:
+    return _ALL_LEVELS if levelno is None else 1 << _level_bucket(levelno)
+
+
+def _date_pattern(date_format: str) -> str:
+    pattern = []
+    i = 0
+    while i < len(date_format):
+        char = date_format[i]
+        if char == "%" and i + 1 < len(date_format):
+            pattern.append(_DATE_DIRECTIVES.get(date_format[i + 1], r"\S+?"))
+            i += 2
+        else:
+            pattern.append(re.escape(char))
+            i += 1
+    return "".join(pattern)
+
+
+def record_pattern(log_format: str, date_format: Optional[str] = None) -> Pattern[str]:
+    """
+    Build a regex matching the first line of a record written with a %-style format.
+
+    Args:
+        log_format: logging format string
+        date_format: Date format used for ``asctime``
+
+    Returns:
+        Pattern[str]: Regex with ``asctime`` and ``levelname`` groups where the format has them
+    """
+    fields = {
+        "asctime": _date_pattern(date_format or _DEFAULT_DATE_FORMAT),
+        "levelname": r"[A-Z]+|Level \d+",
+        "levelno": r"\d+",
+        "created": r"\d+(?:\.\d+)?",
+        "message": r".*",
+    }
+    pattern = []
+    seen = set()
+    position = 0
+    for match in _FORMAT_FIELD.finditer(log_format):
+        pattern.append(re.escape(log_format[position : match.start()]))
+        key = match.group(1)
+        if key in fields and key not in seen:
+            pattern.append(f"(?P<{key}>{fields[key]})")
+            seen.add(key)
+        else:
+            pattern.append(r".*?")
+        position = match.end()
+    pattern.append(re.escape(log_format[position:]))
+    return re.compile("".join(pattern))
+
+
+class LogIndex:
+    """Sidecar index of block offsets for one log file."""
+
+    def __init__(
+        self,
+        log_path: str,
+        log_format: str = logging.BASIC_FORMAT,
+        date_format: Optional[str] = None,
+        interval: int = INDEX_INTERVAL,
+        encoding: str = "utf-8",
+    ):
+        """
+        Initialize the log index.
+
+        Args:
+            log_path: Log file to index
+            log_format: Format the log is written with, used to parse unindexed records
+            date_format: Date format of ``asctime`` in the log
+            interval: Bytes of log covered by one index entry
+            encoding: Encoding of the log file
+        """
+        self.log_path = os.fspath(log_path)
+        self.path = f"{self.log_path}.idx"
+        self.pattern = record_pattern(log_format, date_format)
+        self.date_format = date_format or _DEFAULT_DATE_FORMAT
+        self.interval = interval
+        self.encoding = encoding
+        self._entries: Optional[List[Tuple[int, int, float, float, int]]] = None
+        self._block: Optional[List] = None
+        self._times: Tuple[Optional[str], Optional[float]] = (None, None)
+        self._lock = threading.RLock()
+
+    def add(self, start: int, end: int, created: Optional[float], levelno: Optional[int]) -> None:
+        """
+        Record a log record written between two byte offsets.
+
+        Args:
+            start: Offset of the record's first byte
+            end: Offset just past the record
+            created: Record time, None if unknown
+            levelno: Record level, None if unknown
+        """
+        with self._lock:
+            first = float("-inf") if created is None else created
+            last = float("inf") if created is None else created
+            block = self._block
+            if block is None or block[1] != start:
+                self._write_block()
+                self._block = [start, end, first, last, _level_mask(levelno)]
+            else:
+                block[1] = end
+                block[2] = min(block[2], first)
+                block[3] = max(block[3], last)
+                block[4] |= _level_mask(levelno)
+            if self._block[1] - self._block[0] >= self.interval:
+                self._write_block()
+
+    def flush(self) -> None:
+        """Write the block being filled to the sidecar."""
+        with self._lock:
+            self._write_block()
+
+    def _write_block(self) -> None:
+        if self._block is None:
+            return
+        entry = tuple(self._block)
+        self._block = None
+        try:
+            with open(self.path, "ab") as f:
+                f.write(_ENTRY.pack(*entry))
+        except OSError as e:
+            logger.warning(f"Could not write log index {self.path}: {e}")
+            return
+        if self._entries is not None:
+            self._entries.append(entry)
+
+    def reset(self) -> None:
+        """Forget the index, after the log was truncated or replaced."""
+        with self._lock:
+            self._block = None
+            self._entries = []
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _load(self) -> List[Tuple[int, int, float, float, int]]:
+        if self._entries is None:
+            try:
+                with open(self.path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = b""
+            usable = len(data) - len(data) % _ENTRY.size
+            self._entries = list(_ENTRY.iter_unpack(data[:usable]))
+        return self._entries
+
+    def sync(self) -> None:
+        """Bring the index up to date with the end of the log file."""
+        with self._lock:
+            self._write_block()
+            try:
+                size = os.path.getsize(self.log_path)
+            except FileNotFoundError:
+                self.reset()
+                return
+            entries = self._load()
+            if entries and entries[-1][1] > size:
+                logger.info(f"Log {self.log_path} shrank, rebuilding its index")
+                self.reset()
+                entries = self._entries
+            indexed = entries[-1][1] if entries else 0
+            if indexed >= size:
+                return
+            with open(self.log_path, "rb") as f:
+                for start, end, _, created, levelno in self._records(f, indexed, size):
+                    self.add(start, end, created, levelno)
+            self._write_block()
+
+    def _parse_time(self, asctime: str) -> Optional[float]:
+        # Consecutive records usually share a timestamp, so remember the last one
+        if self._times[0] == asctime:
+            return self._times[1]
+        try:
+            parsed = datetime.strptime(asctime, self.date_format).timestamp()
+        except ValueError:
+            parsed = None
+        self._times = (asctime, parsed)
+        return parsed
+
+    def _records(self, f, start: int, end: int) -> Iterator[Record]:
+        """Parse the records between two offsets that fall on record boundaries."""
+        f.seek(start)
+        offset = start
+        current = None
+        while offset < end:
+            line = f.readline(end - offset)
+            if not line:
+                break
+            text = line.decode(self.encoding, "replace")
+            match = self.pattern.match(text)
+            if match or current is None:
+                if current is not None:
+                    yield current[0], offset, "".join(current[1]), current[2], current[3]
+                created = levelno = None
+                if match:
+                    fields = match.groupdict()
+                    if fields.get("asctime"):
+                        created = self._parse_time(fields["asctime"])
+                    elif fields.get("created"):
+                        created = float(fields["created"])
+                    if fields.get("levelno"):
+                        levelno = int(fields["levelno"])
+                    elif fields.get("levelname"):
+                        level = logging.getLevelName(fields["levelname"])
+                        if isinstance(level, int):
+                            levelno = level
+                        elif fields["levelname"].startswith("Level "):
+                            levelno = int(fields["levelname"][6:])
+                current = [offset, [text], created, levelno]
+            else:
+                current[1].append(text)
+            offset += len(line)
+        if current is not None:
+            yield current[0], offset, "".join(current[1]), current[2], current[3]
+
+    def _normalize(self, timestamp: float) -> float:
+        """Truncate a time to the precision of the log's date format."""
+        try:
+            text = datetime.fromtimestamp(timestamp).strftime(self.date_format)
+            return datetime.strptime(text, self.date_format).timestamp()
+        except (ValueError, OverflowError, OSError):
+            return timestamp
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        min_level: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Find records by time and level.
+
+        Only index blocks whose time range and levels can match are read.
+
+        Args:
+            start: Earliest record time, as a Unix timestamp
+            end: Latest record time, as a Unix timestamp
+            min_level: Lowest level to include
+            limit: Return at most this many of the newest matching records
+
+        Returns:
+            List[str]: Matching records, oldest first; multi-line records are kept whole
+        """
+        with self._lock:
+            self.sync()
+            entries = list(self._load())
+        if start is not None:
+            start = self._normalize(start)
+        wanted = _ALL_LEVELS if min_level is None else _ALL_LEVELS & ~((1 << _level_bucket(min_level)) - 1)
+
+        # Merge neighbouring candidate blocks into contiguous reads
+        ranges: List[List[int]] = []
+        for block_start, block_end, first, last, mask in entries:
+            if not mask & wanted:
+                continue
+            if (start is not None and last < start) or (end is not None and first > end):
+                continue
+            if ranges and ranges[-1][1] == block_start:
+                ranges[-1][1] = block_end
+            else:
+                ranges.append([block_start, block_end])
+
+        matches: List[str] = []
+        with open(self.log_path, "rb") as f:
+            for range_start, range_end in reversed(ranges):
+                found = [
+                    text
+                    for _, _, text, created, levelno in self._records(f, range_start, range_end)
+                    if (min_level is None or levelno is None or levelno >= min_level)
+                    and (created is None or start is None or created >= start)
+                    and (created is None or end is None or created <= end)
+                ]
+                matches.extend(reversed(found))
+                if limit is not None and len(matches) >= limit:
+                    del matches[limit:]
+                    break
+        matches.reverse()
+        return matches
+
+    def rotate(self, handler: RotatingFileHandler) -> None:
+        """Move sidecars along with a handler's backup files and start a new index."""
+        with self._lock:
+            self._write_block()
+            for i in range(handler.backupCount - 1, 0, -1):
+                source = handler.rotation_filename(f"{self.log_path}.{i}") + ".idx"
+                if os.path.exists(source):
+                    os.replace(source, handler.rotation_filename(f"{self.log_path}.{i + 1}") + ".idx")
+            if os.path.exists(self.path):
+                os.replace(self.path, handler.rotation_filename(f"{self.log_path}.1") + ".idx")
+            self._entries = []
+
+
+class IndexedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that maintains a sidecar offset index of what it writes.
+
+    The handler must be the only writer of its file for offsets to stay exact.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 0,
+        backupCount: int = 0,
+        formatter: Optional[logging.Formatter] = None,
+        index_interval: int = INDEX_INTERVAL,
+        encoding: str = "utf-8",
+    ):
+        """
+        Initialize the handler.
+
+        Args:
+            filename: Log file to write
+            maxBytes: Size at which the file is rotated, 0 to never rotate
+            backupCount: Number of rotated files to keep
+            formatter: Formatter for records, also used to parse records written elsewhere
+            index_interval: Bytes of log covered by one index entry
+            encoding: Encoding of the log file
+        """
+        super().__init__(
+            filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True
+        )
+        formatter = formatter or logging.Formatter()
+        self.setFormatter(formatter)
+        self.index = LogIndex(
+            self.baseFilename,
+            formatter._fmt or logging.BASIC_FORMAT,
+            formatter.datefmt,
+            interval=index_interval,
+            encoding=encoding,
+        )
+        # What the file already holds is indexed before the first write, not here,
+        # so creating a handler never reads the log
+        self.index_synced = False
+
+    def sync_index(self) -> None:
+        """Index whatever the file already holds, so new entries continue from its end.
+
+        Runs once, on the first write if not called earlier. Callers on an event
+        loop should call it from a worker thread before writing to a large log.
+        """
+        self.acquire()
+        try:
+            if not self.index_synced:
+                self.index.sync()
+                self.index_synced = True
+        finally:
+            self.release()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record and add its byte range to the index."""
+        try:
+            self.sync_index()
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            start = self.stream.tell()
+            logging.FileHandler.emit(self, record)
+            self.index.add(start, self.stream.tell(), record.created, record.levelno)
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self) -> None:
+        """Rotate the log files and their sidecar indexes."""
+        if self.backupCount > 0:
+            self.index.rotate(self)
+        super().doRollover()
+        # The new file is empty, so there is nothing left to index
+        self.index_synced = True
+
+    def truncate(self) -> None:
+        """Empty the log file and its index."""
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            with open(self.baseFilename, "w", encoding=self.encoding):
+                pass
+            self.index.reset()
+            self.index_synced = True
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Close the file and write any pending index entry."""
+        self.acquire()
+        try:
+            self.index.flush()
+        finally:
+            self.release()
+        super().close()
@@ -0,0 +1,275 @@
+"""
+Ollama Client Service for streaming model responses.
+
+---
+description: Shared async Ollama client with a keep-alive connection pool
+endpoints: [ollama_client]
+inputs: [prompt, model, options]
+outputs: [tokens, response]
+dependencies: [aiohttp, logging]
+auth: none
+alwaysApply: false
+---
+
+- Keep a single pooled HTTP session per event loop
+- Stream generated tokens as NDJSON chunks arrive
+- Aggregate streamed chunks into a complete response
+- List available models
+- Share one client instance across the application
+- Close pooled sessions when they are replaced and on shutdown
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiohttp
+
+from labeeb.core.exceptions import AIError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+
+
+class OllamaClient:
+    """Async client for the Ollama HTTP API with a shared connection pool."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        pool_size: int = 8,
+        keepalive_timeout: float = 60.0,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the Ollama client.
+
+        Args:
+            base_url: Base URL of the Ollama server
+            pool_size: Maximum number of pooled connections
+            keepalive_timeout: Seconds an idle connection is kept open
+            timeout: Total request timeout in seconds, or None for no limit
+        """
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session, creating it on first use.
+
+        A session is bound to the event loop it was created on, so a new one
+        is created if the client is used from a different loop.
+
+        Returns:
+            aiohttp.ClientSession: The shared session
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None:
+                await _close_session(self._session, self._loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+            logger.debug(f"Opened Ollama connection pool for {self.base_url}")
+        return self._session
+
+    def _build_payload(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]],
+        stream: bool,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Build the request body for /api/generate."""
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt, "stream": stream}
+        if options:
+            payload["options"] = options
+        payload.update({k: v for k, v in kwargs.items() if v is not None})
+        return payload
+
+    async def stream_generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream raw generation chunks from the model.
+
+        Args:
+            model: Name of the model
+            prompt: The prompt to send
+            options: Optional generation options
+            **kwargs: Extra request fields (e.g. ``system``, ``context``, ``keep_alive``)
+
+        Yields:
+            Dict[str, Any]: Each decoded NDJSON chunk, the last one having ``done`` set
+
+        Raises:
+            AIError: If the server returns an error or cannot be reached
+        """
+        session = await self._get_session()
+        payload = self._build_payload(model, prompt, options, True, **kwargs)
+        try:
+            async with session.post(f"{self.base_url}/api/generate", json=payload) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    raise AIError(f"Ollama returned status {response.status}: {body}")
+
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise AIError(f"Ollama error: {chunk['error']}")
+                    yield chunk
+                    if chunk.get("done"):
+                        break
+        except aiohttp.ClientError as e:
+            logger.error(f"Error streaming from Ollama: {str(e)}")
+            raise AIError(f"Failed to connect to Ollama: {str(e)}")
+
+    async def stream_tokens(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text tokens from the model.
+
+        Args:
+            model: Name of the model
+            prompt: The prompt to send
+            options: Optional generation options
+            **kwargs: Extra request fields
+
+        Yields:
+            str: Each non-empty token as soon as it is received
+        """
+        async for chunk in self.stream_generate(model, prompt, options, **kwargs):
+            token = chunk.get("response", "")
+            if token:
+                yield token
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Generate a complete response by aggregating the token stream.
+
+        Args:
+            model: Name of the model
+            prompt: The prompt to send
+            options: Optional generation options
+            **kwargs: Extra request fields
+
+        Returns:
+            Dict[str, Any]: The final chunk with ``response`` holding the full text
+        """
+        parts: List[str] = []
+        final: Dict[str, Any] = {}
+        async for chunk in self.stream_generate(model, prompt, options, **kwargs):
+            parts.append(chunk.get("response", ""))
+            final = chunk
+        result = dict(final)
+        result["response"] = "".join(parts)
+        return result
+
+    async def list_models(self) -> List[Dict[str, Any]]:
+        """
+        List the models available on the server.
+
+        Returns:
+            List[Dict[str, Any]]: Model information from /api/tags
+        """
+        session = await self._get_session()
+        try:
+            async with session.get(f"{self.base_url}/api/tags") as response:
+                if response.status != 200:
+                    raise AIError(f"Ollama returned status {response.status}")
+                data = await response.json()
+                return data.get("models", [])
+        except aiohttp.ClientError as e:
+            logger.error(f"Error listing Ollama models: {str(e)}")
+            raise AIError(f"Failed to connect to Ollama: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None:
+            await _close_session(self._session, self._loop)
+        self._session = None
+        self._loop = None
+
+
+async def _close_session(
+    session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """
+    Close a pooled session on the event loop it was created on.
+
+    Args:
+        session: The session to close
+        loop: The loop the session belongs to
+    """
+    if session.closed:
+        return
+    try:
+        if loop is None or loop is asyncio.get_running_loop():
+            await session.close()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        elif not loop.is_closed():
+            # A stopped loop can still be run, just not from a thread that runs another one
+            await asyncio.to_thread(loop.run_until_complete, session.close())
+        else:
+            logger.debug("Ollama connection pool belongs to a closed event loop")
+            return
+        logger.debug("Closed Ollama connection pool")
+    except Exception as e:
+        logger.warning(f"Error closing Ollama connection pool: {str(e)}")
+
+
+_clients: Dict[str, OllamaClient] = {}
+
+
+def get_ollama_client(base_url: str = DEFAULT_BASE_URL) -> OllamaClient:
+    """
+    Get the shared Ollama client for a server.
+
+    Args:
+        base_url: Base URL of the Ollama server
+
+    Returns:
+        OllamaClient: The shared client instance
+    """
+    key = base_url.rstrip("/")
+    if key not in _clients:
+        _clients[key] = OllamaClient(base_url=key)
+    return _clients[key]
+
+
+async def close_ollama_clients() -> None:
+    """Close the connection pools of every shared Ollama client."""
+    for client in list(_clients.values()):
+        await client.close()
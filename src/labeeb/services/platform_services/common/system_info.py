@@ -7,12 +7,37 @@ information while maintaining a consistent interface across different operating
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import psutil
 import platform
 from labeeb.utils.i18n import gettext as _
 
 
+@lru_cache(maxsize=1)
+def _get_static_info() -> Dict[str, Any]:
+    """Get system facts that do not change while the process runs."""
+    cpu_freq = psutil.cpu_freq()
+    # Prime non-blocking CPU sampling for get_common_info
+    psutil.cpu_percent(interval=None)
+    psutil.cpu_percent(percpu=True, interval=None)
+    return {
+        "platform": {
+            "system": platform.system(),
+            "release": platform.release(),
+            "version": platform.version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "cpu": {
+            "physical_cores": psutil.cpu_count(logical=False),
+            "total_cores": psutil.cpu_count(logical=True),
+            "max_frequency": cpu_freq.max if cpu_freq else None,
+            "min_frequency": cpu_freq.min if cpu_freq else None,
+        },
+    }
+
+
 class BaseSystemInfoGatherer(ABC):
     """Base class for gathering system information across platforms."""
 
@@ -37,40 +62,37 @@ class BaseSystemInfoGatherer(ABC):
         Returns:
             Dict[str, Any]: Dictionary containing common system information
         """
+        static = _get_static_info()
+        cpu_freq = psutil.cpu_freq()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage("/")
+        network = psutil.net_io_counters()
         return {
-            "platform": {
-                "system": platform.system(),
-                "release": platform.release(),
-                "version": platform.version(),
-                "machine": platform.machine(),
-                "processor": platform.processor(),
-            },
+            "platform": dict(static["platform"]),
             "cpu": {
-                "physical_cores": psutil.cpu_count(logical=False),
-                "total_cores": psutil.cpu_count(logical=True),
-                "max_frequency": psutil.cpu_freq().max if psutil.cpu_freq() else None,
-                "min_frequency": psutil.cpu_freq().min if psutil.cpu_freq() else None,
-                "current_frequency": psutil.cpu_freq().current if psutil.cpu_freq() else None,
-                "cpu_usage_per_core": [x for x in psutil.cpu_percent(percpu=True, interval=1)],
-                "total_cpu_usage": psutil.cpu_percent(interval=1),
+                **static["cpu"],
+                "current_frequency": cpu_freq.current if cpu_freq else None,
+                # Usage since the previous call, so this never blocks
+                "cpu_usage_per_core": psutil.cpu_percent(percpu=True, interval=None),
+                "total_cpu_usage": psutil.cpu_percent(interval=None),
             },
             "memory": {
-                "total": psutil.virtual_memory().total,
-                "available": psutil.virtual_memory().available,
-                "used": psutil.virtual_memory().used,
-                "percentage": psutil.virtual_memory().percent,
+                "total": memory.total,
+                "available": memory.available,
+                "used": memory.used,
+                "percentage": memory.percent,
             },
             "disk": {
-                "total": psutil.disk_usage("/").total,
-                "used": psutil.disk_usage("/").used,
-                "free": psutil.disk_usage("/").free,
-                "percentage": psutil.disk_usage("/").percent,
+                "total": disk.total,
+                "used": disk.used,
+                "free": disk.free,
+                "percentage": disk.percent,
             },
             "network": {
-                "bytes_sent": psutil.net_io_counters().bytes_sent,
-                "bytes_received": psutil.net_io_counters().bytes_recv,
-                "packets_sent": psutil.net_io_counters().packets_sent,
-                "packets_received": psutil.net_io_counters().packets_recv,
+                "bytes_sent": network.bytes_sent,
+                "bytes_received": network.bytes_recv,
+                "packets_sent": network.packets_sent,
+                "packets_received": network.packets_recv,
             },
         }
 
@@ -1,16 +1,58 @@
 import logging
 import os
 import shutil
+import stat as stat_module
 import pwd
 import grp
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from ..base_fs_handler import BaseFSHandler
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _user_name(uid: int) -> str:
+    """Resolve a user id to a name, once per id."""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=1024)
+def _group_name(gid: int) -> str:
+    """Resolve a group id to a name, once per id."""
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+def _tree_size(path: str) -> int:
+    """Get the total size of the files below a directory, without following symlinks."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
 class LinuxFSHandler(BaseFSHandler):
     """Linux-specific file system handler implementation."""
 
@@ -77,11 +119,58 @@ class LinuxFSHandler(BaseFSHandler):
             logging.error(f"Error getting file system status: {e}")
             return {"error": str(e)}
 
-    def list_directory(self, path: str) -> List[Dict[str, Any]]:
+    def iter_directory(
+        self, path: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream information about the contents of a directory.
+
+        Each entry costs one stat call at most; the type comes from the
+        directory listing itself and owner names are resolved once per id.
+
+        Args:
+            path: Directory path to list
+            offset: Number of entries to skip
+            limit: Maximum number of entries to yield, None for all
+
+        Yields:
+            Dict[str, Any]: File/directory information dictionaries, in directory order
+        """
+        if not self._initialized:
+            return
+        for info, _ in self._scan(path, offset, limit):
+            yield info
+
+    def _scan(
+        self, path: str, offset: int, limit: Optional[int]
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[int]]]:
+        """Yield information and the device id of each directory entry."""
+        stop = None if limit is None else offset + limit
+        with os.scandir(path) as entries:
+            for entry in islice(entries, offset, stop):
+                try:
+                    # DirEntry.stat() follows symlinks like os.stat() and caches its result
+                    stat = entry.stat()
+                except OSError as e:
+                    yield {"name": entry.name, "path": entry.path, "error": str(e)}, None
+                    continue
+                yield self._stat_info(entry.path, entry.name, stat), stat.st_dev
+
+    def list_directory(
+        self,
+        path: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        include_space: bool = False,
+        include_tree_size: bool = False,
+    ) -> List[Dict[str, Any]]:
         """List contents of a directory.
 
         Args:
             path: Directory path to list
+            offset: Number of entries to skip, for paging through large directories
+            limit: Maximum number of entries to return, None for all
+            include_space: Add disk usage of the containing filesystem to directories
+            include_tree_size: Add the total size of the files below each directory
 
         Returns:
             List[Dict[str, Any]]: List of file/directory information dictionaries
@@ -90,16 +179,54 @@ class LinuxFSHandler(BaseFSHandler):
             if not self._initialized:
                 return []
 
-            items = []
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                items.append(self.get_path_info(item_path))
+            scanned = list(self._scan(path, offset, limit))
+            items = [info for info, _ in scanned]
+            directories = [item for item in items if item.get("type") == "directory"]
+
+            if include_space and directories:
+                # Entries of one directory are usually on one filesystem, so ask once per device
+                space_cache: Dict[int, Dict[str, int]] = {}
+                for item, dev in scanned:
+                    if item.get("type") == "directory":
+                        item["space"] = self._space(item["path"], dev, space_cache)
+
+            if include_tree_size and directories:
+                with ThreadPoolExecutor(max_workers=min(8, len(directories))) as pool:
+                    sizes = pool.map(_tree_size, [item["path"] for item in directories])
+                    for item, size in zip(directories, sizes):
+                        item["tree_size"] = size
 
             return items
         except Exception as e:
             logging.error(f"Error listing directory {path}: {e}")
             return []
 
+    @staticmethod
+    def _space(path: str, dev: int, cache: Dict[int, Dict[str, int]]) -> Dict[str, int]:
+        """Get disk usage for a path, reusing the result for paths on the same device."""
+        if dev not in cache:
+            try:
+                total, used, free = shutil.disk_usage(path)
+                cache[dev] = {"total": total, "used": used, "free": free}
+            except OSError:
+                cache[dev] = {}
+        return cache[dev]
+
+    def _stat_info(self, path: str, name: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Build a path information dictionary from stat data already in hand."""
+        return {
+            "name": name,
+            "path": path,
+            "type": "directory" if stat_module.S_ISDIR(stat.st_mode) else "file",
+            "size": stat.st_size,
+            "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "accessed": datetime.fromtimestamp(stat.st_atime).isoformat(),
+            "permissions": oct(stat.st_mode)[-3:],
+            "owner": _user_name(stat.st_uid),
+            "group": _group_name(stat.st_gid),
+        }
+
     def create_directory(self, path: str) -> bool:
         """Create a new directory.
 
@@ -201,34 +328,10 @@ class LinuxFSHandler(BaseFSHandler):
             if not self._initialized:
                 return {"error": "Handler not initialized"}
 
-            stat = os.stat(path)
-
-            # Get Linux-specific user and group info
-            try:
-                owner = pwd.getpwuid(stat.st_uid).pw_name
-            except KeyError:
-                owner = str(stat.st_uid)
-
-            try:
-                group = grp.getgrgid(stat.st_gid).gr_name
-            except KeyError:
-                group = str(stat.st_gid)
-
-            info = {
-                "name": os.path.basename(path),
-                "path": path,
-                "type": "directory" if os.path.isdir(path) else "file",
-                "size": stat.st_size,
-                "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "accessed": datetime.fromtimestamp(stat.st_atime).isoformat(),
-                "permissions": oct(stat.st_mode)[-3:],
-                "owner": owner,
-                "group": group,
-            }
+            info = self._stat_info(path, os.path.basename(path), os.stat(path))
 
             # Add Linux-specific attributes
-            if os.path.isdir(path):
+            if info["type"] == "directory":
                 try:
                     total, used, free = shutil.disk_usage(path)
                     info["space"] = {"total": total, "used": used, "free": free}
@@ -0,0 +1,241 @@
+"""
+SQL Stream Service for reading MySQL results without buffering them.
+
+---
+description: Unbuffered MySQL reads, server-side row limits, bulk inserts and schema discovery
+endpoints: [sql_stream]
+inputs: [connection, query, params, limit, page_size, table, columns, rows]
+outputs: [columns, rows, truncated, affected_rows, schema]
+dependencies: [aiomysql]
+auth: none
+alwaysApply: false
+---
+
+- Read results through an unbuffered server-side cursor, one page at a time
+- Add a LIMIT to SELECT queries so the server stops sending rows that would be dropped
+- Iterate over every row of a result without holding more than a page in memory
+- Insert many rows with multi-row INSERT statements, in batches
+- Describe every table with a single information_schema query
+"""
+
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+import aiomysql
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server per round trip
+DEFAULT_PAGE_SIZE = 500
+
+_SELECT = re.compile(r"^\s*(\(\s*)*(SELECT|WITH)\b", re.IGNORECASE)
+# A literal LIMIT clause at the end of the statement: LIMIT n, LIMIT o, n or LIMIT n OFFSET o
+_TRAILING_LIMIT = re.compile(
+    r"\bLIMIT\s+(?:(\d+)\s*,\s*)?(\d+)(\s+OFFSET\s+\d+)?\s*$", re.IGNORECASE
+)
+# Any LIMIT clause at the end of the statement, e.g. one with a placeholder
+_ANY_TRAILING_LIMIT = re.compile(r"\bLIMIT\s+[^()]*$", re.IGNORECASE)
+_IDENTIFIER = re.compile(r"^[A-Za-z0-9_$]+$")
+
+SCHEMA_QUERY = (
+    "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA "
+    "FROM information_schema.columns WHERE TABLE_SCHEMA = DATABASE() "
+    "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+)
+
+Params = Optional[Union[Sequence[Any], Dict[str, Any]]]
+
+
+def with_limit(query: str, limit: int) -> str:
+    """
+    Make a SELECT query return at most ``limit`` rows.
+
+    A LIMIT is appended when the query has none, and a larger literal LIMIT
+    at the end of the query is lowered. Other statements, and queries ending
+    in a LIMIT with placeholders, are returned as is.
+
+    Args:
+        query: SQL query
+        limit: Most rows the server should send
+
+    Returns:
+        str: Query with the limit applied
+    """
+    if not _SELECT.match(query):
+        return query
+    query = query.rstrip()
+    match = _TRAILING_LIMIT.search(query)
+    if match is None:
+        if _ANY_TRAILING_LIMIT.search(query):
+            return query
+        return f"{query} LIMIT {limit}"
+    if int(match.group(2)) <= limit:
+        return query
+    start, end = match.span(2)
+    return f"{query[:start]}{limit}{query[end:]}"
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a table or column name.
+
+    Args:
+        name: Unquoted identifier
+
+    Returns:
+        str: Backtick-quoted identifier
+
+    Raises:
+        ValueError: If the name contains characters other than letters, digits, ``_`` or ``$``
+    """
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f"`{name}`"
+
+
+async def fetch_limited(
+    conn: Any,
+    query: str,
+    params: Params = None,
+    limit: int = 1000,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[str], List[Dict[str, Any]], bool]:
+    """
+    Fetch at most ``limit`` rows of a query.
+
+    The server is asked for one row more than the limit, to tell whether
+    the result was cut, and rows are read a page at a time.
+
+    Args:
+        conn: aiomysql connection
+        query: SQL query
+        params: Query parameters
+        limit: Most rows to return
+        page_size: Rows fetched per round trip
+
+    Returns:
+        Tuple[List[str], List[Dict[str, Any]], bool]: (columns, rows, truncated)
+    """
+    rows: List[Dict[str, Any]] = []
+    async with conn.cursor(aiomysql.SSCursor) as cur:
+        await cur.execute(with_limit(query, limit + 1), params)
+        columns = [desc[0] for desc in cur.description or ()]
+        while len(rows) <= limit:
+            page = await cur.fetchmany(min(page_size, limit + 1 - len(rows)))
+            if not page:
+                break
+            rows.extend(dict(zip(columns, row)) for row in page)
+    return columns, rows[:limit], len(rows) > limit
+
+
+async def iter_rows(
+    conn: Any, query: str, params: Params = None, page_size: int = DEFAULT_PAGE_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Iterate over every row of a query, holding at most one page in memory.
+
+    Stopping early still reads, and discards, the rest of the result before
+    the connection can be reused; add a LIMIT when only the first rows matter.
+
+    Args:
+        conn: aiomysql connection
+        query: SQL query
+        params: Query parameters
+        page_size: Rows fetched per round trip
+
+    Yields:
+        Dict[str, Any]: Row keyed by column name
+    """
+    async with conn.cursor(aiomysql.SSCursor) as cur:
+        await cur.execute(query, params)
+        columns = [desc[0] for desc in cur.description or ()]
+        while True:
+            page = await cur.fetchmany(page_size)
+            if not page:
+                break
+            for row in page:
+                yield dict(zip(columns, row))
+
+
+async def insert_many(
+    conn: Any,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Union[Sequence[Any], Dict[str, Any]]],
+    batch_size: int = DEFAULT_PAGE_SIZE,
+) -> int:
+    """
+    Insert rows in batches, each batch sent as one multi-row INSERT.
+
+    All batches run in one transaction, which is rolled back on error.
+
+    Args:
+        conn: aiomysql connection
+        table: Table name
+        columns: Column names
+        rows: Values per row, in column order or keyed by column name
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        int: Number of rows inserted
+
+    Raises:
+        ValueError: If a name is invalid or a row does not match the columns
+    """
+    if not columns:
+        raise ValueError("At least one column is required")
+    statement = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote_identifier(table),
+        ", ".join(quote_identifier(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+    values = []
+    for row in rows:
+        if isinstance(row, dict):
+            row = [row.get(column) for column in columns]
+        if len(row) != len(columns):
+            raise ValueError(f"Row has {len(row)} values for {len(columns)} columns")
+        values.append(tuple(row))
+
+    inserted = 0
+    async with conn.cursor() as cur:
+        try:
+            await conn.begin()
+            for start in range(0, len(values), batch_size):
+                # aiomysql rewrites INSERT ... VALUES into one multi-row statement
+                await cur.executemany(statement, values[start : start + batch_size])
+                inserted += cur.rowcount
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+    return inserted
+
+
+async def fetch_schema(conn: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Describe the columns of every table in the current database in one query.
+
+    Args:
+        conn: aiomysql connection
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Columns per table, in table order, with the
+        fields of ``DESCRIBE``: field, type, null, key, default and extra
+    """
+    schema: Dict[str, List[Dict[str, Any]]] = {}
+    async with conn.cursor() as cur:
+        await cur.execute(SCHEMA_QUERY)
+        for table, field, column_type, nullable, key, default, extra in await cur.fetchall():
+            schema.setdefault(table, []).append(
+                {
+                    "field": field,
+                    "type": column_type,
+                    "null": nullable,
+                    "key": key,
+                    "default": default,
+                    "extra": extra,
+                }
+            )
+    return schema
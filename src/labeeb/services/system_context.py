@@ -0,0 +1,228 @@
+"""
+System Context Service for describing the host in AI prompts.
+
+---
+description: Cached system facts with per-field TTLs and a prompt fragment
+endpoints: [system_context]
+inputs: [field_ttls]
+outputs: [fragment, snapshot]
+dependencies: [psutil, platform, threading]
+auth: none
+alwaysApply: false
+---
+
+- Compute static facts such as platform, machine and core count once
+- Sample volatile facts such as CPU and memory usage on a background thread
+- Keep each field for its own TTL
+- Serve a pre-rendered prompt fragment without blocking the caller
+"""
+
+import logging
+import platform
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ContextField:
+    """One fact about the system.
+
+    A field with no TTL is static and sampled once.
+    """
+
+    name: str
+    label: str
+    sample: Callable[[], Any]
+    ttl: Optional[float] = None
+    fmt: str = "{}"
+    value: Any = None
+    sampled_at: Optional[float] = None
+
+    def is_stale(self, now: float) -> bool:
+        """Check whether the field needs to be sampled."""
+        if self.sampled_at is None:
+            return True
+        return self.ttl is not None and now - self.sampled_at >= self.ttl
+
+
+def _cpu_percent() -> float:
+    """CPU usage since the previous call, without blocking."""
+    return psutil.cpu_percent(interval=None)
+
+
+def _disk_free_gb() -> float:
+    """Free space on the root filesystem in GB."""
+    return psutil.disk_usage("/").free / 1024**3
+
+
+def default_fields() -> List[ContextField]:
+    """Get the fields included in AI prompts."""
+    return [
+        ContextField("system", "OS", platform.system),
+        ContextField("release", "Release", platform.release),
+        ContextField("machine", "Architecture", platform.machine),
+        ContextField("cores", "CPU cores", lambda: psutil.cpu_count(logical=True)),
+        ContextField("cpu_percent", "CPU usage", _cpu_percent, ttl=5.0, fmt="{:.0f}%"),
+        ContextField(
+            "memory_percent",
+            "Memory usage",
+            lambda: psutil.virtual_memory().percent,
+            ttl=5.0,
+            fmt="{:.0f}%",
+        ),
+        ContextField("disk_free", "Disk free", _disk_free_gb, ttl=60.0, fmt="{:.1f} GB"),
+    ]
+
+
+class SystemContext:
+    """Keeps system facts fresh in the background and renders them for prompts.
+
+    Static fields are sampled once on construction. Volatile fields are
+    refreshed by a daemon thread when their TTL expires, so reading the
+    fragment never waits on the system. The fragment string is rebuilt only
+    when a rendered value changes.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[List[ContextField]] = None,
+        refresh_interval: float = 1.0,
+        background: bool = True,
+    ):
+        """
+        Initialize the system context.
+
+        Args:
+            fields: Fields to track, defaults to :func:`default_fields`
+            refresh_interval: Seconds between checks for expired fields
+            background: Whether to refresh volatile fields on a background thread
+        """
+        self.fields: Dict[str, ContextField] = {
+            field.name: field for field in (fields if fields is not None else default_fields())
+        }
+        self.refresh_interval = refresh_interval
+        self.background = background
+        self._lock = threading.Lock()
+        self._version = 0
+        self._rendered: Tuple[int, str] = (-1, "")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Prime non-blocking CPU sampling so the first real sample is meaningful
+        psutil.cpu_percent(interval=None)
+        self.refresh(static_only=True)
+
+    def refresh(self, static_only: bool = False) -> bool:
+        """
+        Sample every field whose TTL has expired.
+
+        Args:
+            static_only: Only sample static fields that were never sampled
+
+        Returns:
+            bool: True if any rendered value changed
+        """
+        now = time.monotonic()
+        changed = False
+        for field in self.fields.values():
+            if static_only and field.ttl is not None:
+                continue
+            if not field.is_stale(now):
+                continue
+            try:
+                value = field.sample()
+            except Exception as e:
+                logger.debug(f"Failed to sample system field {field.name}: {e}")
+                value = None
+            field.sampled_at = now
+            if value != field.value:
+                field.value = value
+                changed = True
+        if changed:
+            with self._lock:
+                self._version += 1
+        return changed
+
+    def _run(self) -> None:
+        """Refresh volatile fields until stopped."""
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start(self) -> None:
+        """Start the background refresh thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="system-context", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self, name: str) -> Any:
+        """
+        Get the latest value of a field.
+
+        Args:
+            name: The field name
+
+        Returns:
+            Any: The last sampled value, or None if unknown
+        """
+        field = self.fields.get(name)
+        return field.value if field is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the latest value of every field.
+
+        Returns:
+            Dict[str, Any]: Field names mapped to their last sampled values
+        """
+        return {name: field.value for name, field in self.fields.items()}
+
+    def fragment(self) -> str:
+        """
+        Get the system description used in prompts.
+
+        The first call starts the background thread. Without one, expired
+        fields are sampled on the calling thread.
+
+        Returns:
+            str: A single-line description of the system
+        """
+        if self.background:
+            self.start()
+        else:
+            self.refresh()
+
+        version = self._version
+        rendered_version, fragment = self._rendered
+        if rendered_version == version:
+            return fragment
+
+        parts = []
+        for field in self.fields.values():
+            if field.value is None or field.value == "":
+                continue
+            try:
+                value = field.fmt.format(field.value)
+            except (ValueError, TypeError):
+                value = str(field.value)
+            parts.append(f"{field.label}: {value}")
+        fragment = ", ".join(parts)
+        with self._lock:
+            # Only publish if no field changed while rendering
+            if self._version == version:
+                self._rendered = (version, fragment)
+        return fragment
@@ -0,0 +1,441 @@
+"""
+Video Pipeline Service for processing videos without holding them in memory.
+
+---
+description: Streaming decode -> transform -> encode pipeline with ffmpeg stream-copy fast paths
+endpoints: [video_pipeline]
+inputs: [path, stream, transform, segments]
+outputs: [output_paths]
+dependencies: [opencv-python, numpy, ffmpeg (optional binary)]
+auth: none
+alwaysApply: false
+---
+
+- Read videos from files, spooling pipes and in-memory data to a temporary file in chunks
+- Decode, transform and encode on separate threads joined by bounded queues
+- Split into any number of segments in a single pass over the input
+- Trim, split and merge by stream copy through a local ffmpeg binary when no re-encode is needed
+"""
+
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Sequence, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frames buffered between two pipeline stages
+DEFAULT_QUEUE_SIZE = 8
+# Bytes copied per read when spooling a stream to disk
+SPOOL_CHUNK_SIZE = 1024**2
+# Four character codes used by OpenCV for each container
+FOURCC_BY_FORMAT = {"MP4": "mp4v", "MOV": "mp4v", "MKV": "mp4v", "AVI": "MJPG"}
+
+Frame = np.ndarray
+Transform = Callable[[Frame], Frame]
+VideoInput = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+_END = object()
+
+
+@dataclass
+class VideoInfo:
+    """Basic properties of a video file."""
+
+    width: int
+    height: int
+    fps: float
+    frame_count: int
+    fourcc: str
+
+    @property
+    def duration(self) -> float:
+        """Length of the video in seconds."""
+        return self.frame_count / self.fps if self.fps else 0.0
+
+
+def probe(path: str) -> Optional[VideoInfo]:
+    """
+    Read the properties of a video file.
+
+    Args:
+        path: Video file
+
+    Returns:
+        Optional[VideoInfo]: Video properties, or None if the file cannot be opened
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            return None
+        code = int(cap.get(cv2.CAP_PROP_FOURCC))
+        return VideoInfo(
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=cap.get(cv2.CAP_PROP_FPS),
+            frame_count=int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            fourcc="".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)),
+        )
+    finally:
+        cap.release()
+
+
+@contextmanager
+def open_source(source: VideoInput, suffix: str = ".mp4") -> Iterator[str]:
+    """
+    Provide a file path for a video given as a path, bytes or a readable stream.
+
+    Paths are used as they are. Bytes and streams, including pipes, are
+    copied to a temporary file in fixed-size chunks, which is removed on exit.
+
+    Args:
+        source: Video file path, video data, or a binary stream
+        suffix: Extension for the temporary file
+
+    Yields:
+        str: Path of a readable video file
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix="labeeb-video-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                f.write(source)
+            else:
+                shutil.copyfileobj(source, f, SPOOL_CHUNK_SIZE)
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def read_frames(
+    path: str, start_frame: int = 0, end_frame: Optional[int] = None
+) -> Iterator[Frame]:
+    """
+    Decode frames from a video file one at a time.
+
+    Args:
+        path: Video file
+        start_frame: Index of the first frame to yield
+        end_frame: Index past the last frame to yield, None for the end of the video
+
+    Yields:
+        Frame: Decoded BGR frames
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video: {path}")
+        if start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        index = start_frame
+        while end_frame is None or index < end_frame:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame
+            index += 1
+    finally:
+        cap.release()
+
+
+class SegmentWriter:
+    """Writes a frame stream to one or more files, switching files at frame boundaries."""
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        fps: float,
+        size: tuple,
+        boundaries: Sequence[int] = (),
+        fourcc: str = "mp4v",
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            paths: Output file for each segment
+            fps: Output frame rate
+            size: Output (width, height)
+            boundaries: Frame index at which each segment after the first starts
+            fourcc: OpenCV four character code of the output codec
+        """
+        if len(boundaries) != len(paths) - 1:
+            raise ValueError("Need one boundary between each pair of segments")
+        self.paths = list(paths)
+        self.fps = fps
+        self.size = tuple(size)
+        self.boundaries = list(boundaries)
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.frames_written = 0
+        self._segment = -1
+        self._writer = None
+
+    def _open(self, segment: int) -> None:
+        if self._writer is not None:
+            self._writer.release()
+        self._segment = segment
+        self._writer = cv2.VideoWriter(self.paths[segment], self.fourcc, self.fps, self.size)
+        if not self._writer.isOpened():
+            raise ValueError(f"Failed to open video writer: {self.paths[segment]}")
+
+    def write(self, frame: Frame) -> None:
+        """Write the next frame, starting the next segment when its boundary is reached."""
+        while self._segment < 0 or (
+            self._segment + 1 < len(self.paths)
+            and self.frames_written >= self.boundaries[self._segment]
+        ):
+            self._open(self._segment + 1)
+        if frame.shape[1::-1] != self.size:
+            frame = cv2.resize(frame, self.size)
+        self._writer.write(frame)
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """Finish the open segment and open any segments the stream never reached."""
+        for segment in range(self._segment + 1, len(self.paths)):
+            self._open(segment)
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+
+class FramePipeline:
+    """Runs decode -> transform -> encode on threads joined by bounded queues.
+
+    At most ``queue_size`` frames wait between two stages, so memory use is
+    independent of the video length. OpenCV releases the GIL while decoding,
+    filtering and encoding, so the stages overlap.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Initialize the pipeline.
+
+        Args:
+            queue_size: Frames buffered between two stages
+        """
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        frames: Iterable[Frame],
+        sink: Callable[[Frame], None],
+        transform: Optional[Transform] = None,
+    ) -> int:
+        """
+        Stream frames through a transform into a sink.
+
+        Args:
+            frames: Frame source, consumed on a decode thread
+            sink: Called with each output frame, on the calling thread
+            transform: Applied to each frame on a transform thread, None to pass frames through
+
+        Returns:
+            int: Number of frames written to the sink
+
+        Raises:
+            Exception: The first error raised by any stage
+        """
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        decoded: queue.Queue = queue.Queue(self.queue_size)
+        transformed: queue.Queue = queue.Queue(self.queue_size) if transform else decoded
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _END
+
+        def stage(body: Callable[[], None], output: queue.Queue) -> Callable[[], None]:
+            def target() -> None:
+                try:
+                    body()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+                finally:
+                    put(output, _END)
+
+            return target
+
+        def decode() -> None:
+            for frame in frames:
+                if not put(decoded, frame):
+                    return
+
+        def apply() -> None:
+            while True:
+                frame = get(decoded)
+                if frame is _END or not put(transformed, transform(frame)):
+                    return
+
+        threads = [
+            threading.Thread(target=stage(decode, decoded), name="video-decode", daemon=True)
+        ]
+        if transform:
+            threads.append(
+                threading.Thread(
+                    target=stage(apply, transformed), name="video-transform", daemon=True
+                )
+            )
+        for thread in threads:
+            thread.start()
+
+        written = 0
+        try:
+            while True:
+                frame = get(transformed)
+                if frame is _END:
+                    break
+                sink(frame)
+                written += 1
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            close = getattr(frames, "close", None)
+            if close:
+                close()
+        if errors:
+            raise errors[0]
+        return written
+
+
+def find_ffmpeg(path: Optional[str] = None) -> Optional[str]:
+    """
+    Locate an ffmpeg binary.
+
+    Args:
+        path: Configured binary, checked before PATH
+
+    Returns:
+        Optional[str]: Path of the binary, None if ffmpeg is not installed
+    """
+    return shutil.which(path or "ffmpeg")
+
+
+def _run_ffmpeg(ffmpeg: str, args: List[str]) -> bool:
+    command = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", *args]
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        logger.debug(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.returncode == 0
+
+
+def copy_trim(ffmpeg: str, source: str, output: str, start: float, end: Optional[float]) -> bool:
+    """
+    Trim a video by stream copy, without decoding it.
+
+    Cuts land on the keyframe at or before ``start``.
+
+    Args:
+        ffmpeg: ffmpeg binary
+        source: Input video file
+        output: Output video file
+        start: Start time in seconds
+        end: End time in seconds, None for the end of the video
+
+    Returns:
+        bool: True if ffmpeg succeeded
+    """
+    args = ["-ss", f"{start:.6f}", "-i", source]
+    if end is not None:
+        args += ["-t", f"{max(end - start, 0):.6f}"]
+    args += ["-map", "0", "-c", "copy", "-avoid_negative_ts", "make_zero", output]
+    return _run_ffmpeg(ffmpeg, args)
+
+
+def copy_split(
+    ffmpeg: str, source: str, pattern: str, times: Sequence[float]
+) -> Optional[List[str]]:
+    """
+    Split a video by stream copy in a single pass.
+
+    Each segment starts at the first keyframe at or after its split time,
+    so fewer segments than requested can result from sparse keyframes.
+    ffmpeg writes into a fresh directory next to the outputs, so only the
+    segments of this run are returned and files from earlier runs are
+    never picked up or removed.
+
+    Args:
+        ffmpeg: ffmpeg binary
+        source: Input video file
+        pattern: printf-style output path with one integer field in the file name,
+            e.g. ``out_%03d.mp4``
+        times: Split times in seconds
+
+    Returns:
+        Optional[List[str]]: Segment files in order, None if ffmpeg failed
+    """
+    args = ["-i", source, "-map", "0", "-c", "copy", "-f", "segment", "-reset_timestamps", "1"]
+    if times:
+        args += ["-segment_times", ",".join(f"{t:.6f}" for t in times)]
+    name = os.path.basename(pattern)
+    work_dir = tempfile.mkdtemp(
+        prefix="labeeb-split-", dir=os.path.dirname(os.path.abspath(pattern))
+    )
+    try:
+        if not _run_ffmpeg(ffmpeg, args + [os.path.join(work_dir, name)]):
+            return None
+        paths = []
+        while os.path.exists(os.path.join(work_dir, name % len(paths))):
+            os.replace(os.path.join(work_dir, name % len(paths)), pattern % len(paths))
+            paths.append(pattern % len(paths))
+        return paths
+    finally:
+        # Partial segments of a failed run go with the directory
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def copy_concat(ffmpeg: str, sources: Sequence[str], output: str) -> bool:
+    """
+    Join videos that share codecs and parameters by stream copy.
+
+    Args:
+        ffmpeg: ffmpeg binary
+        sources: Input video files, in order
+        output: Output video file
+
+    Returns:
+        bool: True if ffmpeg succeeded
+    """
+    fd, listing = tempfile.mkstemp(suffix=".txt", prefix="labeeb-concat-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for source in sources:
+                escaped = os.path.abspath(source).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        return _run_ffmpeg(
+            ffmpeg, ["-f", "concat", "-safe", "0", "-i", listing, "-map", "0", "-c", "copy", output]
+        )
+    finally:
+        os.remove(listing)
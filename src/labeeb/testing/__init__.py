@@ -0,0 +1,13 @@
+"""
+Test doubles shared by Labeeb's tests and benchmarks.
+
+---
+description: Local stand-ins for external services used in tests and benchmarks
+endpoints: [fake_ollama]
+inputs: []
+outputs: []
+dependencies: [aiohttp]
+auth: none
+alwaysApply: false
+---
+"""
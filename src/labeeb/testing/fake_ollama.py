@@ -0,0 +1,263 @@
+"""
+Deterministic fake Ollama server shared by the tests and the benchmarks.
+
+---
+description: Serves /api/tags, /api/generate and /api/chat with scripted responses
+endpoints: [fake_ollama]
+inputs: [FakeOllamaConfig]
+outputs: [base_url]
+dependencies: [aiohttp, asyncio, threading]
+auth: none
+alwaysApply: false
+---
+
+- Stream a fixed or computed response in fixed-size chunks as NDJSON
+- Add configurable latency before the first chunk and between chunks
+- Inject failures at a seeded, reproducible rate, as HTTP errors or mid-stream
+- Run on the caller's event loop or on a background thread
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from aiohttp import web
+
+# A response the plan extractor accepts
+DEFAULT_RESPONSE = json.dumps(
+    {
+        "plan": [
+            {
+                "step": "list_files",
+                "description": "List files in the current directory",
+                "operation": "system_command",
+                "parameters": {"command": "ls"},
+                "confidence": 0.95,
+                "conditions": None,
+            }
+        ]
+    }
+)
+
+
+@dataclass
+class FakeOllamaConfig:
+    """Behaviour of the fake server."""
+
+    models: List[str] = field(default_factory=lambda: ["gemma3:4b", "qwen3:8b"])
+    # Response text, or a function of the request body returning it
+    response: Union[str, Callable[[Dict[str, Any]], str]] = DEFAULT_RESPONSE
+    # Characters per streamed chunk
+    chunk_size: int = 4
+    # Seconds before the first chunk, standing in for prompt evaluation
+    first_token_latency: float = 0.0
+    # Seconds between chunks
+    token_latency: float = 0.0
+    # Fraction of generate/chat requests that fail
+    failure_rate: float = 0.0
+    # Fail after the first chunk instead of with an HTTP 500
+    fail_mid_stream: bool = False
+    seed: int = 0
+
+
+class FakeOllamaServer:
+    """A local stand-in for the Ollama HTTP API.
+
+    Use it as an async context manager on the current loop, or with
+    :meth:`run_in_thread` when the code under test runs its own loop::
+
+        async with FakeOllamaServer(FakeOllamaConfig(token_latency=0.01)) as url:
+            ...
+
+        with FakeOllamaServer().run_in_thread() as url:
+            ...
+    """
+
+    def __init__(self, config: Optional[FakeOllamaConfig] = None):
+        """
+        Initialize the fake server.
+
+        Args:
+            config: Server behaviour, defaults to instant successful responses
+        """
+        self.config = config or FakeOllamaConfig()
+        self.requests: List[Dict[str, Any]] = []
+        self.failures = 0
+        self.base_url: Optional[str] = None
+        self._random = random.Random(self.config.seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    def _build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/tags", self._tags)
+        app.router.add_post("/api/generate", self._generate)
+        app.router.add_post("/api/chat", self._chat)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 for any free port
+
+        Returns:
+            str: The base URL of the server
+        """
+        self._runner = web.AppRunner(self._build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> str:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    @contextmanager
+    def run_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """
+        Serve from a background thread with its own event loop.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 for any free port
+
+        Yields:
+            str: The base URL of the server
+        """
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        def serve() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start(host, port))
+            except BaseException as e:
+                errors.append(e)
+                started.set()
+                return
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        thread = threading.Thread(target=serve, name="fake-ollama", daemon=True)
+        thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        try:
+            yield self.base_url
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+    def _response_text(self, body: Dict[str, Any]) -> str:
+        response = self.config.response
+        return response(body) if callable(response) else response
+
+    def _chunks(self, text: str) -> List[str]:
+        size = max(1, self.config.chunk_size)
+        return [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+    def _should_fail(self) -> bool:
+        failed = self._random.random() < self.config.failure_rate
+        if failed:
+            self.failures += 1
+        return failed
+
+    async def _tags(self, request: web.Request) -> web.Response:
+        models = [
+            {"name": name, "model": name, "size": 0, "digest": f"fake-{i}"}
+            for i, name in enumerate(self.config.models)
+        ]
+        return web.json_response({"models": models})
+
+    async def _generate(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, "generate")
+
+    async def _chat(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, "chat")
+
+    def _chunk_message(self, kind: str, model: str, text: str, done: bool) -> Dict[str, Any]:
+        message: Dict[str, Any] = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "done": done,
+        }
+        if kind == "chat":
+            message["message"] = {"role": "assistant", "content": text}
+        else:
+            message["response"] = text
+        return message
+
+    def _final_message(
+        self, kind: str, model: str, body: Dict[str, Any], chunks: List[str], text: str
+    ) -> Dict[str, Any]:
+        message = self._chunk_message(kind, model, text, True)
+        prompt = body.get("prompt") or json.dumps(body.get("messages", []))
+        message.update(
+            {
+                "done_reason": "stop",
+                "prompt_eval_count": len(prompt.split()),
+                "eval_count": len(chunks),
+            }
+        )
+        if kind == "generate":
+            message["context"] = list(range(len(prompt.split()) + len(chunks)))
+        return message
+
+    async def _respond(self, request: web.Request, kind: str) -> web.StreamResponse:
+        body = await request.json()
+        self.requests.append({"path": request.path, "body": body})
+        model = body.get("model", "")
+        if model not in self.config.models:
+            return web.json_response({"error": f"model '{model}' not found"}, status=404)
+
+        fail = self._should_fail()
+        if fail and not (self.config.fail_mid_stream and body.get("stream", True)):
+            return web.json_response({"error": "injected failure"}, status=500)
+
+        text = self._response_text(body)
+        chunks = self._chunks(text)
+        if self.config.first_token_latency:
+            await asyncio.sleep(self.config.first_token_latency)
+
+        if not body.get("stream", True):
+            if self.config.token_latency:
+                await asyncio.sleep(self.config.token_latency * len(chunks))
+            return web.json_response(self._final_message(kind, model, body, chunks, text))
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for index, chunk in enumerate(chunks):
+            if index and self.config.token_latency:
+                await asyncio.sleep(self.config.token_latency)
+            line = self._chunk_message(kind, model, chunk, False)
+            await response.write((json.dumps(line) + "\n").encode("utf-8"))
+            if fail:
+                await response.write(b'{"error": "injected failure"}\n')
+                await response.write_eof()
+                return response
+        final = self._final_message(kind, model, body, chunks, "")
+        await response.write((json.dumps(final) + "\n").encode("utf-8"))
+        await response.write_eof()
+        return response
@@ -2,34 +2,90 @@
 Tools module for Labeeb AI system.
 
 This module provides various tools that can be used by AI agents to perform tasks.
+
+Tools are registered by import path and imported on first use, so importing
+this package does not pull in heavy dependencies such as torch, OpenCV,
+matplotlib or GUI automation libraries. Tool classes remain importable from
+the package, e.g. ``from labeeb.tools import FileTool``.
 """
 
-from .tool_registry import ToolRegistry
-
-# Import tools
-from .file_tool import FileTool
-from .web_tool import WebTool
-from .system_tool import SystemTool
-from .datetime_tool import DateTimeTool
-from .file_and_document_organizer_tool import FileAndDocumentOrganizerTool
-from .code_path_updater_tool import CodePathUpdaterTool
-from .graph_maker_tool import GraphMakerTool
-from .clipboard_tool import ClipboardTool
-from .calculator_tools import CalculatorTool
-from labeeb.core.platform_core.app_control_tool import AppControlTool
-from .vision_tool import VisionTool
-from .screen_control_tool import ScreenControlTool
-
-# Re-register all tools to ensure correct .name registration after registry fix
-ToolRegistry.register(FileTool)
-ToolRegistry.register(WebTool)
-ToolRegistry.register(SystemTool)
-ToolRegistry.register(DateTimeTool)
-ToolRegistry.register(FileAndDocumentOrganizerTool)
-ToolRegistry.register(CodePathUpdaterTool)
-ToolRegistry.register(GraphMakerTool)
-ToolRegistry.register(ClipboardTool)
-ToolRegistry.register(CalculatorTool)
-ToolRegistry.register(AppControlTool)
-ToolRegistry.register(VisionTool)
-ToolRegistry.register(ScreenControlTool)
+from typing import Any
+
+from .tool_registry import ToolRegistry, _import_class
+
+# Tool class name -> (registry name, import path, description)
+_TOOLS = {
+    "FileTool": ("file", "labeeb.tools.file_tool:FileTool", "Tool for file operations"),
+    "WebTool": (
+        "WebTool",
+        "labeeb.tools.web_tool:WebTool",
+        "Handles web-related operations including web scraping, content extraction, and URL validation",
+    ),
+    "SystemTool": (
+        "system_tool",
+        "labeeb.tools.system_tool:SystemTool",
+        "Tool for system-related operations",
+    ),
+    "DateTimeTool": (
+        "DateTimeTool",
+        "labeeb.tools.datetime_tool:DateTimeTool",
+        "Handles date and time operations including formatting, parsing, and calculations",
+    ),
+    "FileAndDocumentOrganizerTool": (
+        "file_and_document_organizer",
+        "labeeb.tools.file_and_document_organizer_tool:FileAndDocumentOrganizerTool",
+        "Tool for organizing and managing files and documents",
+    ),
+    "CodePathUpdaterTool": (
+        "code_path_updater",
+        "labeeb.tools.code_path_updater_tool:CodePathUpdaterTool",
+        "Tool for updating and managing code paths",
+    ),
+    "GraphMakerTool": (
+        "graph_maker",
+        "labeeb.tools.graph_maker_tool:GraphMakerTool",
+        "Tool for generating graphs from folder data",
+    ),
+    "ClipboardTool": (
+        "clipboard_tool",
+        "labeeb.tools.clipboard_tool:ClipboardTool",
+        "Tool for managing clipboard operations with platform-specific optimizations.",
+    ),
+    "CalculatorTool": (
+        "calculator",
+        "labeeb.tools.calculator_tools:CalculatorTool",
+        "Automate calculator operations including mouse movements and keyboard inputs",
+    ),
+    "AppControlTool": (
+        "app_control",
+        "labeeb.core.platform_core.app_control_tool:AppControlTool",
+        "Tool for launching and controlling applications",
+    ),
+    "VisionTool": (
+        "vision",
+        "labeeb.tools.vision_tool:VisionTool",
+        "Local vision-language tool using SmolVLM-256M.",
+    ),
+    "ScreenControlTool": (
+        "screen_control",
+        "labeeb.tools.screen_control_tool:ScreenControlTool",
+        "Tool for screen control and automation capabilities.",
+    ),
+}
+
+for _class_name, (_name, _import_path, _description) in _TOOLS.items():
+    ToolRegistry.register_lazy(_name, _import_path, description=_description)
+
+
+def __getattr__(name: str) -> Any:
+    """Import a tool class on first attribute access."""
+    if name in _TOOLS:
+        tool_name, import_path, _ = _TOOLS[name]
+        tool_class = _import_class(import_path)
+        ToolRegistry.register(tool_class, name=tool_name)
+        globals()[name] = tool_class
+        return tool_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["ToolRegistry", *_TOOLS]
@@ -9,16 +9,25 @@ This tool provides audio processing capabilities while following:
 
 import logging
 import asyncio
+import os
 import time
 import io
-import wave
-import numpy as np
+import uuid
 from typing import Dict, Any, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services import audio_stream
+from labeeb.services.audio_stream import AudioSource
+from labeeb.utils.platform_utils import get_labeeb_temp_dir
 
 logger = logging.getLogger(__name__)
 
 
+def _staging_path(path: str) -> str:
+    """Temporary name an output is written under before it replaces ``path``."""
+    base, ext = os.path.splitext(path)
+    return f"{base}.partial-{uuid.uuid4().hex[:8]}{ext}"
+
+
 class AudioTool(BaseTool):
     """Tool for performing audio operations."""
 
@@ -180,40 +189,47 @@ class AudioTool(BaseTool):
         cache_time = self._cache[cache_key]["timestamp"]
         return time.time() - cache_time < self._cache_duration
 
-    def _validate_audio(self, audio_data: bytes) -> Tuple[bool, Optional[str]]:
+    def _validate_audio(self, audio_data: AudioSource) -> Tuple[bool, Optional[str]]:
         """Validate audio data.
 
         Args:
-            audio_data: Audio data to validate
+            audio_data: Audio data or WAV file path to validate
 
         Returns:
             Tuple[bool, Optional[str]]: (is_valid, error_message)
         """
-        if len(audio_data) > self._max_audio_size:
+        if isinstance(audio_data, (bytes, bytearray)) and len(audio_data) > self._max_audio_size:
             return False, f"Audio exceeds maximum size ({self._max_audio_size} bytes)"
 
         try:
-            with wave.open(io.BytesIO(audio_data), "rb") as wav:
-                if wav.getnchannels() not in [1, 2]:
-                    return False, f"Unsupported number of channels: {wav.getnchannels()}"
+            params = audio_stream.read_params(audio_data)
+            if params.nchannels not in [1, 2]:
+                return False, f"Unsupported number of channels: {params.nchannels}"
 
-                if wav.getsampwidth() not in [1, 2, 4]:
-                    return False, f"Unsupported sample width: {wav.getsampwidth()}"
+            if params.sampwidth not in [1, 2, 4]:
+                return False, f"Unsupported sample width: {params.sampwidth}"
 
-                duration = wav.getnframes() / wav.getframerate()
-                if duration > self._max_duration:
-                    return False, f"Audio exceeds maximum duration ({self._max_duration} seconds)"
+            duration = params.nframes / params.framerate
+            if duration > self._max_duration:
+                return False, f"Audio exceeds maximum duration ({self._max_duration} seconds)"
 
             return True, None
         except Exception as e:
             return False, f"Invalid audio data: {str(e)}"
 
-    async def _process_audio(self, audio_data: bytes, operation: str, **kwargs) -> Dict[str, Any]:
+    async def _process_audio(
+        self, audio_data: AudioSource, operation: str, output_path: Optional[str] = None, **kwargs
+    ) -> Dict[str, Any]:
         """Process audio data with the given operation.
 
+        Audio is read and written in blocks. Audio given as data is returned as
+        data, as before; audio given as a WAV file path is written to
+        ``output_path`` (or a generated path) and never held in memory.
+
         Args:
-            audio_data: Audio data to process
+            audio_data: Audio data or WAV file path to process
             operation: Operation to perform
+            output_path: Where to write the result of a path input
             **kwargs: Operation parameters
 
         Returns:
@@ -225,125 +241,135 @@ class AudioTool(BaseTool):
             if not is_valid:
                 return {"error": error}
 
-            # Check cache
-            cache_key = self._get_cache_key(audio_data, operation, **kwargs)
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
-
-            # Process audio
-            with wave.open(io.BytesIO(audio_data), "rb") as wav:
-                params = wav.getparams()
-                frames = wav.readframes(wav.getnframes())
-                audio_array = np.frombuffer(frames, dtype=np.int16)
-
-                if operation == "convert":
-                    format = kwargs.get("format")
-                    if format not in self._allowed_formats:
-                        return {"error": f"Unsupported format: {format}"}
-                    # Convert audio format
-                    output = io.BytesIO()
-                    with wave.open(output, "wb") as out_wav:
-                        out_wav.setparams(params)
-                        out_wav.writeframes(audio_array.tobytes())
-                    processed_data = output.getvalue()
-
-                elif operation == "trim":
-                    start = kwargs.get("start", 0)
-                    end = kwargs.get("end")
-                    if end is None:
-                        end = len(audio_array) / self._sample_rate
-                    start_frame = int(start * self._sample_rate)
-                    end_frame = int(end * self._sample_rate)
-                    audio_array = audio_array[start_frame:end_frame]
-                    output = io.BytesIO()
-                    with wave.open(output, "wb") as out_wav:
-                        out_wav.setparams(params)
-                        out_wav.writeframes(audio_array.tobytes())
-                    processed_data = output.getvalue()
-
-                elif operation == "merge":
-                    other_audio = kwargs.get("other_audio")
-                    if not other_audio:
-                        return {"error": "Missing other audio data"}
-                    with wave.open(io.BytesIO(other_audio), "rb") as other_wav:
-                        other_frames = other_wav.readframes(other_wav.getnframes())
-                        other_array = np.frombuffer(other_frames, dtype=np.int16)
-                        merged_array = np.concatenate([audio_array, other_array])
-                    output = io.BytesIO()
-                    with wave.open(output, "wb") as out_wav:
-                        out_wav.setparams(params)
-                        out_wav.writeframes(merged_array.tobytes())
-                    processed_data = output.getvalue()
-
-                elif operation == "split":
-                    segments = kwargs.get("segments", 2)
-                    segment_length = len(audio_array) // segments
-                    segments_data = []
-                    for i in range(segments):
-                        start = i * segment_length
-                        end = start + segment_length if i < segments - 1 else len(audio_array)
-                        segment_array = audio_array[start:end]
-                        output = io.BytesIO()
-                        with wave.open(output, "wb") as out_wav:
-                            out_wav.setparams(params)
-                            out_wav.writeframes(segment_array.tobytes())
-                        segments_data.append(output.getvalue())
-                    processed_data = segments_data
-
-                elif operation == "normalize":
-                    max_value = np.max(np.abs(audio_array))
-                    if max_value > 0:
-                        normalized_array = (audio_array / max_value * 32767).astype(np.int16)
-                    else:
-                        normalized_array = audio_array
-                    output = io.BytesIO()
-                    with wave.open(output, "wb") as out_wav:
-                        out_wav.setparams(params)
-                        out_wav.writeframes(normalized_array.tobytes())
-                    processed_data = output.getvalue()
-
-                elif operation == "filter":
-                    filter_type = kwargs.get("filter_type")
-                    if filter_type == "lowpass":
-                        # Simple low-pass filter
-                        cutoff = kwargs.get("cutoff", 1000)
-                        nyquist = self._sample_rate / 2
-                        normalized_cutoff = cutoff / nyquist
-                        b, a = signal.butter(4, normalized_cutoff, btype="low")
-                        filtered_array = signal.filtfilt(b, a, audio_array)
-                    elif filter_type == "highpass":
-                        # Simple high-pass filter
-                        cutoff = kwargs.get("cutoff", 1000)
-                        nyquist = self._sample_rate / 2
-                        normalized_cutoff = cutoff / nyquist
-                        b, a = signal.butter(4, normalized_cutoff, btype="high")
-                        filtered_array = signal.filtfilt(b, a, audio_array)
-                    else:
-                        return {"error": f"Unsupported filter type: {filter_type}"}
-                    output = io.BytesIO()
-                    with wave.open(output, "wb") as out_wav:
-                        out_wav.setparams(params)
-                        out_wav.writeframes(filtered_array.tobytes())
-                    processed_data = output.getvalue()
+            in_memory = isinstance(audio_data, (bytes, bytearray))
+            if in_memory:
+                # Check cache
+                cache_key = self._get_cache_key(audio_data, operation, **kwargs)
+                if self._is_cache_valid(cache_key):
+                    return self._cache[cache_key]["data"]
+
+            if operation == "convert" and kwargs.get("format") not in self._allowed_formats:
+                return {"error": f"Unsupported format: {kwargs.get('format')}"}
+
+            result = await asyncio.to_thread(
+                self._run_operation, audio_data, operation, output_path, kwargs
+            )
 
             # Cache result
-            self._cache[cache_key] = {
-                "data": {
-                    "status": "success",
-                    "action": operation,
-                    "audio_data": processed_data,
-                    "format": "WAV",
-                    "size": len(processed_data),
-                    "duration": len(audio_array) / self._sample_rate,
-                },
-                "timestamp": time.time(),
-            }
+            if in_memory and "error" not in result:
+                self._cache[cache_key] = {"data": result, "timestamp": time.time()}
 
-            return self._cache[cache_key]["data"]
+            return result
         except Exception as e:
             logger.error(f"Error processing audio: {e}")
             return {"error": str(e)}
 
+    def _run_operation(
+        self,
+        audio_data: AudioSource,
+        operation: str,
+        output_path: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run an operation to completion on a worker thread.
+
+        Args:
+            audio_data: Audio data or WAV file path
+            operation: Operation to perform
+            output_path: Where to write the result of a path input
+            kwargs: Operation parameters
+
+        Returns:
+            Dict[str, Any]: Processing result
+        """
+        in_memory = isinstance(audio_data, (bytes, bytearray))
+        params = audio_stream.read_params(audio_data)
+
+        if operation == "split":
+            count = max(int(kwargs.get("segments") or 2), 1)
+        else:
+            count = 1
+        if in_memory:
+            outputs = [io.BytesIO() for _ in range(count)]
+        else:
+            if output_path:
+                base, ext = os.path.splitext(output_path)
+            else:
+                directory = get_labeeb_temp_dir() / "audio"
+                directory.mkdir(parents=True, exist_ok=True)
+                stem = os.path.splitext(os.path.basename(audio_data))[0]
+                base, ext = str(directory / f"{stem}_{operation}_{uuid.uuid4().hex[:8]}"), ""
+            ext = ext or ".wav"
+            if operation == "split":
+                outputs = [f"{base}_{i:03d}{ext}" for i in range(count)]
+            else:
+                outputs = [f"{base}{ext}"]
+
+        # Files are written under temporary names and renamed when complete, so an
+        # output path that is also an input is not truncated before it is read
+        targets = outputs
+        if not in_memory:
+            outputs = [_staging_path(target) for target in targets]
+        try:
+            if operation == "convert":
+                audio_stream.convert(audio_data, outputs[0])
+            elif operation == "trim":
+                audio_stream.trim(
+                    audio_data, outputs[0], kwargs.get("start") or 0, kwargs.get("end")
+                )
+            elif operation == "merge":
+                other_audio = kwargs.get("other_audio")
+                if not other_audio:
+                    return {"error": "Missing other audio data"}
+                audio_stream.merge([audio_data, other_audio], outputs[0])
+            elif operation == "split":
+                audio_stream.split(audio_data, outputs)
+            elif operation == "normalize":
+                audio_stream.normalize(audio_data, outputs[0])
+            elif operation == "filter":
+                sos = audio_stream.design_filter(
+                    kwargs.get("filter_type"), kwargs.get("cutoff", 1000), params.framerate
+                )
+                audio_stream.apply_filter(audio_data, outputs[0], sos)
+            else:
+                return {"error": f"Unsupported operation: {operation}"}
+
+            if in_memory:
+                data = [output.getvalue() for output in outputs]
+                sizes = [len(item) for item in data]
+            else:
+                sizes = [os.path.getsize(output) for output in outputs]
+                for staged, target in zip(outputs, targets):
+                    os.replace(staged, target)
+        finally:
+            if not in_memory:
+                for staged in outputs:
+                    if os.path.exists(staged):
+                        os.remove(staged)
+        outputs = targets
+
+        result = {
+            "status": "success",
+            "action": operation,
+            "format": "WAV",
+            "size": sum(sizes),
+            "duration": params.nframes / params.framerate,
+        }
+        if operation == "split":
+            result["sizes"] = sizes
+        if in_memory:
+            result["audio_data"] = data if operation == "split" else data[0]
+        elif operation == "split":
+            result["output_paths"] = outputs
+        else:
+            result["output_path"] = outputs[0]
+        return result
+
+    @staticmethod
+    def _get_source(args: Dict[str, Any]) -> Optional[AudioSource]:
+        """Get the input audio from command arguments, preferring a file path."""
+        return args.get("audio_path") or args.get("audio_data")
+
     async def _convert_format(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Convert audio format.
 
@@ -354,10 +380,15 @@ class AudioTool(BaseTool):
             Dict[str, Any]: Convert result
         """
         try:
-            if not args or "audio_data" not in args or "format" not in args:
+            if not args or not self._get_source(args) or "format" not in args:
                 return {"error": "Missing required arguments"}
 
-            result = await self._process_audio(args["audio_data"], "convert", format=args["format"])
+            result = await self._process_audio(
+                self._get_source(args),
+                "convert",
+                output_path=args.get("output_path"),
+                format=args["format"],
+            )
 
             if "error" not in result:
                 self._add_to_history("convert", {"format": args["format"], "size": result["size"]})
@@ -377,11 +408,15 @@ class AudioTool(BaseTool):
             Dict[str, Any]: Trim result
         """
         try:
-            if not args or "audio_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing audio data"}
 
             result = await self._process_audio(
-                args["audio_data"], "trim", start=args.get("start", 0), end=args.get("end")
+                self._get_source(args),
+                "trim",
+                output_path=args.get("output_path"),
+                start=args.get("start", 0),
+                end=args.get("end"),
             )
 
             if "error" not in result:
@@ -405,11 +440,15 @@ class AudioTool(BaseTool):
             Dict[str, Any]: Merge result
         """
         try:
-            if not args or "audio_data" not in args or "other_audio" not in args:
+            other_audio = args.get("other_path") or args.get("other_audio") if args else None
+            if not args or not self._get_source(args) or not other_audio:
                 return {"error": "Missing required arguments"}
 
             result = await self._process_audio(
-                args["audio_data"], "merge", other_audio=args["other_audio"]
+                self._get_source(args),
+                "merge",
+                output_path=args.get("output_path"),
+                other_audio=other_audio,
             )
 
             if "error" not in result:
@@ -430,20 +469,20 @@ class AudioTool(BaseTool):
             Dict[str, Any]: Split result
         """
         try:
-            if not args or "audio_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing audio data"}
 
             result = await self._process_audio(
-                args["audio_data"], "split", segments=args.get("segments", 2)
+                self._get_source(args),
+                "split",
+                output_path=args.get("output_path"),
+                segments=args.get("segments", 2),
             )
 
             if "error" not in result:
                 self._add_to_history(
                     "split",
-                    {
-                        "segments": args.get("segments", 2),
-                        "sizes": [len(segment) for segment in result["audio_data"]],
-                    },
+                    {"segments": args.get("segments", 2), "sizes": result["sizes"]},
                 )
 
             return result
@@ -461,10 +500,12 @@ class AudioTool(BaseTool):
             Dict[str, Any]: Normalize result
         """
         try:
-            if not args or "audio_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing audio data"}
 
-            result = await self._process_audio(args["audio_data"], "normalize")
+            result = await self._process_audio(
+                self._get_source(args), "normalize", output_path=args.get("output_path")
+            )
 
             if "error" not in result:
                 self._add_to_history("normalize", {"size": result["size"]})
@@ -484,12 +525,13 @@ class AudioTool(BaseTool):
             Dict[str, Any]: Filter result
         """
         try:
-            if not args or "audio_data" not in args or "filter_type" not in args:
+            if not args or not self._get_source(args) or "filter_type" not in args:
                 return {"error": "Missing required arguments"}
 
             result = await self._process_audio(
-                args["audio_data"],
+                self._get_source(args),
                 "filter",
+                output_path=args.get("output_path"),
                 filter_type=args["filter_type"],
                 cutoff=args.get("cutoff", 1000),
             )
@@ -9,14 +9,29 @@ This tool provides caching operations while following:
 
 import logging
 import asyncio
+import heapq
 import time
 import json
 import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
 
 logger = logging.getLogger(__name__)
 
+EVICTION_POLICIES = ("lru", "lfu", "ttl")
+
+
+@dataclass
+class _CacheEntry:
+    """A cached value with its size, measured once when it is stored."""
+
+    value: Any
+    size: int
+    expiry: Optional[float]
+    hits: int = 0
+
 
 class CacheTool(BaseTool):
     """Tool for performing caching operations."""
@@ -34,7 +49,18 @@ class CacheTool(BaseTool):
         self._max_memory = config.get("max_memory", 100 * 1024 * 1024)  # 100MB
         self._default_ttl = config.get("default_ttl", 3600)  # 1 hour
         self._serializer = config.get("serializer", "json")
-        self._cache = {}
+        self._eviction_policy = config.get("eviction_policy", "lru")
+        # Entries in recency order, least recently used first
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # Keys grouped by hit count, each group in recency order, for LFU eviction
+        self._frequencies: Dict[int, "OrderedDict[str, None]"] = {}
+        # (expiry, key) pairs; stale pairs are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._memory_usage = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
 
@@ -49,6 +75,9 @@ class CacheTool(BaseTool):
             if self._serializer not in ["json", "pickle"]:
                 logger.error(f"Invalid serializer: {self._serializer}")
                 return False
+            if self._eviction_policy not in EVICTION_POLICIES:
+                logger.error(f"Invalid eviction policy: {self._eviction_policy}")
+                return False
             return await super().initialize()
         except Exception as e:
             logger.error(f"Failed to initialize CacheTool: {e}")
@@ -57,7 +86,7 @@ class CacheTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache.clear()
+            self._clear_entries()
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -92,8 +121,9 @@ class CacheTool(BaseTool):
             "max_memory": self._max_memory,
             "default_ttl": self._default_ttl,
             "serializer": self._serializer,
+            "eviction_policy": self._eviction_policy,
             "cache_size": len(self._cache),
-            "memory_usage": self._get_memory_usage(),
+            "memory_usage": self._memory_usage,
             "history_size": len(self._operation_history),
             "max_history": self._max_history,
         }
@@ -175,11 +205,127 @@ class CacheTool(BaseTool):
         Returns:
             int: Memory usage in bytes
         """
-        total_size = 0
-        for key, value in self._cache.items():
-            total_size += len(key.encode())
-            total_size += len(self._serialize(value))
-        return total_size
+        return self._memory_usage
+
+    def _store(self, key: str, value: Any, size: int, expiry: Optional[float]) -> None:
+        """Store an entry, replacing any entry under the same key.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Serialized size of the key and value
+            expiry: Expiry timestamp, or None if the entry never expires
+        """
+        self._remove(key)
+        self._cache[key] = _CacheEntry(value, size, expiry)
+        self._frequencies.setdefault(0, OrderedDict())[key] = None
+        self._memory_usage += size
+        if expiry is not None:
+            heapq.heappush(self._expiry_heap, (expiry, key))
+
+    def _remove(self, key: str) -> Optional[_CacheEntry]:
+        """Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[_CacheEntry]: The removed entry, or None if there was none
+        """
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return None
+        bucket = self._frequencies[entry.hits]
+        del bucket[key]
+        if not bucket:
+            del self._frequencies[entry.hits]
+        self._memory_usage -= entry.size
+        return entry
+
+    def _touch(self, key: str, entry: _CacheEntry) -> None:
+        """Record a hit on an entry for LRU and LFU ordering.
+
+        Args:
+            key: Cache key
+            entry: The entry that was hit
+        """
+        self._cache.move_to_end(key)
+        bucket = self._frequencies[entry.hits]
+        del bucket[key]
+        if not bucket:
+            del self._frequencies[entry.hits]
+        entry.hits += 1
+        self._frequencies.setdefault(entry.hits, OrderedDict())[key] = None
+
+    def _clear_entries(self) -> None:
+        """Remove all entries."""
+        self._cache.clear()
+        self._frequencies.clear()
+        self._expiry_heap.clear()
+        self._memory_usage = 0
+
+    def _is_live_expiry(self, expiry: float, key: str) -> bool:
+        """Check whether a heap item still matches a stored entry."""
+        entry = self._cache.get(key)
+        return entry is not None and entry.expiry == expiry
+
+    def _purge_expired(self, now: Optional[float] = None) -> int:
+        """Remove every expired entry.
+
+        Args:
+            now: Current timestamp, defaults to time.time()
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time() if now is None else now
+        purged = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expiry, key = heapq.heappop(self._expiry_heap)
+            if self._is_live_expiry(expiry, key):
+                self._remove(key)
+                purged += 1
+        self._expirations += purged
+        # Drop stale heap items once they outnumber live entries
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                item for item in self._expiry_heap if self._is_live_expiry(*item)
+            ]
+            heapq.heapify(self._expiry_heap)
+        return purged
+
+    def _select_victim(self) -> Optional[str]:
+        """Choose the entry to evict under the configured policy.
+
+        Returns:
+            Optional[str]: Key of the entry to evict, or None if the cache is empty
+        """
+        if not self._cache:
+            return None
+        if self._eviction_policy == "lfu":
+            # Least frequently used, least recently used among ties
+            return next(iter(self._frequencies[min(self._frequencies)]))
+        if self._eviction_policy == "ttl":
+            # Soonest to expire; entries without a TTL go last, in LRU order
+            while self._expiry_heap:
+                expiry, key = self._expiry_heap[0]
+                if self._is_live_expiry(expiry, key):
+                    return key
+                heapq.heappop(self._expiry_heap)
+        return next(iter(self._cache))
+
+    def _make_room(self, size: int) -> None:
+        """Evict entries until an entry of the given size fits both limits.
+
+        Args:
+            size: Size of the entry to be stored
+        """
+        self._purge_expired()
+        while self._cache and (
+            len(self._cache) >= self._max_size or self._memory_usage + size > self._max_memory
+        ):
+            self._remove(self._select_victim())
+            self._evictions += 1
 
     async def _get(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get value from cache.
@@ -197,20 +343,24 @@ class CacheTool(BaseTool):
             key = args["key"]
 
             # Check if key exists
-            if key not in self._cache:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
                 return {"status": "error", "action": "get", "error": f"Key not found: {key}"}
 
-            # Get value
-            value, expiry = self._cache[key]
-
             # Check expiry
-            if expiry and time.time() > expiry:
-                del self._cache[key]
+            if entry.expiry is not None and time.time() > entry.expiry:
+                self._remove(key)
+                self._misses += 1
+                self._expirations += 1
                 return {"status": "error", "action": "get", "error": f"Key expired: {key}"}
 
-            self._add_to_history("get", {"key": key, "value_size": len(self._serialize(value))})
+            self._hits += 1
+            self._touch(key, entry)
+
+            self._add_to_history("get", {"key": key, "value_size": entry.size})
 
-            return {"status": "success", "action": "get", "key": key, "value": value}
+            return {"status": "success", "action": "get", "key": key, "value": entry.value}
         except Exception as e:
             logger.error(f"Error getting value from cache: {e}")
             return {"error": str(e)}
@@ -232,18 +382,19 @@ class CacheTool(BaseTool):
             value = args["value"]
             ttl = args.get("ttl", self._default_ttl)
 
-            # Check cache size
-            if len(self._cache) >= self._max_size:
-                return {"status": "error", "action": "set", "error": "Cache size limit reached"}
-
-            # Check memory usage
+            # Measure the entry once; the running total is kept from here on
             value_size = len(self._serialize(value))
-            if self._get_memory_usage() + value_size > self._max_memory:
-                return {"status": "error", "action": "set", "error": "Memory limit reached"}
+            entry_size = len(key.encode()) + value_size
+            if entry_size > self._max_memory:
+                return {"status": "error", "action": "set", "error": "Value exceeds memory limit"}
+
+            # Replace any existing entry, then evict until the new one fits
+            self._remove(key)
+            self._make_room(entry_size)
 
             # Set value
             expiry = time.time() + ttl if ttl > 0 else None
-            self._cache[key] = (value, expiry)
+            self._store(key, value, entry_size, expiry)
 
             self._add_to_history("set", {"key": key, "value_size": value_size, "ttl": ttl})
 
@@ -267,12 +418,9 @@ class CacheTool(BaseTool):
 
             key = args["key"]
 
-            # Check if key exists
-            if key not in self._cache:
-                return {"status": "error", "action": "delete", "error": f"Key not found: {key}"}
-
             # Delete value
-            del self._cache[key]
+            if self._remove(key) is None:
+                return {"status": "error", "action": "delete", "error": f"Key not found: {key}"}
 
             self._add_to_history("delete", {"key": key})
 
@@ -288,7 +436,7 @@ class CacheTool(BaseTool):
             Dict[str, Any]: Clear result
         """
         try:
-            self._cache.clear()
+            self._clear_entries()
 
             self._add_to_history("clear", {"cache_size": 0})
 
@@ -304,13 +452,21 @@ class CacheTool(BaseTool):
             Dict[str, Any]: Cache statistics
         """
         try:
+            self._purge_expired()
+            lookups = self._hits + self._misses
             stats = {
                 "size": len(self._cache),
-                "memory_usage": self._get_memory_usage(),
+                "memory_usage": self._memory_usage,
                 "max_size": self._max_size,
                 "max_memory": self._max_memory,
                 "default_ttl": self._default_ttl,
                 "serializer": self._serializer,
+                "eviction_policy": self._eviction_policy,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
             }
 
             self._add_to_history("stats", stats)
@@ -10,9 +10,10 @@ This tool provides calendar capabilities while following:
 import logging
 import asyncio
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.event_store import EventStore
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +33,11 @@ class CalendarTool(BaseTool):
         self._calendar_id = config.get("calendar_id")
         self._timezone = config.get("timezone", "UTC")
         self._max_events = config.get("max_events", 100)
-        self._max_recurrence = config.get("max_recurrence", 52)  # weeks
+        self._max_recurrence = config.get("max_recurrence", 52)  # occurrences
+        self._storage_path = config.get("storage_path")  # SQLite file, None for memory only
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._events = {}  # In-memory event storage
+        self._events = EventStore(self._storage_path)
 
     async def initialize(self) -> bool:
         """Initialize the tool.
@@ -49,8 +51,9 @@ class CalendarTool(BaseTool):
                 logger.error("Calendar ID is required")
                 return False
 
-            # Initialize event storage
-            self._events = {}
+            # Initialize event storage, loading persisted events
+            self._events.close()
+            self._events = EventStore(self._storage_path)
 
             return await super().initialize()
         except Exception as e:
@@ -60,7 +63,9 @@ class CalendarTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._events = {}
+            # Persisted events stay on disk; in-memory ones are discarded
+            self._events.close()
+            self._events = EventStore()
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -95,6 +100,7 @@ class CalendarTool(BaseTool):
             "timezone": self._timezone,
             "max_events": self._max_events,
             "max_recurrence": self._max_recurrence,
+            "storage_path": self._storage_path,
             "event_count": len(self._events),
             "history_size": len(self._operation_history),
             "max_history": self._max_history,
@@ -208,33 +214,15 @@ class CalendarTool(BaseTool):
                 "updated_at": datetime.now().isoformat(),
             }
 
-            # Handle recurrence
+            # Recurring events are stored once, as a rule, and expanded when searched
             if event["recurrence"]:
-                if event["recurrence"].get("count", 0) > self._max_recurrence:
+                count = event["recurrence"].get("count")
+                if count is not None and count > self._max_recurrence:
                     return {"error": f"Maximum recurrence count exceeded ({self._max_recurrence})"}
-
-                # Create recurring events
-                start_time = datetime.fromisoformat(event["start_time"])
-                end_time = datetime.fromisoformat(event["end_time"])
-                duration = end_time - start_time
-
-                for i in range(event["recurrence"].get("count", 1)):
-                    if i == 0:
-                        self._events[event_id] = event
-                    else:
-                        recur_id = f"{event_id}_recur_{i}"
-                        recur_start = start_time + timedelta(weeks=i)
-                        recur_end = recur_start + duration
-
-                        recur_event = event.copy()
-                        recur_event["id"] = recur_id
-                        recur_event["start_time"] = recur_start.isoformat()
-                        recur_event["end_time"] = recur_end.isoformat()
-                        recur_event["recurrence"] = None
-
-                        self._events[recur_id] = recur_event
-            else:
-                self._events[event_id] = event
+                if count is None:
+                    # A series without a count still ends after max_recurrence occurrences
+                    event["recurrence"] = {**event["recurrence"], "count": self._max_recurrence}
+            self._events.add(event)
 
             result = {"status": "success", "action": "create", "event_id": event_id, "event": event}
 
@@ -259,10 +247,11 @@ class CalendarTool(BaseTool):
                 return {"error": "Missing event ID"}
 
             event_id = args["event_id"]
-            if event_id not in self._events:
+            event = self._events.get(event_id)
+            if event is None:
                 return {"error": "Event not found"}
 
-            result = {"status": "success", "action": "read", "event": self._events[event_id]}
+            result = {"status": "success", "action": "read", "event": event}
 
             self._add_to_history("read", {"event_id": event_id})
 
@@ -285,11 +274,13 @@ class CalendarTool(BaseTool):
                 return {"error": "Invalid update data"}
 
             event_id = args["event_id"]
-            if event_id not in self._events:
+            # An occurrence of a recurring event becomes an event of its own
+            event = self._events.detach(event_id)
+            if event is None:
                 return {"error": "Event not found"}
 
             # Update event
-            event = self._events[event_id]
+            event = dict(event)
             event.update(
                 {
                     "title": args["title"],
@@ -301,6 +292,7 @@ class CalendarTool(BaseTool):
                     "updated_at": datetime.now().isoformat(),
                 }
             )
+            self._events.add(event)
 
             result = {"status": "success", "action": "update", "event_id": event_id, "event": event}
 
@@ -325,17 +317,12 @@ class CalendarTool(BaseTool):
                 return {"error": "Missing event ID"}
 
             event_id = args["event_id"]
-            if event_id not in self._events:
-                return {"error": "Event not found"}
 
-            # Delete event
-            event = self._events.pop(event_id)
-
-            # Delete recurring events
-            if event.get("recurrence"):
-                for recur_id in list(self._events.keys()):
-                    if recur_id.startswith(f"{event_id}_recur_"):
-                        self._events.pop(recur_id)
+            # Deleting a recurring event deletes the series; deleting one
+            # occurrence skips it in the series
+            event = self._events.remove(event_id)
+            if event is None:
+                return {"error": "Event not found"}
 
             result = {"status": "success", "action": "delete", "event_id": event_id}
 
@@ -370,35 +357,18 @@ class CalendarTool(BaseTool):
             if end_time:
                 end_time = datetime.fromisoformat(end_time)
 
-            # Search events
-            matching_events = []
-            for event in self._events.values():
-                # Skip recurring event instances
-                if "_recur_" in event["id"]:
-                    continue
-
-                # Check query match
+            def matches(event: Dict[str, Any]) -> bool:
                 if (
                     query
                     and query not in event["title"].lower()
                     and query not in event["description"].lower()
                 ):
-                    continue
-
-                # Check time range
-                event_start = datetime.fromisoformat(event["start_time"])
-                event_end = datetime.fromisoformat(event["end_time"])
-
-                if start_time and event_end < start_time:
-                    continue
-                if end_time and event_start > end_time:
-                    continue
-
-                # Check location
-                if location and location not in event["location"].lower():
-                    continue
+                    return False
+                return not location or location in event["location"].lower()
 
-                matching_events.append(event)
+            # With a time range, recurring events are expanded into their
+            # occurrences within it; without one, each series is listed once
+            matching_events = self._events.between(start_time, end_time, matches)
 
             result = {"status": "success", "action": "search", "events": matching_events}
 
@@ -11,8 +11,16 @@ import logging
 import asyncio
 import time
 import aiomysql
-from typing import Dict, Any, List, Optional, Union, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service
+from labeeb.services.sql_stream import (
+    DEFAULT_PAGE_SIZE,
+    fetch_limited,
+    fetch_schema,
+    insert_many,
+    iter_rows,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +45,11 @@ class DatabaseTool(BaseTool):
         self._max_connections = config.get("max_connections", 10)
         self._max_query_time = config.get("max_query_time", 30)  # seconds
         self._max_results = config.get("max_results", 1000)
+        self._page_size = config.get("page_size", DEFAULT_PAGE_SIZE)
+        self._schema_cache_ttl = config.get("schema_cache_ttl", 300)  # seconds
+        self._schema_cache = get_cache_service().namespace(
+            "database_tool", ttl=self._schema_cache_ttl
+        )
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
         self._pool = None
@@ -72,6 +85,7 @@ class DatabaseTool(BaseTool):
         """Clean up resources used by the tool."""
         try:
             if self._pool:
+                self._schema_cache.delete(self._schema_key())
                 self._pool.close()
                 await self._pool.wait_closed()
                 self._pool = None
@@ -93,6 +107,7 @@ class DatabaseTool(BaseTool):
             "execute": True,
             "transaction": True,
             "schema": True,
+            "insert_many": True,
             "history": True,
         }
         return {**base_capabilities, **tool_capabilities}
@@ -111,6 +126,7 @@ class DatabaseTool(BaseTool):
             "max_connections": self._max_connections,
             "max_query_time": self._max_query_time,
             "max_results": self._max_results,
+            "page_size": self._page_size,
             "history_size": len(self._operation_history),
             "max_history": self._max_history,
         }
@@ -136,6 +152,8 @@ class DatabaseTool(BaseTool):
             return await self._transaction(args)
         elif command == "schema":
             return await self._schema(args)
+        elif command == "insert_many":
+            return await self._insert_many(args)
         elif command == "get_history":
             return await self._get_history()
         elif command == "clear_history":
@@ -212,34 +230,56 @@ class DatabaseTool(BaseTool):
             if not self._pool:
                 return {"error": "Database connection not initialized"}
 
-            async with self._pool.acquire() as conn:
-                async with conn.cursor() as cur:
-                    await cur.execute(query, params)
-                    results = await cur.fetchall()
+            limit = min(args.get("max_results", self._max_results), self._max_results)
 
-                    # Get column names
-                    columns = [desc[0] for desc in cur.description]
-
-                    # Convert results to list of dictionaries
-                    rows = []
-                    for row in results[: self._max_results]:
-                        rows.append(dict(zip(columns, row)))
+            async with self._pool.acquire() as conn:
+                # The server stops after `limit` rows, and rows arrive a page at a time
+                columns, rows, truncated = await fetch_limited(
+                    conn, query, params, limit=limit, page_size=self._page_size
+                )
 
-                    self._add_to_history(
-                        "query", {"query": query, "params": params, "rows_returned": len(rows)}
-                    )
+            self._add_to_history(
+                "query", {"query": query, "params": params, "rows_returned": len(rows)}
+            )
 
-                    return {
-                        "status": "success",
-                        "action": "query",
-                        "columns": columns,
-                        "rows": rows,
-                        "total": len(rows),
-                    }
+            return {
+                "status": "success",
+                "action": "query",
+                "columns": columns,
+                "rows": rows,
+                "total": len(rows),
+                "truncated": truncated,
+            }
         except Exception as e:
             logger.error(f"Error executing query: {e}")
             return {"error": str(e)}
 
+    async def iter_query(
+        self, query: str, params: Optional[Union[List[Any], Dict[str, Any]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over every row of a SELECT query, one page in memory at a time.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+
+        Yields:
+            Dict[str, Any]: Row keyed by column name
+
+        Raises:
+            ValueError: If the query is rejected
+            RuntimeError: If the connection pool is not initialized
+        """
+        is_valid, error = self._validate_query(query)
+        if not is_valid:
+            raise ValueError(error)
+        if not self._pool:
+            raise RuntimeError("Database connection not initialized")
+
+        async with self._pool.acquire() as conn:
+            async for row in iter_rows(conn, query, params, page_size=self._page_size):
+                yield row
+
     async def _execute(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute a non-SELECT query.
 
@@ -355,41 +395,73 @@ class DatabaseTool(BaseTool):
             if not self._pool:
                 return {"error": "Database connection not initialized"}
 
-            async with self._pool.acquire() as conn:
-                async with conn.cursor() as cur:
-                    # Get tables
-                    await cur.execute("SHOW TABLES")
-                    tables = [row[0] for row in await cur.fetchall()]
-
-                    # Get table information
-                    table_info = {}
-                    for table in tables:
-                        await cur.execute(f"DESCRIBE {table}")
-                        columns = await cur.fetchall()
-                        table_info[table] = [
-                            {
-                                "field": col[0],
-                                "type": col[1],
-                                "null": col[2],
-                                "key": col[3],
-                                "default": col[4],
-                                "extra": col[5],
-                            }
-                            for col in columns
-                        ]
-
-                    self._add_to_history("schema", {"tables": tables, "table_info": table_info})
+            # Cached per pool; pass refresh to pick up schema changes
+            key = self._schema_key()
+            table_info = None if args and args.get("refresh") else self._schema_cache.get(key)
+            cached = table_info is not None
+            if not cached:
+                async with self._pool.acquire() as conn:
+                    table_info = await fetch_schema(conn)
+                self._schema_cache.set(key, table_info)
+            tables = list(table_info)
 
-                    return {
-                        "status": "success",
-                        "action": "schema",
-                        "tables": tables,
-                        "table_info": table_info,
-                    }
+            self._add_to_history("schema", {"tables": tables, "cached": cached})
+
+            return {
+                "status": "success",
+                "action": "schema",
+                "tables": tables,
+                "table_info": table_info,
+                "cached": cached,
+            }
         except Exception as e:
             logger.error(f"Error getting schema: {e}")
             return {"error": str(e)}
 
+    def _schema_key(self) -> Tuple[str, int, str, str]:
+        """Cache key for the schema of the database this tool's pool connects to."""
+        return ("schema", self._host, self._port, self._database)
+
+    async def _insert_many(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Insert many rows into a table with batched multi-row INSERTs.
+
+        Args:
+            args: Insert arguments: table, columns, rows (value lists in column order,
+                or dicts keyed by column) and an optional batch_size
+
+        Returns:
+            Dict[str, Any]: Insert result
+        """
+        try:
+            if not args or not all(key in args for key in ("table", "columns", "rows")):
+                return {"error": "Missing required arguments"}
+
+            if not self._pool:
+                return {"error": "Database connection not initialized"}
+
+            async with self._pool.acquire() as conn:
+                affected_rows = await insert_many(
+                    conn,
+                    args["table"],
+                    args["columns"],
+                    args["rows"],
+                    batch_size=args.get("batch_size", self._page_size),
+                )
+
+            self._add_to_history(
+                "insert_many",
+                {
+                    "table": args["table"],
+                    "columns": args["columns"],
+                    "affected_rows": affected_rows,
+                },
+            )
+
+            return {"status": "success", "action": "insert_many", "affected_rows": affected_rows}
+        except Exception as e:
+            logger.error(f"Error inserting rows: {e}")
+            return {"error": str(e)}
+
     async def _get_history(self) -> Dict[str, Any]:
         """Get operation history.
 
@@ -7,13 +7,19 @@ This tool provides file system operations while following:
 - SmolAgents pattern for minimal, efficient implementation
 """
 
+import asyncio
 import os
 import shutil
 import logging
 import hashlib
-from typing import Dict, Any, List, Optional, Union
+import time
+from functools import partial
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Union
 from pathlib import Path
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.file_hash_service import get_file_hasher
+from labeeb.services.file_index import get_file_index
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +88,7 @@ class FileSystemTool(BaseTool):
             "list": True,
             "search": True,
             "hash": True,
+            "duplicates": True,
             "history": True,
         }
         return {**base_capabilities, **tool_capabilities}
@@ -130,6 +137,8 @@ class FileSystemTool(BaseTool):
             return await self._search_files(args)
         elif command == "hash":
             return await self._hash_file(args)
+        elif command == "duplicates":
+            return await self._find_duplicates(args)
         elif command == "get_history":
             return await self._get_history()
         elif command == "clear_history":
@@ -396,6 +405,58 @@ class FileSystemTool(BaseTool):
             logger.error(f"Error copying file: {e}")
             return {"error": str(e)}
 
+    def _scan_entries(
+        self, path: Path, recursive: bool, include_hidden: bool
+    ) -> Iterator[os.DirEntry]:
+        """Walk a directory with os.scandir, yielding entries as they are read.
+
+        Args:
+            path: Directory to list
+            recursive: Whether to descend into subdirectories
+            include_hidden: Whether to include entries starting with a dot
+
+        Yields:
+            os.DirEntry: Directory entries, each directory before its contents
+        """
+        stack = [str(path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as scanner:
+                    subdirs = []
+                    for entry in scanner:
+                        if not include_hidden and entry.name.startswith("."):
+                            continue
+                        yield entry
+                        if recursive and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                    stack.extend(reversed(subdirs))
+            except OSError as e:
+                logger.debug(f"Cannot list directory: {e}")
+
+    def _entry_info(self, entry: os.DirEntry) -> Dict[str, Any]:
+        """Describe a directory entry from the stat data cached on it.
+
+        Args:
+            entry: Directory entry
+
+        Returns:
+            Dict[str, Any]: Entry information
+        """
+        is_dir = entry.is_dir()
+        try:
+            stat = entry.stat()
+            size, modified = (None if is_dir else stat.st_size), stat.st_mtime
+        except OSError:
+            # Broken symlink
+            size, modified = None, None
+        return {
+            "name": entry.name,
+            "path": os.path.relpath(entry.path, self._base_path),
+            "type": "directory" if is_dir else "file",
+            "size": size,
+            "modified": modified,
+        }
+
     async def _list_directory(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """List directory contents.
 
@@ -419,41 +480,16 @@ class FileSystemTool(BaseTool):
 
             recursive = args.get("recursive", False)
             include_hidden = args.get("include_hidden", False)
+            offset = args.get("offset", 0)
+            limit = args.get("limit")
 
-            items = []
-            if recursive:
-                for root, dirs, files in os.walk(path):
-                    # Filter hidden items
-                    if not include_hidden:
-                        dirs[:] = [d for d in dirs if not d.startswith(".")]
-                        files = [f for f in files if not f.startswith(".")]
-
-                    for item in dirs + files:
-                        item_path = Path(root) / item
-                        items.append(
-                            {
-                                "name": item,
-                                "path": str(item_path.relative_to(self._base_path)),
-                                "type": "directory" if item_path.is_dir() else "file",
-                                "size": item_path.stat().st_size if item_path.is_file() else None,
-                                "modified": item_path.stat().st_mtime,
-                            }
-                        )
-            else:
-                for item in path.iterdir():
-                    # Skip hidden items
-                    if not include_hidden and item.name.startswith("."):
-                        continue
-
-                    items.append(
-                        {
-                            "name": item.name,
-                            "path": str(item.relative_to(self._base_path)),
-                            "type": "directory" if item.is_dir() else "file",
-                            "size": item.stat().st_size if item.is_file() else None,
-                            "modified": item.stat().st_mtime,
-                        }
-                    )
+            # Fetch one entry past the page to tell whether more remain
+            stop = None if limit is None else offset + limit + 1
+            entries = islice(self._scan_entries(path, recursive, include_hidden), offset, stop)
+            items = [self._entry_info(entry) for entry in entries]
+            has_more = limit is not None and len(items) > limit
+            if has_more:
+                items.pop()
 
             self._add_to_history(
                 "list",
@@ -465,7 +501,14 @@ class FileSystemTool(BaseTool):
                 },
             )
 
-            return {"status": "success", "action": "list", "path": str(path), "items": items}
+            return {
+                "status": "success",
+                "action": "list",
+                "path": str(path),
+                "items": items,
+                "offset": offset,
+                "has_more": has_more,
+            }
         except Exception as e:
             logger.error(f"Error listing directory: {e}")
             return {"error": str(e)}
@@ -495,43 +538,27 @@ class FileSystemTool(BaseTool):
                 return {"error": f"Path is not a directory: {path}"}
 
             matches = []
-            if recursive:
-                for root, dirs, files in os.walk(path):
-                    # Filter hidden items
-                    if not include_hidden:
-                        dirs[:] = [d for d in dirs if not d.startswith(".")]
-                        files = [f for f in files if not f.startswith(".")]
-
-                    for item in dirs + files:
-                        if pattern in item:
-                            item_path = Path(root) / item
-                            matches.append(
-                                {
-                                    "name": item,
-                                    "path": str(item_path.relative_to(self._base_path)),
-                                    "type": "directory" if item_path.is_dir() else "file",
-                                    "size": (
-                                        item_path.stat().st_size if item_path.is_file() else None
-                                    ),
-                                    "modified": item_path.stat().st_mtime,
-                                }
-                            )
+            if recursive and not include_hidden:
+                # The file index skips hidden directories, so it serves only visible entries.
+                # Nothing else is excluded, so matches under node_modules and the like are
+                # still found, as they were by a directory walk.
+                records = get_file_index(excludes=()).search(
+                    term=pattern, root=path, case_sensitive=True, limit=None
+                )
+                for record in records:
+                    matches.append(
+                        {
+                            "name": record.name,
+                            "path": str(Path(record.path).relative_to(self._base_path)),
+                            "type": "directory" if record.is_dir else "file",
+                            "size": None if record.is_dir else record.size,
+                            "modified": record.mtime,
+                        }
+                    )
             else:
-                for item in path.iterdir():
-                    # Skip hidden items
-                    if not include_hidden and item.name.startswith("."):
-                        continue
-
-                    if pattern in item.name:
-                        matches.append(
-                            {
-                                "name": item.name,
-                                "path": str(item.relative_to(self._base_path)),
-                                "type": "directory" if item.is_dir() else "file",
-                                "size": item.stat().st_size if item.is_file() else None,
-                                "modified": item.stat().st_mtime,
-                            }
-                        )
+                for entry in self._scan_entries(path, recursive, include_hidden):
+                    if pattern in entry.name:
+                        matches.append(self._entry_info(entry))
 
             self._add_to_history(
                 "search",
@@ -575,12 +602,8 @@ class FileSystemTool(BaseTool):
             if algorithm not in hashlib.algorithms_available:
                 return {"error": f"Unsupported hash algorithm: {algorithm}"}
 
-            hash_obj = hashlib.new(algorithm)
-            with open(path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_obj.update(chunk)
-
-            hash_value = hash_obj.hexdigest()
+            # Hashed on a thread pool; unchanged files are answered from the digest cache
+            hash_value = await get_file_hasher().hash_file_async(path, algorithm)
 
             self._add_to_history(
                 "hash", {"path": str(path), "algorithm": algorithm, "hash": hash_value}
@@ -597,6 +620,58 @@ class FileSystemTool(BaseTool):
             logger.error(f"Error calculating file hash: {e}")
             return {"error": str(e)}
 
+    async def _find_duplicates(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Find files with identical contents.
+
+        Args:
+            args: Duplicate search arguments
+
+        Returns:
+            Dict[str, Any]: Groups of duplicate files
+        """
+        try:
+            if not args or "path" not in args:
+                return {"error": "Missing path parameter"}
+
+            path = self._validate_path(args["path"])
+            if not path.is_dir():
+                return {"error": f"Path is not a directory: {path}"}
+
+            algorithm = args.get("algorithm", "sha256")
+            if algorithm not in hashlib.algorithms_available:
+                return {"error": f"Unsupported hash algorithm: {algorithm}"}
+
+            loop = asyncio.get_running_loop()
+            groups = await loop.run_in_executor(
+                None,
+                partial(
+                    get_file_hasher().find_duplicates,
+                    path,
+                    algorithm=algorithm,
+                    min_size=args.get("min_size", 1),
+                    include_hidden=args.get("include_hidden", False),
+                ),
+            )
+            duplicates = [
+                [os.path.relpath(file_path, self._base_path) for file_path in group]
+                for group in groups
+            ]
+
+            self._add_to_history(
+                "duplicates", {"path": str(path), "algorithm": algorithm, "groups": len(duplicates)}
+            )
+
+            return {
+                "status": "success",
+                "action": "duplicates",
+                "path": str(path),
+                "algorithm": algorithm,
+                "duplicates": duplicates,
+            }
+        except Exception as e:
+            logger.error(f"Error finding duplicate files: {e}")
+            return {"error": str(e)}
+
     async def _get_history(self) -> Dict[str, Any]:
         """Get operation history.
 
@@ -9,7 +9,6 @@ from labeeb.core.ai.a2a_protocol import A2AProtocol
 from labeeb.core.ai.mcp_protocol import MCPProtocol
 from labeeb.core.ai.smol_agent import SmolAgentProtocol
 import os
-import matplotlib.pyplot as plt
 from labeeb.core.ai.agents.information_collector import InformationCollectorAgent
 
 
@@ -70,7 +69,9 @@ class GraphMakerTool(BaseAgent, A2AProtocol, MCPProtocol, SmolAgentProtocol):
             if debug:
                 print(f"[DEBUG] File type counts: {ext_counts}")
 
-            # Step 3: Generate graph
+            # Step 3: Generate graph (matplotlib is only imported when a graph is drawn)
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots()
             ax.bar(ext_counts.keys(), ext_counts.values())
             ax.set_title("File Type Distribution")
@@ -9,15 +9,21 @@ This tool provides image processing capabilities while following:
 
 import logging
 import asyncio
+import os
 import time
 import aiohttp
 import io
 from PIL import Image
 from typing import Dict, Any, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service, make_cache_key
+from labeeb.services.image_pipeline import get_image_batch_processor, process_image
 
 logger = logging.getLogger(__name__)
 
+# Operations that can be chained in a pipeline or batch
+PIPELINE_OPERATIONS = ("resize", "thumbnail", "crop", "rotate", "flip", "filter", "convert")
+
 
 class ImageTool(BaseTool):
     """Tool for performing image operations."""
@@ -37,8 +43,10 @@ class ImageTool(BaseTool):
         self._quality = config.get("quality", 85)
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Image cache
         self._cache_duration = config.get("cache_duration", 3600)  # 1 hour
+        self._cache = get_cache_service().namespace(
+            "image_tool", ttl=self._cache_duration, scope={"quality": self._quality}
+        )
 
     async def initialize(self) -> bool:
         """Initialize the tool.
@@ -47,9 +55,6 @@ class ImageTool(BaseTool):
             bool: True if initialization was successful, False otherwise
         """
         try:
-            # Initialize cache
-            self._cache = {}
-
             return await super().initialize()
         except Exception as e:
             logger.error(f"Failed to initialize ImageTool: {e}")
@@ -58,7 +63,6 @@ class ImageTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache = {}
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -78,6 +82,8 @@ class ImageTool(BaseTool):
             "flip": True,
             "filter": True,
             "convert": True,
+            "pipeline": True,
+            "batch": True,
             "history": True,
         }
         return {**base_capabilities, **tool_capabilities}
@@ -125,6 +131,10 @@ class ImageTool(BaseTool):
             return await self._apply_filter(args)
         elif command == "convert":
             return await self._convert_format(args)
+        elif command == "pipeline":
+            return await self._pipeline(args)
+        elif command == "batch":
+            return await self._batch(args)
         elif command == "get_history":
             return await self._get_history()
         elif command == "clear_history":
@@ -156,49 +166,33 @@ class ImageTool(BaseTool):
         Returns:
             str: Cache key
         """
-        import hashlib
-
-        params = [hashlib.md5(image_data).hexdigest(), operation]
-        for key, value in sorted(kwargs.items()):
-            params.append(f"{key}={value}")
-        return "|".join(params)
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
+        return make_cache_key(image_data, operation, **kwargs)
 
-        Args:
-            cache_key: Cache key to check
-
-        Returns:
-            bool: True if cache is valid, False otherwise
-        """
-        if cache_key not in self._cache:
-            return False
-
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
-
-    def _validate_image(self, image_data: bytes) -> Tuple[bool, Optional[str]]:
+    def _validate_image(self, image_data: Union[bytes, str]) -> Tuple[bool, Optional[str]]:
         """Validate image data.
 
+        Only the image header is decoded.
+
         Args:
-            image_data: Image data to validate
+            image_data: Image data, or the path of an image file, to validate
 
         Returns:
             Tuple[bool, Optional[str]]: (is_valid, error_message)
         """
-        if len(image_data) > self._max_image_size:
-            return False, f"Image exceeds maximum size ({self._max_image_size} bytes)"
-
         try:
-            image = Image.open(io.BytesIO(image_data))
-            if image.format not in self._allowed_formats:
-                return False, f"Unsupported image format: {image.format}"
+            size = os.path.getsize(image_data) if isinstance(image_data, str) else len(image_data)
+            if size > self._max_image_size:
+                return False, f"Image exceeds maximum size ({self._max_image_size} bytes)"
+
+            source = image_data if isinstance(image_data, str) else io.BytesIO(image_data)
+            with Image.open(source) as image:
+                if image.format not in self._allowed_formats:
+                    return False, f"Unsupported image format: {image.format}"
 
-            width, height = image.size
-            max_width, max_height = self._max_dimensions
-            if width > max_width or height > max_height:
-                return False, f"Image dimensions exceed maximum ({max_width}x{max_height})"
+                width, height = image.size
+                max_width, max_height = self._max_dimensions
+                if width > max_width or height > max_height:
+                    return False, f"Image dimensions exceed maximum ({max_width}x{max_height})"
 
             return True, None
         except Exception as e:
@@ -212,6 +206,44 @@ class ImageTool(BaseTool):
             operation: Operation to perform
             **kwargs: Operation parameters
 
+        Returns:
+            Dict[str, Any]: Processing result
+        """
+        return await self._run_pipeline(image_data, [{"op": operation, **kwargs}], action=operation)
+
+    def _check_operations(self, operations: Any) -> Optional[str]:
+        """Check a chain of operations before any image is decoded.
+
+        Args:
+            operations: Operations to check
+
+        Returns:
+            Optional[str]: Error message, None if the chain is valid
+        """
+        if not isinstance(operations, list) or not operations:
+            return "Operations must be a non-empty list"
+        for op in operations:
+            if not isinstance(op, dict) or op.get("op") not in PIPELINE_OPERATIONS:
+                return f"Unsupported operation: {op}"
+            if op["op"] == "convert" and op.get("format") not in self._allowed_formats:
+                return f"Unsupported format: {op.get('format')}"
+        return None
+
+    async def _run_pipeline(
+        self,
+        image_data: bytes,
+        operations: List[Dict[str, Any]],
+        output_format: Optional[str] = None,
+        action: str = "pipeline",
+    ) -> Dict[str, Any]:
+        """Apply a chain of operations in a single decode/encode cycle.
+
+        Args:
+            image_data: Image data to process
+            operations: Operations to apply in order
+            output_format: Format to encode, defaults to the source format
+            action: Action name reported in the result
+
         Returns:
             Dict[str, Any]: Processing result
         """
@@ -221,74 +253,145 @@ class ImageTool(BaseTool):
             if not is_valid:
                 return {"error": error}
 
+            error = self._check_operations(operations)
+            if error:
+                return {"error": error}
+
             # Check cache
-            cache_key = self._get_cache_key(image_data, operation, **kwargs)
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
-
-            # Process image
-            image = Image.open(io.BytesIO(image_data))
-
-            if operation == "resize":
-                width = kwargs.get("width")
-                height = kwargs.get("height")
-                image = image.resize((width, height), Image.Resampling.LANCZOS)
-            elif operation == "crop":
-                left = kwargs.get("left", 0)
-                top = kwargs.get("top", 0)
-                right = kwargs.get("right", image.width)
-                bottom = kwargs.get("bottom", image.height)
-                image = image.crop((left, top, right, bottom))
-            elif operation == "rotate":
-                angle = kwargs.get("angle", 0)
-                image = image.rotate(angle, expand=True)
-            elif operation == "flip":
-                direction = kwargs.get("direction", "horizontal")
-                if direction == "horizontal":
-                    image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-                else:
-                    image = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-            elif operation == "filter":
-                filter_type = kwargs.get("filter_type")
-                if filter_type == "blur":
-                    from PIL import ImageFilter
-
-                    image = image.filter(ImageFilter.BLUR)
-                elif filter_type == "sharpen":
-                    from PIL import ImageFilter
-
-                    image = image.filter(ImageFilter.SHARPEN)
-                elif filter_type == "grayscale":
-                    image = image.convert("L")
-            elif operation == "convert":
-                format = kwargs.get("format")
-                if format not in self._allowed_formats:
-                    return {"error": f"Unsupported format: {format}"}
-                image = image.convert("RGB")
-
-            # Save processed image
-            output = io.BytesIO()
-            image.save(output, format=image.format, quality=self._quality)
-            processed_data = output.getvalue()
+            cache_key = self._get_cache_key(
+                image_data, action, operations=operations, format=output_format
+            )
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Decoding, resampling and encoding release the GIL
+            processed = await asyncio.to_thread(
+                process_image, image_data, operations, output_format, self._quality
+            )
 
             # Cache result
-            self._cache[cache_key] = {
-                "data": {
-                    "status": "success",
-                    "action": operation,
-                    "image_data": processed_data,
-                    "format": image.format,
-                    "size": len(processed_data),
-                    "dimensions": image.size,
-                },
-                "timestamp": time.time(),
+            result = {
+                "status": "success",
+                "action": action,
+                "image_data": processed["image_data"],
+                "format": processed["format"],
+                "size": len(processed["image_data"]),
+                "dimensions": processed["dimensions"],
             }
+            self._cache.set(cache_key, result)
 
-            return self._cache[cache_key]["data"]
+            return result
         except Exception as e:
             logger.error(f"Error processing image: {e}")
             return {"error": str(e)}
 
+    async def _pipeline(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Apply a chain of operations to an image.
+
+        Args:
+            args: Pipeline arguments: image_data, operations (a list of dicts with an
+                ``op`` key and that operation's arguments) and an optional format
+
+        Returns:
+            Dict[str, Any]: Pipeline result
+        """
+        try:
+            if not args or "image_data" not in args or "operations" not in args:
+                return {"error": "Missing required arguments"}
+
+            result = await self._run_pipeline(
+                args["image_data"], args["operations"], output_format=args.get("format")
+            )
+
+            if "error" not in result:
+                self._add_to_history(
+                    "pipeline",
+                    {
+                        "operations": [op["op"] for op in args["operations"]],
+                        "format": result["format"],
+                        "size": result["size"],
+                    },
+                )
+
+            return result
+        except Exception as e:
+            logger.error(f"Error running image pipeline: {e}")
+            return {"error": str(e)}
+
+    async def _batch(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Apply a chain of operations to many images on a process pool.
+
+        Args:
+            args: Batch arguments: images (image data) and/or image_paths, operations,
+                and optionally format and output_dir for the results of image_paths
+
+        Returns:
+            Dict[str, Any]: Batch result with one entry per image, in order
+        """
+        try:
+            if not args or "operations" not in args:
+                return {"error": "Missing required arguments"}
+            sources = list(args.get("image_paths") or []) + list(args.get("images") or [])
+            if not sources:
+                return {"error": "Missing images"}
+
+            error = self._check_operations(args["operations"])
+            if error:
+                return {"error": error}
+
+            output_dir = args.get("output_dir")
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            # Invalid images are reported without being sent to the workers
+            errors = {}
+            for i, source in enumerate(sources):
+                is_valid, error = self._validate_image(source)
+                if not is_valid:
+                    errors[i] = error
+            valid = [source for i, source in enumerate(sources) if i not in errors]
+
+            processed = []
+            if valid:
+                processed = await asyncio.to_thread(
+                    get_image_batch_processor().process,
+                    valid,
+                    args["operations"],
+                    args.get("format"),
+                    self._quality,
+                    output_dir,
+                )
+            processed = iter(processed)
+
+            results = []
+            for i in range(len(sources)):
+                if i in errors:
+                    results.append({"error": errors[i]})
+                    continue
+                item = next(processed)
+                if isinstance(item, Exception):
+                    results.append({"error": str(item)})
+                    continue
+                item.pop("source_dimensions", None)
+                if "image_data" in item:
+                    item["size"] = len(item["image_data"])
+                results.append(item)
+
+            self._add_to_history(
+                "batch",
+                {
+                    "operations": [op["op"] for op in args["operations"]],
+                    "images": len(results),
+                    "errors": sum(1 for item in results if "error" in item),
+                },
+            )
+
+            return {"status": "success", "action": "batch", "results": results}
+        except Exception as e:
+            logger.error(f"Error processing image batch: {e}")
+            return {"error": str(e)}
+
     async def _resize_image(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Resize an image.
 
@@ -12,8 +12,10 @@ import asyncio
 import time
 import json
 import os
+from datetime import datetime
 from typing import Dict, Any, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.log_index import IndexedRotatingFileHandler, tail_lines
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +79,7 @@ class LogTool(BaseTool):
         tool_capabilities = {
             "log": True,
             "get_logs": True,
+            "query_logs": True,
             "clear_logs": True,
             "rotate_logs": True,
             "history": True,
@@ -118,6 +121,8 @@ class LogTool(BaseTool):
             return await self._log(args)
         elif command == "get_logs":
             return await self._get_logs(args)
+        elif command == "query_logs":
+            return await self._query_logs(args)
         elif command == "clear_logs":
             return await self._clear_logs(args)
         elif command == "rotate_logs":
@@ -142,30 +147,28 @@ class LogTool(BaseTool):
         if len(self._operation_history) > self._max_history:
             self._operation_history.pop(0)
 
-    def _get_handler(self, name: str) -> logging.FileHandler:
-        """Get or create a file handler.
+    def _get_handler(self, name: str) -> IndexedRotatingFileHandler:
+        """Get or create the file handler for a log.
+
+        Handlers are created once per log name and reused, so the file is
+        opened once and its offset index stays in memory. Creating one does
+        not read the log; indexing happens on the first write or query.
 
         Args:
             name: Handler name
 
         Returns:
-            logging.FileHandler: File handler
+            IndexedRotatingFileHandler: Rotating file handler that indexes what it writes
         """
         if name not in self._handlers:
-            # Create handler
-            handler = logging.FileHandler(
+            formatter = logging.Formatter(self._log_format, datefmt=self._date_format)
+            self._handlers[name] = IndexedRotatingFileHandler(
                 os.path.join(self._log_dir, f"{name}.log"),
                 maxBytes=self._max_file_size,
                 backupCount=self._max_files,
+                formatter=formatter,
             )
 
-            # Set formatter
-            formatter = logging.Formatter(self._log_format, datefmt=self._date_format)
-            handler.setFormatter(formatter)
-
-            # Store handler
-            self._handlers[name] = handler
-
         return self._handlers[name]
 
     async def _log(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -185,16 +188,20 @@ class LogTool(BaseTool):
             level = args.get("level", "INFO")
             name = args.get("name", "default")
 
-            # Get handler
-            handler = self._get_handler(name)
+            levelno = logging.getLevelName(level.upper())
+            if not isinstance(levelno, int):
+                return {"error": f"Invalid log level: {level}"}
 
-            # Create logger
-            logger = logging.getLogger(name)
-            logger.addHandler(handler)
-            logger.setLevel(getattr(logging, level.upper()))
-
-            # Log message
-            logger.log(getattr(logging, level.upper()), message)
+            # Hand the record straight to the log's handler rather than attaching
+            # the handler to a shared logger on every call
+            record = logging.makeLogRecord(
+                {"name": name, "levelno": levelno, "levelname": level.upper(), "msg": message}
+            )
+            handler = self._get_handler(name)
+            if not handler.index_synced:
+                # Index an existing log off the event loop before the first write
+                await asyncio.to_thread(handler.sync_index)
+            handler.handle(record)
 
             self._add_to_history("log", {"name": name, "level": level, "message": message})
 
@@ -230,12 +237,8 @@ class LogTool(BaseTool):
                     "error": f"Log file not found: {name}",
                 }
 
-            # Read log file
-            with open(log_file, "r") as f:
-                lines = f.readlines()
-
-            # Get last N lines
-            lines = lines[-max_lines:]
+            # Read only the end of the file
+            lines = tail_lines(log_file, max_lines)
 
             self._add_to_history("get_logs", {"name": name, "lines": len(lines)})
 
@@ -244,6 +247,61 @@ class LogTool(BaseTool):
             logger.error(f"Error getting logs: {e}")
             return {"error": str(e)}
 
+    @staticmethod
+    def _parse_time(value: Union[int, float, str, None]) -> Optional[float]:
+        """Convert a Unix timestamp or ISO date string to a timestamp."""
+        if value is None or isinstance(value, (int, float)):
+            return value
+        return datetime.fromisoformat(value).timestamp()
+
+    async def _query_logs(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Query log records by time range and level.
+
+        Args:
+            args: Query arguments: name, and optionally start, end (Unix time or
+                ISO date), level (lowest level to include) and max_records
+
+        Returns:
+            Dict[str, Any]: Query result with the newest matching records, oldest first
+        """
+        try:
+            if not args or "name" not in args:
+                return {"error": "Missing required arguments"}
+
+            name = args["name"]
+            max_records = args.get("max_records", 1000)
+
+            min_level = None
+            if args.get("level"):
+                min_level = logging.getLevelName(args["level"].upper())
+                if not isinstance(min_level, int):
+                    return {"error": f"Invalid log level: {args['level']}"}
+
+            # Check if file exists
+            if not os.path.exists(os.path.join(self._log_dir, f"{name}.log")):
+                return {
+                    "status": "error",
+                    "action": "query_logs",
+                    "error": f"Log file not found: {name}",
+                }
+
+            # The query brings the index up to date first, so it runs off the event loop
+            index = self._get_handler(name).index
+            records = await asyncio.to_thread(
+                index.query,
+                start=self._parse_time(args.get("start")),
+                end=self._parse_time(args.get("end")),
+                min_level=min_level,
+                limit=max_records,
+            )
+
+            self._add_to_history("query_logs", {"name": name, "records": len(records)})
+
+            return {"status": "success", "action": "query_logs", "name": name, "records": records}
+        except Exception as e:
+            logger.error(f"Error querying logs: {e}")
+            return {"error": str(e)}
+
     async def _clear_logs(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Clear log contents.
 
@@ -270,9 +328,8 @@ class LogTool(BaseTool):
                     "error": f"Log file not found: {name}",
                 }
 
-            # Clear log file
-            with open(log_file, "w") as f:
-                f.write("")
+            # Clear log file and its index, without indexing what is being discarded
+            self._get_handler(name).truncate()
 
             self._add_to_history("clear_logs", {"name": name})
 
@@ -14,6 +14,7 @@ import math
 import numpy as np
 from typing import Dict, Any, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +36,10 @@ class MathTool(BaseTool):
         self._max_vector_size = config.get("max_vector_size", 1000)
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Math cache
         self._cache_duration = config.get("cache_duration", 3600)  # 1 hour
+        self._cache = get_cache_service().namespace(
+            "math_tool", ttl=self._cache_duration, scope={"max_precision": self._max_precision}
+        )
 
     async def initialize(self) -> bool:
         """Initialize the tool.
@@ -45,9 +48,6 @@ class MathTool(BaseTool):
             bool: True if initialization was successful, False otherwise
         """
         try:
-            # Initialize cache
-            self._cache = {}
-
             return await super().initialize()
         except Exception as e:
             logger.error(f"Failed to initialize MathTool: {e}")
@@ -56,7 +56,6 @@ class MathTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache = {}
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -152,30 +151,7 @@ class MathTool(BaseTool):
         Returns:
             str: Cache key
         """
-        import hashlib
-
-        params = [operation]
-        for key, value in sorted(kwargs.items()):
-            if isinstance(value, (list, tuple)):
-                params.append(f"{key}={hashlib.md5(str(value).encode()).hexdigest()}")
-            else:
-                params.append(f"{key}={value}")
-        return "|".join(params)
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
-
-        Args:
-            cache_key: Cache key to check
-
-        Returns:
-            bool: True if cache is valid, False otherwise
-        """
-        if cache_key not in self._cache:
-            return False
-
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
+        return make_cache_key(operation, **kwargs)
 
     def _validate_matrix(self, matrix: List[List[float]]) -> Tuple[bool, Optional[str]]:
         """Validate matrix data.
@@ -233,8 +209,9 @@ class MathTool(BaseTool):
         try:
             # Check cache
             cache_key = self._get_cache_key(operation, **kwargs)
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Process operation
             if operation == "basic":
@@ -396,12 +373,10 @@ class MathTool(BaseTool):
                     processed_data = round(result, self._max_precision)
 
             # Cache result
-            self._cache[cache_key] = {
-                "data": {"status": "success", "action": operation, "result": processed_data},
-                "timestamp": time.time(),
-            }
+            result = {"status": "success", "action": operation, "result": processed_data}
+            self._cache.set(cache_key, result)
 
-            return self._cache[cache_key]["data"]
+            return result
         except Exception as e:
             logger.error(f"Error processing operation: {e}")
             return {"error": str(e)}
@@ -13,6 +13,7 @@ import time
 import aiohttp
 from typing import Dict, Any, List, Optional, Union
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +34,14 @@ class SearchTool(BaseTool):
         self._api_url = config.get("api_url", "https://api.search.example.com/v1")
         self._max_results = config.get("max_results", 10)
         self._cache_duration = config.get("cache_duration", 3600)  # 1 hour
+        self._cache = get_cache_service().namespace(
+            "search_tool",
+            ttl=self._cache_duration,
+            scope={"api_url": self._api_url, "max_results": self._max_results},
+        )
         self._max_requests = config.get("max_requests", 100)  # per hour
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Search cache
         self._session = None
 
     async def initialize(self) -> bool:
@@ -53,9 +58,6 @@ class SearchTool(BaseTool):
             # Initialize HTTP session
             self._session = aiohttp.ClientSession()
 
-            # Initialize cache
-            self._cache = {}
-
             return await super().initialize()
         except Exception as e:
             logger.error(f"Failed to initialize SearchTool: {e}")
@@ -68,7 +70,6 @@ class SearchTool(BaseTool):
                 await self._session.close()
                 self._session = None
 
-            self._cache = {}
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -168,21 +169,6 @@ class SearchTool(BaseTool):
                 params.append(f"{key}={value}")
         return "|".join(params)
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
-
-        Args:
-            cache_key: Cache key to check
-
-        Returns:
-            bool: True if cache is valid, False otherwise
-        """
-        if cache_key not in self._cache:
-            return False
-
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
-
     async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Make an API request.
 
@@ -226,8 +212,9 @@ class SearchTool(BaseTool):
         try:
             # Check cache
             cache_key = self._get_cache_key(operation, **kwargs)
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Process operation
             if operation == "web_search":
@@ -299,7 +286,7 @@ class SearchTool(BaseTool):
                 }
 
             # Cache result
-            self._cache[cache_key] = {"data": processed_data, "timestamp": time.time()}
+            self._cache.set(cache_key, processed_data)
 
             return processed_data
         except Exception as e:
@@ -6,7 +6,7 @@ It uses Whisper for speech recognition.
 
 ---
 description: Convert speech to text
-endpoints: [transcribe, record_from_microphone]
+endpoints: [transcribe, record_from_microphone, stream_from_microphone]
 inputs: [audio_file, language]
 outputs: [text]
 dependencies: [whisper, sounddevice, numpy]
@@ -15,15 +15,12 @@ alwaysApply: false
 ---
 """
 
-import os
 import logging
-import whisper
-import sounddevice as sd
-import numpy as np
-from typing import Dict, Any, Optional
+import queue
+import time
+from typing import Dict, Any, Iterator, Optional
 from labeeb.core.config_manager import ConfigManager
-import tempfile
-import wave
+from labeeb.models.audio.transcriber import SAMPLE_RATE, get_transcription_engine
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +30,13 @@ class STTTool:
     def __init__(self):
         """Initialize the STT tool."""
         self.config = ConfigManager()
-        self.model = whisper.load_model("base")
+        self.model_name = "base"
+        self.engine = get_transcription_engine()
+
+    @property
+    def model(self) -> Any:
+        """The Whisper model, loaded on first use and shared with other callers."""
+        return self.engine.load_model(self.model_name)
         
     def transcribe(self, audio_file: str, language: str = "en") -> Dict[str, Any]:
         """
@@ -51,8 +54,9 @@ class STTTool:
         """
         try:
             # Transcribe audio
-            result = self.model.transcribe(
+            result = self.engine.transcribe(
                 audio_file,
+                self.model_name,
                 language=language,
                 task="transcribe"
             )
@@ -67,6 +71,59 @@ class STTTool:
             logger.error(error_msg)
             raise Exception(error_msg)
             
+    def _microphone_chunks(self, duration: float) -> Iterator[Any]:
+        """Yield 100 ms blocks of microphone samples until the duration has passed."""
+        import sounddevice as sd
+
+        blocks = queue.Queue()
+
+        def callback(indata, frames, time_info, status):
+            blocks.put(indata[:, 0].copy())
+
+        deadline = time.monotonic() + duration
+        with sd.InputStream(
+            samplerate=SAMPLE_RATE,
+            channels=1,
+            dtype='float32',
+            blocksize=SAMPLE_RATE // 10,
+            callback=callback
+        ):
+            while time.monotonic() < deadline:
+                try:
+                    yield blocks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+        while not blocks.empty():
+            yield blocks.get_nowait()
+
+    def stream_from_microphone(self, language: str = "en", duration: int = 5) -> Iterator[Dict[str, Any]]:
+        """
+        Record from the microphone and yield text as each spoken phrase ends.
+        
+        Audio stays in memory. Each phrase is transcribed while recording
+        continues, so the first words arrive after the first pause, not
+        after the whole recording.
+        
+        Args:
+            language: Language code ("en" for English, "ar" for Arabic).
+            duration: Recording duration in seconds.
+            
+        Yields:
+            Dict containing the text of one phrase and its start and end times.
+        """
+        for segment in self.engine.stream(
+            self._microphone_chunks(duration),
+            self.model_name,
+            language=language,
+            task="transcribe"
+        ):
+            yield {
+                "text": segment.text,
+                "start": segment.start,
+                "end": segment.end,
+                "language": language
+            }
+
     def record_from_microphone(self, language: str = "en", duration: int = 5) -> Dict[str, Any]:
         """
         Record audio from microphone and convert to text.
@@ -82,39 +139,15 @@ class STTTool:
             Exception: If recording or transcription fails.
         """
         try:
-            # Set up recording parameters
-            sample_rate = 16000
-            channels = 1
-            
             print(f"Recording for {duration} seconds...")
             
-            # Record audio
-            recording = sd.rec(
-                int(duration * sample_rate),
-                samplerate=sample_rate,
-                channels=channels,
-                dtype='float32'
-            )
-            sd.wait()
-            
-            # Convert to 16-bit PCM
-            recording = (recording * 32767).astype(np.int16)
+            segments = list(self.stream_from_microphone(language, duration))
             
-            # Save to temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                with wave.open(temp_file.name, 'wb') as wf:
-                    wf.setnchannels(channels)
-                    wf.setsampwidth(2)  # 2 bytes for int16
-                    wf.setframerate(sample_rate)
-                    wf.writeframes(recording.tobytes())
-                
-                # Transcribe the temporary file
-                result = self.transcribe(temp_file.name, language)
-                
-                # Clean up
-                os.unlink(temp_file.name)
-                
-                return result
+            return {
+                "text": " ".join(segment["text"] for segment in segments),
+                "language": language,
+                "segments": segments
+            }
             
         except Exception as e:
             error_msg = f"Error recording from microphone: {e}"
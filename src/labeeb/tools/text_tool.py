@@ -13,6 +13,7 @@ import unicodedata
 import json
 from typing import Dict, Any, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +38,8 @@ class TextTool(BaseTool):
         )
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Text cache
         self._cache_duration = config.get("cache_duration", 3600)  # 1 hour
+        self._cache = get_cache_service().namespace("text_tool", ttl=self._cache_duration)
 
     async def initialize(self) -> bool:
         """Initialize the tool.
@@ -47,9 +48,6 @@ class TextTool(BaseTool):
             bool: True if initialization was successful, False otherwise
         """
         try:
-            # Initialize cache
-            self._cache = {}
-
             return await super().initialize()
         except Exception as e:
             logger.error(f"Failed to initialize TextTool: {e}")
@@ -58,7 +56,6 @@ class TextTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache = {}
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -265,27 +262,7 @@ class TextTool(BaseTool):
         Returns:
             str: Cache key
         """
-        import hashlib
-
-        params = [hashlib.md5(text.encode()).hexdigest(), operation]
-        for key, value in sorted(kwargs.items()):
-            params.append(f"{key}={value}")
-        return "|".join(params)
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
-
-        Args:
-            cache_key: Cache key to check
-
-        Returns:
-            bool: True if cache is valid, False otherwise
-        """
-        if cache_key not in self._cache:
-            return False
-
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
+        return make_cache_key(text, operation, **kwargs)
 
     def _validate_text(self, text: str) -> Tuple[bool, Optional[str]]:
         """Validate text data.
@@ -323,8 +300,9 @@ class TextTool(BaseTool):
 
             # Check cache
             cache_key = self._get_cache_key(text, operation, **kwargs)
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Process text
             if operation == "clean":
@@ -414,12 +392,10 @@ class TextTool(BaseTool):
                 processed_data = [word for word, _ in keywords]
 
             # Cache result
-            self._cache[cache_key] = {
-                "data": {"status": "success", "action": operation, "result": processed_data},
-                "timestamp": time.time(),
-            }
+            result = {"status": "success", "action": operation, "result": processed_data}
+            self._cache.set(cache_key, result)
 
-            return self._cache[cache_key]["data"]
+            return result
         except Exception as e:
             logger.error(f"Error processing text: {e}")
             return {"error": str(e)}
@@ -0,0 +1,294 @@
+"""
+Tool lifecycle manager for Labeeb.
+
+---
+description: Hands out warm, initialized tool instances under concurrency policies
+endpoints: [tool_lifecycle_manager]
+inputs: [tool_name]
+outputs: [tool_instance]
+dependencies: [asyncio, tool_manager]
+auth: none
+alwaysApply: false
+---
+
+- Construct and initialize each tool once, on first use
+- Share one instance, pool N instances, or hand out one instance exclusively
+- Run sync or async initialize/cleanup hooks
+- Clean up every instance on shutdown
+"""
+
+import asyncio
+import inspect
+import logging
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Type
+
+from labeeb.tools.tool_manager import ToolManager
+
+logger = logging.getLogger(__name__)
+
+# One instance used by every caller at once
+POLICY_SHARED = "shared"
+# Up to N instances, each used by one caller at a time
+POLICY_POOLED = "pooled"
+# A single instance used by one caller at a time
+POLICY_EXCLUSIVE = "exclusive"
+
+POLICIES = (POLICY_SHARED, POLICY_POOLED, POLICY_EXCLUSIVE)
+
+
+async def _maybe_await(value: Any) -> Any:
+    """Await a value if it is awaitable."""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class _ToolPool:
+    """Idle instances of one tool class under a pooled or exclusive policy.
+
+    Instances outlive any one event loop, but asyncio primitives bind to the
+    loop they are first used on, so the condition callers wait on is created
+    per running loop.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.instances: List[Any] = []
+        self.idle: "deque[Any]" = deque()
+        self._conditions: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Condition]"
+        ) = weakref.WeakKeyDictionary()
+
+    def condition(self) -> asyncio.Condition:
+        """Get the condition signalling idle instances on the running loop."""
+        loop = asyncio.get_running_loop()
+        condition = self._conditions.get(loop)
+        if condition is None:
+            condition = self._conditions[loop] = asyncio.Condition()
+        return condition
+
+
+class ToolLifecycleManager(ToolManager):
+    """Tool manager that keeps initialized instances warm between uses.
+
+    Each tool gets a concurrency policy, taken from the ``concurrency_policy``
+    and ``pool_size`` class attributes unless set explicitly:
+
+    - ``shared``: one lazily created instance used concurrently
+    - ``pooled``: up to ``pool_size`` instances, one caller each
+    - ``exclusive``: one instance, one caller at a time
+
+    Tools that do not declare a policy are exclusive, since most keep
+    per-call state and plan steps run concurrently.
+    """
+
+    def __init__(
+        self,
+        resolver: Optional[Callable[[str], Optional[Type[Any]]]] = None,
+        default_policy: str = POLICY_EXCLUSIVE,
+    ):
+        """Initialize the tool lifecycle manager.
+
+        Args:
+            resolver: Optional lookup used for tool names that were never
+                registered, e.g. ``ToolRegistry.get_tool``
+            default_policy: Policy for tools that do not declare one
+        """
+        super().__init__()
+        if default_policy not in POLICIES:
+            raise ValueError(f"Unknown concurrency policy: {default_policy}")
+        self.resolver = resolver
+        self.default_policy = default_policy
+        self._configs: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._policies: Dict[str, Tuple[str, int]] = {}
+        self._pools: Dict[str, _ToolPool] = {}
+        # Plans run on different loops, so creation locks are kept per loop
+        self._shared_locks: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]"
+        ) = weakref.WeakKeyDictionary()
+
+    def register_tool(
+        self,
+        tool_class: Type[Any],
+        config: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
+        policy: Optional[str] = None,
+        pool_size: Optional[int] = None,
+    ) -> bool:
+        """Register a tool class.
+
+        Args:
+            tool_class: Tool class to register
+            config: Optional configuration passed to the constructor
+            name: Name to register under, defaults to the class name
+            policy: Concurrency policy, defaults to the class declaration
+            pool_size: Instance count for the pooled policy
+
+        Returns:
+            bool: True if registration was successful, False otherwise
+        """
+        tool_name = name or tool_class.__name__
+        if tool_name in self._tool_classes:
+            logger.warning(f"Tool {tool_name} is already registered")
+            return False
+
+        policy = policy or getattr(tool_class, "concurrency_policy", self.default_policy)
+        if policy not in POLICIES:
+            logger.error(f"Unknown concurrency policy {policy} for tool {tool_name}")
+            return False
+        if policy == POLICY_EXCLUSIVE:
+            pool_size = 1
+        else:
+            pool_size = pool_size or getattr(tool_class, "pool_size", 1)
+
+        self._tool_classes[tool_name] = tool_class
+        self._configs[tool_name] = config
+        self._policies[tool_name] = (policy, max(1, pool_size))
+        return True
+
+    def get_policy(self, tool_name: str) -> Optional[Tuple[str, int]]:
+        """Get the concurrency policy and pool size of a tool.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            Optional[Tuple[str, int]]: Policy name and pool size, or None if unknown
+        """
+        if not self._ensure_registered(tool_name):
+            return None
+        return self._policies[tool_name]
+
+    def _ensure_registered(self, tool_name: str) -> bool:
+        """Register a tool through the resolver on first use."""
+        if tool_name in self._tool_classes:
+            return True
+        if self.resolver is None:
+            return False
+        tool_class = self.resolver(tool_name)
+        if tool_class is None:
+            return False
+        return self.register_tool(tool_class, name=tool_name)
+
+    async def _create_instance(self, tool_name: str) -> Any:
+        """Construct a tool and run its initialize hook."""
+        tool_class = self._tool_classes[tool_name]
+        config = self._configs.get(tool_name)
+        tool = tool_class(config) if config is not None else tool_class()
+
+        initialize = getattr(tool, "initialize", None)
+        if callable(initialize):
+            if await _maybe_await(initialize()) is False:
+                raise RuntimeError(f"Failed to initialize tool {tool_name}")
+        logger.debug(f"Created warm instance of tool {tool_name}")
+        return tool
+
+    async def _get_shared(self, tool_name: str) -> Any:
+        """Get the shared instance of a tool, creating it once."""
+        tool = self._tools.get(tool_name)
+        if tool is not None:
+            return tool
+        locks = self._shared_locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.setdefault(tool_name, asyncio.Lock())
+        async with lock:
+            if tool_name not in self._tools:
+                self._tools[tool_name] = await self._create_instance(tool_name)
+        return self._tools[tool_name]
+
+    async def _checkout(self, tool_name: str, pool_size: int) -> Any:
+        """Take an idle pooled instance, creating one if the pool has room."""
+        pool = self._pools.get(tool_name)
+        if pool is None:
+            pool = self._pools[tool_name] = _ToolPool(pool_size)
+
+        condition = pool.condition()
+        async with condition:
+            while not pool.idle:
+                if len(pool.instances) < pool.size:
+                    tool = await self._create_instance(tool_name)
+                    pool.instances.append(tool)
+                    return tool
+                await condition.wait()
+            return pool.idle.popleft()
+
+    async def _checkin(self, tool_name: str, tool: Any) -> None:
+        """Return a pooled instance and wake the callers waiting for one."""
+        pool = self._pools[tool_name]
+        condition = pool.condition()
+        async with condition:
+            pool.idle.append(tool)
+            # Waiters re-check the idle list, so a cancelled waiter cannot swallow the wakeup
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def acquire(self, tool_name: str) -> AsyncIterator[Any]:
+        """Borrow a warm instance of a tool for the duration of the block.
+
+        Args:
+            tool_name: Name of the tool
+
+        Yields:
+            The initialized tool instance
+
+        Raises:
+            KeyError: If the tool is not registered and cannot be resolved
+        """
+        if not self._ensure_registered(tool_name):
+            raise KeyError(f"Tool {tool_name} is not registered")
+
+        policy, pool_size = self._policies[tool_name]
+        if policy == POLICY_SHARED:
+            yield await self._get_shared(tool_name)
+            return
+
+        tool = await self._checkout(tool_name, pool_size)
+        try:
+            yield tool
+        finally:
+            # Shielded so a cancelled caller still returns the instance to the pool
+            await asyncio.shield(self._checkin(tool_name, tool))
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get instance counts per tool.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Policy, pool size, live and idle instance counts
+        """
+        stats = {}
+        for tool_name, (policy, pool_size) in self._policies.items():
+            pool = self._pools.get(tool_name)
+            if policy == POLICY_SHARED:
+                live = 1 if tool_name in self._tools else 0
+                idle = live
+            else:
+                live = len(pool.instances) if pool else 0
+                idle = len(pool.idle) if pool else 0
+            stats[tool_name] = {
+                "policy": policy,
+                "pool_size": pool_size,
+                "instances": live,
+                "idle": idle,
+            }
+        return stats
+
+    async def cleanup_async(self) -> None:
+        """Run the cleanup hook of every instance and drop them."""
+        instances = [(name, tool) for name, tool in self._tools.items()]
+        for name, pool in self._pools.items():
+            instances.extend((name, tool) for tool in pool.instances)
+
+        for tool_name, tool in instances:
+            cleanup = getattr(tool, "cleanup", None)
+            if not callable(cleanup):
+                continue
+            try:
+                await _maybe_await(cleanup())
+            except Exception as e:
+                logger.error(f"Error cleaning up tool {tool_name}: {e}")
+
+        self._tools.clear()
+        self._pools.clear()
+        self._shared_locks.clear()
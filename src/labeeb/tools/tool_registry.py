@@ -2,31 +2,71 @@
 Tool Registry for Labeeb AI system.
 
 This module provides the ToolRegistry class for managing all available tools.
+Tools can be registered lazily by import path, so that importing the registry
+does not import every tool module and its heavy dependencies.
 """
 
-from typing import Dict, Type, Optional
+import importlib
+import logging
+from typing import Any, Dict, List, Type, Optional
 from labeeb.tools.base_tool import BaseTool
 
+logger = logging.getLogger(__name__)
+
+
+def _import_class(import_path: str) -> Type[Any]:
+    """Import a class from a ``"package.module:ClassName"`` path.
+
+    Args:
+        import_path: Module path and class name separated by a colon
+
+    Returns:
+        Type[Any]: The imported class
+    """
+    module_name, _, class_name = import_path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 class ToolRegistry:
     """Registry for all available tools."""
 
     _tools: Dict[str, Type[BaseTool]] = {}
+    _lazy_tools: Dict[str, str] = {}
+    _metadata: Dict[str, Dict[str, Any]] = {}
 
     @classmethod
-    def register(cls, tool_class: Type[BaseTool]) -> None:
+    def register(cls, tool_class: Type[BaseTool], name: Optional[str] = None) -> None:
         """Register a tool class.
 
         Args:
             tool_class: Tool class to register
+            name: Name to register under, defaults to the tool's ``name``
         """
-        # Instantiate the tool to get its name
-        tool_instance = tool_class()
-        cls._tools[tool_instance.name] = tool_class
+        if name is None:
+            name = getattr(tool_class, "name", None)
+        if not isinstance(name, str):
+            # Instantiate the tool to get its name
+            name = tool_class().name
+        cls._tools[name] = tool_class
+        cls._lazy_tools.pop(name, None)
+
+    @classmethod
+    def register_lazy(cls, name: str, import_path: str, **metadata: Any) -> None:
+        """Register a tool by import path without importing it.
+
+        The tool module is imported the first time the tool is looked up.
+
+        Args:
+            name: Name of the tool
+            import_path: ``"package.module:ClassName"`` path of the tool class
+            **metadata: Descriptive metadata available without importing the tool
+        """
+        cls._lazy_tools[name] = import_path
+        cls._metadata[name] = {"import_path": import_path, **metadata}
 
     @classmethod
     def get_tool(cls, tool_name: str) -> Optional[Type[BaseTool]]:
-        """Get a tool class by name.
+        """Get a tool class by name, importing it on first access.
 
         Args:
             tool_name: Name of the tool
@@ -34,13 +74,62 @@ class ToolRegistry:
         Returns:
             Optional[Type[BaseTool]]: Tool class if found, None otherwise
         """
-        return cls._tools.get(tool_name)
+        tool_class = cls._tools.get(tool_name)
+        if tool_class is not None:
+            return tool_class
+
+        import_path = cls._lazy_tools.get(tool_name)
+        if import_path is None:
+            return None
+        try:
+            tool_class = _import_class(import_path)
+        except (ImportError, AttributeError) as e:
+            logger.error(f"Failed to load tool {tool_name} from {import_path}: {e}")
+            return None
+        cls._tools[tool_name] = tool_class
+        del cls._lazy_tools[tool_name]
+        return tool_class
+
+    @classmethod
+    def get_metadata(cls, tool_name: str) -> Dict[str, Any]:
+        """Get the registration metadata of a tool without importing it.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            Dict[str, Any]: Metadata given at registration, empty if none
+        """
+        return dict(cls._metadata.get(tool_name, {}))
+
+    @classmethod
+    def get_tool_names(cls) -> List[str]:
+        """Get the names of all registered tools without importing them.
+
+        Returns:
+            List[str]: Tool names
+        """
+        return list(cls._tools) + [name for name in cls._lazy_tools if name not in cls._tools]
+
+    @classmethod
+    def is_loaded(cls, tool_name: str) -> bool:
+        """Check whether a tool's class has been imported.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            bool: True if the tool class is loaded
+        """
+        return tool_name in cls._tools
 
     @classmethod
     def get_all_tools(cls) -> Dict[str, Type[BaseTool]]:
-        """Get all registered tools.
+        """Get all registered tools, importing any that are not loaded yet.
 
         Returns:
             Dict[str, Type[BaseTool]]: Dictionary of tool names to tool classes
         """
+        for tool_name in list(cls._lazy_tools):
+            cls.get_tool(tool_name)
         return cls._tools.copy()
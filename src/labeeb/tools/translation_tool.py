@@ -13,6 +13,7 @@ import time
 import aiohttp
 from typing import Dict, Any, List, Optional, Union
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +39,13 @@ class TranslationTool(BaseTool):
         self._source_language = config.get("source_language", "auto")
         self._target_language = config.get("target_language", "en")
         self._cache_duration = config.get("cache_duration", 3600)  # 1 hour
+        self._cache = get_cache_service().namespace(
+            "translation_tool", ttl=self._cache_duration, scope={"api_url": self._api_url}
+        )
         self._max_requests = config.get("max_requests", 100)  # per minute
         self._max_text_length = config.get("max_text_length", 5000)
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Translation cache
         self._request_times = []  # Request rate limiting
 
     async def initialize(self) -> bool:
@@ -57,8 +60,7 @@ class TranslationTool(BaseTool):
                 logger.error("API key is required")
                 return False
 
-            # Initialize cache and request tracking
-            self._cache = {}
+            # Initialize request tracking
             self._request_times = []
 
             return await super().initialize()
@@ -69,7 +71,6 @@ class TranslationTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache = {}
             self._request_times = []
             self._operation_history = []
             await super().cleanup()
@@ -172,21 +173,6 @@ class TranslationTool(BaseTool):
         """
         return f"{text}|{source}|{target}"
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
-
-        Args:
-            cache_key: Cache key to check
-
-        Returns:
-            bool: True if cache is valid, False otherwise
-        """
-        if cache_key not in self._cache:
-            return False
-
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
-
     async def _make_api_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Make a request to the translation API.
 
@@ -239,8 +225,9 @@ class TranslationTool(BaseTool):
             cache_key = self._get_cache_key(text, source, target)
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"q": text, "source": source, "target": target, "format": "text"}
@@ -250,7 +237,7 @@ class TranslationTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
@@ -289,8 +276,9 @@ class TranslationTool(BaseTool):
             cache_key = self._get_cache_key(text, "detect", "")
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"q": text}
@@ -300,7 +288,7 @@ class TranslationTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
@@ -333,8 +321,9 @@ class TranslationTool(BaseTool):
             cache_key = f"languages|{target}"
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"target": target}
@@ -344,7 +333,7 @@ class TranslationTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
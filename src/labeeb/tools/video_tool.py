@@ -9,16 +9,44 @@ This tool provides video processing capabilities while following:
 
 import logging
 import asyncio
+import glob
+import os
+import tempfile
 import time
-import io
+import uuid
 import cv2
 import numpy as np
-from typing import Dict, Any, List, Optional, Union, Tuple
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional, Union, Tuple
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service, make_cache_key
+from labeeb.services.video_pipeline import (
+    DEFAULT_QUEUE_SIZE,
+    FOURCC_BY_FORMAT,
+    FramePipeline,
+    SegmentWriter,
+    VideoInfo,
+    VideoInput,
+    copy_concat,
+    copy_split,
+    copy_trim,
+    find_ffmpeg,
+    open_source,
+    probe,
+    read_frames,
+)
+from labeeb.utils.platform_utils import get_labeeb_temp_dir
 
 logger = logging.getLogger(__name__)
 
 
+def _remove_staged(staged: str) -> None:
+    """Remove outputs still under their temporary name after a failed operation."""
+    for path in glob.glob(f"{glob.escape(staged)}*"):
+        os.remove(path)
+
+
 class VideoTool(BaseTool):
     """Tool for performing video operations."""
 
@@ -38,8 +66,10 @@ class VideoTool(BaseTool):
         self._max_fps = config.get("max_fps", 60)
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Video cache
         self._cache_duration = config.get("cache_duration", 3600)  # 1 hour
+        self._cache = get_cache_service().namespace("video_tool", ttl=self._cache_duration)
+        self._ffmpeg = find_ffmpeg(config.get("ffmpeg_path"))
+        self._queue_size = config.get("queue_size", DEFAULT_QUEUE_SIZE)
 
     async def initialize(self) -> bool:
         """Initialize the tool.
@@ -48,9 +78,6 @@ class VideoTool(BaseTool):
             bool: True if initialization was successful, False otherwise
         """
         try:
-            # Initialize cache
-            self._cache = {}
-
             return await super().initialize()
         except Exception as e:
             logger.error(f"Failed to initialize VideoTool: {e}")
@@ -59,7 +86,6 @@ class VideoTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache = {}
             self._operation_history = []
             await super().cleanup()
         except Exception as e:
@@ -97,6 +123,7 @@ class VideoTool(BaseTool):
             "allowed_formats": self._allowed_formats,
             "max_resolution": self._max_resolution,
             "max_fps": self._max_fps,
+            "ffmpeg": self._ffmpeg,
             "cache_duration": self._cache_duration,
             "cache_size": len(self._cache),
             "history_size": len(self._operation_history),
@@ -161,269 +188,294 @@ class VideoTool(BaseTool):
         Returns:
             str: Cache key
         """
-        import hashlib
-
-        params = [hashlib.md5(video_data).hexdigest(), operation]
-        for key, value in sorted(kwargs.items()):
-            params.append(f"{key}={value}")
-        return "|".join(params)
+        return make_cache_key(video_data, operation, **kwargs)
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
+    def _validate_video(self, path: str) -> Tuple[Optional[VideoInfo], Optional[str]]:
+        """Validate a video file.
 
         Args:
-            cache_key: Cache key to check
+            path: Video file to validate
 
         Returns:
-            bool: True if cache is valid, False otherwise
+            Tuple[Optional[VideoInfo], Optional[str]]: (video properties, error_message)
         """
-        if cache_key not in self._cache:
-            return False
+        try:
+            info = probe(path)
+            if info is None or not info.fps:
+                return None, "Invalid video data"
 
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
+            # Check resolution
+            max_width, max_height = self._max_resolution
+            if info.width > max_width or info.height > max_height:
+                return None, f"Video resolution exceeds maximum ({max_width}x{max_height})"
 
-    def _validate_video(self, video_data: bytes) -> Tuple[bool, Optional[str]]:
-        """Validate video data.
+            # Check FPS
+            if info.fps > self._max_fps:
+                return None, f"Video FPS exceeds maximum ({self._max_fps})"
 
-        Args:
-            video_data: Video data to validate
+            # Check duration
+            if info.duration > self._max_duration:
+                return None, f"Video duration exceeds maximum ({self._max_duration} seconds)"
 
-        Returns:
-            Tuple[bool, Optional[str]]: (is_valid, error_message)
-        """
-        if len(video_data) > self._max_video_size:
-            return False, f"Video exceeds maximum size ({self._max_video_size} bytes)"
-
-        try:
-            # Create a temporary file to read with OpenCV
-            with io.BytesIO(video_data) as temp_file:
-                cap = cv2.VideoCapture(temp_file)
-                if not cap.isOpened():
-                    return False, "Invalid video data"
-
-                # Get video properties
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-                # Check resolution
-                max_width, max_height = self._max_resolution
-                if width > max_width or height > max_height:
-                    return False, f"Video resolution exceeds maximum ({max_width}x{max_height})"
-
-                # Check FPS
-                if fps > self._max_fps:
-                    return False, f"Video FPS exceeds maximum ({self._max_fps})"
-
-                # Check duration
-                duration = frame_count / fps
-                if duration > self._max_duration:
-                    return False, f"Video duration exceeds maximum ({self._max_duration} seconds)"
-
-                cap.release()
-                return True, None
+            return info, None
         except Exception as e:
-            return False, f"Invalid video data: {str(e)}"
+            return None, f"Invalid video data: {str(e)}"
 
-    async def _process_video(self, video_data: bytes, operation: str, **kwargs) -> Dict[str, Any]:
-        """Process video data with the given operation.
+    async def _process_video(
+        self, video_data: VideoInput, operation: str, output_path: Optional[str] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Process a video with the given operation.
+
+        Videos given as data are returned as data, as before. Videos given as a
+        path are streamed from and to disk and never held in memory; the result
+        then carries the output path instead of the data.
 
         Args:
-            video_data: Video data to process
+            video_data: Video data, a video file path, or a binary stream
             operation: Operation to perform
+            output_path: Where to write the result, defaults to the Labeeb temp directory
             **kwargs: Operation parameters
 
         Returns:
             Dict[str, Any]: Processing result
         """
         try:
-            # Validate video
-            is_valid, error = self._validate_video(video_data)
-            if not is_valid:
-                return {"error": error}
-
-            # Check cache
-            cache_key = self._get_cache_key(video_data, operation, **kwargs)
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
-
-            # Process video
-            with io.BytesIO(video_data) as temp_file:
-                cap = cv2.VideoCapture(temp_file)
-                if not cap.isOpened():
-                    return {"error": "Failed to open video"}
-
-                # Get video properties
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-                if operation == "convert":
-                    format = kwargs.get("format")
-                    if format not in self._allowed_formats:
-                        return {"error": f"Unsupported format: {format}"}
-                    # Convert video format
-                    output = io.BytesIO()
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                    while cap.isOpened():
-                        ret, frame = cap.read()
-                        if not ret:
-                            break
-                        out.write(frame)
-                    out.release()
-                    processed_data = output.getvalue()
-
-                elif operation == "trim":
-                    start = kwargs.get("start", 0)
-                    end = kwargs.get("end")
-                    if end is None:
-                        end = frame_count / fps
-                    start_frame = int(start * fps)
-                    end_frame = int(end * fps)
-                    output = io.BytesIO()
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-                    for _ in range(end_frame - start_frame):
-                        ret, frame = cap.read()
-                        if not ret:
-                            break
-                        out.write(frame)
-                    out.release()
-                    processed_data = output.getvalue()
-
-                elif operation == "merge":
-                    other_video = kwargs.get("other_video")
-                    if not other_video:
-                        return {"error": "Missing other video data"}
-                    output = io.BytesIO()
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                    # Write first video
-                    while cap.isOpened():
-                        ret, frame = cap.read()
-                        if not ret:
-                            break
-                        out.write(frame)
-                    # Write second video
-                    with io.BytesIO(other_video) as other_file:
-                        other_cap = cv2.VideoCapture(other_file)
-                        while other_cap.isOpened():
-                            ret, frame = other_cap.read()
-                            if not ret:
-                                break
-                            out.write(frame)
-                        other_cap.release()
-                    out.release()
-                    processed_data = output.getvalue()
-
-                elif operation == "split":
-                    segments = kwargs.get("segments", 2)
-                    segment_frames = frame_count // segments
-                    segments_data = []
-                    for i in range(segments):
-                        output = io.BytesIO()
-                        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                        out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                        start_frame = i * segment_frames
-                        end_frame = (
-                            start_frame + segment_frames if i < segments - 1 else frame_count
-                        )
-                        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-                        for _ in range(end_frame - start_frame):
-                            ret, frame = cap.read()
-                            if not ret:
-                                break
-                            out.write(frame)
-                        out.release()
-                        segments_data.append(output.getvalue())
-                    processed_data = segments_data
-
-                elif operation == "resize":
-                    new_width = kwargs.get("width", width)
-                    new_height = kwargs.get("height", height)
-                    output = io.BytesIO()
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    out = cv2.VideoWriter(output, fourcc, fps, (new_width, new_height))
-                    while cap.isOpened():
-                        ret, frame = cap.read()
-                        if not ret:
-                            break
-                        resized_frame = cv2.resize(frame, (new_width, new_height))
-                        out.write(resized_frame)
-                    out.release()
-                    processed_data = output.getvalue()
-
-                elif operation == "rotate":
-                    angle = kwargs.get("angle", 0)
-                    output = io.BytesIO()
-                    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                    out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                    while cap.isOpened():
-                        ret, frame = cap.read()
-                        if not ret:
-                            break
-                        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1)
-                        rotated_frame = cv2.warpAffine(frame, matrix, (width, height))
-                        out.write(rotated_frame)
-                    out.release()
-                    processed_data = output.getvalue()
-
-                elif operation == "filter":
-                    filter_type = kwargs.get("filter_type")
-                    if filter_type == "blur":
-                        kernel_size = kwargs.get("kernel_size", 5)
-                        output = io.BytesIO()
-                        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                        out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                        while cap.isOpened():
-                            ret, frame = cap.read()
-                            if not ret:
-                                break
-                            filtered_frame = cv2.GaussianBlur(frame, (kernel_size, kernel_size), 0)
-                            out.write(filtered_frame)
-                        out.release()
-                        processed_data = output.getvalue()
-                    elif filter_type == "grayscale":
-                        output = io.BytesIO()
-                        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                        out = cv2.VideoWriter(output, fourcc, fps, (width, height))
-                        while cap.isOpened():
-                            ret, frame = cap.read()
-                            if not ret:
-                                break
-                            filtered_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                            filtered_frame = cv2.cvtColor(filtered_frame, cv2.COLOR_GRAY2BGR)
-                            out.write(filtered_frame)
-                        out.release()
-                        processed_data = output.getvalue()
-                    else:
-                        return {"error": f"Unsupported filter type: {filter_type}"}
-
-                cap.release()
+            in_memory = isinstance(video_data, (bytes, bytearray, memoryview))
+            if in_memory:
+                if len(video_data) > self._max_video_size:
+                    return {"error": f"Video exceeds maximum size ({self._max_video_size} bytes)"}
+
+                # Check cache
+                cache_key = self._get_cache_key(video_data, operation, **kwargs)
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            result = await asyncio.to_thread(
+                self._run_operation, video_data, operation, output_path, kwargs
+            )
 
             # Cache result
-            self._cache[cache_key] = {
-                "data": {
-                    "status": "success",
-                    "action": operation,
-                    "video_data": processed_data,
-                    "format": "MP4",
-                    "size": len(processed_data),
-                    "duration": frame_count / fps,
-                },
-                "timestamp": time.time(),
-            }
+            if in_memory and "error" not in result:
+                self._cache.set(cache_key, result)
 
-            return self._cache[cache_key]["data"]
+            return result
         except Exception as e:
             logger.error(f"Error processing video: {e}")
             return {"error": str(e)}
 
+    def _run_operation(
+        self,
+        video_data: VideoInput,
+        operation: str,
+        output_path: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run an operation to completion on a worker thread.
+
+        Args:
+            video_data: Video data, a video file path, or a binary stream
+            operation: Operation to perform
+            output_path: Where to write the result, None for a generated path
+            kwargs: Operation parameters
+
+        Returns:
+            Dict[str, Any]: Processing result
+        """
+        in_memory = isinstance(video_data, (bytes, bytearray, memoryview))
+        if operation == "convert":
+            format = (kwargs.get("format") or "").upper()
+            if format not in self._allowed_formats:
+                return {"error": f"Unsupported format: {kwargs.get('format')}"}
+        if operation == "filter" and kwargs.get("filter_type") not in ("blur", "grayscale"):
+            return {"error": f"Unsupported filter type: {kwargs.get('filter_type')}"}
+
+        with ExitStack() as stack:
+            source = stack.enter_context(open_source(video_data))
+            info, error = self._validate_video(source)
+            if error:
+                return {"error": error}
+
+            # Work out where the output goes
+            ext = os.path.splitext(source)[1] or ".mp4"
+            if operation == "convert":
+                ext = f".{format.lower()}"
+            if output_path:
+                base, ext = os.path.splitext(output_path)
+                ext = ext or ".mp4"
+            else:
+                if in_memory:
+                    directory = stack.enter_context(
+                        tempfile.TemporaryDirectory(prefix="labeeb-video-")
+                    )
+                else:
+                    directory = str(get_labeeb_temp_dir() / "video")
+                    os.makedirs(directory, exist_ok=True)
+                stem = os.path.splitext(os.path.basename(source))[0]
+                base = os.path.join(directory, f"{stem}_{operation}_{uuid.uuid4().hex[:8]}")
+            # A given output path may also be an input, so write under a temporary
+            # name and rename once the operation has finished reading
+            staged = base
+            if output_path:
+                staged = f"{base}.partial-{uuid.uuid4().hex[:8]}"
+                stack.callback(_remove_staged, staged)
+            target = f"{staged}_%03d{ext}" if operation == "split" else f"{staged}{ext}"
+
+            outputs = self._apply_operation(stack, source, info, operation, target, ext, kwargs)
+            if staged != base:
+                finished = [base + path[len(staged) :] for path in outputs]
+                for path, final in zip(outputs, finished):
+                    if os.path.exists(path):
+                        os.replace(path, final)
+                outputs = finished
+
+            sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in outputs]
+            result = {
+                "status": "success",
+                "action": operation,
+                "format": ext.lstrip(".").upper(),
+                "size": sum(sizes),
+                "duration": info.duration,
+            }
+            if operation == "split":
+                result["sizes"] = sizes
+            if in_memory:
+                data = [
+                    Path(path).read_bytes() if os.path.exists(path) else b"" for path in outputs
+                ]
+                result["video_data"] = data if operation == "split" else data[0]
+            elif operation == "split":
+                result["output_paths"] = outputs
+            else:
+                result["output_path"] = outputs[0]
+            return result
+
+    def _apply_operation(
+        self,
+        stack: ExitStack,
+        source: str,
+        info: VideoInfo,
+        operation: str,
+        target: str,
+        ext: str,
+        kwargs: Dict[str, Any],
+    ) -> List[str]:
+        """Write the output of an operation, using stream copy where no re-encode is needed.
+
+        Args:
+            stack: Context for temporary inputs
+            source: Input video file
+            info: Input video properties
+            operation: Operation to perform
+            target: Output file, or a printf-style pattern for split segments
+            ext: Output extension
+            kwargs: Operation parameters
+
+        Returns:
+            List[str]: Output files
+        """
+        stream_copy = kwargs.get("stream_copy", True) and self._ffmpeg is not None
+        fourcc = FOURCC_BY_FORMAT.get(ext.lstrip(".").upper(), "mp4v")
+        size = (info.width, info.height)
+
+        if operation == "trim":
+            start = kwargs.get("start") or 0
+            end = kwargs.get("end")
+            if stream_copy and copy_trim(self._ffmpeg, source, target, start, end):
+                return [target]
+            frames = read_frames(
+                source, int(start * info.fps), None if end is None else int(end * info.fps)
+            )
+            self._encode(frames, SegmentWriter([target], info.fps, size, fourcc=fourcc))
+            return [target]
+
+        if operation == "merge":
+            other = stack.enter_context(open_source(kwargs["other_video"]))
+            other_info = probe(other)
+            if other_info is None:
+                raise ValueError("Invalid other video data")
+            compatible = (
+                os.path.splitext(other)[1].lower() == os.path.splitext(source)[1].lower()
+                and (other_info.fourcc, other_info.width, other_info.height)
+                == (info.fourcc, info.width, info.height)
+                and abs(other_info.fps - info.fps) < 0.01
+            )
+            if stream_copy and compatible and copy_concat(self._ffmpeg, [source, other], target):
+                return [target]
+
+            def frames() -> Iterator[np.ndarray]:
+                yield from read_frames(source)
+                yield from read_frames(other)
+
+            # Frames of the second video are scaled to the first video's size
+            self._encode(frames(), SegmentWriter([target], info.fps, size, fourcc=fourcc))
+            return [target]
+
+        if operation == "split":
+            segments = max(int(kwargs.get("segments") or 2), 1)
+            if stream_copy:
+                times = [info.duration * i / segments for i in range(1, segments)]
+                paths = copy_split(self._ffmpeg, source, target, times)
+                if paths:
+                    return paths
+            # One pass over the input, switching output file at each boundary
+            segment_frames = info.frame_count // segments
+            paths = [target % i for i in range(segments)]
+            boundaries = [segment_frames * i for i in range(1, segments)]
+            self._encode(
+                read_frames(source), SegmentWriter(paths, info.fps, size, boundaries, fourcc)
+            )
+            return paths
+
+        transform = None
+        if operation == "resize":
+            size = (kwargs.get("width") or info.width, kwargs.get("height") or info.height)
+            transform = lambda frame: cv2.resize(frame, size)
+        elif operation == "rotate":
+            matrix = cv2.getRotationMatrix2D(
+                (info.width / 2, info.height / 2), kwargs.get("angle", 0), 1
+            )
+            transform = lambda frame: cv2.warpAffine(frame, matrix, size)
+        elif operation == "filter":
+            if kwargs.get("filter_type") == "blur":
+                kernel_size = kwargs.get("kernel_size", 5)
+                transform = lambda frame: cv2.GaussianBlur(frame, (kernel_size, kernel_size), 0)
+            else:
+                transform = lambda frame: cv2.cvtColor(
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), cv2.COLOR_GRAY2BGR
+                )
+
+        self._encode(
+            read_frames(source), SegmentWriter([target], info.fps, size, fourcc=fourcc), transform
+        )
+        return [target]
+
+    def _encode(
+        self,
+        frames: Iterator[np.ndarray],
+        writer: SegmentWriter,
+        transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> int:
+        """Stream frames through the decode -> transform -> encode pipeline.
+
+        Args:
+            frames: Decoded frames
+            writer: Output writer
+            transform: Per-frame transform, None to copy frames
+
+        Returns:
+            int: Number of frames written
+        """
+        try:
+            return FramePipeline(self._queue_size).run(frames, writer.write, transform)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _get_source(args: Dict[str, Any]) -> Optional[VideoInput]:
+        """Get the input video from command arguments, preferring a file path."""
+        return args.get("video_path") or args.get("video_data")
+
     async def _convert_format(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Convert video format.
 
@@ -434,10 +486,15 @@ class VideoTool(BaseTool):
             Dict[str, Any]: Convert result
         """
         try:
-            if not args or "video_data" not in args or "format" not in args:
+            if not args or not self._get_source(args) or "format" not in args:
                 return {"error": "Missing required arguments"}
 
-            result = await self._process_video(args["video_data"], "convert", format=args["format"])
+            result = await self._process_video(
+                self._get_source(args),
+                "convert",
+                output_path=args.get("output_path"),
+                format=args["format"],
+            )
 
             if "error" not in result:
                 self._add_to_history("convert", {"format": args["format"], "size": result["size"]})
@@ -451,17 +508,23 @@ class VideoTool(BaseTool):
         """Trim video.
 
         Args:
-            args: Trim arguments
+            args: Trim arguments; with ``stream_copy`` (default True) and ffmpeg
+                available, cuts snap to keyframes and nothing is re-encoded
 
         Returns:
             Dict[str, Any]: Trim result
         """
         try:
-            if not args or "video_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing video data"}
 
             result = await self._process_video(
-                args["video_data"], "trim", start=args.get("start", 0), end=args.get("end")
+                self._get_source(args),
+                "trim",
+                output_path=args.get("output_path"),
+                start=args.get("start", 0),
+                end=args.get("end"),
+                stream_copy=args.get("stream_copy", True),
             )
 
             if "error" not in result:
@@ -479,17 +542,23 @@ class VideoTool(BaseTool):
         """Merge video files.
 
         Args:
-            args: Merge arguments
+            args: Merge arguments; videos with matching codec, size and frame
+                rate are joined by stream copy when ffmpeg is available
 
         Returns:
             Dict[str, Any]: Merge result
         """
         try:
-            if not args or "video_data" not in args or "other_video" not in args:
+            other_video = args.get("other_path") or args.get("other_video") if args else None
+            if not args or not self._get_source(args) or not other_video:
                 return {"error": "Missing required arguments"}
 
             result = await self._process_video(
-                args["video_data"], "merge", other_video=args["other_video"]
+                self._get_source(args),
+                "merge",
+                output_path=args.get("output_path"),
+                other_video=other_video,
+                stream_copy=args.get("stream_copy", True),
             )
 
             if "error" not in result:
@@ -504,26 +573,27 @@ class VideoTool(BaseTool):
         """Split video into segments.
 
         Args:
-            args: Split arguments
+            args: Split arguments; with ``stream_copy`` (default True) and ffmpeg
+                available, segments start at keyframes and nothing is re-encoded
 
         Returns:
             Dict[str, Any]: Split result
         """
         try:
-            if not args or "video_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing video data"}
 
             result = await self._process_video(
-                args["video_data"], "split", segments=args.get("segments", 2)
+                self._get_source(args),
+                "split",
+                output_path=args.get("output_path"),
+                segments=args.get("segments", 2),
+                stream_copy=args.get("stream_copy", True),
             )
 
             if "error" not in result:
                 self._add_to_history(
-                    "split",
-                    {
-                        "segments": args.get("segments", 2),
-                        "sizes": [len(segment) for segment in result["video_data"]],
-                    },
+                    "split", {"segments": args.get("segments", 2), "sizes": result["sizes"]}
                 )
 
             return result
@@ -541,11 +611,15 @@ class VideoTool(BaseTool):
             Dict[str, Any]: Resize result
         """
         try:
-            if not args or "video_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing video data"}
 
             result = await self._process_video(
-                args["video_data"], "resize", width=args.get("width"), height=args.get("height")
+                self._get_source(args),
+                "resize",
+                output_path=args.get("output_path"),
+                width=args.get("width"),
+                height=args.get("height"),
             )
 
             if "error" not in result:
@@ -573,11 +647,14 @@ class VideoTool(BaseTool):
             Dict[str, Any]: Rotate result
         """
         try:
-            if not args or "video_data" not in args:
+            if not args or not self._get_source(args):
                 return {"error": "Missing video data"}
 
             result = await self._process_video(
-                args["video_data"], "rotate", angle=args.get("angle", 0)
+                self._get_source(args),
+                "rotate",
+                output_path=args.get("output_path"),
+                angle=args.get("angle", 0),
             )
 
             if "error" not in result:
@@ -600,12 +677,13 @@ class VideoTool(BaseTool):
             Dict[str, Any]: Filter result
         """
         try:
-            if not args or "video_data" not in args or "filter_type" not in args:
+            if not args or not self._get_source(args) or "filter_type" not in args:
                 return {"error": "Missing required arguments"}
 
             result = await self._process_video(
-                args["video_data"],
+                self._get_source(args),
                 "filter",
+                output_path=args.get("output_path"),
                 filter_type=args["filter_type"],
                 kernel_size=args.get("kernel_size", 5),
             )
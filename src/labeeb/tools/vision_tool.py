@@ -1,8 +1,7 @@
-import torch
-from PIL import Image
-from transformers import AutoProcessor, AutoModelForVision2Seq
-from typing import Optional
+import asyncio
+from typing import List, Optional
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.models.vision.model_host import get_vision_model_host
 import logging
 import tempfile
 
@@ -13,26 +12,17 @@ class VisionTool(BaseTool):
     """
     VisionTool for Labeeb using SmolVLM-256M. All processing is 100% local.
     Do not send any data to the internet unless explicitly requested by the user.
+
+    torch, transformers and the model weights are loaded on the first analysis,
+    not at construction, and only once per process.
     """
 
     def __init__(self):
         super().__init__(
             name="vision", description="Local vision-language tool using SmolVLM-256M."
         )
-        self._init_model()
-
-    def _init_model(self):
-        try:
-            self.processor = AutoProcessor.from_pretrained("HuggingFaceTB/SmolVLM-256M-Instruct")
-            self.model = AutoModelForVision2Seq.from_pretrained(
-                "HuggingFaceTB/SmolVLM-256M-Instruct", torch_dtype=torch.bfloat16
-            )
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            self.model = self.model.to(self.device)
-            logger.info("SmolVLM-256M loaded locally on %s", self.device)
-        except Exception as e:
-            logger.error(f"Failed to load SmolVLM-256M: {e}")
-            raise
+        # One model per process, shared with VisionProcessor
+        self.host = get_vision_model_host()
 
     def analyze_image(self, image_path: str, prompt: Optional[str] = None) -> str:
         """
@@ -43,23 +33,27 @@ class VisionTool(BaseTool):
         Returns:
             str: Model's description/caption
         """
-        if prompt is None:
-            prompt = "Can you describe this image?"
-        # Ensure the prompt includes <image> for each image
-        if "<image>" not in prompt:
-            prompt = prompt.strip() + " <image>"
         try:
-            image = Image.open(image_path)
-            inputs = self.processor(text=prompt, images=[image], return_tensors="pt").to(
-                self.device
-            )
-            with torch.no_grad():
-                generated_ids = self.model.generate(**inputs, max_new_tokens=500)
-            return self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            return self.host.generate(image_path, prompt)
         except Exception as e:
             logger.error(f"VisionTool failed to analyze image: {e}")
             return f"[VisionTool error: {e}]"
 
+    def analyze_images(self, image_paths: List[str], prompt: Optional[str] = None) -> List[str]:
+        """
+        Analyze several images, batched into as few forward passes as possible.
+        Args:
+            image_paths: Paths to the image files
+            prompt: Optional prompt/question for the model, shared by all images
+        Returns:
+            List[str]: Model's description/caption per image
+        """
+        try:
+            return self.host.generate_many(image_paths, prompt)
+        except Exception as e:
+            logger.error(f"VisionTool failed to analyze images: {e}")
+            return [f"[VisionTool error: {e}]"] * len(image_paths)
+
     async def _execute_command(self, action: str, args: dict) -> dict:
         if action == "analyze_image":
             image_path = args.get("image_path")
@@ -89,9 +83,27 @@ class VisionTool(BaseTool):
                                 raise RuntimeError("GUI/display features are not available in this environment. Please run in a graphical session.")
                             raise
             try:
-                result = self.analyze_image(image_path, prompt)
+                # Concurrent calls join the same batch instead of blocking the loop
+                result = await self.host.agenerate(image_path, prompt)
                 return {"result": result, "image_path": image_path}
             except Exception as e:
+                logger.error(f"VisionTool failed to analyze image: {e}")
                 return {"error": str(e), "image_path": image_path}
+        elif action == "analyze_images":
+            image_paths = args.get("image_paths") or []
+            if not image_paths:
+                return {"error": "Missing image paths"}
+            results = await asyncio.gather(
+                *(self.host.agenerate(path, args.get("prompt")) for path in image_paths),
+                return_exceptions=True,
+            )
+            return {
+                "results": [
+                    {"error": str(result), "image_path": path}
+                    if isinstance(result, Exception)
+                    else {"result": result, "image_path": path}
+                    for path, result in zip(image_paths, results)
+                ]
+            }
         else:
             return {"error": f"Unknown action: {action}"}
@@ -7,6 +7,8 @@ import requests
 from typing import Dict, Any, Optional
 import os
 
+from labeeb.services.cache_service import get_cache_service
+
 # Plugin metadata
 PLUGIN_INFO = {
     "name": "weather",
@@ -21,20 +23,29 @@ PLUGIN_INFO = {
 class WeatherPlugin:
     """Weather plugin implementation."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_duration: int = 300):
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
         if not self.api_key:
             raise ValueError("OpenWeather API key is required")
+        self.cache = get_cache_service().namespace("weather_plugin", ttl=cache_duration)
+
+    def _fetch(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Get an OpenWeather response, reusing a cached one while it is fresh."""
+        cache_key = (endpoint, tuple(sorted((k, v) for k, v in params.items() if k != "appid")))
+        data = self.cache.get(cache_key)
+        if data is None:
+            url = f"http://api.openweathermap.org/data/2.5/{endpoint}"
+            response = requests.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            self.cache.set(cache_key, data)
+        return data
 
     def get_current_weather(self, city: str) -> Dict[str, Any]:
         """Get current weather for a city."""
-        url = f"http://api.openweathermap.org/data/2.5/weather"
         params = {"q": city, "appid": self.api_key, "units": "metric"}
+        data = self._fetch("weather", params)
 
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-
-        data = response.json()
         return {
             "temperature": data["main"]["temp"],
             "description": data["weather"][0]["description"],
@@ -44,18 +55,14 @@ class WeatherPlugin:
 
     def get_forecast(self, city: str, days: int = 5) -> Dict[str, Any]:
         """Get weather forecast for a city."""
-        url = f"http://api.openweathermap.org/data/2.5/forecast"
         params = {
             "q": city,
             "appid": self.api_key,
             "units": "metric",
             "cnt": days * 8,  # API returns data in 3-hour intervals
         }
+        data = self._fetch("forecast", params)
 
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-
-        data = response.json()
         forecast = []
 
         for item in data["list"]:
@@ -73,13 +80,9 @@ class WeatherPlugin:
 
     def get_weather_alerts(self, city: str) -> Dict[str, Any]:
         """Get weather alerts for a city."""
-        url = f"http://api.openweathermap.org/data/2.5/onecall"
         params = {"q": city, "appid": self.api_key, "exclude": "current,minutely,hourly,daily"}
+        data = self._fetch("onecall", params)
 
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-
-        data = response.json()
         alerts = data.get("alerts", [])
 
         return {
@@ -126,4 +129,6 @@ class WeatherPlugin:
 # Plugin initialization function
 def initialize(config: Dict[str, Any]) -> WeatherPlugin:
     """Initialize the weather plugin."""
-    return WeatherPlugin(api_key=config.get("api_key"))
+    return WeatherPlugin(
+        api_key=config.get("api_key"), cache_duration=config.get("cache_duration", 300)
+    )
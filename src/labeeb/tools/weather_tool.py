@@ -13,6 +13,7 @@ import time
 import aiohttp
 from typing import Dict, Any, List, Optional, Union
 from labeeb.core.ai.tool_base import BaseTool
+from labeeb.services.cache_service import get_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +37,14 @@ class WeatherTool(BaseTool):
         self._units = config.get("units", "metric")
         self._language = config.get("language", "en")
         self._cache_duration = config.get("cache_duration", 300)  # 5 minutes
+        self._cache = get_cache_service().namespace(
+            "weather_tool",
+            ttl=self._cache_duration,
+            scope={"api_url": self._api_url, "units": self._units, "language": self._language},
+        )
         self._max_requests = config.get("max_requests", 60)  # per minute
         self._operation_history = []
         self._max_history = config.get("max_history", 100)
-        self._cache = {}  # Weather data cache
         self._request_times = []  # Request rate limiting
 
     async def initialize(self) -> bool:
@@ -54,8 +59,7 @@ class WeatherTool(BaseTool):
                 logger.error("API key is required")
                 return False
 
-            # Initialize cache and request tracking
-            self._cache = {}
+            # Initialize request tracking
             self._request_times = []
 
             return await super().initialize()
@@ -66,7 +70,6 @@ class WeatherTool(BaseTool):
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
         try:
-            self._cache = {}
             self._request_times = []
             self._operation_history = []
             await super().cleanup()
@@ -179,21 +182,6 @@ class WeatherTool(BaseTool):
             params.append(f"{key}={value}")
         return "|".join(params)
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid.
-
-        Args:
-            cache_key: Cache key to check
-
-        Returns:
-            bool: True if cache is valid, False otherwise
-        """
-        if cache_key not in self._cache:
-            return False
-
-        cache_time = self._cache[cache_key]["timestamp"]
-        return time.time() - cache_time < self._cache_duration
-
     async def _make_api_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Make a request to the weather API.
 
@@ -242,8 +230,9 @@ class WeatherTool(BaseTool):
             cache_key = self._get_cache_key(location, "current")
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"q": location}
@@ -253,7 +242,7 @@ class WeatherTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
@@ -291,8 +280,9 @@ class WeatherTool(BaseTool):
             cache_key = self._get_cache_key(location, "forecast", days=days)
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"q": location, "cnt": days * 8}  # API returns 3-hour intervals
@@ -302,7 +292,7 @@ class WeatherTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
@@ -340,8 +330,9 @@ class WeatherTool(BaseTool):
             cache_key = self._get_cache_key(location, "historical", date=date)
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"q": location, "dt": int(time.mktime(time.strptime(date, "%Y-%m-%d")))}
@@ -351,7 +342,7 @@ class WeatherTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
@@ -385,8 +376,9 @@ class WeatherTool(BaseTool):
             cache_key = self._get_cache_key(location, "alerts")
 
             # Check cache
-            if self._is_cache_valid(cache_key):
-                return self._cache[cache_key]["data"]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Make API request
             params = {"q": location}
@@ -396,7 +388,7 @@ class WeatherTool(BaseTool):
                 return data
 
             # Cache response
-            self._cache[cache_key] = {"data": data, "timestamp": time.time()}
+            self._cache.set(cache_key, data)
 
             result = {
                 "status": "success",
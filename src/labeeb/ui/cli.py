@@ -109,7 +109,12 @@ def run_stt(file_path: str = None, language: str = "en", use_mic: bool = False)
         
         if use_mic:
             print("Recording from microphone... (Press Ctrl+C to stop)")
-            result = tool.record_from_microphone(language=language)
+            # Print each phrase as soon as it is transcribed
+            phrases = []
+            for segment in tool.stream_from_microphone(language=language):
+                print(f"[{segment['start']:.1f}s] {segment['text']}", flush=True)
+                phrases.append(segment["text"])
+            result = {"text": " ".join(phrases)}
         else:
             print(f"Transcribing file: {file_path}")
             result = tool.transcribe(file_path, language=language)
@@ -10,7 +10,8 @@ import shlex
 import platform
 import glob
 from pathlib import Path
-import fnmatch  # Make sure fnmatch is properly imported
+
+from labeeb.services.file_index import get_file_index
 
 logger = logging.getLogger(__name__)
 
@@ -39,8 +40,8 @@ class FileUtils:
     @staticmethod
     def search_files(search_term, search_path=None, name_pattern=None, file_type=None, limit=15):
         """
-        Search for files matching criteria using Python's os module.
-        This is more reliable and cross-platform than using the find command.
+        Search for files matching criteria using the file index.
+        The search path is crawled once and kept current, so repeated searches do not walk it again.
 
         Args:
             search_term (str): Term to search for in filenames
@@ -65,60 +66,29 @@ class FileUtils:
         if not search_term and not name_pattern and not file_type:
             return [], "No search criteria provided"
 
-        # Prepare search results
-        results = []
-        seen_files = set()  # Track seen files to prevent duplicates
+        if not os.path.isdir(expanded_path):
+            return [], f"Search path is not a directory: {expanded_path}"
+
+        # Patterns from both arguments must match; plain terms are substrings
+        patterns = [name_pattern] if name_pattern else []
+        term = None
+        if search_term:
+            if "*" in search_term or "?" in search_term:
+                patterns.append(search_term)
+            else:
+                term = search_term
 
+        # Like the directory walk this replaced, only hidden directories are skipped
         try:
-            # Walk through directory structure
-            for root, dirs, files in os.walk(expanded_path):
-                # Skip hidden directories
-                dirs[:] = [d for d in dirs if not d.startswith(".")]
-
-                for filename in files:
-                    # Skip hidden files
-                    if filename.startswith("."):
-                        continue
-
-                    # Check if file matches search criteria
-                    file_path = os.path.join(root, filename)
-
-                    # Skip if we've already processed this file
-                    if file_path in seen_files:
-                        continue
-                    seen_files.add(file_path)
-
-                    match = True
-
-                    # Apply name pattern filter if specified
-                    if name_pattern:
-                        if not fnmatch.fnmatch(filename, name_pattern):
-                            match = False
-
-                    # Apply file type filter if specified
-                    if file_type and match:
-                        ext = os.path.splitext(filename)[1].lower()
-                        if not ext.endswith(file_type.lower()):
-                            match = False
-
-                    # Apply search term filter if specified - make this more robust
-                    if search_term and match:
-                        # If search_term has wildcards, use fnmatch pattern matching
-                        if "*" in search_term or "?" in search_term:
-                            if not fnmatch.fnmatch(filename.lower(), search_term.lower()):
-                                match = False
-                        # Otherwise use simple substring search
-                        elif search_term.lower() not in filename.lower():
-                            match = False
-
-                    if match:
-                        results.append(file_path)
-
-                    # Check limit
-                    if limit and len(results) >= limit:
-                        return results[:limit], None
-
-            return results, None
+            records = get_file_index(excludes=()).search(
+                term=term,
+                root=expanded_path,
+                glob=patterns,
+                ext=file_type,
+                include_dirs=False,
+                limit=limit or None,
+            )
+            return [record.path for record in records], None
 
         except Exception as e:
             logger.error(f"Error during file search: {str(e)}")
@@ -143,14 +113,23 @@ class FileUtils:
         results = []
         seen_files = set()  # Track seen files to prevent duplicates
 
-        # Search for each combination of term and extension
-        for term in cv_terms:
-            for ext in cv_extensions:
-                files, _ = FileUtils.search_files(term, search_path, f"*{ext}")
-                for file in files:
-                    if file not in seen_files:
-                        seen_files.add(file)
-                        results.append(file)
+        expanded_path = FileUtils.expand_path(search_path or "~")
+        if not os.path.isdir(expanded_path):
+            return [], f"Search path does not exist: {expanded_path}"
+
+        # One indexed query per term covers every extension
+        try:
+            for term in cv_terms:
+                records = get_file_index(excludes=()).search(
+                    term=term, root=expanded_path, ext=cv_extensions, include_dirs=False, limit=None
+                )
+                for record in records:
+                    if record.path not in seen_files:
+                        seen_files.add(record.path)
+                        results.append(record.path)
+        except Exception as e:
+            logger.error(f"Error during CV search: {str(e)}")
+            return results, str(e)
 
         return results, None
 
@@ -10,7 +10,7 @@ This module provides functionality for:
 
 import os
 import gettext
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 
@@ -18,7 +18,7 @@ class I18nManager:
     """Manages internationalization for the Labeeb platform.
 
     This class handles:
-    - Translation loading and caching
+    - Translation loading and caching, one catalog per language on first use
     - Language switching
     - String translation
     - Plural forms
@@ -35,24 +35,43 @@ class I18nManager:
         self.locale_dir = Path(locale_dir)
         self.translations: Dict[str, gettext.GNUTranslations] = {}
         self.current_language = "en"
-        self._load_translations()
+        self._languages: Optional[List[str]] = None
+
+    def _discover_languages(self) -> List[str]:
+        """Find the languages that have a catalog, without loading any of them."""
+        if self._languages is None:
+            languages = []
+            if self.locale_dir.exists():
+                catalog = Path("LC_MESSAGES") / f"{self.domain}.mo"
+                for lang_dir in self.locale_dir.iterdir():
+                    if lang_dir.is_dir() and (lang_dir / catalog).exists():
+                        languages.append(lang_dir.name)
+            self._languages = languages
+        return self._languages
+
+    def _get_translation(self, language: str) -> Optional[gettext.GNUTranslations]:
+        """Get the catalog for a language, loading it on first use.
 
-    def _load_translations(self) -> None:
-        """Load all available translations."""
-        if not self.locale_dir.exists():
-            return
-
-        for lang_dir in self.locale_dir.iterdir():
-            if not lang_dir.is_dir():
-                continue
+        Args:
+            language: Language code
 
-            try:
-                translation = gettext.translation(
-                    self.domain, localedir=str(self.locale_dir), languages=[lang_dir.name]
-                )
-                self.translations[lang_dir.name] = translation
-            except Exception as e:
-                print(f"Failed to load translation for {lang_dir.name}: {e}")
+        Returns:
+            Optional[gettext.GNUTranslations]: The catalog, or None if unavailable
+        """
+        translation = self.translations.get(language)
+        if translation is not None or language not in self._discover_languages():
+            return translation
+
+        try:
+            translation = gettext.translation(
+                self.domain, localedir=str(self.locale_dir), languages=[language]
+            )
+        except Exception as e:
+            print(f"Failed to load translation for {language}: {e}")
+            self._languages.remove(language)
+            return None
+        self.translations[language] = translation
+        return translation
 
     def set_language(self, language: str) -> bool:
         """Set the current language.
@@ -63,7 +82,7 @@ class I18nManager:
         Returns:
             bool: True if language was set successfully
         """
-        if language not in self.translations:
+        if language not in self._discover_languages():
             return False
 
         self.current_language = language
@@ -83,7 +102,7 @@ class I18nManager:
         Returns:
             list[str]: List of available language codes
         """
-        return list(self.translations.keys())
+        return list(self._discover_languages())
 
     def translate(self, text: str, **kwargs: Any) -> str:
         """Translate a string.
@@ -95,10 +114,11 @@ class I18nManager:
         Returns:
             str: Translated text
         """
-        if self.current_language not in self.translations:
+        catalog = self._get_translation(self.current_language)
+        if catalog is None:
             return text
 
-        translation = self.translations[self.current_language].gettext(text)
+        translation = catalog.gettext(text)
         return translation.format(**kwargs) if kwargs else translation
 
     def translate_plural(self, singular: str, plural: str, count: int, **kwargs: Any) -> str:
@@ -113,10 +133,11 @@ class I18nManager:
         Returns:
             str: Translated text in appropriate plural form
         """
-        if self.current_language not in self.translations:
+        catalog = self._get_translation(self.current_language)
+        if catalog is None:
             return singular if count == 1 else plural
 
-        translation = self.translations[self.current_language].ngettext(singular, plural, count)
+        translation = catalog.ngettext(singular, plural, count)
         return translation.format(**kwargs) if kwargs else translation
 
 
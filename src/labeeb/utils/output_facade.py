@@ -75,6 +75,9 @@ class OutputFacade:
         # RTL support
         self._rtl_support = False
 
+        # Streamed text not yet written because its line is incomplete
+        self._stream_line = ""
+
     def set_rtl_support(self, enabled: bool) -> None:
         """
         Enable or disable RTL language support.
@@ -264,6 +267,31 @@ class OutputFacade:
         message = self._process_rtl_text(message)
         return self._handler.status(message, "info")
 
+    def stream_token(self, token: str) -> None:
+        """
+        Write a streamed response token without a trailing newline.
+
+        With RTL support a line can only be reshaped once it is complete, so
+        tokens are written a line at a time instead.
+
+        Args:
+            token: The token to write
+        """
+        if not self._rtl_support:
+            self._handler.stream(token)
+            return
+        self._stream_line += token
+        while "\n" in self._stream_line:
+            line, self._stream_line = self._stream_line.split("\n", 1)
+            self._handler.stream(self._process_rtl_text(line) + "\n")
+
+    def end_stream(self) -> None:
+        """Finish a streamed response, writing any incomplete last line."""
+        if self._stream_line:
+            self._handler.stream(self._process_rtl_text(self._stream_line))
+            self._stream_line = ""
+        self._handler.end_stream()
+
     # -- Formatting methods --
 
     def header(self, text: str, emoji_key: Optional[str] = None) -> str:
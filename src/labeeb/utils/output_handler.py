@@ -52,6 +52,7 @@ class OutputHandler:
         # State tracking
         self.capture_mode = False
         self.captured_output = []
+        self._stream_parts: List[str] = []
         self.thinking_shown = False
         self.command_shown = False
         self.result_shown = False
@@ -135,6 +136,26 @@ class OutputHandler:
 
         return output
 
+    def stream(self, text: str) -> None:
+        """
+        Write part of a streamed response without a trailing newline.
+
+        Args:
+            text: The text to write, already prepared for display
+        """
+        if self.capture_mode:
+            self._stream_parts.append(text)
+        else:
+            print(text, end="", flush=True)
+
+    def end_stream(self) -> None:
+        """Finish a streamed response, capturing it as one output in capture mode."""
+        if self.capture_mode:
+            self.captured_output.append("".join(self._stream_parts))
+        else:
+            print(flush=True)
+        self._stream_parts = []
+
     def thinking(self, message: str) -> Optional[str]:
         """
         Display thinking message (only once per sequence).
@@ -0,0 +1,60 @@
+"""
+Text normalization helpers for matching user commands.
+
+---
+description: Normalizes English and Arabic command text for lookups
+endpoints: [normalize_arabic, normalize_command]
+inputs: [text]
+outputs: [normalized_text]
+dependencies: [re]
+auth: none
+alwaysApply: false
+---
+
+- Collapse whitespace and fold case
+- Strip Arabic diacritics (tashkeel) and tatweel
+- Unify alef and yaa variants
+"""
+
+import re
+
+# Fathatan through sukun, plus superscript alef
+_ARABIC_DIACRITICS = re.compile("[\u064b-\u0652\u0670]")
+_WHITESPACE = re.compile(r"\s+")
+
+_ARABIC_LETTER_MAP = str.maketrans(
+    {
+        "\u0623": "\u0627",  # alef with hamza above -> alef
+        "\u0625": "\u0627",  # alef with hamza below -> alef
+        "\u0622": "\u0627",  # alef with madda -> alef
+        "\u0671": "\u0627",  # alef wasla -> alef
+        "\u0649": "\u064a",  # alef maksura -> yaa
+        "\u0640": None,  # tatweel
+    }
+)
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    Normalize Arabic spelling variants.
+
+    Args:
+        text: The text to normalize
+
+    Returns:
+        str: Text without diacritics or tatweel and with unified alef/yaa forms
+    """
+    return _ARABIC_DIACRITICS.sub("", text).translate(_ARABIC_LETTER_MAP)
+
+
+def normalize_command(text: str) -> str:
+    """
+    Normalize a command so that trivially different spellings compare equal.
+
+    Args:
+        text: The command text
+
+    Returns:
+        str: Case-folded, whitespace-collapsed, Arabic-normalized text
+    """
+    return _WHITESPACE.sub(" ", normalize_arabic(text)).strip().casefold()
@@ -6,7 +6,7 @@ and formatted output. The module can be run as a script to automatically update
 method in shell_handler.py, creating a backup of the original file before making changes.
 
 Key features:
-- Enhanced file search with metadata support (size, modification time)
+- Enhanced file search backed by the file index, with metadata support (size, modification time)
 - Improved error handling and user feedback
 - Formatted output with emojis and clear organization
 - Automatic backup of original files before modification
@@ -32,22 +32,16 @@ def get_fixed_method():
         Returns:
             str: Formatted search results
         """
-        file_name = file_name.replace('"', '\\"').replace("'", "\\'")  # Escape quotes
         location = os.path.expanduser(location)
         
         try:
-            # Prepare results container
-            all_files = []
+            # Query the file index; the location is crawled once and then kept current
+            from labeeb.services.file_index import get_file_index
             
-            # Construct the find command with error redirection for filesystem files
-            command = f'find {location} -type f -name "*{file_name}*" -not -path "*/\\.*" 2>/dev/null | grep -v "Library/|.Trash" | head -n {max_results}'
-            
-            # Execute the command
-            result = self.execute_command(command, force_shell=True)
-            
-            # Process filesystem results
-            if result and result.strip() != "":
-                all_files = result.strip().split("\\n")
+            records = get_file_index().search(
+                term=file_name, root=location, include_dirs=False, limit=max_results
+            )
+            all_files = [record.path for record in records]
             
             # Format the output with emojis according to enhancement guidelines
             if not all_files:
@@ -60,10 +54,13 @@ def get_fixed_method():
             
             # Include metadata if requested
             if include_metadata:
-                for file_path in all_files:
+                import datetime
+                
+                for record in records:
+                    file_path = record.path
                     try:
-                        # Get file size and format it
-                        file_size = os.path.getsize(file_path)
+                        # Size and modification time come from the index, not extra stat calls
+                        file_size = record.size
                         if file_size < 1024:
                             size_str = f"{file_size} B"
                         elif file_size < 1024 * 1024:
@@ -72,9 +69,7 @@ def get_fixed_method():
                             size_str = f"{file_size/(1024*1024):.1f} MB"
                         
                         # Get last modified time
-                        mod_time = os.path.getmtime(file_path)
-                        import datetime
-                        mod_time_str = datetime.datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d %H:%M')
+                        mod_time_str = datetime.datetime.fromtimestamp(record.mtime).strftime('%Y-%m-%d %H:%M')
                         
                         formatted_result += f"  • {file_path} ({size_str}, modified: {mod_time_str})\\n"
                     except Exception as e:
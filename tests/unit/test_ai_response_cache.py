@@ -0,0 +1,155 @@
+"""
+Unit tests for the AI response cache.
+
+---
+description: Test LRU eviction, TTL expiry and key normalization
+endpoints: [test_ai_response_cache]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import asyncio
+import sqlite3
+import pytest
+from unittest.mock import patch
+
+from labeeb.services.ai_response_cache import AIResponseCache
+from labeeb.services.ai_response_store import PersistentResponseStore
+from labeeb.utils.text_normalizer import normalize_command
+
+
+@pytest.fixture
+def cache():
+    """Create a small response cache."""
+    return AIResponseCache(max_size=3, ttl=60)
+
+
+def test_get_and_set(cache):
+    """Test a stored response is returned."""
+    cache.set("open firefox", {"plan": []})
+    assert cache.get("open firefox") == {"plan": []}
+    assert cache.get("close firefox") is None
+
+
+def test_lru_eviction(cache):
+    """Test the least recently used entry is evicted first."""
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get_cache_stats()["evictions"] == 1
+
+
+def test_ttl_expiry(cache):
+    """Test entries expire on the monotonic clock."""
+    with patch("labeeb.services.ai_response_cache.time.monotonic", return_value=100.0):
+        cache.set("weather", "sunny")
+    with patch("labeeb.services.ai_response_cache.time.monotonic", return_value=159.0):
+        assert cache.get("weather") == "sunny"
+    with patch("labeeb.services.ai_response_cache.time.monotonic", return_value=160.0):
+        assert cache.get("weather") is None
+    assert cache.get_cache_stats()["expirations"] == 1
+
+
+def test_normalized_keys(cache):
+    """Test equivalent commands share one entry."""
+    cache.set("Open  Firefox", "ok")
+    assert cache.get("open firefox ") == "ok"
+    cache.set("أَحْمَــد", "arabic")
+    assert cache.get("احمد") == "arabic"
+    assert len(cache) == 2
+
+
+def test_custom_key_normalizer():
+    """Test the key normalizer is pluggable."""
+    cache = AIResponseCache(key_normalizer=None)
+    cache.set("Open Firefox", "ok")
+    assert cache.get("open firefox") is None
+
+
+def test_cache_stats(cache):
+    """Test hit and miss counters."""
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_normalize_command():
+    """Test whitespace, case and Arabic letter variants are normalized."""
+    assert normalize_command("  Open\tFIREFOX ") == "open firefox"
+    assert normalize_command("إلى مستشفى") == normalize_command("الي مستشفي")
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    """Test a new cache reads responses written by a previous one."""
+    store = PersistentResponseStore(db_path=tmp_path / "responses.db")
+    first = AIResponseCache(persistent_store=store)
+    first.set("Open Firefox", {"plan": ["firefox"]})
+    first.flush()
+    store.close()
+
+    store = PersistentResponseStore(db_path=tmp_path / "responses.db")
+    second = AIResponseCache(persistent_store=store)
+    try:
+        assert second.get("open  firefox") == {"plan": ["firefox"]}
+        assert second.get_cache_stats()["persistent_hits"] == 1
+    finally:
+        store.close()
+
+
+def test_persistent_tier_enforces_ttl(tmp_path):
+    """Test expired rows are not returned from the persistent tier."""
+    store = PersistentResponseStore(db_path=tmp_path / "responses.db")
+    try:
+        store.put("weather", "sunny", ttl=-1)
+        store.flush()
+        assert store.get("weather") is None
+    finally:
+        store.close()
+
+
+def test_persistent_tier_is_trimmed_when_opened(tmp_path):
+    """Test rows past the cap and expired rows are purged as soon as the store opens."""
+    path = tmp_path / "responses.db"
+    store = PersistentResponseStore(db_path=path)
+    for i in range(5):
+        store.put(f"key {i}", i, ttl=3600)
+    store.put("expired", "old", ttl=-1)
+    store.close()
+
+    store = PersistentResponseStore(db_path=path, max_entries=2)
+    try:
+        store.flush()
+        with sqlite3.connect(str(path)) as conn:
+            keys = {row[0] for row in conn.execute("SELECT key FROM responses")}
+        assert len(keys) == 2
+        assert "expired" not in keys
+    finally:
+        store.close()
+
+
+def test_get_async_reads_the_persistent_tier(tmp_path):
+    """Test async lookups read through to the store and count as persistent hits."""
+    store = PersistentResponseStore(db_path=tmp_path / "responses.db")
+    try:
+        store.put("open firefox", {"plan": ["firefox"]}, ttl=3600)
+        store.flush()
+        cache = AIResponseCache(persistent_store=store)
+        assert asyncio.run(cache.get_async("Open Firefox")) == {"plan": ["firefox"]}
+        assert asyncio.run(cache.get_async("Open Firefox")) == {"plan": ["firefox"]}
+        assert asyncio.run(cache.get_async("close firefox")) is None
+        stats = cache.get_cache_stats()
+        assert (stats["hits"], stats["persistent_hits"], stats["misses"]) == (2, 1, 1)
+    finally:
+        store.close()
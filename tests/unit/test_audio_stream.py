@@ -0,0 +1,67 @@
+"""Tests for the chunked audio stream service."""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from labeeb.services import audio_stream
+
+RATE = 8000
+
+
+def make_wav(samples, sampwidth=2):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(samples.shape[1])
+        out.setsampwidth(sampwidth)
+        out.setframerate(RATE)
+        out.writeframes(audio_stream.from_float(samples, sampwidth))
+    return buffer.getvalue()
+
+
+def read_samples(data, sampwidth=2):
+    with audio_stream.open_wav(data) as wav:
+        return audio_stream.to_float(
+            wav.readframes(wav.getnframes()), sampwidth, wav.getnchannels()
+        )
+
+
+@pytest.fixture
+def tone():
+    t = np.arange(RATE * 3) / RATE
+    mono = 0.3 * np.sin(2 * np.pi * 100 * t) + 0.2 * np.sin(2 * np.pi * 3000 * t)
+    return np.stack([mono, -0.5 * mono], axis=1)
+
+
+def test_blockwise_filter_matches_whole_signal(tone, monkeypatch):
+    signal = pytest.importorskip("scipy.signal")
+    monkeypatch.setattr(audio_stream, "BLOCK_FRAMES", 1000)
+    data = make_wav(tone)
+    sos = audio_stream.design_filter("lowpass", 500, RATE)
+    output = io.BytesIO()
+    assert audio_stream.apply_filter(data, output, sos) == len(tone)
+
+    samples = read_samples(data)
+    zi = signal.sosfilt_zi(sos)[:, :, np.newaxis] * samples[0]
+    expected, _ = signal.sosfilt(sos, samples, axis=0, zi=zi)
+    assert np.abs(read_samples(output.getvalue()) - expected).max() < 1e-4
+
+
+@pytest.mark.parametrize("sampwidth", [1, 2, 4])
+def test_normalize_reaches_full_scale(tone, sampwidth):
+    output = io.BytesIO()
+    audio_stream.normalize(make_wav(tone, sampwidth), output)
+    peak = np.abs(read_samples(output.getvalue(), sampwidth)).max()
+    assert peak == pytest.approx(1.0, abs=2 / 2 ** (8 * sampwidth - 1))
+
+
+def test_split_trim_and_merge(tone):
+    data = make_wav(tone)
+    parts = [io.BytesIO() for _ in range(3)]
+    assert audio_stream.split(data, parts) == [8000, 8000, 8000]
+    assert audio_stream.trim(data, io.BytesIO(), start=0.5, end=1.0) == 4000
+    assert audio_stream.merge([data, parts[0].getvalue()], io.BytesIO()) == 32000
+    with pytest.raises(ValueError):
+        audio_stream.merge([data, make_wav(tone[:, :1])], io.BytesIO())
@@ -0,0 +1,101 @@
+"""
+Unit tests for the batch executor.
+
+---
+description: Test ordered output, checkpointing and resume in BatchExecutor
+endpoints: [test_batch_executor]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import asyncio
+import io
+import json
+
+from labeeb.services.batch_executor import BatchExecutor, BatchItem, read_checkpoint
+
+
+def make_items(*commands):
+    return [BatchItem(line=i, command=command) for i, command in enumerate(commands, 1)]
+
+
+async def process(command):
+    """Finish later commands first, and fail commands starting with 'fail'."""
+    await asyncio.sleep(0.01 * (5 - int(command[-1])))
+    if command.startswith("fail"):
+        raise RuntimeError(f"{command} failed")
+    return command.upper()
+
+
+def test_results_are_written_in_input_order():
+    out = io.StringIO()
+    executor = BatchExecutor(process, concurrency=4, output=out)
+    results = asyncio.run(executor.run(make_items("a1", "b2", "c3", "d4")))
+    assert [r.result for r in results] == ["A1", "B2", "C3", "D4"]
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["line"] for line in lines] == [1, 2, 3, 4]
+    assert all(line["status"] == "ok" for line in lines)
+
+
+def test_workers_stay_within_a_window_of_the_emitter():
+    """A slow head item stops workers from finishing the whole batch ahead of it."""
+    started = []
+    release_head = None
+
+    async def slow_head(command):
+        started.append(command)
+        if command == "item0":
+            await release_head.wait()
+        return command
+
+    async def main():
+        nonlocal release_head
+        release_head = asyncio.Event()
+        executor = BatchExecutor(slow_head, concurrency=2)
+        run = asyncio.ensure_future(executor.run(make_items(*(f"item{i}" for i in range(50)))))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        # Items started but not yet emitted are capped at twice the concurrency
+        assert len(started) == 4
+        release_head.set()
+        return await run
+
+    results = asyncio.run(main())
+    assert [r.result for r in results] == [f"item{i}" for i in range(50)]
+
+
+def test_checkpoint_records_next_line_and_failures(tmp_path):
+    checkpoint = tmp_path / "out.jsonl.checkpoint"
+    out = io.StringIO()
+    executor = BatchExecutor(process, concurrency=2, output=out, checkpoint_path=checkpoint)
+    results = asyncio.run(executor.run(make_items("a1", "fail2", "c3")))
+    assert [r.status for r in results] == ["ok", "error", "ok"]
+    assert json.loads(out.getvalue().splitlines()[1])["error"] == "fail2 failed"
+    assert read_checkpoint(checkpoint) == (4, {2})
+
+
+def test_resume_retries_failed_lines_and_skips_done_ones(tmp_path):
+    checkpoint = tmp_path / "out.jsonl.checkpoint"
+    checkpoint.write_text(json.dumps({"next_line": 3, "failed": [2]}))
+    seen = []
+
+    async def record(command):
+        seen.append(command)
+        return command
+
+    executor = BatchExecutor(record, concurrency=2, checkpoint_path=checkpoint)
+    start_line, failed = read_checkpoint(checkpoint)
+    results = asyncio.run(
+        executor.run(make_items("a1", "b2", "c3", "d4"), start_line, None, failed)
+    )
+    assert [r.line for r in results] == [2, 3, 4]
+    assert sorted(seen) == ["b2", "c3", "d4"]
+    assert read_checkpoint(checkpoint) == (5, set())
+
+
+def test_missing_checkpoint_starts_from_the_beginning(tmp_path):
+    assert read_checkpoint(tmp_path / "missing") == (0, set())
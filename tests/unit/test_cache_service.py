@@ -0,0 +1,145 @@
+"""Tests for the shared cache service."""
+
+import os
+import time
+
+import pytest
+
+from labeeb.services.cache_service import CacheService, estimate_size, make_cache_key
+
+
+@pytest.fixture
+def service(tmp_path):
+    return CacheService(memory_budget=10_000, spill_dir=tmp_path, spill_threshold=4_096)
+
+
+def test_namespaces_are_isolated(service):
+    text = service.namespace("text")
+    math = service.namespace("math")
+    text.set("key", "a")
+    math.set("key", "b")
+    assert text.get("key") == "a"
+    assert math.get("key") == "b"
+    text.clear()
+    assert text.get("key") is None
+    assert math.get("key") == "b"
+    assert len(text) == 0 and len(math) == 1
+
+
+def test_ttl_expires_entries(service):
+    ns = service.namespace("weather", ttl=0.01)
+    ns.set("city", {"temp": 20})
+    assert ns.get("city") == {"temp": 20}
+    time.sleep(0.02)
+    assert ns.get("city") is None
+    assert ns.get_stats()["expirations"] == 1
+
+
+def test_memory_budget_evicts_least_recently_used():
+    service = CacheService(memory_budget=3_000, policy="lru", spill_threshold=None)
+    ns = service.namespace("blobs")
+    for i in range(3):
+        ns.set(i, b"x" * 1_000)
+    ns.get(0)
+    ns.set(3, b"x" * 1_000)
+    assert 0 in ns and 1 not in ns and 3 in ns
+    stats = service.get_stats()
+    assert stats["memory_bytes"] <= 3_000
+    assert stats["evictions"] == 1
+
+
+def test_tinylfu_keeps_frequent_entries():
+    service = CacheService(memory_budget=2_000, spill_threshold=None)
+    ns = service.namespace("hot")
+    ns.set("a", b"x" * 1_000)
+    ns.set("b", b"x" * 1_000)
+    for _ in range(5):
+        ns.get("a")
+        ns.get("b")
+    # A one-off key is not admitted over keys that are used often
+    assert ns.set("once", b"x" * 1_000) is False
+    assert "a" in ns and "b" in ns
+    assert service.get_stats()["rejections"] == 1
+
+
+def test_large_values_spill_to_disk(service, tmp_path):
+    ns = service.namespace("image")
+    image = {"image_data": b"\x89PNG" + b"\0" * 8_000, "format": "PNG"}
+    ns.set("thumb", image)
+    assert list(tmp_path.glob("*.bin"))
+    assert service.get_stats()["memory_bytes"] == 0
+    assert ns.get("thumb") == image
+    ns.delete("thumb")
+    assert not list(tmp_path.glob("*.bin"))
+
+
+def test_stats_report_hits_and_bytes(service):
+    ns = service.namespace("text")
+    ns.set("k", "value")
+    ns.get("k")
+    ns.get("missing")
+    stats = service.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["namespaces"]["text"]["bytes"] == estimate_size("value")
+
+
+def test_cache_keys_are_canonical():
+    payload = b"\x00" * (3 * 1024**2 + 7)
+    key = make_cache_key(payload, "resize", width=10, height=20)
+    assert key == make_cache_key(bytearray(payload), "resize", height=20, width=10)
+    assert key == make_cache_key(memoryview(payload), "resize", height=20, width=10)
+    assert key != make_cache_key(payload[:-1], "resize", width=10, height=20)
+    assert make_cache_key("1", "x") != make_cache_key(1, "x")
+    assert make_cache_key({"b": [1, 2], "a": None}) == make_cache_key({"a": None, "b": [1, 2]})
+
+
+def test_cache_keys_hash_arrays_by_content():
+    np = pytest.importorskip("numpy")
+    matrix = np.arange(12, dtype=np.float64).reshape(3, 4)
+    assert make_cache_key(matrix) == make_cache_key(matrix.copy())
+    assert make_cache_key(matrix.T) == make_cache_key(np.ascontiguousarray(matrix.T))
+    assert make_cache_key(matrix) != make_cache_key(matrix.astype(np.float32))
+
+
+def test_overwriting_spilled_value_keeps_new_value(service, tmp_path):
+    ns = service.namespace("image")
+    ns.set("frame", b"a" * 8_000)
+    ns.set("frame", b"b" * 9_000)
+    assert ns.get("frame") == b"b" * 9_000
+    assert service.get_stats()["disk_bytes"] == 9_000
+    assert len(list(tmp_path.glob("*.bin"))) == 1
+
+
+def test_failed_read_of_a_replaced_spill_file_keeps_the_new_value(service, tmp_path):
+    ns = service.namespace("image")
+    ns.set("frame", b"a" * 8_000)
+    (old_path,) = tmp_path.glob("*.bin")
+    # Another thread sets the key again while this read of the old file is in progress
+    ns.set("frame", b"b" * 9_000)
+    assert service._read_spilled(("image", "frame"), old_path, None) is None
+    assert ns.get("frame") == b"b" * 9_000
+
+    # A failed read of the current file drops the entry
+    (current_path,) = tmp_path.glob("*.bin")
+    current_path.write_bytes(b"P not a pickle")
+    assert ns.get("frame") is None
+    assert not service.contains("image", "frame")
+    assert service.get_stats()["disk_bytes"] == 0
+
+
+def test_stale_spill_files_are_removed_on_startup(tmp_path):
+    (tmp_path / "0123456789abcdef.bin").write_bytes(b"B" + b"\0" * 100)
+    (tmp_path / "999999999-0.bin").write_bytes(b"B" + b"\0" * 100)
+    service = CacheService(spill_dir=tmp_path, spill_threshold=10)
+    service.namespace("image").set("frame", b"\0" * 100)
+    assert [path.name for path in tmp_path.iterdir()] == [f"{os.getpid()}-0.bin"]
+
+
+def test_scoped_namespaces_keep_settings_apart(service):
+    metric = service.namespace("weather_tool", scope={"units": "metric"})
+    imperial = service.namespace("weather_tool", scope={"units": "imperial"})
+    metric.set("London", {"temp": 20})
+    assert imperial.get("London") is None
+    assert service.namespace("weather_tool", scope={"units": "metric"}).get("London") == {
+        "temp": 20
+    }
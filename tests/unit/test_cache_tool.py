@@ -0,0 +1,139 @@
+"""
+Unit tests for the cache tool.
+
+---
+description: Test eviction order per policy, expiry and the running byte total
+endpoints: [test_cache_tool]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import json
+
+import pytest
+
+from labeeb.tools import cache_tool
+from labeeb.tools.cache_tool import CacheTool
+
+
+def make_tool(**config):
+    """Create a cache tool with a small entry limit."""
+    return CacheTool({"max_size": 3, **config})
+
+
+async def set_value(tool, key, value="v", ttl=0):
+    """Store a value through the tool, ttl=0 meaning no expiry."""
+    result = await tool._execute_command("set", {"key": key, "value": value, "ttl": ttl})
+    assert result["status"] == "success"
+
+
+async def get_value(tool, key):
+    """Read a value through the tool."""
+    return await tool._execute_command("get", {"key": key})
+
+
+def entry_size(key, value):
+    """Bytes the tool accounts for an entry."""
+    return len(key.encode()) + len(json.dumps(value).encode())
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_the_least_recently_used_entry():
+    """A read refreshes an entry, so the oldest unread entry goes first."""
+    tool = make_tool(eviction_policy="lru")
+    for key in ("a", "b", "c"):
+        await set_value(tool, key)
+    await get_value(tool, "a")
+    await set_value(tool, "d")
+    assert list(tool._cache) == ["c", "a", "d"]
+    await set_value(tool, "e")
+    assert list(tool._cache) == ["a", "d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_lfu_evicts_the_least_frequently_used_entry():
+    """The entry with the fewest hits goes first, the older one among ties."""
+    tool = make_tool(eviction_policy="lfu")
+    for key in ("a", "b", "c"):
+        await set_value(tool, key)
+    for key in ("a", "a", "b", "c"):
+        await get_value(tool, key)
+    await set_value(tool, "d")
+    # b and c have one hit each; b was read first
+    assert set(tool._cache) == {"a", "c", "d"}
+    await set_value(tool, "e")
+    # d has no hits yet
+    assert set(tool._cache) == {"a", "c", "e"}
+
+
+@pytest.mark.asyncio
+async def test_ttl_evicts_the_entry_closest_to_expiry():
+    """The soonest expiry goes first and entries without a TTL go last."""
+    tool = make_tool(eviction_policy="ttl")
+    await set_value(tool, "long", ttl=300)
+    await set_value(tool, "short", ttl=10)
+    await set_value(tool, "forever", ttl=0)
+    await set_value(tool, "medium", ttl=60)
+    assert set(tool._cache) == {"long", "forever", "medium"}
+    await set_value(tool, "new", ttl=600)
+    assert set(tool._cache) == {"long", "forever", "new"}
+    await set_value(tool, "another", ttl=0)
+    assert set(tool._cache) == {"forever", "new", "another"}
+    await set_value(tool, "last", ttl=0)
+    # "new" is the only entry left with a TTL, so it goes before any without one
+    assert set(tool._cache) == {"forever", "another", "last"}
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_returned_and_are_purged(monkeypatch):
+    """Reads miss expired entries, and expired entries free their bytes."""
+    now = 1000.0
+    monkeypatch.setattr(cache_tool.time, "time", lambda: now)
+    tool = make_tool(max_size=10)
+    await set_value(tool, "soon", ttl=5)
+    await set_value(tool, "later", ttl=50)
+    await set_value(tool, "never", ttl=0)
+
+    now = 1010.0
+    result = await get_value(tool, "soon")
+    assert result["status"] == "error"
+    assert "expired" in result["error"]
+    assert (await get_value(tool, "later"))["value"] == "v"
+
+    now = 1100.0
+    stats = (await tool._execute_command("stats"))["stats"]
+    assert stats["size"] == 1
+    assert stats["expirations"] == 2
+    assert stats["memory_usage"] == entry_size("never", "v")
+
+
+@pytest.mark.asyncio
+async def test_memory_usage_tracks_every_change():
+    """The running byte total follows sets, overwrites, deletes, evictions and clears."""
+    tool = make_tool(max_size=100, max_memory=50)
+    await set_value(tool, "a", "x" * 10)
+    await set_value(tool, "b", "y" * 10)
+    assert tool._memory_usage == entry_size("a", "x" * 10) + entry_size("b", "y" * 10)
+
+    await set_value(tool, "a", "z" * 20)
+    assert tool._memory_usage == entry_size("a", "z" * 20) + entry_size("b", "y" * 10)
+
+    await tool._execute_command("delete", {"key": "b"})
+    assert tool._memory_usage == entry_size("a", "z" * 20)
+
+    # Needs more room than is left, so "a" is evicted by size, not by count
+    await set_value(tool, "c", "w" * 30)
+    assert list(tool._cache) == ["c"]
+    assert tool._memory_usage == entry_size("c", "w" * 30)
+    assert (await tool._execute_command("stats"))["stats"]["evictions"] == 1
+
+    result = await tool._execute_command("set", {"key": "big", "value": "q" * 100})
+    assert result["status"] == "error"
+    assert tool._memory_usage == entry_size("c", "w" * 30)
+
+    await tool._execute_command("clear")
+    assert tool._memory_usage == 0
@@ -0,0 +1,201 @@
+"""
+Unit tests for the Labeeb daemon.
+
+---
+description: Test the socket protocol, concurrent clients and shutdown with a fake command processor
+endpoints: [test_daemon]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+
+import pytest
+
+from labeeb.services import daemon as daemon_module
+from labeeb.services.daemon import LabeebDaemon, send_request
+
+
+class FakeCommandProcessor:
+    """Answers every command with its upper-cased text, streaming one token per word."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def process_command_async(self, command, on_token=None):
+        if command == "fail":
+            raise RuntimeError("command failed")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            words = command.upper().split()
+            if on_token is not None:
+                for word in words:
+                    on_token(word)
+            return " ".join(words)
+        finally:
+            self.in_flight -= 1
+
+
+class FakeLabeeb:
+    """The parts of Labeeb the daemon uses."""
+
+    def __init__(self, delay=0.0):
+        self.command_processor = FakeCommandProcessor(delay)
+        self.cleaned_up = False
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+
+@pytest.fixture
+def socket_path():
+    """A socket path short enough for the Unix socket length limit."""
+    with tempfile.TemporaryDirectory(prefix="labeeb-") as directory:
+        yield os.path.join(directory, "d.sock")
+
+
+async def exchange(path, requests):
+    """Send raw request lines on one connection and read a response per request."""
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        for request in requests:
+            line = request if isinstance(request, str) else json.dumps(request)
+            writer.write((line + "\n").encode())
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in requests]
+    finally:
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_answered_by_id(socket_path):
+    """Each request gets one response carrying its id, including failures."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    daemon = LabeebDaemon(FakeLabeeb(), socket_path)
+    await daemon.start()
+    try:
+        assert oct(os.stat(socket_path).st_mode & 0o777) == "0o600"
+        # The process umask is left as it was
+        previous = os.umask(0o022)
+        os.umask(previous)
+        assert previous == umask
+        responses = await exchange(
+            socket_path,
+            [
+                {"id": 1, "op": "ping"},
+                {"id": 2, "command": "open firefox"},
+                {"id": 3, "command": "fail"},
+                {"id": 4},
+                {"id": 5, "op": "dance"},
+                "not json",
+            ],
+        )
+        by_id = {response["id"]: response for response in responses}
+        assert by_id[1] == {"id": 1, "status": "ok", "result": "pong"}
+        assert by_id[2] == {"id": 2, "status": "ok", "result": "OPEN FIREFOX"}
+        assert by_id[3]["status"] == "error"
+        assert "command failed" in by_id[3]["error"]
+        assert by_id[4] == {"id": 4, "status": "error", "error": "Request has no command"}
+        assert by_id[5] == {"id": 5, "status": "error", "error": "Unknown op: dance"}
+        assert by_id[None]["status"] == "error"
+        assert daemon.requests_served == 1
+    finally:
+        await daemon.stop()
+
+
+@pytest.mark.asyncio
+async def test_socket_is_private_from_the_moment_it_is_bound(socket_path, monkeypatch):
+    """Other users cannot reach the socket even before the explicit chmod."""
+    monkeypatch.setattr(daemon_module.os, "chmod", lambda path, mode: None)
+    daemon = LabeebDaemon(FakeLabeeb(), socket_path)
+    await daemon.start()
+    try:
+        assert os.stat(socket_path).st_mode & 0o077 == 0
+    finally:
+        await daemon.stop()
+
+
+@pytest.mark.asyncio
+async def test_streamed_tokens_arrive_before_the_result(socket_path):
+    """A streaming request receives its tokens in order, then the final result."""
+    daemon = LabeebDaemon(FakeLabeeb(), socket_path)
+    await daemon.start()
+    try:
+        tokens = []
+        response = await send_request(
+            {"command": "list the files"}, socket_path, on_token=tokens.append
+        )
+        assert tokens == ["LIST", "THE", "FILES"]
+        assert response == {"id": 1, "status": "ok", "result": "LIST THE FILES"}
+    finally:
+        await daemon.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clients_are_served_concurrently(socket_path):
+    """Requests from many clients overlap instead of queueing behind each other."""
+    labeeb = FakeLabeeb(delay=0.05)
+    daemon = LabeebDaemon(labeeb, socket_path)
+    await daemon.start()
+    try:
+        responses = await asyncio.gather(
+            *(send_request({"id": i, "command": f"task {i}"}, socket_path) for i in range(10))
+        )
+        assert [response["result"] for response in responses] == [f"TASK {i}" for i in range(10)]
+        assert labeeb.command_processor.max_in_flight > 1
+        assert daemon.requests_served == 10
+    finally:
+        await daemon.stop()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_request_stops_the_daemon(socket_path):
+    """A shutdown request ends serve_forever, removes the socket and cleans up."""
+    labeeb = FakeLabeeb()
+    daemon = LabeebDaemon(labeeb, socket_path)
+    server = asyncio.ensure_future(daemon.serve_forever())
+    while not os.path.exists(socket_path):
+        await asyncio.sleep(0.01)
+
+    # An idle client must not keep the daemon alive
+    idle_reader, idle_writer = await asyncio.open_unix_connection(socket_path)
+    response = await send_request({"op": "shutdown"}, socket_path)
+    assert response["result"] == "shutting down"
+    await asyncio.wait_for(server, timeout=5)
+
+    assert not os.path.exists(socket_path)
+    assert labeeb.cleaned_up
+    assert await idle_reader.read() == b""
+    idle_writer.close()
+    with pytest.raises(ConnectionError):
+        await send_request({"op": "ping"}, socket_path)
+
+
+@pytest.mark.asyncio
+async def test_stale_socket_is_replaced_but_a_live_one_is_not(socket_path):
+    """A leftover socket file is removed; a socket with a listener is left alone."""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    daemon = LabeebDaemon(FakeLabeeb(), socket_path)
+    await daemon.start()
+    try:
+        assert (await send_request({"op": "ping"}, socket_path))["result"] == "pong"
+        with pytest.raises(RuntimeError):
+            await LabeebDaemon(FakeLabeeb(), socket_path).start()
+    finally:
+        await daemon.stop()
@@ -0,0 +1,90 @@
+"""Tests for the indexed calendar event store."""
+
+import random
+from datetime import datetime, timedelta
+
+from labeeb.services.event_store import OPEN_ENDED_OCCURRENCES, EventStore
+
+
+def make_event(event_id, start, hours=1, recurrence=None, title="Event"):
+    return {
+        "id": event_id,
+        "title": title,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=hours)).isoformat(),
+        "recurrence": recurrence,
+    }
+
+
+def test_weekly_series_expands_only_within_the_window():
+    store = EventStore()
+    store.add(make_event("standup", datetime(2020, 1, 6, 9), recurrence={"frequency": "weekly"}))
+    events = store.between(datetime(2025, 3, 1), datetime(2025, 3, 31))
+    assert [event["start_time"] for event in events] == [
+        "2025-03-03T09:00:00",
+        "2025-03-10T09:00:00",
+        "2025-03-17T09:00:00",
+        "2025-03-24T09:00:00",
+    ]
+    assert events[0]["id"] == "standup_recur_269"
+    assert store.get("standup_recur_269") == events[0]
+    # Without an end time an endless series lists its next occurrences instead of failing
+    store.add(make_event("once", datetime(2025, 6, 1)))
+    open_ended = store.between(datetime(2025, 3, 1))
+    assert len(open_ended) == OPEN_ENDED_OCCURRENCES + 1
+    assert open_ended[0]["start_time"] == "2025-03-03T09:00:00"
+    assert "once" in [event["id"] for event in open_ended]
+
+
+def test_monthly_series_clamps_days_and_respects_count():
+    store = EventStore()
+    store.add(
+        make_event("rent", datetime(2024, 1, 31), recurrence={"frequency": "monthly", "count": 3})
+    )
+    starts = [event["start_time"][:10] for event in store.between(end=datetime(2030, 1, 1))]
+    assert starts == ["2024-01-31", "2024-02-29", "2024-03-31"]
+    assert store.get("rent_recur_3") is None
+
+
+def test_range_queries_match_a_linear_scan():
+    rng = random.Random(7)
+    store = EventStore()
+    events = []
+    for i in range(500):
+        start = datetime(2024, 1, 1) + timedelta(hours=rng.randrange(24 * 365))
+        event = make_event(f"e{i}", start, hours=rng.choice([1, 2, 30, 24 * 20]))
+        store.add(event)
+        events.append(event)
+
+    for _ in range(50):
+        low = datetime(2024, 1, 1) + timedelta(hours=rng.randrange(24 * 365))
+        high = low + timedelta(hours=rng.randrange(1, 24 * 30))
+        expected = {
+            event["id"]
+            for event in events
+            if datetime.fromisoformat(event["end_time"]) >= low
+            and datetime.fromisoformat(event["start_time"]) <= high
+        }
+        assert {event["id"] for event in store.between(low, high)} == expected
+
+
+def test_occurrences_can_be_skipped_detached_and_persisted(tmp_path):
+    path = tmp_path / "calendar.db"
+    store = EventStore(path)
+    store.add(make_event("gym", datetime(2025, 1, 1, 18), recurrence={"frequency": "daily"}))
+    store.remove("gym_recur_1")
+    detached = store.detach("gym_recur_2")
+    detached["title"] = "Moved"
+    store.add(detached)
+    store.close()
+
+    store = EventStore(path)
+    window = store.between(datetime(2025, 1, 1), datetime(2025, 1, 4, 23))
+    assert [(event["id"], event["title"]) for event in window] == [
+        ("gym", "Event"),
+        ("gym_recur_2", "Moved"),
+        ("gym_recur_3", "Event"),
+    ]
+    assert store.remove("gym") is not None
+    assert store.between(datetime(2025, 1, 1), datetime(2025, 1, 4, 23)) == [detached]
+    store.close()
@@ -0,0 +1,96 @@
+"""
+Unit tests for the benchmark fake Ollama server and harness.
+
+---
+description: Test the fake server's streaming and failure injection, and percentile math
+endpoints: [test_fake_ollama]
+inputs: []
+outputs: []
+dependencies: [pytest, aiohttp]
+auth: none
+alwaysApply: false
+---
+"""
+
+import json
+
+import aiohttp
+import pytest
+
+from labeeb.testing.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+from benchmarks.harness import BenchmarkResult, compare_to_baseline, percentile
+
+
+async def _post_lines(url, body):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=body) as response:
+            return response.status, [json.loads(line) async for line in response.content if line.strip()]
+
+
+@pytest.mark.asyncio
+async def test_generate_streams_response_in_chunks():
+    """The response is streamed in fixed-size chunks followed by a final chunk."""
+    config = FakeOllamaConfig(response="abcdefghij", chunk_size=4)
+    async with FakeOllamaServer(config) as url:
+        status, lines = await _post_lines(
+            f"{url}/api/generate", {"model": "gemma3:4b", "prompt": "hi"}
+        )
+    assert status == 200
+    assert [line["response"] for line in lines] == ["abcd", "efgh", "ij", ""]
+    assert lines[-1]["done"] and lines[-1]["eval_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_chat_and_tags():
+    """Chat streams message content and tags lists the configured models."""
+    config = FakeOllamaConfig(response="hello", chunk_size=5, models=["m1"])
+    async with FakeOllamaServer(config) as url:
+        status, lines = await _post_lines(
+            f"{url}/api/chat", {"model": "m1", "messages": [{"role": "user", "content": "hi"}]}
+        )
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{url}/api/tags") as response:
+                tags = await response.json()
+    assert lines[0]["message"]["content"] == "hello"
+    assert [m["name"] for m in tags["models"]] == ["m1"]
+
+
+@pytest.mark.asyncio
+async def test_failure_injection_is_reproducible():
+    """The same seed fails the same requests, as HTTP errors or mid-stream."""
+
+    async def statuses(config):
+        server = FakeOllamaServer(config)
+        async with server as url:
+            results = []
+            for _ in range(20):
+                status, lines = await _post_lines(
+                    f"{url}/api/generate", {"model": "gemma3:4b", "prompt": "x"}
+                )
+                results.append(status == 500 or any("error" in line for line in lines))
+        return results, server.failures
+
+    config = FakeOllamaConfig(failure_rate=0.3, seed=7)
+    first, failures = await statuses(config)
+    second, _ = await statuses(FakeOllamaConfig(failure_rate=0.3, seed=7))
+    mid_stream, _ = await statuses(FakeOllamaConfig(failure_rate=0.3, seed=7, fail_mid_stream=True))
+    assert first == second == mid_stream
+    assert sum(first) == failures > 0
+
+
+def test_percentile_and_regression_check():
+    """Percentiles interpolate, and slower results are reported as regressions."""
+    assert percentile([], 50) == 0.0
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5, 1, 3], 100) == 5
+
+    result = BenchmarkResult("b", iterations=4, concurrency=1, wall_time=1.0, peak_rss=0,
+                             latencies=[0.01, 0.01, 0.01, 0.01])
+    baseline = result.to_dict()
+    assert compare_to_baseline(result, baseline) == []
+
+    slower = BenchmarkResult("b", iterations=4, concurrency=1, wall_time=2.0, peak_rss=0,
+                             latencies=[0.02, 0.02, 0.02, 0.02])
+    messages = compare_to_baseline(slower, baseline)
+    assert any(m.startswith("p50_ms") for m in messages)
+    assert any(m.startswith("throughput_per_s") for m in messages)
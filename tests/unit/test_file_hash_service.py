@@ -0,0 +1,67 @@
+"""Tests for the file hash service."""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from labeeb.services import file_hash_service
+from labeeb.services.cache_service import CacheService
+from labeeb.services.file_hash_service import FileHasher
+
+
+@pytest.fixture
+def hasher():
+    file_hasher = FileHasher(workers=4, cache=CacheService(spill_threshold=None).namespace("file_hash"))
+    yield file_hasher
+    file_hasher.shutdown()
+
+
+def test_digests_match_hashlib_for_small_and_mapped_files(hasher, tmp_path):
+    small = tmp_path / "small.bin"
+    small.write_bytes(b"labeeb" * 100)
+    large = tmp_path / "large.bin"
+    large.write_bytes(os.urandom(file_hash_service.MMAP_THRESHOLD + 12345))
+    for path in (small, large):
+        assert hasher.hash_file(path) == hashlib.sha256(path.read_bytes()).hexdigest()
+        assert hasher.hash_file(path, "md5") == hashlib.md5(path.read_bytes()).hexdigest()
+
+
+def test_unchanged_files_are_not_read_again(hasher, tmp_path, monkeypatch):
+    path = tmp_path / "file.txt"
+    path.write_text("first")
+    digest = hasher.hash_file(path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was read again")
+
+    monkeypatch.setattr(file_hash_service, "_digest_file", fail)
+    assert hasher.hash_file(path) == digest
+
+    monkeypatch.undo()
+    path.write_text("second, longer")
+    assert hasher.hash_file(path) == hashlib.sha256(b"second, longer").hexdigest()
+
+
+def test_async_hashing_reports_errors_per_file(hasher, tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_text("ok")
+    results = asyncio.run(hasher.hash_files_async([good, tmp_path / "missing.txt"]))
+    assert results[str(good)] == hashlib.sha256(b"ok").hexdigest()
+    assert isinstance(results[str(tmp_path / "missing.txt")], OSError)
+
+
+def test_find_duplicates(hasher, tmp_path):
+    (tmp_path / "a").mkdir()
+    same = b"x" * 100_000
+    (tmp_path / "one.bin").write_bytes(same)
+    (tmp_path / "a" / "two.bin").write_bytes(same)
+    # Same size and same first bytes, different ending
+    (tmp_path / "a" / "near.bin").write_bytes(same[:-1] + b"y")
+    (tmp_path / "empty1").write_bytes(b"")
+    (tmp_path / "empty2").write_bytes(b"")
+
+    assert hasher.find_duplicates(tmp_path) == [
+        [str(tmp_path / "a" / "two.bin"), str(tmp_path / "one.bin")]
+    ]
@@ -0,0 +1,90 @@
+"""Tests for the file index service."""
+
+import os
+
+import pytest
+
+from labeeb.services import file_index
+from labeeb.services.file_index import FileIndex
+
+
+@pytest.fixture
+def home(tmp_path):
+    root = tmp_path / "home"
+    (root / "Documents").mkdir(parents=True)
+    (root / "Documents" / "My_CV.pdf").write_bytes(b"x" * 2048)
+    (root / "Documents" / "notes.txt").write_text("notes")
+    (root / ".config").mkdir()
+    (root / ".config" / "cv.pdf").write_text("hidden")
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "pkg" / "cv.js").write_text("skipped")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    file_index = FileIndex(tmp_path / "index.db", watch=False)
+    yield file_index
+    file_index.close()
+
+
+def names(records):
+    return sorted(record.name for record in records)
+
+
+def test_substring_search_skips_hidden_and_excluded(index, home):
+    assert names(index.search("cv", root=home)) == ["My_CV.pdf"]
+    assert names(index.search("CV", root=home, case_sensitive=True)) == ["My_CV.pdf"]
+    assert index.search("cv", root=home, case_sensitive=True) == []
+    # Two-letter terms are shorter than a trigram and use a plain scan
+    assert names(index.search("no", root=home)) == ["notes.txt"]
+
+
+def test_filters(index, home):
+    assert names(index.search(root=home, glob="*.PDF")) == ["My_CV.pdf"]
+    assert names(index.search(root=home, ext=".txt")) == ["notes.txt"]
+    assert names(index.search(root=home, min_size=1024)) == ["My_CV.pdf"]
+    assert names(index.search(root=home, include_files=False)) == ["Documents"]
+    future = os.stat(home / "Documents" / "notes.txt").st_mtime + 1
+    assert index.search(root=home, modified_after=future) == []
+
+
+def test_refresh_picks_up_changes(index, home):
+    index.index_root(home)
+    (home / "Documents" / "notes.txt").unlink()
+    (home / "Projects" / "old").mkdir(parents=True)
+    (home / "Projects" / "old" / "resume_cv.docx").write_text("cv")
+    assert index.refresh() >= 1
+    assert names(index.search("cv", root=home)) == ["My_CV.pdf", "resume_cv.docx"]
+    assert index.search(root=home, ext="txt") == []
+
+
+def test_index_persists_between_instances(tmp_path, home):
+    first = FileIndex(tmp_path / "index.db", watch=False)
+    first.index_root(home)
+    first.close()
+    second = FileIndex(tmp_path / "index.db", watch=False)
+    try:
+        assert second.get_stats()["roots"] == [str(home)]
+        assert names(second.search("cv")) == ["My_CV.pdf"]
+    finally:
+        second.close()
+
+
+def test_path_search(index, home):
+    assert names(index.search("Documents/my", root=home, in_path=True)) == ["My_CV.pdf"]
+
+
+def test_shared_indexes_are_kept_per_exclusion_set(tmp_path, home, monkeypatch):
+    monkeypatch.setattr(file_index, "get_labeeb_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(file_index, "_indexes", {})
+    default = file_index.get_file_index()
+    everything = file_index.get_file_index(excludes=())
+    try:
+        assert file_index.get_file_index() is default
+        assert everything is not default and everything.db_path != default.db_path
+        assert names(default.search("cv", root=home)) == ["My_CV.pdf"]
+        assert names(everything.search("cv", root=home)) == ["My_CV.pdf", "cv.js"]
+    finally:
+        default.close()
+        everything.close()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the file system tool's directory listing.
+
+---
+description: Test the scandir walk and offset/limit paging of the list command
+endpoints: [test_file_system_tool]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import os
+
+import pytest
+
+from labeeb.services import file_index
+from labeeb.tools.file_system_tool import FileSystemTool
+
+
+@pytest.fixture
+def root(tmp_path):
+    """A base directory with nested and hidden entries."""
+    base = tmp_path / "base"
+    (base / "docs" / "deep").mkdir(parents=True)
+    (base / "docs" / "a.txt").write_bytes(b"x" * 10)
+    (base / "docs" / "deep" / "b.txt").write_bytes(b"x" * 20)
+    (base / ".hidden").mkdir()
+    (base / ".hidden" / "secret.txt").write_text("secret")
+    for i in range(4):
+        (base / f"file{i}.txt").write_bytes(b"x" * i)
+    return base.resolve()
+
+
+@pytest.fixture
+def tool(root):
+    """A tool rooted at the base directory."""
+    return FileSystemTool({"base_path": str(root)})
+
+
+def scanned(tool, path, recursive=False, include_hidden=False):
+    """Paths yielded by the scandir walk, relative to the listed directory."""
+    return [
+        os.path.relpath(entry.path, path)
+        for entry in tool._scan_entries(path, recursive, include_hidden)
+    ]
+
+
+async def list_names(tool, **args):
+    """Run the list command and return its result with item paths only."""
+    result = await tool._execute_command("list", {"path": ".", **args})
+    assert result["status"] == "success"
+    return [item["path"] for item in result["items"]], result
+
+
+def test_scan_entries_skips_hidden_and_descends_when_recursive(tool, root):
+    """Hidden entries are opt-in and each directory precedes its contents."""
+    top = scanned(tool, root)
+    assert sorted(top) == ["docs", "file0.txt", "file1.txt", "file2.txt", "file3.txt"]
+
+    walked = scanned(tool, root, recursive=True)
+    assert sorted(walked) == sorted(top + ["docs/a.txt", "docs/deep", "docs/deep/b.txt"])
+    for path in walked:
+        parent = os.path.dirname(path)
+        if parent:
+            assert walked.index(parent) < walked.index(path)
+
+    hidden = scanned(tool, root, recursive=True, include_hidden=True)
+    assert {".hidden", ".hidden/secret.txt"} <= set(hidden)
+
+
+def test_scan_entries_survives_unreadable_directories(tool, root):
+    """A directory that cannot be opened is skipped rather than ending the walk."""
+    assert scanned(tool, root / "missing", recursive=True) == []
+
+
+@pytest.mark.asyncio
+async def test_list_describes_entries(tool, root):
+    """Files carry their size, directories do not, and broken symlinks are kept."""
+    os.symlink(root / "nowhere", root / "broken")
+    _, result = await list_names(tool)
+    items = {item["name"]: item for item in result["items"]}
+    assert items["file3.txt"] == {
+        "name": "file3.txt",
+        "path": "file3.txt",
+        "type": "file",
+        "size": 3,
+        "modified": os.stat(root / "file3.txt").st_mtime,
+    }
+    assert items["docs"]["type"] == "directory"
+    assert items["docs"]["size"] is None
+    assert items["broken"]["size"] is None
+    assert items["broken"]["modified"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_pages_report_whether_more_remain(tool):
+    """Offset/limit pages cover the listing once and has_more marks the last page."""
+    everything, result = await list_names(tool, recursive=True)
+    assert len(everything) == 8
+    assert result["has_more"] is False
+    assert result["offset"] == 0
+
+    pages = []
+    offset = 0
+    while True:
+        page, result = await list_names(tool, recursive=True, offset=offset, limit=3)
+        pages.append(page)
+        assert result["offset"] == offset
+        if not result["has_more"]:
+            break
+        offset += 3
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert [path for page in pages for path in page] == everything
+
+    # A page that ends exactly at the last entry has nothing more
+    exact, result = await list_names(tool, recursive=True, offset=5, limit=3)
+    assert exact == everything[5:]
+    assert result["has_more"] is False
+
+    past_end, result = await list_names(tool, offset=100, limit=3)
+    assert past_end == []
+    assert result["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_list_rejects_bad_paths(tool, root):
+    """Missing, non-directory and out-of-base paths return errors."""
+    assert "error" in await tool._execute_command("list", {})
+    assert "error" in await tool._execute_command("list", {"path": "missing"})
+    assert "error" in await tool._execute_command("list", {"path": "file1.txt"})
+    assert "error" in await tool._execute_command("list", {"path": str(root.parent)})
+
+
+@pytest.mark.asyncio
+async def test_search_still_finds_matches_under_commonly_excluded_directories(
+    tool, root, tmp_path, monkeypatch
+):
+    """The indexed search skips hidden directories only, like the walk it replaced."""
+    monkeypatch.setattr(file_index, "get_labeeb_cache_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(file_index, "_indexes", {})
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "pkg" / "a.txt").write_text("dependency")
+    try:
+        result = await tool._execute_command("search", {"path": ".", "pattern": "a.txt"})
+        assert sorted(match["path"] for match in result["matches"]) == [
+            "docs/a.txt",
+            "node_modules/pkg/a.txt",
+        ]
+    finally:
+        for index in file_index._indexes.values():
+            index.close()
@@ -0,0 +1,176 @@
+"""
+Unit tests for the Linux file system handler.
+
+---
+description: Test directory listing, paging, opt-in space and tree sizes, and owner name caching
+endpoints: [test_fs_handler]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import os
+
+import pytest
+
+from labeeb.services.platform_services.linux import fs_handler
+from labeeb.services.platform_services.linux.fs_handler import LinuxFSHandler, _tree_size
+
+
+@pytest.fixture
+def handler():
+    """An initialized handler."""
+    fs = LinuxFSHandler({})
+    assert fs.initialize()
+    yield fs
+    fs.cleanup()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A directory with files, nested directories and a symlink."""
+    root = tmp_path / "root"
+    (root / "docs" / "deep").mkdir(parents=True)
+    (root / "docs" / "a.txt").write_bytes(b"x" * 10)
+    (root / "docs" / "deep" / "b.txt").write_bytes(b"x" * 20)
+    (root / "empty").mkdir()
+    for i in range(5):
+        (root / f"file{i}.txt").write_bytes(b"x" * i)
+    os.symlink(root / "docs", root / "docs" / "deep" / "loop")
+    return root
+
+
+def test_list_directory_describes_each_entry(handler, tree):
+    """Every entry is listed once with its type, size and owner."""
+    items = {item["name"]: item for item in handler.list_directory(str(tree))}
+    assert set(items) == {"docs", "empty"} | {f"file{i}.txt" for i in range(5)}
+    assert items["docs"]["type"] == "directory"
+    assert items["file3.txt"]["type"] == "file"
+    assert items["file3.txt"]["size"] == 3
+    assert items["file3.txt"]["path"] == str(tree / "file3.txt")
+    assert items["file3.txt"]["owner"] == fs_handler._user_name(os.getuid())
+    assert items["file3.txt"]["group"] == fs_handler._group_name(os.getgid())
+
+
+def test_iter_directory_matches_list_directory(handler, tree):
+    """The streaming listing yields the same entries, in the same order."""
+    assert list(handler.iter_directory(str(tree))) == handler.list_directory(str(tree))
+
+
+def test_uninitialized_handler_lists_nothing(tree):
+    """Listing before initialize returns no entries."""
+    fs = LinuxFSHandler({})
+    assert fs.list_directory(str(tree)) == []
+    assert list(fs.iter_directory(str(tree))) == []
+
+
+def test_pages_cover_the_directory_without_overlap(handler, tree):
+    """Consecutive offset/limit pages return every entry exactly once."""
+    everything = [item["name"] for item in handler.list_directory(str(tree))]
+    pages = [
+        [item["name"] for item in handler.list_directory(str(tree), offset=offset, limit=3)]
+        for offset in range(0, len(everything), 3)
+    ]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [name for page in pages for name in page] == everything
+    assert handler.list_directory(str(tree), offset=len(everything)) == []
+    streamed = handler.iter_directory(str(tree), offset=2, limit=2)
+    assert [item["name"] for item in streamed] == everything[2:4]
+
+
+def test_entry_that_cannot_be_stat_is_reported(handler, tmp_path):
+    """A broken symlink is listed with an error instead of failing the listing."""
+    os.symlink(tmp_path / "missing", tmp_path / "broken")
+    (tmp_path / "ok.txt").write_text("ok")
+    items = {item["name"]: item for item in handler.list_directory(str(tmp_path))}
+    assert "error" in items["broken"]
+    assert items["ok.txt"]["type"] == "file"
+
+
+def test_space_and_tree_size_are_opt_in(handler, tree):
+    """Directory extras are only computed when asked for."""
+    for item in handler.list_directory(str(tree)):
+        assert "space" not in item
+        assert "tree_size" not in item
+
+    items = {
+        item["name"]: item
+        for item in handler.list_directory(str(tree), include_space=True, include_tree_size=True)
+    }
+    link_size = os.lstat(tree / "docs" / "deep" / "loop").st_size
+    assert set(items["docs"]["space"]) == {"total", "used", "free"}
+    assert items["docs"]["tree_size"] == 30 + link_size
+    assert items["empty"]["tree_size"] == 0
+    assert "space" not in items["file1.txt"]
+    assert "tree_size" not in items["file1.txt"]
+
+
+def test_space_is_queried_once_per_device(handler, tree, monkeypatch):
+    """Directories on one filesystem share a single disk usage call."""
+    calls = []
+
+    def disk_usage(path):
+        calls.append(path)
+        return (100, 40, 60)
+
+    monkeypatch.setattr(fs_handler.shutil, "disk_usage", disk_usage)
+    items = handler.list_directory(str(tree), include_space=True)
+    directories = [item for item in items if item["type"] == "directory"]
+    assert len(directories) == 2
+    assert len(calls) == 1
+    for item in directories:
+        assert item["space"] == {"total": 100, "used": 40, "free": 60}
+
+
+def test_tree_size_does_not_follow_symlinks(tree):
+    """A symlink back up the tree is neither followed nor counted as its target."""
+    link_size = os.lstat(tree / "docs" / "deep" / "loop").st_size
+    assert _tree_size(str(tree / "docs")) == 30 + link_size
+    assert _tree_size(str(tree / "missing")) == 0
+
+
+def test_owner_names_are_resolved_once_per_id(handler, tree, monkeypatch):
+    """Listing many entries with one owner looks the owner up once."""
+    lookups = {"user": 0, "group": 0}
+    real_getpwuid, real_getgrgid = fs_handler.pwd.getpwuid, fs_handler.grp.getgrgid
+
+    def getpwuid(uid):
+        lookups["user"] += 1
+        return real_getpwuid(uid)
+
+    def getgrgid(gid):
+        lookups["group"] += 1
+        return real_getgrgid(gid)
+
+    monkeypatch.setattr(fs_handler.pwd, "getpwuid", getpwuid)
+    monkeypatch.setattr(fs_handler.grp, "getgrgid", getgrgid)
+    fs_handler._user_name.cache_clear()
+    fs_handler._group_name.cache_clear()
+    try:
+        handler.list_directory(str(tree))
+        handler.list_directory(str(tree / "docs"))
+        assert lookups == {"user": 1, "group": 1}
+    finally:
+        fs_handler._user_name.cache_clear()
+        fs_handler._group_name.cache_clear()
+
+
+def test_unknown_ids_fall_back_to_numbers(monkeypatch):
+    """Ids without a passwd or group entry are shown as numbers."""
+
+    def missing(_):
+        raise KeyError
+
+    monkeypatch.setattr(fs_handler.pwd, "getpwuid", missing)
+    monkeypatch.setattr(fs_handler.grp, "getgrgid", missing)
+    fs_handler._user_name.cache_clear()
+    fs_handler._group_name.cache_clear()
+    try:
+        assert fs_handler._user_name(54321) == "54321"
+        assert fs_handler._group_name(54321) == "54321"
+    finally:
+        fs_handler._user_name.cache_clear()
+        fs_handler._group_name.cache_clear()
@@ -0,0 +1,86 @@
+"""Tests for the image pipeline service."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from labeeb.services.image_pipeline import (
+    ImageBatchProcessor,
+    draft_scale,
+    output_paths,
+    process_image,
+)
+
+
+def make_image(size=(800, 600), image_format="JPEG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 40, 90)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def test_draft_scale_follows_the_first_resize():
+    resize = {"op": "resize", "width": 100, "height": 75}
+    assert draft_scale([resize], (800, 600)) == pytest.approx(0.125)
+    assert draft_scale([{"op": "crop", "right": 400, "bottom": 300}, resize], (800, 600)) == 0.25
+    assert draft_scale([{"op": "filter", "filter_type": "blur"}, resize], (800, 600)) == 1.0
+    assert draft_scale([{"op": "rotate", "angle": 90}], (800, 600)) == 1.0
+
+
+def test_chained_operations_decode_once():
+    result = process_image(
+        make_image(),
+        [
+            {"op": "crop", "left": 0, "top": 0, "right": 400, "bottom": 300},
+            {"op": "resize", "width": 40, "height": 30},
+            {"op": "rotate", "angle": 90},
+            {"op": "convert", "format": "PNG"},
+        ],
+    )
+    assert result["format"] == "PNG"
+    assert result["dimensions"] == (30, 40)
+    assert result["source_dimensions"] == (800, 600)
+    assert Image.open(io.BytesIO(result["image_data"])).size == (30, 40)
+
+
+def test_crop_after_resize_uses_resized_coordinates():
+    source = make_image(size=(4000, 3000))
+    operations = [
+        {"op": "resize", "width": 400, "height": 300},
+        {"op": "crop", "left": 0, "top": 0, "right": 200, "bottom": 150},
+    ]
+    assert process_image(source, operations)["dimensions"] == (200, 150)
+    assert process_image(source, operations, draft=False)["dimensions"] == (200, 150)
+
+
+def test_batch_processes_data_and_files(tmp_path):
+    path = tmp_path / "photo.png"
+    path.write_bytes(make_image(image_format="PNG"))
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    processor = ImageBatchProcessor(workers=2)
+    try:
+        results = processor.process(
+            [make_image(), str(path), b"not an image"],
+            [{"op": "thumbnail", "width": 80, "height": 80}],
+            output_dir=str(output_dir),
+        )
+        # Workers must not be forked from a parent that runs threads
+        assert processor.executor._mp_context.get_start_method() != "fork"
+    finally:
+        processor.shutdown()
+
+    assert results[0]["dimensions"] == (80, 60)
+    assert results[0]["format"] == "JPEG"
+    assert results[1]["output_path"] == str(output_dir / "photo.png")
+    assert Image.open(results[1]["output_path"]).size == (80, 60)
+    assert isinstance(results[2], Exception)
+
+
+def test_output_paths_are_unique_and_never_replace_sources(tmp_path):
+    first, second = tmp_path / "a" / "photo.png", tmp_path / "b" / "photo.png"
+    paths = output_paths([str(first), b"data", str(second)], str(tmp_path / "a"))
+    assert paths == {0: str(tmp_path / "a" / "photo-1.png"), 2: str(tmp_path / "a" / "photo-2.png")}
+    assert output_paths([str(first)], str(tmp_path / "out"), "JPEG") == {
+        0: str(tmp_path / "out" / "photo.jpeg")
+    }
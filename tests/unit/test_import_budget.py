@@ -0,0 +1,111 @@
+"""
+Import-time budget tests for the Labeeb startup path.
+
+---
+description: Check that light imports do not pull in heavy dependencies
+endpoints: [test_import_budget]
+inputs: []
+outputs: []
+dependencies: [pytest, subprocess]
+auth: none
+alwaysApply: false
+---
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+# Modules that must only be imported when a tool or model actually needs them
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "cv2",
+    "scipy",
+    "matplotlib",
+    "selenium",
+    "pyautogui",
+    "whisper",
+]
+
+# Wall-clock budget for importing the module, in seconds
+IMPORT_BUDGET = 1.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _probe_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report what it loaded."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["labeeb.tools", "labeeb.utils.i18n", "labeeb.models.vision.processor"],
+)
+def test_import_skips_heavy_modules(module):
+    """Importing the module does not import heavy optional dependencies."""
+    probe = _probe_import(module)
+    loaded = set(probe["modules"])
+    assert [name for name in HEAVY_MODULES if name in loaded] == []
+
+
+@pytest.mark.parametrize("module", ["labeeb.tools", "labeeb.utils.i18n"])
+def test_import_within_budget(module):
+    """Importing the module stays within the import-time budget."""
+    probe = _probe_import(module)
+    assert probe["elapsed"] < IMPORT_BUDGET
+
+
+def test_tools_are_registered_without_importing_them():
+    """Tool registration records names and metadata but imports no tool module."""
+    probe = _probe_import("labeeb.tools")
+    loaded = set(probe["modules"])
+    assert "labeeb.tools.tool_registry" in loaded
+    assert "labeeb.tools.vision_tool" not in loaded
+    assert "labeeb.tools.screen_control_tool" not in loaded
+    assert "labeeb.tools.graph_maker_tool" not in loaded
+
+
+def test_registry_imports_tool_on_first_lookup():
+    """Looking up a lazily registered tool imports and caches its class."""
+    from labeeb.tools.tool_registry import ToolRegistry
+
+    ToolRegistry.register_lazy(
+        "lazy_test_tool",
+        "labeeb.tools.tool_registry:ToolRegistry",
+        description="Registry stand-in used as a tool class",
+    )
+    assert not ToolRegistry.is_loaded("lazy_test_tool")
+    assert ToolRegistry.get_metadata("lazy_test_tool")["description"] == (
+        "Registry stand-in used as a tool class"
+    )
+    assert "lazy_test_tool" in ToolRegistry.get_tool_names()
+
+    assert ToolRegistry.get_tool("lazy_test_tool") is ToolRegistry
+    assert ToolRegistry.is_loaded("lazy_test_tool")
+
+    ToolRegistry.register_lazy("broken_test_tool", "labeeb.tools.does_not_exist:Missing")
+    assert ToolRegistry.get_tool("broken_test_tool") is None
@@ -0,0 +1,89 @@
+"""
+Unit tests for the shared intent matcher.
+
+---
+description: Test intent selection and slot extraction in English and Arabic
+endpoints: [test_intent_matcher]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import pytest
+
+from labeeb.services.intent_matcher import Intent, IntentMatcher, get_intent_matcher
+
+
+@pytest.mark.parametrize(
+    "command, intent, slots",
+    [
+        ("What is the weather in Kuwait", "weather", {"city": "Kuwait"}),
+        ("ما هو الطقس في الكويت؟", "weather", {"city": "الكويت"}),
+        ("ما هو الطقس الآن", "weather", {}),
+        ("take a screenshot", "screenshot", {}),
+        ("خذ لقطة للشاشة", "screenshot", {}),
+        ("احسب 5 + 3", "calculate", {"expression": "5 + 3"}),
+        ("copy the text Hello", "clipboard_copy", {"text": "Hello"}),
+        ("play the file song.wav", "play_sound", {"filename": "song.wav"}),
+        ("ابحث في الإنترنت عن الأخبار", "web_search", {"query": "الأخبار"}),
+        ("Hello there", "greeting", {}),
+        ("take a screenshot of the weather app", "screenshot", {}),
+        ("calculate 20 + 5 for the temperature log", "calculate", {"expression": "20 + 5"}),
+    ],
+)
+def test_matches_intent_and_slots(command, intent, slots):
+    """Commands map to their intent and slots in one call."""
+    match = get_intent_matcher().match(command)
+    assert match is not None
+    assert match.intent == intent
+    assert match.slots == slots
+
+
+def test_arabic_variants_are_normalized():
+    """Diacritics and alef variants do not prevent a match."""
+    match = get_intent_matcher().match("ابْحَثْ في الانترنت عن الطقس")
+    assert match.intent == "weather"
+
+
+def test_slot_values_keep_the_original_spelling():
+    """Slots are matched on normalized text but cut from the command as typed."""
+    matcher = get_intent_matcher()
+    match = matcher.match("ابحث في الإنترنت عن أخبار")
+    assert match.slots == {"query": "أخبار"}
+    match = matcher.match("انسخ النص  مَرْحَبًا   يا صديقي")
+    assert match.intent == "clipboard_copy"
+    assert match.slots == {"text": "مَرْحَبًا   يا صديقي"}
+
+
+def test_weather_needs_a_weather_phrase():
+    """A passing mention of the weather does not select the weather intent."""
+    matcher = get_intent_matcher()
+    assert matcher.match("open the weather app") is None
+    assert matcher.match("how's the weather today").intent == "weather"
+
+
+def test_prefix_triggers_need_a_word_boundary():
+    """Prefix intents do not fire inside longer words or mid-sentence."""
+    matcher = get_intent_matcher()
+    assert matcher.match("history of rome") is None
+    assert matcher.match("say hello") is None
+
+
+def test_table_order_sets_precedence():
+    """An earlier intent wins even when a later one appears first in the text."""
+    matcher = IntentMatcher([Intent("first", ("beta",)), Intent("second", ("alpha",))])
+    assert matcher.match("alpha then beta").intent == "first"
+
+
+def test_allowed_restricts_candidates():
+    """Callers can limit matching to the intents they handle."""
+    matcher = get_intent_matcher()
+    assert matcher.match("hello, weather in paris").intent == "greeting"
+    match = matcher.match("hello, weather in paris", allowed={"weather"})
+    assert match.intent == "weather"
+    assert match.slots == {"city": "paris"}
+    assert matcher.match("Weather for Paris").slots == {"city": "Paris"}
+    assert matcher.match("echo hi", allowed={"weather"}) is None
@@ -0,0 +1,141 @@
+"""Tests for the log index service."""
+
+import logging
+import time
+
+import pytest
+
+from labeeb.services import log_index
+from labeeb.services.log_index import IndexedRotatingFileHandler, LogIndex, tail_lines
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def make_handler(path, **kwargs):
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+    return IndexedRotatingFileHandler(str(path), formatter=formatter, **kwargs)
+
+
+def emit(handler, message, level=logging.INFO, created=None):
+    record = logging.makeLogRecord(
+        {"name": "test", "levelno": level, "levelname": logging.getLevelName(level), "msg": message}
+    )
+    if created is not None:
+        record.created = created
+    handler.handle(record)
+
+
+@pytest.mark.parametrize("block_size", [7, 64 * 1024])
+def test_tail_lines(tmp_path, block_size):
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)) + "no newline")
+    assert tail_lines(str(path), 3, block_size) == ["line 998\n", "line 999\n", "no newline"]
+    assert len(tail_lines(str(path), 5000, block_size)) == 1001
+    assert tail_lines(str(path), 0, block_size) == []
+
+
+def test_tail_does_not_read_whole_file(tmp_path, monkeypatch):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"x" * 4 * 1024 * 1024 + b"\nlast\n")
+    reads = []
+    real_open = open
+
+    class Tracked:
+        def __init__(self, f):
+            self.f = f
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def read(self, size=-1):
+            data = self.f.read(size)
+            reads.append(len(data))
+            return data
+
+    monkeypatch.setattr(log_index, "open", lambda *a, **k: Tracked(real_open(*a, **k)), raising=False)
+    assert tail_lines(str(path), 1) == ["last\n"]
+    assert sum(reads) < 1024 * 1024
+
+
+def test_query_by_time_and_level(tmp_path):
+    handler = make_handler(tmp_path / "app.log", index_interval=256)
+    base = time.time() - 10_000
+    for i in range(200):
+        level = logging.ERROR if i % 50 == 0 else logging.INFO
+        emit(handler, f"event {i}", level, created=base + i * 10)
+    emit(handler, "boom\nTraceback (most recent call last):\n  File x", logging.ERROR, base + 2000)
+
+    index = handler.index
+    errors = index.query(min_level=logging.ERROR)
+    assert [r.split(" - ")[-1].splitlines()[0] for r in errors] == [
+        "event 0", "event 50", "event 100", "event 150", "boom"
+    ]
+    assert errors[-1].endswith("  File x\n")
+    window = index.query(start=base + 500, end=base + 540)
+    assert [r.split(" - ")[-1].strip() for r in window] == [f"event {i}" for i in range(50, 55)]
+    assert len(index.query(limit=3)) == 3
+    handler.close()
+
+
+def test_index_survives_reopen_and_rebuilds_after_truncation(tmp_path):
+    path = tmp_path / "app.log"
+    handler = make_handler(path)
+    emit(handler, "kept", logging.WARNING)
+    handler.close()
+    assert (tmp_path / "app.log.idx").exists()
+
+    handler = make_handler(path)
+    emit(handler, "second")
+    assert len(handler.index.query(min_level=logging.WARNING)) == 1
+    handler.truncate()
+    emit(handler, "after")
+    assert [r.split(" - ")[-1] for r in handler.index.query()] == ["after\n"]
+    handler.close()
+
+    # Logs written by something else are indexed on first query
+    other = tmp_path / "other.log"
+    other.write_text("2026-01-01 00:00:00 - x - ERROR - old\n2026-01-02 00:00:00 - x - INFO - new\n")
+    index = LogIndex(str(other), LOG_FORMAT, DATE_FORMAT)
+    assert index.query(min_level=logging.ERROR) == ["2026-01-01 00:00:00 - x - ERROR - old\n"]
+
+
+def test_handler_indexes_an_existing_log_on_first_write_only(tmp_path, monkeypatch):
+    path = tmp_path / "app.log"
+    path.write_text("2026-01-01 00:00:00 - x - ERROR - old\n")
+    syncs = []
+    real_sync = LogIndex.sync
+    monkeypatch.setattr(LogIndex, "sync", lambda self: syncs.append(1) or real_sync(self))
+
+    handler = make_handler(path)
+    assert syncs == [] and not handler.index_synced
+    emit(handler, "new")
+    emit(handler, "newer")
+    assert len(syncs) == 1
+    assert [r.split(" - ")[-1] for r in handler.index.query(min_level=logging.ERROR)] == ["old\n"]
+    handler.close()
+
+    # Clearing a log does not index the contents it discards
+    syncs.clear()
+    handler = make_handler(path)
+    handler.truncate()
+    emit(handler, "fresh")
+    assert syncs == []
+    assert [r.split(" - ")[-1] for r in handler.index.query()] == ["fresh\n"]
+    handler.close()
+
+
+def test_rollover_moves_index(tmp_path):
+    handler = make_handler(tmp_path / "app.log", maxBytes=200, backupCount=2)
+    for i in range(10):
+        emit(handler, f"message {i}")
+    handler.close()
+    assert (tmp_path / "app.log.1").exists() and (tmp_path / "app.log.1.idx").exists()
+    current = LogIndex(str(tmp_path / "app.log"), LOG_FORMAT, DATE_FORMAT)
+    assert current.query()[-1].endswith("message 9\n")
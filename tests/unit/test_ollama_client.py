@@ -0,0 +1,120 @@
+"""
+Unit tests for the shared Ollama client.
+
+---
+description: Test streaming generation against a fake NDJSON server
+endpoints: [test_ollama_client]
+inputs: []
+outputs: []
+dependencies: [pytest, aiohttp]
+auth: none
+alwaysApply: false
+---
+"""
+
+import asyncio
+
+import pytest
+
+from labeeb.core.exceptions import AIError
+from labeeb.services.ollama_client import OllamaClient, get_ollama_client
+from labeeb.testing.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+
+RESPONSE = '{"plan": []}'
+CHUNK_SIZE = 4
+TOKENS = [RESPONSE[i : i + CHUNK_SIZE] for i in range(0, len(RESPONSE), CHUNK_SIZE)]
+
+
+def fake_ollama():
+    """A fake Ollama server that streams the response in fixed-size chunks."""
+    return FakeOllamaServer(
+        FakeOllamaConfig(models=["gemma3:4b"], response=RESPONSE, chunk_size=CHUNK_SIZE)
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_tokens_yields_incrementally():
+    """Test tokens are yielded one chunk at a time."""
+    server = fake_ollama()
+    async with server as url:
+        client = OllamaClient(base_url=url)
+        try:
+            tokens = [t async for t in client.stream_tokens("gemma3:4b", "hi")]
+            assert tokens == TOKENS
+            assert server.requests[0]["body"]["stream"] is True
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_generate_aggregates_stream():
+    """Test generate joins the stream into one response."""
+    async with fake_ollama() as url:
+        client = OllamaClient(base_url=url)
+        try:
+            result = await client.generate("gemma3:4b", "hi", options={"temperature": 0.1})
+            assert result["response"] == RESPONSE
+            assert result["done"] is True
+            assert result["eval_count"] == len(TOKENS)
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused():
+    """Test consecutive requests share one pooled session."""
+    async with fake_ollama() as url:
+        client = OllamaClient(base_url=url)
+        try:
+            await client.generate("gemma3:4b", "one")
+            session = client._session
+            await client.generate("gemma3:4b", "two")
+            assert client._session is session
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_error_status_raises():
+    """Test a non-200 response raises AIError."""
+    async with fake_ollama() as url:
+        client = OllamaClient(base_url=url)
+        try:
+            with pytest.raises(AIError):
+                await client.generate("missing", "hi")
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_list_models():
+    """Test listing available models."""
+    async with fake_ollama() as url:
+        client = OllamaClient(base_url=url)
+        try:
+            assert [model["name"] for model in await client.list_models()] == ["gemma3:4b"]
+        finally:
+            await client.close()
+
+
+def test_get_ollama_client_is_shared():
+    """Test the module-level client is shared per base URL."""
+    assert get_ollama_client("http://localhost:11434/") is get_ollama_client(
+        "http://localhost:11434"
+    )
+
+
+def test_session_from_another_loop_is_closed_when_replaced():
+    """Test a session left behind on an earlier event loop is closed, not leaked."""
+    client = OllamaClient()
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        first = first_loop.run_until_complete(client._get_session())
+        second = second_loop.run_until_complete(client._get_session())
+        assert second is not first
+        assert first.closed
+        second_loop.run_until_complete(client.close())
+        assert second.closed
+    finally:
+        first_loop.close()
+        second_loop.close()
@@ -0,0 +1,119 @@
+"""
+Unit tests for dependency-aware plan execution.
+
+---
+description: Test DAG scheduling of plan steps in AICommandInterpreter
+endpoints: [test_plan_execution]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from labeeb.services import ai_command_interpreter
+from labeeb.services.ai_command_interpreter import AICommandInterpreter, PlanStep
+
+
+def make_step(step, operation="echo", text=None, **kwargs):
+    """Create a plan step that echoes its text."""
+    return PlanStep(
+        step=step,
+        description=f"step {step}",
+        operation=operation,
+        parameters={"text": text if text is not None else f"out{step}"},
+        confidence=1.0,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def interpreter():
+    """Create an interpreter without loading real tools."""
+    with patch.object(ai_command_interpreter, "JSONTool", MagicMock()), patch.object(
+        ai_command_interpreter, "SoundTool", MagicMock()
+    ), patch.object(ai_command_interpreter, "WeatherPlugin", MagicMock()):
+        yield AICommandInterpreter(max_concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently(interpreter):
+    """Test independent steps overlap, bounded by the concurrency limit."""
+    running = 0
+    peak = 0
+
+    async def slow_step(step, parameters):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ai_command_interpreter.StepResult(step.step, step.description, "success")
+
+    interpreter._execute_step = slow_step
+    results = await interpreter.process_plan_async([make_step(i) for i in range(1, 5)])
+    assert [r.status for r in results] == ["success"] * 4
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_inferred_dependency_passes_output(interpreter):
+    """Test a parameter reference waits for and receives the earlier output."""
+    plan = [make_step(2, text="got {{step_1}}"), make_step(1, text="hello")]
+    results = await interpreter.process_plan_async(plan)
+    assert results[0].output == "got hello"
+    assert results[1].output == "hello"
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_downstream(interpreter):
+    """Test steps downstream of a failure are cancelled."""
+    plan = [
+        make_step(1, operation="missing_tool.run"),
+        make_step(2, depends_on=[1]),
+        make_step(3, text="{{step_2}}"),
+        make_step(4),
+    ]
+    with patch.object(ai_command_interpreter.ToolRegistry, "get_tool", return_value=None):
+        results = await interpreter.process_plan_async(plan)
+    assert [r.status for r in results] == ["error", "cancelled", "cancelled", "success"]
+
+
+@pytest.mark.asyncio
+async def test_on_success_and_on_failure_handlers(interpreter):
+    """Test handler steps only run for the matching outcome."""
+    plan = [
+        make_step(1, on_success=[2], on_failure=[3]),
+        make_step(2),
+        make_step(3),
+    ]
+    results = await interpreter.process_plan_async(plan)
+    assert [r.status for r in results] == ["success", "success", "skipped"]
+
+
+@pytest.mark.asyncio
+async def test_dependency_cycle_is_reported(interpreter):
+    """Test steps in a cycle fail instead of deadlocking."""
+    plan = [make_step(1, depends_on=[2]), make_step(2, depends_on=[1]), make_step(3)]
+    results = await interpreter.process_plan_async(plan)
+    assert [r.status for r in results] == ["error", "error", "success"]
+
+
+def test_cleanup_runs_warm_tool_hooks(interpreter):
+    """Test the sync cleanup used at exit runs the warm tools' cleanup hooks."""
+    tool = MagicMock()
+    interpreter.tool_lifecycle.register_tool(lambda: tool, name="warm")
+
+    async def use():
+        async with interpreter.tool_lifecycle.acquire("warm"):
+            pass
+
+    asyncio.run(use())
+    interpreter.cleanup()
+    tool.cleanup.assert_called_once()
+    assert interpreter in ai_command_interpreter._live_interpreters
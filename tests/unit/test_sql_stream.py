@@ -0,0 +1,132 @@
+"""Tests for the SQL stream service, against a mocked aiomysql connection."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiomysql")
+
+from labeeb.services import sql_stream  # noqa: E402
+
+
+class FakeCursor:
+    """Unbuffered cursor over generated rows that records what it was asked."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = [("id",), ("name",)]
+        self.rowcount = 0
+        self._rows = iter(())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params=None):
+        self.conn.queries.append(query)
+        if "information_schema" in query:
+            self._rows = iter(self.conn.schema_rows)
+        else:
+            self._rows = ((i, f"row {i}") for i in range(self.conn.total))
+
+    async def fetchmany(self, size):
+        self.conn.page_sizes.append(size)
+        return [row for _, row in zip(range(size), self._rows)]
+
+    async def fetchall(self):
+        return list(self._rows)
+
+    async def executemany(self, query, values):
+        self.conn.queries.append(query)
+        self.conn.batches.append(list(values))
+        self.rowcount = len(values)
+
+
+class FakeConnection:
+    def __init__(self, total=0, schema_rows=()):
+        self.total = total
+        self.schema_rows = list(schema_rows)
+        self.queries, self.page_sizes, self.batches, self.events = [], [], [], []
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    async def begin(self):
+        self.events.append("begin")
+
+    async def commit(self):
+        self.events.append("commit")
+
+    async def rollback(self):
+        self.events.append("rollback")
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("SELECT * FROM t", "SELECT * FROM t LIMIT 11"),
+        ("select * from t limit 500", "select * from t limit 11"),
+        ("SELECT * FROM t LIMIT 20, 500", "SELECT * FROM t LIMIT 20, 11"),
+        ("SELECT * FROM t LIMIT 5", "SELECT * FROM t LIMIT 5"),
+        ("SELECT * FROM t LIMIT %s", "SELECT * FROM t LIMIT %s"),
+        ("SHOW TABLES", "SHOW TABLES"),
+    ],
+)
+def test_with_limit(query, expected):
+    assert sql_stream.with_limit(query, 11) == expected
+
+
+def test_fetch_limited_reads_pages_up_to_the_limit():
+    conn = FakeConnection(total=10_000)
+    columns, rows, truncated = asyncio.run(
+        sql_stream.fetch_limited(conn, "SELECT id, name FROM t", limit=100, page_size=40)
+    )
+    assert conn.queries == ["SELECT id, name FROM t LIMIT 101"]
+    assert columns == ["id", "name"]
+    assert len(rows) == 100 and rows[-1] == {"id": 99, "name": "row 99"}
+    assert truncated
+    assert max(conn.page_sizes) == 40
+
+
+def test_iter_rows_yields_everything():
+    async def collect():
+        return [row async for row in sql_stream.iter_rows(conn, "SELECT 1", page_size=7)]
+
+    conn = FakeConnection(total=30)
+    assert [row["id"] for row in asyncio.run(collect())] == list(range(30))
+
+
+def test_insert_many_batches_in_one_transaction():
+    conn = FakeConnection()
+    rows = [[i, f"n{i}"] for i in range(5)] + [{"name": "last", "id": 5}]
+    inserted = asyncio.run(sql_stream.insert_many(conn, "people", ["id", "name"], rows, 4))
+    assert inserted == 6
+    assert conn.queries[0] == "INSERT INTO `people` (`id`, `name`) VALUES (%s, %s)"
+    assert [len(batch) for batch in conn.batches] == [4, 2]
+    assert conn.batches[1][1] == (5, "last")
+    assert conn.events == ["begin", "commit"]
+    with pytest.raises(ValueError):
+        asyncio.run(sql_stream.insert_many(conn, "people; DROP", ["id"], [[1]]))
+
+
+def test_fetch_schema_uses_one_query():
+    conn = FakeConnection(
+        schema_rows=[
+            ("a", "id", "int", "NO", "PRI", None, "auto_increment"),
+            ("a", "name", "varchar(20)", "YES", "", None, ""),
+            ("b", "id", "int", "NO", "PRI", None, ""),
+        ]
+    )
+    schema = asyncio.run(sql_stream.fetch_schema(conn))
+    assert len(conn.queries) == 1
+    assert list(schema) == ["a", "b"]
+    assert schema["a"][1] == {
+        "field": "name",
+        "type": "varchar(20)",
+        "null": "YES",
+        "key": "",
+        "default": None,
+        "extra": "",
+    }
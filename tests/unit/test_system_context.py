@@ -0,0 +1,94 @@
+"""
+Unit tests for the cached system context.
+
+---
+description: Test per-field TTLs and the cached prompt fragment
+endpoints: [test_system_context]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import time
+
+from labeeb.services.system_context import ContextField, SystemContext
+
+
+class Counter:
+    """Sampler that returns an increasing value and counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_static_fields_are_sampled_once():
+    """Static fields are sampled on construction and never again."""
+    static = Counter()
+    context = SystemContext([ContextField("static", "Static", static)], background=False)
+
+    for _ in range(5):
+        context.fragment()
+
+    assert static.calls == 1
+    assert context.fragment() == "Static: 1"
+
+
+def test_volatile_fields_refresh_after_ttl():
+    """Volatile fields are sampled again only once their TTL expires."""
+    volatile = Counter()
+    context = SystemContext(
+        [ContextField("volatile", "Volatile", volatile, ttl=0.05)], background=False
+    )
+
+    assert context.fragment() == "Volatile: 1"
+    assert context.fragment() == "Volatile: 1"
+    time.sleep(0.06)
+    assert context.fragment() == "Volatile: 2"
+
+
+def test_fragment_is_cached_until_a_value_changes():
+    """The rendered fragment is reused while no value changes."""
+    context = SystemContext(
+        [
+            ContextField("os", "OS", lambda: "Linux"),
+            ContextField("cpu", "CPU usage", lambda: 12.34, ttl=60, fmt="{:.0f}%"),
+            ContextField("missing", "Missing", lambda: None, ttl=60),
+        ],
+        background=False,
+    )
+
+    first = context.fragment()
+    assert first == "OS: Linux, CPU usage: 12%"
+    assert context.fragment() is first
+
+
+def test_background_thread_samples_volatile_fields():
+    """The background thread keeps volatile fields fresh."""
+    volatile = Counter()
+    context = SystemContext(
+        [ContextField("volatile", "Volatile", volatile, ttl=0.01)], refresh_interval=0.01
+    )
+    try:
+        context.fragment()
+        deadline = time.monotonic() + 2
+        while volatile.calls < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert volatile.calls >= 3
+    finally:
+        context.stop()
+
+
+def test_default_fields_render_without_blocking():
+    """The default fields render quickly and describe the platform."""
+    context = SystemContext(background=False)
+    start = time.perf_counter()
+    fragment = context.fragment()
+    assert time.perf_counter() - start < 0.5
+    assert fragment.startswith("OS: ")
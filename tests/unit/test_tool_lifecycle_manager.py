@@ -0,0 +1,182 @@
+"""
+Unit tests for the tool lifecycle manager.
+
+---
+description: Test warm tool instances and concurrency policies
+endpoints: [test_tool_lifecycle_manager]
+inputs: []
+outputs: []
+dependencies: [pytest]
+auth: none
+alwaysApply: false
+---
+"""
+
+import asyncio
+import pytest
+
+from labeeb.tools.tool_lifecycle_manager import (
+    POLICY_EXCLUSIVE,
+    POLICY_POOLED,
+    POLICY_SHARED,
+    ToolLifecycleManager,
+)
+
+
+class CountingTool:
+    """Tool that counts constructions and lifecycle hooks."""
+
+    created = 0
+
+    def __init__(self):
+        CountingTool.created += 1
+        self.initialized = False
+        self.cleaned_up = False
+
+    async def initialize(self) -> bool:
+        self.initialized = True
+        return True
+
+    def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+class PooledTool(CountingTool):
+    """Tool that declares a pooled policy."""
+
+    concurrency_policy = POLICY_POOLED
+    pool_size = 2
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    """Reset the construction counter."""
+    CountingTool.created = 0
+
+
+@pytest.mark.asyncio
+async def test_shared_tool_is_constructed_once():
+    """Test a shared tool is built and initialized once."""
+    manager = ToolLifecycleManager()
+    manager.register_tool(CountingTool, name="counting", policy=POLICY_SHARED)
+    async with manager.acquire("counting") as first:
+        async with manager.acquire("counting") as second:
+            pass
+    assert first is second
+    assert first.initialized
+    assert CountingTool.created == 1
+
+
+@pytest.mark.asyncio
+async def test_undeclared_policy_defaults_to_exclusive():
+    """Test a tool without a declared policy is reused but never used concurrently."""
+    manager = ToolLifecycleManager(resolver={"counting": CountingTool}.get)
+    async with manager.acquire("counting") as first:
+        pass
+    async with manager.acquire("counting") as second:
+        pass
+    assert first is second
+    assert manager.get_policy("counting") == (POLICY_EXCLUSIVE, 1)
+
+
+@pytest.mark.asyncio
+async def test_pooled_tool_caps_instances():
+    """Test a pooled tool never exceeds its pool size."""
+    manager = ToolLifecycleManager()
+    manager.register_tool(PooledTool, name="pooled")
+    seen = set()
+
+    async def use():
+        async with manager.acquire("pooled") as tool:
+            seen.add(id(tool))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(use() for _ in range(6)))
+    assert len(seen) == 2
+    assert manager.get_pool_stats()["pooled"]["idle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_exclusive_tool_serializes_callers():
+    """Test an exclusive tool is used by one caller at a time."""
+    manager = ToolLifecycleManager()
+    manager.register_tool(CountingTool, name="exclusive", policy=POLICY_EXCLUSIVE)
+    active = 0
+    peak = 0
+
+    async def use():
+        nonlocal active, peak
+        async with manager.acquire("exclusive"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(use() for _ in range(3)))
+    assert peak == 1
+    assert CountingTool.created == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_raises():
+    """Test acquiring an unknown tool raises KeyError."""
+    manager = ToolLifecycleManager()
+    with pytest.raises(KeyError):
+        async with manager.acquire("missing"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_cleanup_runs_hooks():
+    """Test cleanup runs every instance's cleanup hook."""
+    manager = ToolLifecycleManager(resolver={"counting": CountingTool}.get)
+    async with manager.acquire("counting") as tool:
+        pass
+    await manager.cleanup_async()
+    assert tool.cleaned_up
+    assert manager.get_pool_stats()["counting"]["instances"] == 0
+
+
+def test_pools_work_across_event_loops():
+    """Test warm instances are reused from a later loop while callers contend for them."""
+    manager = ToolLifecycleManager()
+    manager.register_tool(CountingTool, name="exclusive", policy=POLICY_EXCLUSIVE)
+    manager.register_tool(PooledTool, name="pooled")
+    manager.register_tool(CountingTool, name="shared", policy=POLICY_SHARED)
+
+    async def contend():
+        async def use(name):
+            async with manager.acquire(name):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(use(name) for name in ("exclusive", "pooled", "shared") * 3))
+
+    # Each run is a separate loop, as with process_plan and the daemon
+    asyncio.run(contend())
+    asyncio.run(contend())
+    stats = manager.get_pool_stats()
+    assert stats["exclusive"]["instances"] == 1
+    assert stats["pooled"]["instances"] == 2
+    assert stats["pooled"]["idle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_returns_its_instance():
+    """Test an instance held by a cancelled caller goes back to the pool."""
+    manager = ToolLifecycleManager()
+    manager.register_tool(CountingTool, name="exclusive", policy=POLICY_EXCLUSIVE)
+
+    async def hold():
+        async with manager.acquire("exclusive"):
+            await asyncio.sleep(10)
+
+    holder = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    holder.cancel()
+    waiter.cancel()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+    async with manager.acquire("exclusive"):
+        pass
+    assert manager.get_pool_stats()["exclusive"]["idle"] == 1
@@ -0,0 +1,75 @@
+"""Tests for the streaming transcription engine."""
+
+import time
+
+import numpy as np
+import pytest
+
+from labeeb.models.audio.transcriber import (
+    SAMPLE_RATE,
+    TranscriptionEngine,
+    VoiceActivitySegmenter,
+    to_mono,
+)
+
+
+def speech(seconds, level=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return (0.001 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+
+
+def chunks(audio, seconds=0.1):
+    size = int(seconds * SAMPLE_RATE)
+    for offset in range(0, len(audio), size):
+        yield audio[offset : offset + size]
+
+
+class FakeEngine(TranscriptionEngine):
+    """Engine whose model reports the length of each segment."""
+
+    def _transcribe(self, request):
+        return {"text": f"{len(request.audio) / SAMPLE_RATE:.1f}s", "language": "en"}
+
+
+AUDIO = np.concatenate([silence(1), speech(1), silence(1), speech(2), silence(0.2)])
+
+
+def test_segmenter_splits_on_pauses():
+    segmenter = VoiceActivitySegmenter(padding=0)
+    segments = [segment for chunk in chunks(AUDIO) for segment in segmenter.feed(chunk)]
+    segments += segmenter.flush()
+    assert [(round(s.start, 1), round(s.end, 1)) for s in segments] == [(1.0, 2.0), (3.0, 5.0)]
+    assert VoiceActivitySegmenter().flush() == []
+
+
+def test_stream_yields_each_segment_before_the_audio_ends():
+    engine = FakeEngine()
+    consumed = []
+
+    def source():
+        for chunk in chunks(AUDIO):
+            consumed.append(len(chunk))
+            # Live audio arrives over time rather than all at once
+            time.sleep(0.005)
+            yield chunk
+
+    try:
+        stream = engine.stream(source(), segmenter=VoiceActivitySegmenter(padding=0))
+        first = next(stream)
+        assert first.text == "1.0s"
+        assert sum(consumed) < len(AUDIO)
+        assert [segment.text for segment in stream] == ["2.0s"]
+    finally:
+        engine.shutdown()
+
+
+def test_to_mono_downmixes_and_resamples():
+    stereo = np.stack([speech(1), speech(1)], axis=1)
+    mono = to_mono(stereo, 48000)
+    assert mono.dtype == np.float32
+    assert len(mono) == pytest.approx(SAMPLE_RATE / 3, abs=1)
@@ -0,0 +1,151 @@
+"""
+Unit tests for the streaming video pipeline.
+
+---
+description: Test stage error propagation, segment boundaries, input spooling and stream-copy splits
+endpoints: [test_video_pipeline]
+inputs: []
+outputs: []
+dependencies: [pytest, opencv-python, numpy]
+auth: none
+alwaysApply: false
+---
+"""
+
+import io
+import os
+import stat
+import sys
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from labeeb.services.video_pipeline import (  # noqa: E402
+    FramePipeline,
+    SegmentWriter,
+    copy_split,
+    open_source,
+    read_frames,
+)
+
+SIZE = (32, 24)
+
+
+def make_frames(count):
+    """Frames whose pixel value is their index, to tell them apart after encoding."""
+    for index in range(count):
+        yield np.full((SIZE[1], SIZE[0], 3), index * 20, dtype=np.uint8)
+
+
+def test_pipeline_passes_every_frame_in_order():
+    """Frames reach the sink transformed and in order."""
+    seen = []
+    written = FramePipeline(queue_size=2).run(
+        make_frames(10), lambda frame: seen.append(int(frame[0, 0, 0])), lambda f: f + 1
+    )
+    assert written == 10
+    assert seen == [index * 20 + 1 for index in range(10)]
+
+
+@pytest.mark.parametrize("stage", ["decode", "transform", "sink"])
+def test_pipeline_raises_the_first_stage_error(stage):
+    """An error in any stage stops the pipeline and reaches the caller."""
+
+    def frames():
+        yield from make_frames(3)
+        if stage == "decode":
+            raise ValueError("decode failed")
+        yield from make_frames(100)
+
+    def transform(frame):
+        if stage == "transform" and frame[0, 0, 0] == 40:
+            raise ValueError("transform failed")
+        return frame
+
+    def sink(frame):
+        if stage == "sink" and frame[0, 0, 0] == 20:
+            raise ValueError("sink failed")
+
+    with pytest.raises(ValueError, match=f"{stage} failed"):
+        FramePipeline(queue_size=1).run(frames(), sink, transform)
+
+
+def test_segment_writer_switches_files_at_boundaries(tmp_path):
+    """Each segment gets the frames up to the next boundary; unreached segments still exist."""
+    paths = [str(tmp_path / f"part_{i}.avi") for i in range(4)]
+    writer = SegmentWriter(paths, 10.0, SIZE, boundaries=[3, 5, 20], fourcc="MJPG")
+    for frame in make_frames(7):
+        writer.write(frame)
+    writer.close()
+
+    counts = [sum(1 for _ in read_frames(path)) for path in paths]
+    assert counts == [3, 2, 2, 0]
+    assert writer.frames_written == 7
+    with pytest.raises(ValueError):
+        SegmentWriter(paths, 10.0, SIZE, boundaries=[3])
+
+
+@pytest.mark.parametrize("as_stream", [False, True])
+def test_open_source_spools_data_to_a_temporary_file(as_stream):
+    """Bytes and streams are copied to a file that is removed afterwards."""
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    source = io.BytesIO(data) if as_stream else data
+    with open_source(source, suffix=".avi") as path:
+        assert path.endswith(".avi")
+        with open(path, "rb") as f:
+            assert f.read() == data
+    assert not os.path.exists(path)
+
+
+def test_open_source_uses_paths_as_they_are(tmp_path):
+    """A path is handed back without copying or deleting it."""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    with open_source(video) as path:
+        assert path == str(video)
+    assert video.exists()
+
+
+def fake_ffmpeg(tmp_path, segments, exit_code=0):
+    """An ffmpeg stand-in that writes some segments to its output pattern."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"for index in range({segments}):\n"
+        "    with open(sys.argv[-1] % index, 'w') as f:\n"
+        "        f.write('new')\n"
+        f"sys.exit({exit_code})\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+def test_copy_split_returns_only_the_segments_it_wrote(tmp_path):
+    """Segments left from an earlier, longer split are neither returned nor reused."""
+    out = tmp_path / "out"
+    out.mkdir()
+    stale = [out / f"seg_{i}.mp4" for i in range(3)]
+    for path in stale:
+        path.write_text("old")
+
+    pattern = str(out / "seg_%d.mp4")
+    paths = copy_split(fake_ffmpeg(tmp_path, 2), "in.mp4", pattern, [1.0])
+    assert paths == [pattern % 0, pattern % 1]
+    assert [open(path).read() for path in paths] == ["new", "new"]
+    assert stale[2].read_text() == "old"
+    assert sorted(os.listdir(out)) == ["seg_0.mp4", "seg_1.mp4", "seg_2.mp4"]
+
+
+def test_failed_copy_split_leaves_existing_files_alone(tmp_path):
+    """A failed split removes its partial segments but no files it did not write."""
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "seg_0.mp4").write_text("old")
+
+    pattern = str(out / "seg_%d.mp4")
+    assert copy_split(fake_ffmpeg(tmp_path, 1, exit_code=1), "in.mp4", pattern, [1.0]) is None
+    assert os.listdir(out) == ["seg_0.mp4"]
+    assert (out / "seg_0.mp4").read_text() == "old"
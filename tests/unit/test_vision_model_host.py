@@ -0,0 +1,71 @@
+"""Tests for the shared vision model host."""
+
+import io
+import threading
+
+from PIL import Image
+
+from labeeb.models.vision.model_host import TASK_MAX_NEW_TOKENS, VisionModelHost
+from labeeb.services.cache_service import CacheService
+
+
+class RecordingHost(VisionModelHost):
+    """Host whose model echoes its inputs and records each batch."""
+
+    def __init__(self, **kwargs):
+        super().__init__(cache=CacheService(spill_threshold=None).namespace("vision"), **kwargs)
+        self.batches = []
+
+    def _generate_batch(self, images, prompts, max_new_tokens):
+        self.batches.append(list(max_new_tokens))
+        return [f"{prompt} {image.size[0]}" for image, prompt in zip(images, prompts)]
+
+
+def make_image(width):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, 10)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_concurrent_requests_share_one_batch():
+    host = RecordingHost(batch_window=0.2)
+    try:
+        results = host.generate_many([make_image(width) for width in (10, 20, 30)], "size")
+        assert results == ["size 10", "size 20", "size 30"]
+        assert len(host.batches) == 1
+    finally:
+        host.shutdown()
+
+
+def test_answers_are_cached_by_content_and_capped_per_task():
+    host = RecordingHost(batch_window=0.01)
+    try:
+        assert host.generate(make_image(10), task="document") == "Analyze this document. 10"
+        assert host.batches == [[TASK_MAX_NEW_TOKENS["document"]]]
+        assert host.generate(make_image(10), task="document") == "Analyze this document. 10"
+        assert len(host.batches) == 1
+    finally:
+        host.shutdown()
+
+
+def test_batch_errors_reach_every_caller():
+    class FailingHost(RecordingHost):
+        def _generate_batch(self, images, prompts, max_new_tokens):
+            raise RuntimeError("model failed")
+
+    host = FailingHost(batch_window=0.2)
+    errors = []
+
+    def call(width):
+        try:
+            host.generate(make_image(width))
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call, args=(width,)) for width in (10, 20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    host.shutdown()
+    assert errors == ["model failed", "model failed"]